@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Benchmark regression check.
+
+Runs the benchmark suite (tests/benchmarks/benchmark_suite.gd) in a headless
+Godot process and compares each case's median trial time with the versioned
+baseline in tests/benchmarks/baseline.json. A case regresses when its median
+is more than --threshold slower than the baseline's and the difference is
+above the absolute noise floor. --update records the current run as the new
+baseline; do that on the reference machine, since timings from different
+hardware are not comparable.
+
+Usage:
+    python3 benchmark_check.py [--trials N] [--filter TEXT] [--threshold 0.15]
+                               [--baseline PATH] [--update] [--timeout SECONDS]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from godot_process import run_godot_async
+
+PROJECT_ROOT = Path(__file__).parent
+BENCHMARK_SCRIPT = "res://tools/testing/run_benchmarks.gd"
+BASELINE_FILE = PROJECT_ROOT / "tests" / "benchmarks" / "baseline.json"
+BASELINE_FORMAT_VERSION = 1
+INFO_PREFIX = "BENCHMARK_INFO "
+RESULT_PREFIX = "BENCHMARK_RESULT "
+DEFAULT_TRIALS = 7
+# Fraction a median may grow by before it counts as a regression
+DEFAULT_THRESHOLD = 0.15
+# Differences below this are timer and scheduler noise whatever the ratio
+NOISE_FLOOR_USEC = 50.0
+
+
+def parse_benchmark_output(output: str) -> Dict[str, Any]:
+    """Collect the runner's info and per-case result lines into one run record."""
+    run: Dict[str, Any] = {"godot_version": "", "trials": 0, "cases": {}}
+    for line in output.splitlines():
+        line = line.strip()
+        if line.startswith(INFO_PREFIX):
+            info = json.loads(line[len(INFO_PREFIX):])
+            run["godot_version"] = info.get("godot_version", "")
+            run["trials"] = int(info.get("trials", 0))
+        elif line.startswith(RESULT_PREFIX):
+            result = json.loads(line[len(RESULT_PREFIX):])
+            run["cases"][result.pop("case")] = result
+    return run
+
+
+async def run_benchmarks(trials: int = DEFAULT_TRIALS, case_filter: str = "", timeout: float = 600) -> tuple[Optional[Dict[str, Any]], str]:
+    """Run the suite once; returns (run record, error). The record is None on failure."""
+    args = ["--script", BENCHMARK_SCRIPT, "--", f"--trials={trials}"]
+    if case_filter:
+        args.append(f"--filter={case_filter}")
+    success, output, error = await run_godot_async(args, timeout)
+    run = parse_benchmark_output(output)
+    if not run["cases"]:
+        return None, error or output[-2000:] or "benchmark runner printed no results"
+    if not success:
+        return run, error or "benchmark runner did not exit cleanly"
+    return run, ""
+
+
+def load_baseline(path: Path = BASELINE_FILE) -> tuple[Optional[Dict[str, Any]], str]:
+    """Returns (baseline, error); a missing file is (None, "") so callers can offer --update."""
+    if not path.exists():
+        return None, ""
+    try:
+        baseline = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError) as e:
+        return None, f"Cannot read baseline {path}: {e}"
+    version = baseline.get("format_version")
+    if version != BASELINE_FORMAT_VERSION:
+        return None, f"Baseline {path} has format_version {version}, expected {BASELINE_FORMAT_VERSION}; re-record it with --update"
+    return baseline, ""
+
+
+def write_baseline(run: Dict[str, Any], path: Path = BASELINE_FILE, merge: bool = True) -> Dict[str, Any]:
+    """Store a run as the baseline. With merge, cases not in the run keep their old entry."""
+    cases: Dict[str, Any] = {}
+    if merge:
+        existing, _ = load_baseline(path)
+        if existing:
+            cases.update(existing.get("cases", {}))
+    for name, result in run["cases"].items():
+        cases[name] = {key: result[key] for key in ("ops", "median_usec", "min_usec", "max_usec", "usec_per_op")}
+    baseline = {
+        "format_version": BASELINE_FORMAT_VERSION,
+        "godot_version": run.get("godot_version", ""),
+        "trials": run.get("trials", 0),
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "cases": dict(sorted(cases.items())),
+    }
+    path.write_text(json.dumps(baseline, indent=2) + "\n")
+    return baseline
+
+
+def compare_runs(baseline: Dict[str, Any], run: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD,
+                 noise_floor_usec: float = NOISE_FLOOR_USEC) -> List[Dict[str, Any]]:
+    """
+    One entry per case of the run, with status "regression", "improvement", "ok",
+    "new" (no baseline entry) or "changed" (the case's op count differs, so the
+    medians measure different work).
+    """
+    comparisons = []
+    baseline_cases = baseline.get("cases", {})
+    for name, result in run["cases"].items():
+        entry: Dict[str, Any] = {"case": name, "median_usec": result["median_usec"]}
+        previous = baseline_cases.get(name)
+        if previous is None:
+            entry["status"] = "new"
+        elif previous.get("ops") != result.get("ops"):
+            entry["status"] = "changed"
+        else:
+            base = float(previous["median_usec"])
+            delta = result["median_usec"] - base
+            entry["baseline_usec"] = base
+            entry["ratio"] = result["median_usec"] / base if base > 0 else 1.0
+            if abs(delta) < noise_floor_usec:
+                entry["status"] = "ok"
+            elif entry["ratio"] > 1.0 + threshold:
+                entry["status"] = "regression"
+            elif entry["ratio"] < 1.0 - threshold:
+                entry["status"] = "improvement"
+            else:
+                entry["status"] = "ok"
+        comparisons.append(entry)
+    return comparisons
+
+
+def has_regressions(comparisons: List[Dict[str, Any]]) -> bool:
+    return any(entry["status"] == "regression" for entry in comparisons)
+
+
+def format_comparison(comparisons: List[Dict[str, Any]], threshold: float = DEFAULT_THRESHOLD) -> str:
+    width = max([len(entry["case"]) for entry in comparisons] + [4])
+    lines = [f"{'case':<{width}}  {'median':>12}  {'baseline':>12}  {'change':>8}  status"]
+    for entry in comparisons:
+        baseline = f"{entry['baseline_usec']:.0f} us" if "baseline_usec" in entry else "-"
+        change = f"{(entry['ratio'] - 1.0) * 100:+.1f}%" if "ratio" in entry else "-"
+        lines.append(f"{entry['case']:<{width}}  {entry['median_usec']:>9.0f} us  {baseline:>12}  {change:>8}  {entry['status']}")
+    regressions = [entry["case"] for entry in comparisons if entry["status"] == "regression"]
+    if regressions:
+        lines.append(f"\n{len(regressions)} case(s) regressed by more than {threshold * 100:.0f}%: {', '.join(regressions)}")
+    else:
+        lines.append(f"\nNo regressions beyond {threshold * 100:.0f}%")
+    return "\n".join(lines)
+
+
+def _parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the benchmark suite and compare it with the recorded baseline.")
+    parser.add_argument("--trials", type=int, default=DEFAULT_TRIALS, help="Timed runs per case; the median is compared")
+    parser.add_argument("--filter", default="", help="Only cases whose name contains this text")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown as a fraction")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--update", action="store_true", help="Record this run as the baseline instead of comparing")
+    parser.add_argument("--timeout", type=float, default=600, help="Timeout for the whole run in seconds")
+    return parser.parse_args(argv)
+
+
+async def _main(argv: List[str]) -> int:
+    args = _parse_args(argv)
+    run, error = await run_benchmarks(args.trials, args.filter, args.timeout)
+    if run is None:
+        print(f"Benchmark run failed: {error}", file=sys.stderr)
+        return 1
+    if error:
+        print(f"Warning: {error}", file=sys.stderr)
+
+    if args.update:
+        baseline = write_baseline(run, args.baseline)
+        print(f"Recorded {len(run['cases'])} case(s) in {args.baseline} ({len(baseline['cases'])} total)")
+        return 0
+
+    baseline, error = load_baseline(args.baseline)
+    if error:
+        print(error, file=sys.stderr)
+        return 1
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; record one with --update", file=sys.stderr)
+        return 1
+    comparisons = compare_runs(baseline, run, args.threshold)
+    print(format_comparison(comparisons, args.threshold))
+    return 1 if has_regressions(comparisons) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(sys.argv[1:])))
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Headless Godot processes for the project's tooling.
+
+The MCP server, the sharded GUT runner and the benchmark check all launch
+Godot through run_godot_async. Each process is started in its own process
+group, so a timeout or cancellation terminates only that process and its
+children; other Godot instances (the editor, another tool call) are never
+touched. At most GODOT_MAX_PROCESSES run at once.
+"""
+
+import asyncio
+import os
+import signal
+import subprocess
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+PROJECT_ROOT = Path(__file__).parent
+GODOT_STREAM_LIMIT = 16 * 1024 * 1024
+GODOT_NOT_FOUND_MESSAGE = (
+    "Godot executable not found. Please either:\n"
+    "1. Install Godot and ensure it's in your PATH\n"
+    "2. Set GODOT_PATH environment variable to point to Godot executable\n"
+    "3. Install Godot in /Applications/Godot.app (macOS)"
+)
+
+# Called with each line of Godot output as it arrives
+OutputCallback = Callable[[str], Awaitable[None]]
+
+# Processes started by run_godot_async that have not finished yet
+active_processes: Set[asyncio.subprocess.Process] = set()
+_godot_slots: Optional[asyncio.Semaphore] = None
+
+
+def env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def find_godot_executable() -> Optional[str]:
+    """Find Godot executable in common locations."""
+    # Check if godot is in PATH
+    if subprocess.run(["which", "godot"], capture_output=True).returncode == 0:
+        return "godot"
+
+    # Common macOS locations
+    mac_locations = [
+        "/Applications/Godot.app/Contents/MacOS/Godot",
+        "/Applications/Godot_v4.app/Contents/MacOS/Godot",
+        "/Applications/Godot4.app/Contents/MacOS/Godot",
+        os.path.expanduser("~/Applications/Godot.app/Contents/MacOS/Godot"),
+    ]
+
+    for path in mac_locations:
+        if os.path.exists(path):
+            return path
+
+    # Check environment variable
+    if "GODOT_PATH" in os.environ:
+        return os.environ["GODOT_PATH"]
+
+    return None
+
+
+def new_process_group_kwargs() -> Dict[str, Any]:
+    """Start a child in its own process group so it can be terminated without touching anything else."""
+    if os.name != 'nt':
+        return {'start_new_session': True}
+    return {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+
+
+def signal_process_group(process, sig: int) -> None:
+    """Signal the process group of a child started with new_process_group_kwargs (its pgid is its pid)."""
+    try:
+        if os.name != 'nt':
+            os.killpg(process.pid, sig)
+        elif sig == signal.SIGTERM:
+            process.terminate()
+        else:
+            process.kill()
+    except (ProcessLookupError, OSError):
+        pass
+
+
+def kill_process_group(process) -> None:
+    """Kill one process and its children without touching any other Godot process."""
+    if process.returncode is not None:
+        return
+    signal_process_group(process, signal.SIGKILL)
+
+
+async def terminate_process_group(process, grace: float = 3.0) -> None:
+    """
+    SIGTERM the process group of a child that is still running and SIGKILL it after
+    `grace` seconds. A child that already exited is left alone: once it is reaped its
+    pid, and so the saved pgid, may belong to an unrelated process.
+    """
+    if process.returncode is not None:
+        return
+    signal_process_group(process, signal.SIGTERM)
+    try:
+        await asyncio.wait_for(process.wait(), grace)
+    except asyncio.TimeoutError:
+        signal_process_group(process, signal.SIGKILL)
+        await process.wait()
+
+
+def _get_godot_slots() -> asyncio.Semaphore:
+    """Bounds how many one-shot Godot processes run at once (GODOT_MAX_PROCESSES, default CPU count)."""
+    global _godot_slots
+    if _godot_slots is None:
+        _godot_slots = asyncio.Semaphore(max(1, env_int("GODOT_MAX_PROCESSES", os.cpu_count() or 1)))
+    return _godot_slots
+
+
+async def pump_stream(stream, lines: List[str], on_output: Optional[OutputCallback]) -> None:
+    while True:
+        line = await stream.readline()
+        if not line:
+            return
+        text = line.decode(errors="replace").rstrip("\n")
+        lines.append(text)
+        if on_output:
+            await on_output(text)
+
+
+async def run_godot_async(
+    args: List[str],
+    timeout: float = 60,
+    on_output: Optional[OutputCallback] = None
+) -> tuple[bool, str, str]:
+    """
+    Run one headless Godot process without blocking the event loop.
+
+    At most GODOT_MAX_PROCESSES run at once; further calls wait for a slot. Output lines
+    are passed to on_output as they arrive. On completion, timeout or cancellation only
+    this process's own group is terminated.
+    """
+    godot_path = find_godot_executable()
+    if not godot_path:
+        return False, "", GODOT_NOT_FOUND_MESSAGE
+
+    stdout_lines: List[str] = []
+    stderr_lines: List[str] = []
+    timed_out = False
+    async with _get_godot_slots():
+        process = await asyncio.create_subprocess_exec(
+            godot_path, "--headless", *args,
+            cwd=PROJECT_ROOT,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=GODOT_STREAM_LIMIT,
+            **new_process_group_kwargs(),
+        )
+        active_processes.add(process)
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(
+                    pump_stream(process.stdout, stdout_lines, on_output),
+                    pump_stream(process.stderr, stderr_lines, on_output),
+                    process.wait(),
+                ),
+                timeout,
+            )
+        except asyncio.TimeoutError:
+            timed_out = True
+        finally:
+            await terminate_process_group(process)
+            active_processes.discard(process)
+
+    stdout = "\n".join(stdout_lines)
+    stderr = "\n".join(stderr_lines)
+    if timed_out:
+        return False, stdout, f"{stderr}\nCommand timed out after {timeout}s".strip()
+    return process.returncode == 0, stdout, stderr
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Sharded GUT test runner.
+
+Splits the test scripts across several concurrent headless Godot processes,
+balancing shards with the per-script timings recorded by previous runs, and
+merges the shard results into one JSON and one JUnit XML report.
+
+Scripts that passed last time and whose dependencies are unchanged are skipped
+(see gut_test_cache.py); --full runs them all regardless.
+
+Usage:
+    python3 gut_shard_runner.py [--shards N] [--timeout SECONDS] [--output-dir DIR] [--full] [--quiet | --verbose]
+                                [-gtest=res://tests/unit/test_x.gd[,...]] [-gselect=TEXT]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from xml.sax.saxutils import escape, quoteattr
+
+from godot_process import OutputCallback, run_godot_async
+from gut_test_cache import TestResultCache
+
+PROJECT_ROOT = Path(__file__).parent
+GUT_CONFIG_FILE = PROJECT_ROOT / ".gutconfig.json"
+GUT_CMDLN_SCRIPT = "res://addons/gut/gut_cmdln.gd"
+EXPORT_HOOK_SCRIPT = "res://tools/testing/export_results_hook.gd"
+DEFAULT_OUTPUT_DIR = PROJECT_ROOT / ".godot_logs"
+TIMINGS_FILE_NAME = "gut_timings.json"
+CACHE_FILE_NAME = "gut_test_cache.json"
+RESULTS_JSON_NAME = "gut_results.json"
+RESULTS_XML_NAME = "gut_results.xml"
+# Assumed duration for scripts without a recorded timing when nothing else is known
+DEFAULT_SCRIPT_SECONDS = 1.0
+# Engine boot and script load cost added to every script when balancing
+SCRIPT_OVERHEAD_SECONDS = 0.05
+RESULT_PROPS = ("pending", "failures", "passing", "tests", "orphans", "errors", "warnings")
+
+RunGodot = Callable[[List[str], float, Optional[OutputCallback]], Awaitable[tuple]]
+# (shard index, script paths) -> {"ok", "results", "output", "error"}
+ShardExecutor = Callable[[int, List[str]], Awaitable[Dict[str, Any]]]
+# (shards finished, shard count, shard index, outcome), awaited as each shard finishes
+ShardCallback = Callable[[int, int, int, Dict[str, Any]], Awaitable[None]]
+
+
+def res_to_path(res_path: str) -> Path:
+    return PROJECT_ROOT / res_path.replace("res://", "", 1)
+
+
+def script_key(full_name: str) -> str:
+    """Script path for a GUT script name, dropping any inner class suffix."""
+    index = full_name.find(".gd")
+    return full_name[:index + 3] if index >= 0 else full_name
+
+
+def load_gut_config() -> Dict[str, Any]:
+    config = {"dirs": ["res://tests"], "prefix": "test_", "suffix": ".gd", "include_subdirs": False, "log_level": 1}
+    try:
+        with open(GUT_CONFIG_FILE, "r") as f:
+            config.update(json.load(f))
+    except (OSError, json.JSONDecodeError):
+        pass
+    return config
+
+
+def discover_test_scripts(config: Dict[str, Any], tests: Optional[List[str]] = None, select: str = "") -> List[str]:
+    """
+    Test scripts to run, as res:// paths.
+
+    Like GUT, explicit `tests` paths replace directory discovery; an entry that is not a
+    path (no "res://" and no ".gd") is treated as a file name filter like -gselect.
+    """
+    selects = [select] if select else []
+    explicit = []
+    for entry in tests or []:
+        if entry.startswith("res://") or entry.endswith(".gd"):
+            explicit.append(entry if entry.startswith("res://") else "res://" + entry.lstrip("/"))
+        elif entry:
+            selects.append(entry)
+
+    if explicit:
+        scripts = explicit
+    else:
+        scripts = []
+        for res_dir in config.get("dirs", []):
+            root = res_to_path(res_dir)
+            pattern = "**/*" if config.get("include_subdirs") else "*"
+            for path in sorted(root.glob(pattern + config.get("suffix", ".gd"))):
+                if path.is_file() and path.name.startswith(config.get("prefix", "test_")):
+                    scripts.append("res://" + path.relative_to(PROJECT_ROOT).as_posix())
+
+    if selects:
+        scripts = [s for s in scripts if any(text.lower() in s.rsplit("/", 1)[-1].lower() for text in selects)]
+    return scripts
+
+
+def load_timings(path: Path) -> Dict[str, float]:
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+        return {k: float(v) for k, v in data.get("scripts", {}).items()}
+    except (OSError, json.JSONDecodeError, AttributeError, ValueError):
+        return {}
+
+
+def save_timings(path: Path, timings: Dict[str, float], results: Dict[str, Any]) -> None:
+    """Record the measured duration of every script that ran, keeping older entries for the rest."""
+    measured: Dict[str, float] = {}
+    for full_name, script in results["test_scripts"]["scripts"].items():
+        key = script_key(full_name)
+        seconds = sum(float(test.get("time_taken", 0.0)) for test in script.get("tests", {}).values())
+        measured[key] = measured.get(key, 0.0) + seconds
+    merged = {**timings, **{k: round(v, 4) for k, v in measured.items()}}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"scripts": dict(sorted(merged.items()))}, f, indent=2)
+
+
+def plan_shards(scripts: List[str], shard_count: int, timings: Dict[str, float]) -> List[List[str]]:
+    """Longest-processing-time-first assignment of scripts to the least loaded shard."""
+    shard_count = max(1, min(shard_count, len(scripts)))
+    known = sorted(timings[s] for s in scripts if s in timings)
+    fallback = known[len(known) // 2] if known else DEFAULT_SCRIPT_SECONDS
+
+    def estimate(script: str) -> float:
+        return timings.get(script, fallback) + SCRIPT_OVERHEAD_SECONDS
+
+    shards: List[List[str]] = [[] for _ in range(shard_count)]
+    loads = [0.0] * shard_count
+    for script in sorted(scripts, key=lambda s: (-estimate(s), s)):
+        index = loads.index(min(loads))
+        shards[index].append(script)
+        loads[index] += estimate(script)
+    return [sorted(shard) for shard in shards if shard]
+
+
+def _empty_results() -> Dict[str, Any]:
+    return {"test_scripts": {"props": {key: 0 for key in RESULT_PROPS + ("time",)}, "scripts": {}}}
+
+
+def merge_results(shard_results: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+    """Combine GUT results dictionaries from several shards into one."""
+    merged = _empty_results()
+    props = merged["test_scripts"]["props"]
+    for results in shard_results:
+        shard = results.get("test_scripts", {})
+        for key in RESULT_PROPS:
+            props[key] += shard.get("props", {}).get(key, 0)
+        merged["test_scripts"]["scripts"].update(shard.get("scripts", {}))
+    props["time"] = round(elapsed, 3)
+    return merged
+
+
+def results_to_junit(results: Dict[str, Any]) -> str:
+    """JUnit XML in the layout of GUT's own exporter, with messages escaped."""
+    props = results["test_scripts"]["props"]
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        f'<testsuites name="GutTests" failures="{props["failures"]}" tests="{props["tests"]}" time="{props["time"]}">',
+    ]
+    for full_name, script in sorted(results["test_scripts"]["scripts"].items()):
+        tests = script.get("tests", {})
+        suite_props = script.get("props", {})
+        suite_time = sum(float(test.get("time_taken", 0.0)) for test in tests.values())
+        classname = full_name.replace("res://", "")
+        lines.append(
+            f'  <testsuite name={quoteattr(classname)} tests="{suite_props.get("tests", len(tests))}" '
+            f'failures="{suite_props.get("failures", 0)}" skipped="{suite_props.get("pending", 0)}" time="{suite_time}">'
+        )
+        for name, test in tests.items():
+            assertions = len(test.get("passing", [])) + len(test.get("failing", []))
+            lines.append(
+                f'    <testcase name={quoteattr(name)} assertions="{assertions}" status={quoteattr(test.get("status", ""))} '
+                f'classname={quoteattr(classname)} time="{test.get("time_taken", 0.0)}">'
+            )
+            if test.get("status") == "fail":
+                lines.append(f'      <failure message="failed">{escape(chr(10).join(test.get("failing", [])))}</failure>')
+            elif test.get("status") == "pending":
+                lines.append(f'      <skipped message="pending">{escape(chr(10).join(test.get("pending", [])))}</skipped>')
+            lines.append('    </testcase>')
+        lines.append('  </testsuite>')
+    lines.append('</testsuites>')
+    return "\n".join(lines) + "\n"
+
+
+def godot_process_executor(
+    run_godot: RunGodot = run_godot_async,
+    timeout: float = 120,
+    log_level: int = 1,
+    on_output: Optional[OutputCallback] = None
+) -> ShardExecutor:
+    """Runs each shard as a one-shot `godot -s gut_cmdln.gd` with only that shard's scripts."""
+
+    async def execute(index: int, scripts: List[str]) -> Dict[str, Any]:
+        with tempfile.TemporaryDirectory(prefix="gut_shard_") as tmp:
+            junit_file = Path(tmp) / f"shard_{index}.xml"
+            args = [
+                "-s", GUT_CMDLN_SCRIPT,
+                # Skip .gutconfig.json, otherwise its dirs would add every script to every shard
+                "-gconfig=",
+                f"-gtest={','.join(scripts)}",
+                f"-glog={log_level}",
+                f"-gjunit_xml_file={junit_file}",
+                f"-gpost_run_script={EXPORT_HOOK_SCRIPT}",
+                "-gexit",
+            ]
+            tagged = None
+            if on_output:
+                async def tagged(line: str) -> None:
+                    await on_output(f"[shard {index}] {line}")
+            success, stdout, stderr = await run_godot(args, timeout, tagged)
+            try:
+                with open(junit_file.with_suffix(".json"), "r") as f:
+                    results = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                return {"ok": False, "results": None, "output": stdout, "error": stderr.strip() or "no results written"}
+        # GUT exits non-zero when tests fail; the shard itself still completed
+        return {"ok": True, "results": results, "output": stdout, "error": ""}
+
+    return execute
+
+
+async def run_sharded(
+    scripts: List[str],
+    shard_count: int,
+    execute: ShardExecutor,
+    timings: Optional[Dict[str, float]] = None,
+    on_shard_done: Optional[ShardCallback] = None
+) -> Dict[str, Any]:
+    """
+    Run `scripts` across `shard_count` concurrent shards and merge the results.
+
+    The returned report is a GUT results dictionary plus a "shards" list with each
+    shard's scripts, wall time, status and counts. on_shard_done is the progress
+    hook: it is awaited once per shard, as the shard finishes.
+    """
+    started = time.monotonic()
+    shards = plan_shards(scripts, shard_count, timings or {})
+    done = 0
+
+    async def timed(index: int, shard: List[str]) -> Dict[str, Any]:
+        nonlocal done
+        shard_started = time.monotonic()
+        outcome = await execute(index, shard)
+        outcome["elapsed"] = round(time.monotonic() - shard_started, 3)
+        done += 1
+        if on_shard_done:
+            await on_shard_done(done, len(shards), index, outcome)
+        return outcome
+
+    outcomes = await asyncio.gather(*[timed(i, shard) for i, shard in enumerate(shards)])
+
+    report = merge_results([o["results"] for o in outcomes if o["results"]], time.monotonic() - started)
+    report["shards"] = []
+    for index, (shard, outcome) in enumerate(zip(shards, outcomes)):
+        props = (outcome["results"] or {}).get("test_scripts", {}).get("props", {})
+        entry = {
+            "index": index,
+            "scripts": shard,
+            "elapsed": outcome["elapsed"],
+            "ok": outcome["ok"],
+            "tests": props.get("tests", 0),
+            "failures": props.get("failures", 0),
+        }
+        if not outcome["ok"]:
+            entry["error"] = outcome["error"]
+            entry["output_tail"] = outcome["output"].splitlines()[-40:]
+        report["shards"].append(entry)
+    return report
+
+
+def format_shard_progress(done: int, total: int, index: int, outcome: Dict[str, Any]) -> str:
+    props = (outcome["results"] or {}).get("test_scripts", {}).get("props", {})
+    if not outcome["ok"]:
+        status = f"error: {outcome['error']}"
+    else:
+        status = f"{props.get('tests', 0)} tests, {props.get('failures', 0)} failures"
+    return f"[{done}/{total}] shard {index} finished in {outcome['elapsed']:.1f}s ({status})"
+
+
+def skipped_report(skipped: List[str]) -> Dict[str, Any]:
+    """Report for a run where every selected script was served from the cache."""
+    report = merge_results([], 0.0)
+    report["shards"] = []
+    report["skipped"] = skipped
+    return report
+
+
+def report_passed(report: Dict[str, Any]) -> bool:
+    props = report["test_scripts"]["props"]
+    return all(shard["ok"] for shard in report["shards"]) and props["failures"] == 0 and props["errors"] == 0
+
+
+def format_summary(report: Dict[str, Any]) -> str:
+    props = report["test_scripts"]["props"]
+    lines = ["Shard  Scripts  Tests  Failures  Seconds  Status"]
+    for shard in report["shards"]:
+        status = "ok" if shard["ok"] else f"FAILED: {shard.get('error', '')[:60]}"
+        lines.append(
+            f"{shard['index']:>5}  {len(shard['scripts']):>7}  {shard['tests']:>5}  "
+            f"{shard['failures']:>8}  {shard['elapsed']:>7.2f}  {status}"
+        )
+    lines.append(
+        f"\n{props['tests']} tests, {props['passing']} passing, {props['failures']} failing, "
+        f"{props['pending']} pending, {props['errors']} errors in {props['time']:.2f}s "
+        f"across {len(report['shards'])} shards"
+    )
+    skipped = report.get("skipped", [])
+    if skipped:
+        lines.append(f"{len(skipped)} scripts skipped, unchanged since their last passing run (--full to run them)")
+    return "\n".join(lines)
+
+
+def write_reports(report: Dict[str, Any], output_dir: Path) -> None:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(output_dir / RESULTS_JSON_NAME, "w") as f:
+        json.dump(report, f, indent=2)
+    with open(output_dir / RESULTS_XML_NAME, "w") as f:
+        f.write(results_to_junit(report))
+
+
+def _parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run GUT tests across parallel headless Godot processes.")
+    parser.add_argument("--shards", "-j", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--timeout", type=float, default=120, help="Per-shard timeout in seconds")
+    parser.add_argument("--output-dir", type=Path, default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("-gtest", action="append", default=[], help="Test script path(s), comma separated")
+    parser.add_argument("-gselect", default="", help="Only scripts whose file name contains this text")
+    parser.add_argument("--quiet", action="store_true", help="Do not print a progress line per finished shard")
+    parser.add_argument("--verbose", action="store_true", help="Also stream every shard's Godot output")
+    parser.add_argument("--full", action="store_true", help="Run every script, ignoring the result cache")
+    return parser.parse_args(argv)
+
+
+async def _main(argv: List[str]) -> int:
+    args = _parse_args(argv)
+    config = load_gut_config()
+    tests = [entry for value in args.gtest for entry in value.split(",") if entry]
+    scripts = discover_test_scripts(config, tests, args.gselect)
+    if not scripts:
+        print("No test scripts matched", file=sys.stderr)
+        return 1
+
+    async def echo(line: str) -> None:
+        print(line, flush=True)
+
+    async def shard_done(done: int, total: int, index: int, outcome: Dict[str, Any]) -> None:
+        print(format_shard_progress(done, total, index, outcome), flush=True)
+
+    cache = TestResultCache(args.output_dir / CACHE_FILE_NAME, PROJECT_ROOT)
+    to_run, skipped = cache.partition(scripts, full_run=args.full)
+    if not to_run:
+        report = skipped_report(skipped)
+        write_reports(report, args.output_dir)
+        print(f"All {len(skipped)} scripts unchanged since their last passing run; use --full to run them anyway")
+        return 0
+
+    timings_file = args.output_dir / TIMINGS_FILE_NAME
+    timings = load_timings(timings_file)
+    executor = godot_process_executor(
+        timeout=args.timeout,
+        log_level=int(config.get("log_level", 1)),
+        on_output=echo if args.verbose else None,
+    )
+    report = await run_sharded(to_run, args.shards, executor, timings, None if args.quiet else shard_done)
+    report["skipped"] = skipped
+
+    write_reports(report, args.output_dir)
+    save_timings(timings_file, timings, report)
+    cache.record(to_run, report)
+    cache.save()
+    print("\n" + format_summary(report))
+    print(f"Reports: {args.output_dir / RESULTS_JSON_NAME}, {args.output_dir / RESULTS_XML_NAME}")
+    return 0 if report_passed(report) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(sys.argv[1:])))
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Dependency-aware cache of GUT test script results.
+
+Each test script's dependencies are followed transitively through res:// paths
+(preload/load and scene/resource references), class_name and autoload names,
+and project settings whose value is a res:// path. A script's result is keyed
+by a hash of the contents of that closure, so a run can skip every script whose
+closure is unchanged since it last passed.
+"""
+
+import hashlib
+import json
+import re
+from configparser import ConfigParser
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+CACHE_VERSION = 1
+# Files whose change invalidates every cached result
+GLOBAL_DEPENDENCIES = ("project.godot", ".gutconfig.json", "addons/gut/plugin.cfg")
+SCANNED_SUFFIXES = (".gd", ".tscn", ".tres")
+SKIPPED_DIRS = ("addons", ".godot", ".git")
+
+RES_PATH_PATTERN = re.compile(r'res://[^"\'\s\)\]]+')
+CLASS_NAME_PATTERN = re.compile(r'^\s*class_name\s+([A-Za-z_][A-Za-z0-9_]*)', re.MULTILINE)
+IDENTIFIER_PATTERN = re.compile(r'\b[A-Za-z_][A-Za-z0-9_]*\b')
+STRING_OR_COMMENT_PATTERN = re.compile(r'"""[\s\S]*?"""|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|#[^\n]*')
+
+
+class DependencyGraph:
+    """Resolves and hashes the transitive res:// dependencies of project files."""
+
+    def __init__(self, project_root: Path):
+        self.project_root = project_root
+        self._edges: Dict[str, Set[str]] = {}
+        self._hashes: Dict[str, str] = {}
+        self._symbols: Dict[str, str] = {}
+        self._setting_paths: Dict[str, str] = {}
+        self._index_symbols()
+        self._global_hash = self._hash_paths(p for p in GLOBAL_DEPENDENCIES if (project_root / p).exists())
+
+    def _index_symbols(self) -> None:
+        """Map class_name and autoload names, and res:// project settings, to the files they stand for."""
+        for path in self._project_files(".gd"):
+            match = CLASS_NAME_PATTERN.search(self._read_text(path))
+            if match:
+                self._symbols[match.group(1)] = path
+
+        settings = ConfigParser(strict=False, interpolation=None)
+        settings.optionxform = str
+        try:
+            # Godot puts config_version above the first section header
+            text = (self.project_root / "project.godot").read_text(encoding="utf-8")
+            settings.read_string("[root]\n" + text)
+        except Exception:
+            return
+        for section in settings.sections():
+            for key, raw_value in settings.items(section):
+                value = raw_value.strip().strip('"').lstrip("*")
+                if not value.startswith("res://"):
+                    continue
+                if section == "autoload":
+                    self._symbols[key] = self._to_relative(value)
+                else:
+                    self._setting_paths[f"{section}/{key}"] = self._to_relative(value)
+
+    def _project_files(self, suffix: str) -> Iterable[str]:
+        for path in sorted(self.project_root.rglob("*" + suffix)):
+            relative = path.relative_to(self.project_root)
+            if relative.parts and relative.parts[0] in SKIPPED_DIRS:
+                continue
+            yield relative.as_posix()
+
+    def _read_text(self, relative: str) -> str:
+        try:
+            return (self.project_root / relative).read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return ""
+
+    @staticmethod
+    def _to_relative(res_path: str) -> str:
+        return res_path.replace("res://", "", 1)
+
+    def dependencies(self, relative: str) -> Set[str]:
+        """Direct dependencies of one file (relative paths of files that exist)."""
+        if relative in self._edges:
+            return self._edges[relative]
+
+        deps: Set[str] = set()
+        if relative.endswith(SCANNED_SUFFIXES):
+            text = self._read_text(relative)
+            for res_path in RES_PATH_PATTERN.findall(text):
+                deps.add(self._to_relative(res_path))
+            for setting, target in self._setting_paths.items():
+                if setting in text:
+                    deps.add(target)
+            if relative.endswith(".gd"):
+                code = STRING_OR_COMMENT_PATTERN.sub(" ", text)
+                for name in set(IDENTIFIER_PATTERN.findall(code)) & self._symbols.keys():
+                    deps.add(self._symbols[name])
+                # Autoloads are also reached by node path, e.g. get_node("/root/RuleProcessor")
+                for name, target in self._symbols.items():
+                    if f"/root/{name}" in text:
+                        deps.add(target)
+
+        deps = {dep for dep in deps if dep != relative and (self.project_root / dep).is_file()}
+        self._edges[relative] = deps
+        return deps
+
+    def closure(self, relative: str) -> Set[str]:
+        seen = {relative}
+        stack = [relative]
+        while stack:
+            for dep in self.dependencies(stack.pop()):
+                if dep not in seen:
+                    seen.add(dep)
+                    stack.append(dep)
+        return seen
+
+    def _file_hash(self, relative: str) -> str:
+        if relative not in self._hashes:
+            try:
+                self._hashes[relative] = hashlib.sha1((self.project_root / relative).read_bytes()).hexdigest()
+            except OSError:
+                self._hashes[relative] = "missing"
+        return self._hashes[relative]
+
+    def _hash_paths(self, paths: Iterable[str]) -> str:
+        digest = hashlib.sha1()
+        for path in sorted(paths):
+            digest.update(f"{path}:{self._file_hash(path)}\n".encode())
+        return digest.hexdigest()
+
+    def closure_hash(self, relative: str) -> str:
+        return hashlib.sha1(f"{CACHE_VERSION}:{self._global_hash}:{self._hash_paths(self.closure(relative))}".encode()).hexdigest()
+
+
+class TestResultCache:
+    """Per-script results keyed by dependency-closure hash, stored as JSON."""
+
+    def __init__(self, path: Path, project_root: Path):
+        self.path = path
+        self.project_root = project_root
+        self.entries: Dict[str, Dict] = {}
+        self._graph: Optional[DependencyGraph] = None
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self.entries = data.get("scripts", {})
+        except (OSError, json.JSONDecodeError, AttributeError):
+            pass
+
+    @property
+    def graph(self) -> DependencyGraph:
+        # Built lazily and once per run, so hashes reflect the files as they were when the run started
+        if self._graph is None:
+            self._graph = DependencyGraph(self.project_root)
+        return self._graph
+
+    def partition(self, scripts: List[str], full_run: bool = False) -> Tuple[List[str], List[str]]:
+        """Split res:// scripts into (to_run, skipped); skipped ones passed last time with the same closure."""
+        if full_run:
+            return list(scripts), []
+        to_run, skipped = [], []
+        for script in scripts:
+            entry = self.entries.get(script)
+            current = self.graph.closure_hash(script.replace("res://", "", 1))
+            if entry and entry.get("passed") and entry.get("hash") == current:
+                skipped.append(script)
+            else:
+                to_run.append(script)
+        return to_run, skipped
+
+    def record(self, scripts: List[str], results: Dict) -> None:
+        """Store the outcome of every script that was run; scripts without results are forgotten."""
+        per_script: Dict[str, Dict[str, int]] = {}
+        for full_name, script in results.get("test_scripts", {}).get("scripts", {}).items():
+            key = full_name[:full_name.find(".gd") + 3] if ".gd" in full_name else full_name
+            props = script.get("props", {})
+            totals = per_script.setdefault(key, {"tests": 0, "failures": 0})
+            totals["tests"] += props.get("tests", 0)
+            totals["failures"] += props.get("failures", 0)
+
+        for script in scripts:
+            totals = per_script.get(script)
+            if totals is None:
+                # Did not load or its shard died; always re-run it
+                self.entries.pop(script, None)
+                continue
+            self.entries[script] = {
+                "hash": self.graph.closure_hash(script.replace("res://", "", 1)),
+                "passed": totals["failures"] == 0,
+                "tests": totals["tests"],
+            }
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump({"version": CACHE_VERSION, "scripts": dict(sorted(self.entries.items()))}, f, indent=2)
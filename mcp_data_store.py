@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+In-process cache for the project data files the MCP tools read and edit.
+
+Every file is parsed once and kept until its mtime or size changes on disk, so
+repeated tool calls cost one stat() instead of a full read and parse. Record
+collections (unit templates, encounters) keep a hash index by id, and appends
+splice the new record into the cached file text instead of re-serializing the
+whole document. Every write goes to a temporary file in the same directory
+that is renamed over the original, so readers (including a running game)
+never see a half-written file.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from configparser import ConfigParser
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write `text` to a temporary file next to `path` and rename it into place."""
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file 0600; keep the original's permissions
+        if path.exists():
+            shutil.copymode(path, temp_path)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(temp_path, 0o666 & ~umask)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def file_signature(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+class CachedFile(Generic[T]):
+    """A file's parsed contents, re-parsed only when its mtime or size changes."""
+
+    def __init__(self, path: Path, parse: Callable[[str], T]):
+        self.path = path
+        self._parse = parse
+        self._signature: Optional[Tuple[int, int]] = None
+        self._text = ""
+        self._value: Optional[T] = None
+
+    def get(self) -> T:
+        """Return the parsed contents; raises OSError/ValueError if the file is missing or invalid."""
+        signature = file_signature(self.path)
+        if signature != self._signature:
+            text = self.path.read_text(encoding="utf-8")
+            self._value = self._parse(text)
+            self._text = text
+            self._signature = signature
+            self._on_reload()
+        return self._value
+
+    def _on_reload(self) -> None:
+        pass
+
+    def _replace(self, text: str, value: T) -> None:
+        """Write new contents and adopt them as the cached state without re-reading."""
+        atomic_write_text(self.path, text)
+        self._text = text
+        self._value = value
+        self._signature = file_signature(self.path)
+
+
+class JsonCollection(CachedFile[Dict[str, Any]]):
+    """
+    A JSON document of the form {"<list_key>": [record, ...]} with records indexed by `id_key`.
+    """
+
+    def __init__(self, path: Path, list_key: str, id_key: str):
+        super().__init__(path, json.loads)
+        self.list_key = list_key
+        self.id_key = id_key
+        self._index: Dict[str, int] = {}
+
+    def _on_reload(self) -> None:
+        self._index = {}
+        for position, record in enumerate(self.records()):
+            if isinstance(record, dict) and self.id_key in record:
+                # Last definition wins, matching how the game loads duplicates
+                self._index[str(record[self.id_key])] = position
+
+    def records(self) -> List[Any]:
+        records = self.get().get(self.list_key, [])
+        return records if isinstance(records, list) else []
+
+    def __len__(self) -> int:
+        return len(self.records())
+
+    def __contains__(self, record_id: str) -> bool:
+        self.get()
+        return record_id in self._index
+
+    def find(self, record_id: str) -> Optional[Dict[str, Any]]:
+        records = self.records()
+        position = self._index.get(record_id)
+        return records[position] if position is not None else None
+
+    def page(
+        self,
+        offset: int = 0,
+        limit: int = 50,
+        predicate: Optional[Callable[[Dict[str, Any]], bool]] = None
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """Return (number of matching records, the matching records in [offset, offset + limit))."""
+        matches: Iterable[Any] = (r for r in self.records() if isinstance(r, dict))
+        if predicate is not None:
+            matches = (r for r in matches if predicate(r))
+        total = 0
+        selected = []
+        for record in matches:
+            if offset <= total < offset + limit:
+                selected.append(record)
+            total += 1
+        return total, selected
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Add a record whose id is not present yet and write the file atomically."""
+        document = self.get()
+        record_id = str(record[self.id_key])
+        if record_id in self._index:
+            raise KeyError(record_id)
+
+        # The cached document and index are only updated once the write succeeded
+        records = self.records() + [record]
+        updated = {**document, self.list_key: records}
+        text = self._splice_record(record)
+        if text is None:
+            text = json.dumps(updated, indent=2) + "\n"
+        self._replace(text, updated)
+        self._index[record_id] = len(records) - 1
+
+    def _splice_record(self, record: Dict[str, Any]) -> Optional[str]:
+        """
+        Insert `record` before the closing bracket of the record list in the cached
+        text. Returns None when the list is not the document's last value, in which
+        case the caller falls back to serializing the whole document.
+        """
+        document = self.get()
+        if not document or list(document)[-1] != self.list_key:
+            return None
+        text = self._text
+        end = text.rstrip()
+        if not end.endswith("}"):
+            return None
+        close = end[:-1].rstrip()
+        if not close.endswith("]"):
+            return None
+        bracket = len(close) - 1
+
+        # Reuse the indentation of the closing bracket so the file's layout is kept
+        line_start = text.rfind("\n", 0, bracket) + 1
+        closing_indent = text[line_start:bracket]
+        if closing_indent.strip():
+            return None
+        item_indent = closing_indent + "  "
+        serialized = json.dumps(record, indent=2).replace("\n", "\n" + item_indent)
+
+        body = text[:line_start].rstrip()
+        if not self.records():
+            if not body.endswith("["):
+                return None
+            return f"{body}\n{item_indent}{serialized}\n{closing_indent}{text[bracket:]}"
+        return f"{body},\n{item_indent}{serialized}\n{closing_indent}{text[bracket:]}"
+
+
+def _parse_project_settings(text: str) -> Dict[str, Dict[str, str]]:
+    parser = ConfigParser(strict=False, interpolation=None)
+    parser.optionxform = str
+    # project.godot starts with config_version above the first section header
+    parser.read_string("[_root]\n" + text)
+    return {
+        section: {key: value.strip().strip('"') for key, value in parser.items(section)}
+        for section in parser.sections()
+    }
+
+
+class DataStore:
+    """Shared cache of parsed project files, keyed by path."""
+
+    def __init__(self):
+        self._files: Dict[Tuple[Path, str], CachedFile] = {}
+
+    def _cached(self, path: Path, kind: str, factory: Callable[[], CachedFile]) -> CachedFile:
+        key = (path.resolve(), kind)
+        if key not in self._files:
+            self._files[key] = factory()
+        return self._files[key]
+
+    def json(self, path: Path) -> Any:
+        return self._cached(path, "json", lambda: CachedFile(path, json.loads)).get()
+
+    def collection(self, path: Path, list_key: str, id_key: str) -> JsonCollection:
+        collection = self._cached(path, f"collection:{list_key}:{id_key}", lambda: JsonCollection(path, list_key, id_key))
+        collection.get()
+        return collection
+
+    def project_settings(self, path: Path) -> Dict[str, Dict[str, str]]:
+        return self._cached(path, "settings", lambda: CachedFile(path, _parse_project_settings)).get()
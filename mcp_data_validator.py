@@ -0,0 +1,591 @@
+#!/usr/bin/env python3
+"""
+Cross-file validation of the game data.
+
+Every data file is read once per change and reduced to the facts the checks
+need: the problems local to that file (JSON syntax, the battle rule schema,
+malformed records), the ids it defines and the ids it references, each with
+the JSON path it was found at. Cross-file references are then resolved
+against a single symbol index, so a full check is linear in the size of the
+data and a re-check after an edit only re-reads the files that changed.
+
+Checked references:
+  - encounter waves -> unit template ids (data/unit_templates.json)
+  - unit template skills -> skill ids in UnitFactory.SKILL_TEMPLATES
+  - next_encounters / unlock_requirements -> encounter ids
+  - rule and encounter modifier conditions -> context properties that some
+    caller of get_modifiers_for_context actually puts in its context (warnings)
+
+Usage:
+    python3 mcp_data_validator.py [--json]
+"""
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from mcp_data_store import DataStore, file_signature
+
+PROJECT_ROOT = Path(__file__).parent
+UNIT_TEMPLATES_FILE = "data/unit_templates.json"
+ENCOUNTERS_FILE = "data/encounters.json"
+RULES_SCHEMA_FILE = "data/battle_rules.schema.json"
+DEFAULT_RULES_FILE = "data/battle_rules.json"
+UNIT_FACTORY_SCRIPT = "src/encounter/unit_factory.gd"
+SOURCE_DIR = "src"
+# BattleRuleProcessor entry points that take a rule context
+RULE_LOOKUP_FUNCTIONS = ("get_modifiers_for_context", "get_modifier_templates_for_context")
+
+FUNC_PATTERN = re.compile(r'^(?:static\s+)?func\s+([A-Za-z_]\w*)\s*\(', re.MULTILINE)
+DICT_KEY_PATTERN = re.compile(r'"([A-Za-z_]\w*)"\s*:')
+KEY_ASSIGN_PATTERN = re.compile(r'\[\s*"([A-Za-z_]\w*)"\s*\]\s*=[^=]')
+CALL_PATTERN = re.compile(r'\b([A-Za-z_]\w*)\s*\(')
+SKILL_ENTRY_PATTERN = re.compile(r'^\s*"([A-Za-z0-9_]+)"\s*:\s*\{', re.MULTILINE)
+SKILL_TABLE_PATTERN = re.compile(r'^const\s+SKILL_TEMPLATES\s*:?=\s*\{(.*?)^\}', re.MULTILINE | re.DOTALL)
+
+Issue = Dict[str, str]
+
+
+def json_path(path: str, key: Any) -> str:
+    if isinstance(key, int):
+        return f"{path}[{key}]"
+    return f"{path}.{key}" if key.isidentifier() else f"{path}[{json.dumps(key)}]"
+
+
+class FileFacts:
+    """What one file contributes to validation."""
+
+    def __init__(self, file: str):
+        self.file = file
+        self.issues: List[Issue] = []
+        # kind -> {id: JSON path of its definition}
+        self.symbols: Dict[str, Dict[str, str]] = {}
+        # (kind, id, JSON path, severity)
+        self.references: List[Tuple[str, str, str, str]] = []
+        # Compiled contents, kept only for files other checks depend on (the schema)
+        self.document: Any = None
+
+    def issue(self, path: str, message: str, severity: str = "error") -> None:
+        self.issues.append({"severity": severity, "file": self.file, "path": path, "message": message})
+
+    def define(self, kind: str, symbol: str, path: str, label: str) -> None:
+        defined = self.symbols.setdefault(kind, {})
+        if symbol in defined:
+            self.issue(path, f"duplicate {label} '{symbol}' (also at {defined[symbol]}); the game keeps the last one")
+        defined[symbol] = path
+
+    def reference(self, kind: str, symbol: Any, path: str, severity: str = "error") -> None:
+        if isinstance(symbol, str):
+            self.references.append((kind, symbol, path, severity))
+        else:
+            self.issue(path, f"expected a string id, got {json.dumps(symbol)}")
+
+
+# JSON Schema (the subset used by data/battle_rules.schema.json)
+SCHEMA_TYPES: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "integer": lambda v: (isinstance(v, int) and not isinstance(v, bool)) or (isinstance(v, float) and v.is_integer()),
+}
+
+
+def _resolve_ref(root: Dict[str, Any], ref: str) -> Dict[str, Any]:
+    node: Any = root
+    for part in ref.lstrip("#/").split("/"):
+        node = node[part]
+    return node
+
+
+def _format_path(base: str, keys: Tuple) -> str:
+    for key in keys:
+        base = json_path(base, key)
+    return base
+
+
+def _fail(errors: Optional[List], keys: Tuple, message: str) -> bool:
+    if errors is not None:
+        errors.append((keys, message))
+    return False
+
+
+# (value, path keys, errors or None) -> valid. With `errors` set every violation is
+# appended; without, checking stops at the first one, which keeps trying the
+# alternatives of oneOf/anyOf cheap.
+Check = Callable[[Any, Tuple, Optional[List]], bool]
+
+
+class SchemaValidator:
+    """A JSON schema compiled once into nested checks, reused for every record."""
+
+    def __init__(self, root: Dict[str, Any]):
+        self.root = root
+        self._compiled: Dict[int, Check] = {}
+
+    def errors(self, value: Any, pointer: str = "#", path: str = "$") -> List[Tuple[str, str]]:
+        """Validate `value` against the sub-schema at `pointer`; returns (JSON path, message) pairs."""
+        schema = self.root if pointer == "#" else _resolve_ref(self.root, pointer)
+        errors: List[Tuple[Tuple, str]] = []
+        self._compile(schema)(value, (), errors)
+        return [(_format_path(path, keys), message) for keys, message in errors]
+
+    def _compile(self, schema: Dict[str, Any]) -> Check:
+        if id(schema) in self._compiled:
+            return self._compiled[id(schema)]
+
+        checks: List[Check] = []
+        type_names: List[str] = []
+        type_tests: List[Callable[[Any], bool]] = []
+
+        def check(value: Any, keys: Tuple, errors: Optional[List]) -> bool:
+            if type_tests and not (type_tests[0](value) or any(test(value) for test in type_tests[1:])):
+                return _fail(errors, keys, f"expected {' or '.join(type_names)}, got {json.dumps(value)[:60]}")
+            valid = True
+            for part in checks:
+                if not part(value, keys, errors):
+                    if errors is None:
+                        return False
+                    valid = False
+            return valid
+
+        # Registered before the children are compiled so recursive $refs resolve to it
+        self._compiled[id(schema)] = check
+
+        if "$ref" in schema:
+            checks.append(self._compile(_resolve_ref(self.root, schema["$ref"])))
+        if "type" in schema:
+            type_names.extend(schema["type"] if isinstance(schema["type"], list) else [schema["type"]])
+            type_tests.extend(SCHEMA_TYPES[name] for name in type_names)
+        for combinator in ("oneOf", "anyOf"):
+            if combinator in schema:
+                checks.append(self._compile_combinator([self._compile(option) for option in schema[combinator]], combinator == "oneOf"))
+        if "enum" in schema:
+            allowed = schema["enum"]
+            listed = ", ".join(map(str, allowed))
+            checks.append(lambda v, k, e: v in allowed or _fail(e, k, f"{json.dumps(v)} is not one of {listed}"))
+        if "minLength" in schema:
+            min_length = schema["minLength"]
+            checks.append(lambda v, k, e: not isinstance(v, str) or len(v) >= min_length or _fail(e, k, "must not be empty"))
+        if "minimum" in schema:
+            minimum = schema["minimum"]
+            is_number = SCHEMA_TYPES["number"]
+            checks.append(lambda v, k, e: not is_number(v) or v >= minimum or _fail(e, k, f"must be at least {minimum}"))
+        if any(key in schema for key in ("required", "properties", "additionalProperties")):
+            checks.append(self._compile_object(schema))
+        if "minItems" in schema or "items" in schema:
+            checks.append(self._compile_array(schema))
+        return check
+
+    @staticmethod
+    def _compile_combinator(options: List[Check], exactly_one: bool) -> Check:
+        def check(value: Any, keys: Tuple, errors: Optional[List]) -> bool:
+            matched = sum(1 for option in options if option(value, keys, None))
+            if matched == 0:
+                if errors is not None:
+                    # Report the alternative that came closest, e.g. a property condition with a bad op
+                    attempts = []
+                    for option in options:
+                        attempt: List = []
+                        option(value, keys, attempt)
+                        attempts.append(attempt)
+                    errors.extend(min(attempts, key=len))
+                return False
+            if exactly_one and matched > 1:
+                return _fail(errors, keys, "matches more than one of the allowed forms")
+            return True
+        return check
+
+    def _compile_object(self, schema: Dict[str, Any]) -> Check:
+        required = schema.get("required", [])
+        properties = {key: self._compile(sub) for key, sub in schema.get("properties", {}).items()}
+        closed = schema.get("additionalProperties") is False
+
+        def check(value: Any, keys: Tuple, errors: Optional[List]) -> bool:
+            if not isinstance(value, dict):
+                return True
+            valid = True
+            for key in required:
+                if key not in value:
+                    valid = _fail(errors, keys, f"missing required '{key}'")
+                    if errors is None:
+                        return False
+            for key, item in value.items():
+                sub = properties.get(key)
+                if sub is not None:
+                    ok = sub(item, keys + (key,), errors)
+                else:
+                    ok = not closed or _fail(errors, keys + (key,), "unexpected property")
+                if not ok:
+                    if errors is None:
+                        return False
+                    valid = False
+            return valid
+        return check
+
+    def _compile_array(self, schema: Dict[str, Any]) -> Check:
+        min_items = schema.get("minItems", 0)
+        items = self._compile(schema["items"]) if "items" in schema else None
+
+        def check(value: Any, keys: Tuple, errors: Optional[List]) -> bool:
+            if not isinstance(value, list):
+                return True
+            valid = len(value) >= min_items or _fail(errors, keys, f"needs at least {min_items} item(s)")
+            if not valid and errors is None:
+                return False
+            if items is not None:
+                for index, item in enumerate(value):
+                    if not items(item, keys + (index,), errors):
+                        if errors is None:
+                            return False
+                        valid = False
+            return valid
+        return check
+
+
+# Per-file fact extraction
+def _condition_references(facts: FileFacts, condition: Any, path: str) -> None:
+    if not isinstance(condition, dict):
+        return
+    for key in ("and", "or"):
+        if isinstance(condition.get(key), list):
+            for index, child in enumerate(condition[key]):
+                _condition_references(facts, child, json_path(json_path(path, key), index))
+    if "not" in condition:
+        _condition_references(facts, condition["not"], json_path(path, "not"))
+    if isinstance(condition.get("property"), str):
+        facts.reference("context_property", condition["property"], json_path(path, "property"), "warning")
+    value = condition.get("value")
+    if isinstance(value, str) and value.startswith("$"):
+        facts.reference("context_property", value[1:], json_path(path, "value"), "warning")
+
+
+def _rule_facts(facts: FileFacts, rule: Any, path: str, schema: Optional[SchemaValidator]) -> None:
+    if schema is not None:
+        for error_path, message in schema.errors(rule, "#/$defs/rule", path):
+            facts.issue(error_path, message)
+    if isinstance(rule, dict):
+        _condition_references(facts, rule.get("conditions"), json_path(path, "conditions"))
+
+
+def _parse_json(facts: FileFacts, text: str) -> Any:
+    try:
+        return json.loads(text)
+    except ValueError as e:
+        facts.issue("$", f"invalid JSON: {e}")
+        return None
+
+
+def battle_rules_facts(file: str, text: str, schema: Optional[SchemaValidator]) -> FileFacts:
+    facts = FileFacts(file)
+    document = _parse_json(facts, text)
+    if document is None:
+        return facts
+
+    # The processor also accepts {"rules": [...]}; the schema describes the array itself
+    rules, base = document, "$"
+    if isinstance(document, dict) and "rules" in document:
+        rules, base = document["rules"], "$.rules"
+    if not isinstance(rules, list):
+        facts.issue("$", "expected an array of rules or an object with a 'rules' array")
+        return facts
+
+    for index, rule in enumerate(rules):
+        path = json_path(base, index)
+        _rule_facts(facts, rule, path, schema)
+        if isinstance(rule, dict) and isinstance(rule.get("id"), str):
+            facts.define("rule", rule["id"], path, "rule id")
+    return facts
+
+
+def unit_template_facts(file: str, text: str) -> FileFacts:
+    facts = FileFacts(file)
+    document = _parse_json(facts, text)
+    if document is None:
+        return facts
+    templates = document.get("unit_templates") if isinstance(document, dict) else None
+    if not isinstance(templates, list):
+        facts.issue("$", "expected an object with a 'unit_templates' array")
+        return facts
+
+    for index, template in enumerate(templates):
+        path = json_path("$.unit_templates", index)
+        if not isinstance(template, dict) or not isinstance(template.get("id"), str) or not template["id"]:
+            facts.issue(path, "unit template needs a non-empty string 'id'")
+            continue
+        facts.define("unit_template", template["id"], path, "unit template")
+
+        stats = template.get("base_stats", {})
+        if not isinstance(stats, dict):
+            facts.issue(json_path(path, "base_stats"), "expected an object")
+        else:
+            for stat, value in stats.items():
+                if not SCHEMA_TYPES["number"](value):
+                    facts.issue(json_path(json_path(path, "base_stats"), stat), f"expected a number, got {json.dumps(value)}")
+
+        skills = template.get("skills", [])
+        if not isinstance(skills, list):
+            facts.issue(json_path(path, "skills"), "expected an array of skill ids")
+            continue
+        for skill_index, skill_id in enumerate(skills):
+            facts.reference("skill", skill_id, json_path(json_path(path, "skills"), skill_index))
+    return facts
+
+
+def _positive_int(facts: FileFacts, record: Dict[str, Any], key: str, path: str) -> None:
+    if key in record and not (SCHEMA_TYPES["integer"](record[key]) and record[key] >= 1):
+        facts.issue(json_path(path, key), f"expected a positive integer, got {json.dumps(record[key])}")
+
+
+def encounter_facts(file: str, text: str, schema: Optional[SchemaValidator]) -> FileFacts:
+    facts = FileFacts(file)
+    document = _parse_json(facts, text)
+    if document is None:
+        return facts
+    encounters = document.get("encounters") if isinstance(document, dict) else None
+    if not isinstance(encounters, list):
+        facts.issue("$", "expected an object with an 'encounters' array")
+        return facts
+
+    for index, encounter in enumerate(encounters):
+        path = json_path("$.encounters", index)
+        if not isinstance(encounter, dict) or not isinstance(encounter.get("encounter_id"), str) or not encounter["encounter_id"]:
+            facts.issue(path, "encounter needs a non-empty string 'encounter_id'")
+            continue
+        facts.define("encounter", encounter["encounter_id"], path, "encounter")
+
+        for next_index, next_id in enumerate(encounter.get("next_encounters", [])):
+            facts.reference("encounter", next_id, json_path(json_path(path, "next_encounters"), next_index))
+        required = encounter.get("unlock_requirements", {}).get("completed_encounters", [])
+        for required_index, required_id in enumerate(required):
+            facts.reference("encounter", required_id, f"{path}.unlock_requirements.completed_encounters[{required_index}]")
+
+        for modifier_index, modifier in enumerate(encounter.get("environment_modifiers", [])):
+            _rule_facts(facts, modifier, json_path(json_path(path, "environment_modifiers"), modifier_index), schema)
+
+        waves = encounter.get("waves")
+        if not isinstance(waves, list) or not waves:
+            facts.issue(json_path(path, "waves"), "encounter needs at least one wave")
+            continue
+        for wave_index, wave in enumerate(waves):
+            wave_path = json_path(json_path(path, "waves"), wave_index)
+            if not isinstance(wave, dict):
+                facts.issue(wave_path, "expected an object")
+                continue
+            for modifier_index, modifier in enumerate(wave.get("wave_modifiers", [])):
+                _rule_facts(facts, modifier, json_path(json_path(wave_path, "wave_modifiers"), modifier_index), schema)
+            for unit_index, unit in enumerate(wave.get("enemy_units", [])):
+                unit_path = json_path(json_path(wave_path, "enemy_units"), unit_index)
+                if not isinstance(unit, dict):
+                    facts.issue(unit_path, "expected an object")
+                    continue
+                if "template_id" not in unit:
+                    facts.issue(unit_path, "missing required 'template_id'")
+                else:
+                    facts.reference("unit_template", unit["template_id"], json_path(unit_path, "template_id"))
+                _positive_int(facts, unit, "count", unit_path)
+                _positive_int(facts, unit, "level", unit_path)
+    return facts
+
+
+def _function_bodies(text: str) -> Dict[str, str]:
+    matches = list(FUNC_PATTERN.finditer(text))
+    return {
+        match.group(1): text[match.end():matches[i + 1].start() if i + 1 < len(matches) else len(text)]
+        for i, match in enumerate(matches)
+    }
+
+
+def skill_facts(file: str, text: str) -> FileFacts:
+    """Skill ids are the keys of UnitFactory.SKILL_TEMPLATES, the table _create_skill_from_id builds from."""
+    facts = FileFacts(file)
+    table = SKILL_TABLE_PATTERN.search(text)
+    if table is None:
+        facts.issue("$", "UnitFactory.SKILL_TEMPLATES not found; skill ids cannot be checked", "warning")
+        return facts
+    for match in SKILL_ENTRY_PATTERN.finditer(table.group(1)):
+        facts.symbols.setdefault("skill", {})[match.group(1)] = f"SKILL_TEMPLATES.{match.group(1)}"
+    return facts
+
+
+def context_property_facts(file: str, text: str) -> FileFacts:
+    """
+    Context keys a script hands to get_modifiers_for_context (or its shared-template
+    variant): the dictionary keys
+    written in every function that calls it, plus those of same-file *context*
+    helpers it calls (e.g. BattleSkill._build_context).
+    """
+    facts = FileFacts(file)
+    bodies = _function_bodies(text)
+    for name, body in bodies.items():
+        if name in RULE_LOOKUP_FUNCTIONS or not any(f"{lookup}(" in body for lookup in RULE_LOOKUP_FUNCTIONS):
+            continue
+        sources = [body] + [
+            bodies[called] for called in set(CALL_PATTERN.findall(body))
+            if called in bodies and called != name and "context" in called
+        ]
+        for source in sources:
+            for key in DICT_KEY_PATTERN.findall(source) + KEY_ASSIGN_PATTERN.findall(source):
+                facts.symbols.setdefault("context_property", {}).setdefault(key, name)
+    return facts
+
+
+REFERENCE_LABELS = {
+    "unit_template": "unknown unit template '{}'",
+    "encounter": "unknown encounter '{}'",
+    "skill": "unknown skill '{}' (not handled by UnitFactory._create_skill_from_id)",
+    "context_property": "context property '{}' is never provided to get_modifiers_for_context, so this condition can never match",
+}
+
+
+class DataValidator:
+    """Validates all data files, re-reading only the ones whose mtime or size changed since the last run."""
+
+    def __init__(self, project_root: Path = PROJECT_ROOT):
+        self.project_root = project_root
+        # (relative path, kind of facts) -> (cache key, facts)
+        self._facts: Dict[Tuple[str, str], Tuple[Any, FileFacts]] = {}
+
+    def _signature(self, relative: str) -> Optional[Tuple[int, int]]:
+        try:
+            return file_signature(self.project_root / relative)
+        except OSError:
+            return None
+
+    def _file_facts(
+        self,
+        relative: str,
+        kind: str,
+        extract: Callable[[str], FileFacts],
+        extra_key: Any,
+        reparsed: List[str]
+    ) -> Optional[FileFacts]:
+        signature = self._signature(relative)
+        if signature is None:
+            self._facts.pop((relative, kind), None)
+            return None
+        key = (signature, extra_key)
+        cached = self._facts.get((relative, kind))
+        if cached is None or cached[0] != key:
+            text = (self.project_root / relative).read_text(encoding="utf-8", errors="replace")
+            cached = (key, extract(text))
+            self._facts[(relative, kind)] = cached
+            reparsed.append(relative)
+        return cached[1]
+
+    def _load_schema(self, reparsed: List[str]) -> Tuple[Optional[SchemaValidator], FileFacts, Any]:
+        def extract(text: str) -> FileFacts:
+            facts = FileFacts(RULES_SCHEMA_FILE)
+            schema = _parse_json(facts, text)
+            if isinstance(schema, dict):
+                try:
+                    facts.document = SchemaValidator(schema)
+                    facts.document.errors([], "#/$defs/rule")
+                except (KeyError, TypeError) as e:
+                    facts.document = None
+                    facts.issue("$", f"unsupported or broken schema: {e}")
+            return facts
+
+        facts = self._file_facts(RULES_SCHEMA_FILE, "schema", extract, None, reparsed)
+        if facts is None:
+            missing = FileFacts(RULES_SCHEMA_FILE)
+            missing.issue("$", "schema file not found; battle rules are not schema-checked", "warning")
+            return None, missing, None
+        # Files checked against the schema are re-checked whenever the schema changes
+        return facts.document, facts, self._signature(RULES_SCHEMA_FILE)
+
+    def validate(self, rules_file: str = DEFAULT_RULES_FILE) -> Dict[str, Any]:
+        """
+        Returns {"files", "reparsed", "errors", "warnings"}; every issue carries
+        severity, file, JSON path and message.
+        """
+        reparsed: List[str] = []
+        schema, schema_facts, schema_key = self._load_schema(reparsed)
+
+        all_facts: List[FileFacts] = [schema_facts]
+        expected = [
+            (rules_file, "rules", lambda text: battle_rules_facts(rules_file, text, schema), schema_key),
+            (UNIT_TEMPLATES_FILE, "unit_templates", lambda text: unit_template_facts(UNIT_TEMPLATES_FILE, text), None),
+            (ENCOUNTERS_FILE, "encounters", lambda text: encounter_facts(ENCOUNTERS_FILE, text, schema), schema_key),
+            (UNIT_FACTORY_SCRIPT, "skills", lambda text: skill_facts(UNIT_FACTORY_SCRIPT, text), None),
+        ]
+        for relative, kind, extract, extra_key in expected:
+            facts = self._file_facts(relative, kind, extract, extra_key, reparsed)
+            if facts is None:
+                facts = FileFacts(relative)
+                facts.issue("$", "file not found")
+            all_facts.append(facts)
+
+        scripts = sorted(p.relative_to(self.project_root).as_posix() for p in (self.project_root / SOURCE_DIR).rglob("*.gd"))
+        # Forget deleted scripts and a previously configured rules file
+        live = {(relative, "context") for relative in scripts} | {(relative, kind) for relative, kind, _, _ in expected}
+        for stale in set(self._facts) - live - {(RULES_SCHEMA_FILE, "schema")}:
+            del self._facts[stale]
+        context_facts = []
+        for relative in scripts:
+            facts = self._file_facts(relative, "context", lambda text, r=relative: context_property_facts(r, text), None, reparsed)
+            if facts is not None:
+                context_facts.append(facts)
+
+        # Symbol index across every file, then resolve references against it
+        symbols: Dict[str, set] = {}
+        for facts in all_facts + context_facts:
+            for kind, defined in facts.symbols.items():
+                symbols.setdefault(kind, set()).update(defined)
+
+        issues: List[Issue] = []
+        for facts in all_facts:
+            issues.extend(facts.issues)
+            for kind, symbol, path, severity in facts.references:
+                if symbol not in symbols.get(kind, ()):
+                    if kind == "skill" and "skill" not in symbols:
+                        continue
+                    issues.append({
+                        "severity": severity,
+                        "file": facts.file,
+                        "path": path,
+                        "message": REFERENCE_LABELS[kind].format(symbol),
+                    })
+
+        return {
+            "files": len(all_facts) + len(context_facts),
+            "reparsed": reparsed,
+            "errors": [issue for issue in issues if issue["severity"] == "error"],
+            "warnings": [issue for issue in issues if issue["severity"] == "warning"],
+        }
+
+
+def format_issue(issue: Issue) -> str:
+    return f"{issue['severity']}: {issue['file']} {issue['path']}: {issue['message']}"
+
+
+def configured_rules_file(project_root: Path = PROJECT_ROOT) -> str:
+    try:
+        settings = DataStore().project_settings(project_root / "project.godot")
+    except (OSError, ValueError):
+        return DEFAULT_RULES_FILE
+    return settings.get("game", {}).get("battle_rules_path", DEFAULT_RULES_FILE).replace("res://", "", 1)
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Validate the game data files and their cross-references.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = DataValidator().validate(configured_rules_file())
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for issue in report["errors"] + report["warnings"]:
+            print(format_issue(issue))
+        print(f"{len(report['errors'])} errors, {len(report['warnings'])} warnings in {report['files']} files")
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -4,20 +4,39 @@ MCP Server for Godot Auto-Battler Project
 Provides tools for AI assistants to interact with the Godot project
 """
 
+import asyncio
 import json
+import math
 import os
 import subprocess
 import sys
 import signal
+import tempfile
 import time
 import atexit
-from configparser import ConfigParser
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set
 
 import httpx
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
+
+import benchmark_check
+import godot_process
+import gut_shard_runner
+from godot_process import (
+    GODOT_NOT_FOUND_MESSAGE,
+    GODOT_STREAM_LIMIT,
+    OutputCallback,
+    env_int,
+    find_godot_executable,
+    kill_process_group,
+    new_process_group_kwargs,
+    run_godot_async,
+)
+from mcp_data_store import DataStore, JsonCollection
+from mcp_data_validator import DataValidator, format_issue
+from gut_test_cache import TestResultCache
 
 # Initialize FastMCP server
 mcp = FastMCP("godot-auto-battler")
@@ -27,20 +46,31 @@ PROJECT_ROOT = Path(__file__).parent
 GODOT_PROJECT_FILE = PROJECT_ROOT / "project.godot"
 DATA_DIR = PROJECT_ROOT / "data"
 TESTS_DIR = PROJECT_ROOT / "tests"
+SIMULATOR_SCRIPT = "res://tools/simulation/encounter_simulator.gd"
+SIMULATION_RESULT_PREFIX = "SIMULATION_RESULT "
+BATTLE_PROFILE_FLAG = "--battle-profile="
+WORKER_SCRIPT = "res://tools/mcp/worker_loop.gd"
+WORKER_READY_PREFIX = "WORKER_READY "
+WORKER_JOB_END_PREFIX = "WORKER_JOB_END "
+WORKER_WATCHED_SUFFIXES = (".gd", ".tscn", ".tres", ".json", ".godot", ".cfg")
+WORKER_OUTPUT_LINES = 5000
+WORKER_START_TIMEOUT = 60
+WORKER_HEALTH_CHECK_INTERVAL = 30
+WORKER_PING_TIMEOUT = 5
 
 
-def _load_project_settings() -> ConfigParser:
-    parser = ConfigParser()
-    parser.optionxform = str
-    parser.read(GODOT_PROJECT_FILE)
-    return parser
+# Parsed data files and project settings, re-read only when they change on disk
+data_store = DataStore()
+# Keeps per-file validation results between calls so only changed files are re-checked
+data_validator = DataValidator(PROJECT_ROOT)
 
 
 def get_project_setting(section: str, option: str, default: str = "") -> str:
-    parser = _load_project_settings()
-    if parser.has_option(section, option):
-        return parser.get(section, option)
-    return default
+    try:
+        settings = data_store.project_settings(GODOT_PROJECT_FILE)
+    except Exception:
+        return default
+    return settings.get(section, {}).get(option, default)
 
 
 def resolve_res_path(res_path: str) -> Path:
@@ -89,7 +119,7 @@ def cleanup_all_processes():
             pass
         untrack_process(process)
     
-    # Also run general cleanup
+    # Also kill any children left in our own process groups
     cleanup_godot_processes()
 
 
@@ -100,12 +130,7 @@ def managed_godot_process(args: List[str], cwd: Path):
     godot_path = find_godot_executable()
     
     if not godot_path:
-        raise RuntimeError(
-            "Godot executable not found. Please either:\n"
-            "1. Install Godot and ensure it's in your PATH\n"
-            "2. Set GODOT_PATH environment variable to point to Godot executable\n"
-            "3. Install Godot in /Applications/Godot.app (macOS)"
-        )
+        raise RuntimeError(GODOT_NOT_FOUND_MESSAGE)
     
     process = None
     try:
@@ -181,64 +206,20 @@ def managed_godot_process(args: List[str], cwd: Path):
                 untrack_process(process)
 
 
-def find_godot_executable() -> Optional[str]:
-    """Find Godot executable in common locations."""
-    # Check if godot is in PATH
-    if subprocess.run(["which", "godot"], capture_output=True).returncode == 0:
-        return "godot"
-    
-    # Common macOS locations
-    mac_locations = [
-        "/Applications/Godot.app/Contents/MacOS/Godot",
-        "/Applications/Godot_v4.app/Contents/MacOS/Godot",
-        "/Applications/Godot4.app/Contents/MacOS/Godot",
-        os.path.expanduser("~/Applications/Godot.app/Contents/MacOS/Godot"),
-    ]
-    
-    for path in mac_locations:
-        if os.path.exists(path):
-            return path
-    
-    # Check environment variable
-    if "GODOT_PATH" in os.environ:
-        return os.environ["GODOT_PATH"]
-    
-    return None
-
 def run_godot_command(args: List[str], timeout: int = 60) -> tuple[bool, str, str]:
-    """Run a Godot command and return success status, stdout, and stderr."""
+    """
+    Run a Godot command and return success status, stdout, and stderr.
+    Blocks the caller; MCP tools use run_godot_async instead.
+    """
     # Always use the safe version with context manager
     return run_godot_command_safe(args, timeout)
 
 
-def load_json_file(file_path: Path) -> Optional[Dict[str, Any]]:
-    """Load and parse a JSON file."""
-    try:
-        with open(file_path, 'r') as f:
-            return json.load(f)
-    except Exception as e:
-        return None
-
-
 def run_godot_command_safe(args: List[str], timeout: int = 60) -> tuple[bool, str, str]:
     """
     Run a Godot command using context manager for guaranteed cleanup.
-    This is the preferred method for running Godot processes.
+    Only this command's process group is terminated; other Godot instances are left alone.
     """
-    # Try to use godot_runner if available
-    try:
-        runner_path = PROJECT_ROOT / "godot_runner.py"
-        if runner_path.exists():
-            import importlib.util
-            spec = importlib.util.spec_from_file_location("godot_runner", runner_path)
-            if spec and spec.loader:
-                godot_runner = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(godot_runner)
-                return godot_runner.run_godot(args, timeout)
-    except Exception:
-        pass  # Fall back to original method
-    
-    # Original method with cleanup
     if "--quit" not in args:
         args = ["--quit"] + args
     
@@ -246,108 +227,416 @@ def run_godot_command_safe(args: List[str], timeout: int = 60) -> tuple[bool, st
         with managed_godot_process(args, PROJECT_ROOT) as process:
             try:
                 stdout, stderr = process.communicate(timeout=timeout)
-                returncode = process.returncode
-                
-                # Always run cleanup after command completes
-                cleanup_godot_processes()
-                
-                return returncode == 0, stdout, stderr
+                return process.returncode == 0, stdout, stderr
             except subprocess.TimeoutExpired:
-                # Cleanup on timeout
-                cleanup_godot_processes()
-                return False, "", "Command timed out"
+                return False, "", f"Command timed out after {timeout}s"
     except RuntimeError as e:
-        cleanup_godot_processes()
         return False, "", str(e)
     except Exception as e:
-        cleanup_godot_processes()
         return False, "", f"Unexpected error: {str(e)}"
 
 
 def cleanup_godot_processes():
-    """Force cleanup any lingering Godot processes."""
-    try:
-        if os.name != 'nt':
-            # Unix/macOS: More aggressive cleanup
-            # First, try to kill headless Godot processes
-            subprocess.run(["pkill", "-9", "-f", "Godot.*--headless"], capture_output=True)
-            # Also kill any Godot processes with --quit flag
-            subprocess.run(["pkill", "-9", "-f", "Godot.*--quit"], capture_output=True)
-            
-            # Additional cleanup using killall (if available)
+    """
+    Kill the process groups of every Godot process this server started, including warm workers.
+    Godot instances started by anything else (the editor, other tool calls' hosts) are not touched.
+    """
+    for process in list(_active_processes) + list(godot_process.active_processes):
+        kill_process_group(process)
+    shutdown_worker_pool()
+
+
+def _progress_reporter(ctx: Optional[Context]) -> Optional[OutputCallback]:
+    """Forward Godot output to the MCP client as log messages and progress notifications."""
+    if ctx is None:
+        return None
+    lines_seen = 0
+    
+    async def report(line: str) -> None:
+        nonlocal lines_seen
+        lines_seen += 1
+        await ctx.report_progress(lines_seen)
+        if line.strip():
+            await ctx.info(line)
+    
+    return report
+
+
+def _shard_progress_reporter(ctx: Optional[Context]) -> Optional[gut_shard_runner.ShardCallback]:
+    """Report one progress step and one log line per finished test shard, not per output line."""
+    if ctx is None:
+        return None
+    
+    async def report(done: int, total: int, index: int, outcome: Dict[str, Any]) -> None:
+        await ctx.report_progress(done, total)
+        await ctx.info(gut_shard_runner.format_shard_progress(done, total, index, outcome))
+    
+    return report
+
+
+# Warm worker pool
+class GodotWorkerError(RuntimeError):
+    """A worker failed to start, crashed, or did not answer in time."""
+
+
+def _project_fingerprint() -> tuple[int, int]:
+    """Newest mtime and file count of scripts, scenes and data; a change means warm workers are stale."""
+    newest = 0
+    count = 0
+    stack = [PROJECT_ROOT]
+    while stack:
+        try:
+            entries = list(os.scandir(stack.pop()))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if not entry.name.startswith("."):
+                    stack.append(entry.path)
+            elif entry.name.endswith(WORKER_WATCHED_SUFFIXES):
+                count += 1
+                newest = max(newest, entry.stat().st_mtime_ns)
+    return newest, count
+
+
+class GodotWorker:
+    """One long-lived headless Godot process running the worker loop script."""
+
+    def __init__(self, process, reader, writer, fingerprint):
+        self.process = process
+        self.reader = reader
+        self.writer = writer
+        self.fingerprint = fingerprint
+        self.jobs = 0
+        self.baseline_memory: Optional[int] = None
+        self.memory = 0
+        self.last_used = time.monotonic()
+        self._output: List[str] = []
+        self._job_ends: Dict[str, asyncio.Event] = {}
+        self._next_id = 0
+        self._on_output: Optional[OutputCallback] = None
+        self._drain_tasks: List[asyncio.Task] = []
+
+    @classmethod
+    async def start(cls, godot_path: str, fingerprint, timeout: float) -> "GodotWorker":
+        process = await asyncio.create_subprocess_exec(
+            godot_path, "--headless", "--script", WORKER_SCRIPT, "--", "--port=0",
+            cwd=PROJECT_ROOT,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=GODOT_STREAM_LIMIT,
+            **new_process_group_kwargs(),
+        )
+
+        try:
+            port = await asyncio.wait_for(cls._read_port(process), timeout)
+            reader, writer = await asyncio.open_connection("127.0.0.1", port, limit=GODOT_STREAM_LIMIT)
+        except (asyncio.TimeoutError, OSError, GodotWorkerError) as e:
+            kill_process_group(process)
+            await process.wait()
+            raise GodotWorkerError(f"Worker failed to start: {str(e) or 'timed out'}")
+
+        worker = cls(process, reader, writer, fingerprint)
+        worker._drain_tasks = [
+            asyncio.create_task(worker._drain(process.stdout)),
+            asyncio.create_task(worker._drain(process.stderr)),
+        ]
+        return worker
+
+    @staticmethod
+    async def _read_port(process) -> int:
+        while True:
+            line = await process.stdout.readline()
+            if not line:
+                stderr = (await process.stderr.read()).decode(errors="replace")
+                raise GodotWorkerError(stderr.strip()[-500:] or "process exited")
+            text = line.decode(errors="replace").strip()
+            if text.startswith(WORKER_READY_PREFIX):
+                return int(text[len(WORKER_READY_PREFIX):])
+
+    async def _drain(self, stream) -> None:
+        """Collect console output so the pipes never fill up and jobs can return their log."""
+        while True:
+            line = await stream.readline()
+            if not line:
+                return
+            text = line.decode(errors="replace").rstrip("\n")
+            if text.startswith(WORKER_JOB_END_PREFIX):
+                event = self._job_ends.get(text[len(WORKER_JOB_END_PREFIX):])
+                if event:
+                    event.set()
+                continue
+            self._output.append(text)
+            if len(self._output) > WORKER_OUTPUT_LINES:
+                del self._output[:len(self._output) - WORKER_OUTPUT_LINES]
+            if self._on_output:
+                try:
+                    await self._on_output(text)
+                except Exception:
+                    # A client that stopped listening must not stall the worker's pipes
+                    self._on_output = None
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None and not self.writer.is_closing()
+
+    async def request(
+        self,
+        command: str,
+        params: Dict[str, Any],
+        timeout: float,
+        on_output: Optional[OutputCallback] = None
+    ) -> Dict[str, Any]:
+        """Send one job and wait for its reply; raises GodotWorkerError on timeout or crash."""
+        self._next_id += 1
+        request_id = str(self._next_id)
+        job_end = self._job_ends[request_id] = asyncio.Event()
+        self._output.clear()
+        self._on_output = on_output
+        try:
+            payload = json.dumps({"id": request_id, "command": command, "params": params})
+            self.writer.write(payload.encode() + b"\n")
+            await self.writer.drain()
+            while True:
+                line = await asyncio.wait_for(self.reader.readline(), timeout)
+                if not line:
+                    raise GodotWorkerError(f"Worker exited during '{command}'")
+                response = json.loads(line)
+                if response.get("id") == request_id:
+                    break
+            # stdout and the socket are separate channels; wait briefly for the job's log to arrive
             try:
-                subprocess.run(["killall", "-9", "Godot"], capture_output=True, check=False)
-            except FileNotFoundError:
+                await asyncio.wait_for(job_end.wait(), 1.0)
+            except asyncio.TimeoutError:
                 pass
-            
-            # Use ps and kill for any remaining processes
-            result = subprocess.run(
-                ["ps", "aux"], 
-                capture_output=True, 
-                text=True
-            )
-            
-            if result.returncode == 0:
-                for line in result.stdout.splitlines():
-                    if "Godot" in line and "--headless" in line:
-                        parts = line.split()
-                        if len(parts) > 1:
-                            pid = parts[1]
-                            try:
-                                subprocess.run(["kill", "-9", pid], capture_output=True)
-                            except:
-                                pass
+        except asyncio.TimeoutError:
+            raise GodotWorkerError(f"'{command}' timed out after {timeout}s")
+        except (OSError, json.JSONDecodeError) as e:
+            raise GodotWorkerError(f"Worker connection failed during '{command}': {e}")
+        finally:
+            self._job_ends.pop(request_id, None)
+            self._on_output = None
+
+        self.jobs += 1
+        self.last_used = time.monotonic()
+        self.memory = int(response.get("memory", 0))
+        if self.baseline_memory is None:
+            self.baseline_memory = self.memory
+        response["output"] = list(self._output)
+        return response
+
+    def kill(self) -> None:
+        kill_process_group(self.process)
+        try:
+            self.writer.close()
+            for task in self._drain_tasks:
+                task.cancel()
+        except RuntimeError:
+            # Event loop already closed (interpreter shutdown); the process group is gone anyway
+            pass
+
+
+class GodotWorkerPool:
+    """
+    Keeps up to `size` warm headless Godot workers and hands each job to an idle one.
+    
+    Workers are recycled after `max_jobs` jobs, when their static memory grows by more
+    than `max_memory_growth_mb` since their first job, or when project files change.
+    A job that times out kills only the worker running it.
+    """
+
+    def __init__(self, size: int, max_jobs: int, max_memory_growth_mb: int):
+        self.size = size
+        self.max_jobs = max_jobs
+        self.max_memory_growth = max_memory_growth_mb * 1024 * 1024
+        self._idle: List[GodotWorker] = []
+        self._workers: Set[GodotWorker] = set()
+        self._slots = asyncio.Semaphore(size)
+
+    async def submit(
+        self,
+        command: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: float = 120,
+        on_output: Optional[OutputCallback] = None
+    ) -> Dict[str, Any]:
+        async with self._slots:
+            worker = await self._acquire()
+            try:
+                response = await worker.request(command, params or {}, timeout, on_output)
+            except BaseException:
+                # Timed out, crashed or cancelled mid-job: never hand this worker out again
+                self._discard(worker)
+                raise
+            self._release(worker)
+            return response
+
+    async def _acquire(self) -> GodotWorker:
+        fingerprint = _project_fingerprint()
+        while self._idle:
+            worker = self._idle.pop()
+            if not worker.alive or worker.fingerprint != fingerprint:
+                self._discard(worker)
+                continue
+            if time.monotonic() - worker.last_used > WORKER_HEALTH_CHECK_INTERVAL:
+                try:
+                    await worker.request("ping", {}, WORKER_PING_TIMEOUT)
+                except GodotWorkerError:
+                    self._discard(worker)
+                    continue
+            return worker
+
+        godot_path = find_godot_executable()
+        if not godot_path:
+            raise GodotWorkerError(GODOT_NOT_FOUND_MESSAGE)
+        worker = await GodotWorker.start(godot_path, fingerprint, WORKER_START_TIMEOUT)
+        self._workers.add(worker)
+        return worker
+
+    def _release(self, worker: GodotWorker) -> None:
+        grown = worker.memory - (worker.baseline_memory or worker.memory)
+        if worker.jobs >= self.max_jobs or grown > self.max_memory_growth or not worker.alive:
+            self._discard(worker)
         else:
-            # Windows: Use taskkill with more options
-            subprocess.run(["taskkill", "/F", "/IM", "Godot.exe"], capture_output=True)
-            subprocess.run(["taskkill", "/F", "/IM", "Godot*.exe"], capture_output=True)
-            # Also try with process tree
-            subprocess.run(["taskkill", "/F", "/T", "/IM", "Godot.exe"], capture_output=True)
-    except Exception as e:
-        print(f"Cleanup error: {e}", file=sys.stderr)
+            self._idle.append(worker)
 
+    def _discard(self, worker: GodotWorker) -> None:
+        worker.kill()
+        self._workers.discard(worker)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "workers": len(self._workers),
+            "idle": len(self._idle),
+            "jobs": [worker.jobs for worker in self._workers],
+        }
+
+    def shutdown(self) -> None:
+        for worker in list(self._workers):
+            self._discard(worker)
+        self._idle.clear()
 
-def save_json_file(file_path: Path, data: Dict[str, Any]) -> bool:
-    """Save data to a JSON file."""
-    try:
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2)
-        return True
-    except Exception:
-        return False
+
+_worker_pool: Optional[GodotWorkerPool] = None
+
+
+def get_worker_pool() -> Optional[GodotWorkerPool]:
+    """The shared warm worker pool, or None when GODOT_WORKER_POOL_SIZE is 0."""
+    global _worker_pool
+    if _worker_pool is None:
+        size = env_int("GODOT_WORKER_POOL_SIZE", os.cpu_count() or 1)
+        if size <= 0:
+            return None
+        _worker_pool = GodotWorkerPool(
+            size,
+            max_jobs=env_int("GODOT_WORKER_MAX_JOBS", 50),
+            max_memory_growth_mb=env_int("GODOT_WORKER_MAX_MEMORY_GROWTH_MB", 512),
+        )
+    return _worker_pool
+
+
+def shutdown_worker_pool() -> None:
+    if _worker_pool is not None:
+        _worker_pool.shutdown()
 
 
 # MCP Tools
-@mcp.tool()
-async def run_tests(test_pattern: str = "") -> str:
+def _worker_shard_executor(pool: GodotWorkerPool, timeout: float, on_output: Optional[OutputCallback], log_level: int = 1):
     """
-    Run Godot unit tests using GUT framework with proper cleanup.
-    
-    Args:
-        test_pattern: Optional pattern to filter tests (e.g., "test_battle" to run only battle tests)
+    Runs each test shard on a warm worker with only that shard's scripts. Shards
+    beyond the pool size run as one-shot Godot processes instead of queueing.
     """
-    # Use GUT with exit flag and add force quit script
-    args = ["-s", "res://addons/gut/gut_cmdln.gd", "-gdir=res://tests", "-gexit"]
-    
-    if test_pattern:
-        args.append(f"-gtest={test_pattern}")
+    one_shot = gut_shard_runner.godot_process_executor(timeout=timeout, log_level=log_level, on_output=on_output)
     
-    # Add force quit script
-    args.extend(["--", "--script", "res://tools/diagnostics/force_quit.gd"])
+    async def execute(index: int, scripts: List[str]) -> Dict[str, Any]:
+        if index >= pool.size:
+            return await one_shot(index, scripts)
+        params = {"dirs": [], "tests": scripts}
+        try:
+            response = await pool.submit("run_tests", params, timeout=timeout, on_output=on_output)
+        except GodotWorkerError as e:
+            return {"ok": False, "results": None, "output": "", "error": str(e)}
+        output = "\n".join(response.get("output", []))
+        if not response.get("ok"):
+            return {"ok": False, "results": None, "output": output, "error": response.get("error", "unknown error")}
+        return {"ok": True, "results": response["result"], "output": output, "error": ""}
     
-    success, stdout, stderr = run_godot_command(args, timeout=120)
+    return execute
+
+
+async def _run_sharded_tests(test_pattern: str, shards: int, full_run: bool, ctx: Optional[Context]) -> str:
+    config = gut_shard_runner.load_gut_config()
+    scripts = gut_shard_runner.discover_test_scripts(config, [test_pattern] if test_pattern else [])
+    if not scripts:
+        return f"No test scripts matched '{test_pattern}'"
     
-    # Ensure cleanup after tests
-    cleanup_godot_processes()
+    output_dir = gut_shard_runner.DEFAULT_OUTPUT_DIR
+    cache = TestResultCache(output_dir / gut_shard_runner.CACHE_FILE_NAME, PROJECT_ROOT)
+    to_run, skipped = cache.partition(scripts, full_run=full_run)
+    if not to_run:
+        gut_shard_runner.write_reports(gut_shard_runner.skipped_report(skipped), output_dir)
+        return (
+            f"Tests completed successfully:\nAll {len(skipped)} test scripts are unchanged since their "
+            f"last passing run; call with full_run=True to run them anyway"
+        )
     
-    if success:
-        return f"Tests completed successfully:\n{stdout}"
+    pool = get_worker_pool()
+    if pool is not None:
+        executor = _worker_shard_executor(pool, 120, None, int(config.get("log_level", 1)))
     else:
-        return f"Tests failed:\nSTDOUT:\n{stdout}\n\nSTDERR:\n{stderr}"
+        executor = gut_shard_runner.godot_process_executor(timeout=120, log_level=int(config.get("log_level", 1)))
+    
+    timings_file = output_dir / gut_shard_runner.TIMINGS_FILE_NAME
+    timings = gut_shard_runner.load_timings(timings_file)
+    report = await gut_shard_runner.run_sharded(to_run, shards, executor, timings, _shard_progress_reporter(ctx))
+    report["skipped"] = skipped
+    gut_shard_runner.write_reports(report, output_dir)
+    gut_shard_runner.save_timings(timings_file, timings, report)
+    cache.record(to_run, report)
+    cache.save()
+    
+    failing = [
+        f"  {gut_shard_runner.script_key(name)}: {test_name}"
+        for name, script in sorted(report["test_scripts"]["scripts"].items())
+        for test_name, test in script.get("tests", {}).items()
+        if test.get("status") == "fail"
+    ]
+    text = gut_shard_runner.format_summary(report)
+    if failing:
+        text += "\n\nFailing tests:\n" + "\n".join(failing)
+    for shard in report["shards"]:
+        if not shard["ok"]:
+            text += f"\n\nShard {shard['index']} output:\n" + "\n".join(shard.get("output_tail", []))
+    text += f"\n\nReports: {output_dir / gut_shard_runner.RESULTS_JSON_NAME}, {output_dir / gut_shard_runner.RESULTS_XML_NAME}"
+    if gut_shard_runner.report_passed(report):
+        return f"Tests completed successfully:\n{text}"
+    return f"Tests failed:\n{text}"
+
+
+@mcp.tool()
+async def run_tests(test_pattern: str = "", shards: int = 1, full_run: bool = False, ctx: Context = None) -> str:
+    """
+    Run Godot unit tests using GUT framework with proper cleanup.
+    
+    Test scripts that passed on their last run are skipped when neither they nor anything
+    they depend on (preloaded scripts, class_name/autoload references, data files) has
+    changed since. Runs on warm workers from the pool when it is enabled
+    (GODOT_WORKER_POOL_SIZE > 0). With shards > 1 the scripts are split across that many
+    concurrent Godot processes (or pool workers), balanced by the timings of previous runs.
+    Results are merged into .godot_logs/gut_results.json and .godot_logs/gut_results.xml.
+    
+    Args:
+        test_pattern: Optional pattern to filter tests (e.g., "test_battle" to run only battle tests),
+            or a full script path like "res://tests/unit/test_battle_unit.gd" (as with -gtest)
+        shards: Number of parallel shards (1 = single process)
+        full_run: Run every matching script, ignoring cached results
+    """
+    return await _run_sharded_tests(test_pattern, max(1, shards), full_run, ctx)
 
 
 @mcp.tool()
-async def run_scene(scene_path: str, timeout_seconds: int = 30) -> str:
+async def run_scene(scene_path: str, timeout_seconds: int = 30, ctx: Context = None) -> str:
     """
     Run a specific Godot scene with proper cleanup.
     
@@ -358,26 +647,36 @@ async def run_scene(scene_path: str, timeout_seconds: int = 30) -> str:
     # Cap timeout to prevent excessive resource usage
     timeout_seconds = min(timeout_seconds, 300)
     
-    # Add --quit flag to ensure Godot exits cleanly
-    args = ["--quit", "--", scene_path]
-    success, stdout, stderr = run_godot_command(args, timeout=timeout_seconds)
+    # The scene runs until it quits on its own or the timeout stops its process group
+    success, stdout, stderr = await run_godot_async([scene_path], timeout=timeout_seconds, on_output=_progress_reporter(ctx))
     
-    if success or "timeout" in stderr.lower():
+    if success or "timed out" in stderr.lower():
         return f"Scene ran for up to {timeout_seconds} seconds:\n{stdout}"
     else:
         return f"Scene failed to run:\nSTDOUT:\n{stdout}\n\nSTDERR:\n{stderr}"
 
 
 @mcp.tool()
-async def check_script_errors() -> str:
+async def check_script_errors(ctx: Context = None) -> str:
     """
     Check all GDScript files for syntax errors with proper cleanup.
     """
-    args = ["--script", "res://tools/testing/check_gut.gd", "--check-only", "--quit"]
-    success, stdout, stderr = run_godot_command(args, timeout=60)
+    pool = get_worker_pool()
+    if pool is not None:
+        try:
+            response = await pool.submit("check_scripts", {}, timeout=60, on_output=_progress_reporter(ctx))
+        except GodotWorkerError as e:
+            return f"Script errors found:\n{e}"
+        if not response.get("ok"):
+            return f"Script errors found:\n{response.get('error', 'unknown error')}"
+        failed = response["result"]["failed"]
+        if not failed:
+            return f"No script errors found ({response['result']['checked']} scripts checked)"
+        output = "\n".join(response.get("output", []))
+        return "Script errors found:\n" + "\n".join(failed) + f"\n\n{output}"
     
-    # Ensure cleanup
-    cleanup_godot_processes()
+    args = ["--script", "res://tools/testing/check_gut.gd", "--check-only", "--quit"]
+    success, stdout, stderr = await run_godot_async(args, timeout=60, on_output=_progress_reporter(ctx))
     
     if success:
         return "No script errors found"
@@ -385,57 +684,118 @@ async def check_script_errors() -> str:
         return f"Script errors found:\n{stderr}"
 
 
+def _load_collection(file_name: str, list_key: str, id_key: str) -> tuple[Optional[JsonCollection], str]:
+    """Returns (collection, "") or (None, error message) for a data/ record file."""
+    try:
+        return data_store.collection(DATA_DIR / file_name, list_key, id_key), ""
+    except FileNotFoundError:
+        return None, f"{file_name} not found"
+    except (OSError, ValueError) as e:
+        return None, f"Failed to load {file_name}: {e}"
+
+
+def _page_footer(total: int, offset: int, shown: int) -> str:
+    if offset + shown < total:
+        return f"\nShowing {offset + 1}-{offset + shown} of {total}; pass offset={offset + shown} for more"
+    return ""
+
+
 @mcp.tool()
-async def get_encounter_data() -> str:
+async def get_encounter_data(
+    offset: int = 0,
+    limit: int = 50,
+    search: str = "",
+    difficulty_level: int = 0,
+    tag: str = ""
+) -> str:
     """
-    Get all encounter configurations from the encounters.json file.
+    Get encounter configurations from the encounters.json file.
+    
+    Args:
+        offset: Index of the first matching encounter to show
+        limit: Maximum number of encounters to show
+        search: Only encounters whose id or name contains this text (case-insensitive)
+        difficulty_level: Only encounters of this difficulty level (0 = any)
+        tag: Only encounters with this tag
     """
-    encounters_file = DATA_DIR / "encounters.json"
-    data = load_json_file(encounters_file)
+    encounters, error = _load_collection("encounters.json", "encounters", "encounter_id")
+    if encounters is None:
+        return error
+    
+    needle = search.lower()
+    
+    def matches(encounter: Dict[str, Any]) -> bool:
+        if needle and needle not in f"{encounter.get('encounter_id', '')} {encounter.get('encounter_name', '')}".lower():
+            return False
+        if difficulty_level and encounter.get("difficulty_level") != difficulty_level:
+            return False
+        return not tag or tag in encounter.get("tags", [])
     
-    if data is None:
-        return "Failed to load encounters.json"
+    filtered = bool(needle or difficulty_level or tag)
+    total, page = encounters.page(max(0, offset), max(1, limit), matches if filtered else None)
     
     summary = []
-    summary.append(f"Total encounters: {len(data.get('encounters', []))}")
+    summary.append(f"Total encounters: {len(encounters)}" + (f" ({total} matching)" if filtered else ""))
     
-    for encounter in data.get('encounters', []):
+    for encounter in page:
         enc_info = [
-            f"\nEncounter: {encounter.get('id', 'Unknown')}",
-            f"  Name: {encounter.get('name', 'Unknown')}",
-            f"  Difficulty: {encounter.get('difficulty', 'Unknown')}",
+            f"\nEncounter: {encounter.get('encounter_id', 'Unknown')}",
+            f"  Name: {encounter.get('encounter_name', 'Unknown')}",
+            f"  Difficulty: {encounter.get('difficulty_level', 'Unknown')}",
             f"  Waves: {len(encounter.get('waves', []))}"
         ]
         summary.extend(enc_info)
     
-    return "\n".join(summary)
+    summary.append(_page_footer(total, max(0, offset), len(page)))
+    return "\n".join(summary).rstrip()
 
 
 @mcp.tool()
-async def get_unit_templates() -> str:
+async def get_unit_templates(
+    offset: int = 0,
+    limit: int = 50,
+    search: str = "",
+    tag: str = ""
+) -> str:
     """
-    Get all unit template configurations from unit_templates.json.
+    Get unit template configurations from unit_templates.json.
+    
+    Args:
+        offset: Index of the first matching template to show
+        limit: Maximum number of templates to show
+        search: Only templates whose id or name contains this text (case-insensitive)
+        tag: Only templates with this tag
     """
-    templates_file = DATA_DIR / "unit_templates.json"
-    data = load_json_file(templates_file)
+    templates, error = _load_collection("unit_templates.json", "unit_templates", "id")
+    if templates is None:
+        return error
+    
+    needle = search.lower()
     
-    if data is None:
-        return "Failed to load unit_templates.json"
+    def matches(unit: Dict[str, Any]) -> bool:
+        if needle and needle not in f"{unit.get('id', '')} {unit.get('name_prefix', '')} {unit.get('name', '')}".lower():
+            return False
+        return not tag or tag in unit.get("tags", [])
+    
+    filtered = bool(needle or tag)
+    total, page = templates.page(max(0, offset), max(1, limit), matches if filtered else None)
     
     summary = []
-    summary.append(f"Total unit templates: {len(data.get('units', []))}")
+    summary.append(f"Total unit templates: {len(templates)}" + (f" ({total} matching)" if filtered else ""))
     
-    for unit in data.get('units', []):
+    for unit in page:
+        base_stats = unit.get('base_stats', {})
         unit_info = [
             f"\nUnit: {unit.get('id', 'Unknown')}",
-            f"  Name: {unit.get('name', 'Unknown')}",
-            f"  Type: {unit.get('type', 'Unknown')}",
-            f"  HP: {unit.get('base_stats', {}).get('max_hp', 0)}",
-            f"  Damage: {unit.get('base_stats', {}).get('damage', 0)}"
+            f"  Name: {(unit.get('name_prefix', '') + ' ' + unit.get('name', 'Unknown')).strip()}",
+            f"  Tags: {', '.join(unit.get('tags', [])) or 'none'}",
+            f"  HP: {base_stats.get('health', 0)}",
+            f"  Attack: {base_stats.get('attack', 0)}"
         ]
         summary.extend(unit_info)
     
-    return "\n".join(summary)
+    summary.append(_page_footer(total, max(0, offset), len(page)))
+    return "\n".join(summary).rstrip()
 
 
 @mcp.tool()
@@ -454,45 +814,42 @@ async def add_unit_template(
     Args:
         unit_id: Unique identifier for the unit
         name: Display name of the unit
-        unit_type: Type of unit (e.g., "warrior", "mage", "archer")
+        unit_type: Type of unit (e.g., "warrior", "mage", "archer"), stored as a tag
         max_hp: Maximum health points
         damage: Base damage value
         armor: Armor value (default: 0)
         speed: Movement/action speed (default: 100)
     """
-    templates_file = DATA_DIR / "unit_templates.json"
-    data = load_json_file(templates_file)
-    
-    if data is None:
-        return "Failed to load unit_templates.json"
+    templates, error = _load_collection("unit_templates.json", "unit_templates", "id")
+    if templates is None:
+        return error
     
     # Check if unit already exists
-    existing_units = data.get('units', [])
-    if any(unit['id'] == unit_id for unit in existing_units):
+    if unit_id in templates:
         return f"Unit with ID '{unit_id}' already exists"
     
-    # Create new unit
+    # Create new unit in the shape UnitFactory reads
     new_unit = {
         "id": unit_id,
         "name": name,
-        "type": unit_type,
         "base_stats": {
-            "max_hp": max_hp,
-            "damage": damage,
-            "armor": armor,
+            "health": max_hp,
+            "attack": damage,
+            "defense": armor,
             "speed": speed
         },
         "skills": [],
-        "equipment_slots": ["weapon", "armor", "accessory"]
+        "tags": [unit_type]
     }
     
-    existing_units.append(new_unit)
-    data['units'] = existing_units
-    
-    if save_json_file(templates_file, data):
-        return f"Successfully added unit template '{name}' with ID '{unit_id}'"
-    else:
-        return "Failed to save unit template"
+    try:
+        templates.append(new_unit)
+    except OSError as e:
+        return f"Failed to save unit template: {e}"
+    return f"Successfully added unit template '{name}' with ID '{unit_id}'"
+
+
+DIFFICULTY_LEVELS = {"easy": 1, "normal": 2, "hard": 3, "elite": 4, "boss": 5}
 
 
 @mcp.tool()
@@ -508,49 +865,400 @@ async def create_encounter(
     Args:
         encounter_id: Unique identifier for the encounter
         name: Display name of the encounter
-        difficulty: Difficulty level (easy, normal, hard, elite, boss)
-        wave_configs: List of wave configurations, each containing unit_ids and counts
+        difficulty: Difficulty level (easy, normal, hard, elite, boss) or a number
+        wave_configs: List of wave configurations, each containing unit template ids and counts
     
     Example wave_configs:
     [
-        {"units": [{"unit_id": "goblin", "count": 3}]},
-        {"units": [{"unit_id": "goblin", "count": 2}, {"unit_id": "goblin_chief", "count": 1}]}
+        {"enemy_units": [{"template_id": "goblin_warrior", "count": 3, "level": 1}]},
+        {"enemy_units": [{"template_id": "goblin_warrior", "count": 2}, {"template_id": "goblin_chief", "count": 1}]}
     ]
     """
-    encounters_file = DATA_DIR / "encounters.json"
-    data = load_json_file(encounters_file)
-    
-    if data is None:
-        return "Failed to load encounters.json"
+    encounters, error = _load_collection("encounters.json", "encounters", "encounter_id")
+    if encounters is None:
+        return error
     
     # Check if encounter already exists
-    existing_encounters = data.get('encounters', [])
-    if any(enc['id'] == encounter_id for enc in existing_encounters):
+    if encounter_id in encounters:
         return f"Encounter with ID '{encounter_id}' already exists"
     
+    difficulty_key = str(difficulty).lower()
+    if difficulty_key.isdigit():
+        difficulty_level = int(difficulty_key)
+    elif difficulty_key in DIFFICULTY_LEVELS:
+        difficulty_level = DIFFICULTY_LEVELS[difficulty_key]
+    else:
+        return f"Unknown difficulty '{difficulty}'; use one of {', '.join(DIFFICULTY_LEVELS)} or a number"
+    
     # Create new encounter
     new_encounter = {
-        "id": encounter_id,
-        "name": name,
-        "difficulty": difficulty,
+        "encounter_id": encounter_id,
+        "encounter_name": name,
+        "difficulty_level": difficulty_level,
+        "is_boss_encounter": difficulty_key == "boss",
         "waves": []
     }
     
-    # Build waves
+    # Build waves; the older {"units": [{"unit_id": ...}]} form is still accepted
     for i, wave_config in enumerate(wave_configs):
+        enemy_units = []
+        for unit in wave_config.get("enemy_units", wave_config.get("units", [])):
+            enemy = dict(unit)
+            if "template_id" not in enemy and "unit_id" in enemy:
+                enemy["template_id"] = enemy.pop("unit_id")
+            enemy_units.append(enemy)
         wave = {
-            "wave_number": i + 1,
-            "units": wave_config.get("units", [])
+            "wave_name": wave_config.get("wave_name", f"Wave {i + 1}"),
+            "enemy_units": enemy_units
         }
         new_encounter["waves"].append(wave)
     
-    existing_encounters.append(new_encounter)
-    data['encounters'] = existing_encounters
+    try:
+        encounters.append(new_encounter)
+    except OSError as e:
+        return f"Failed to save encounter: {e}"
+    return f"Successfully created encounter '{name}' with {len(wave_configs)} waves"
+
+
+def _plan_simulation_shards(runs: int, workers: int) -> List[tuple[int, int]]:
+    """Split run indices into contiguous (first_run, count) shards."""
+    workers = max(1, min(workers, runs))
+    base, extra = divmod(runs, workers)
+    shards = []
+    first_run = 0
+    for index in range(workers):
+        count = base + (1 if index < extra else 0)
+        shards.append((first_run, count))
+        first_run += count
+    return shards
+
+
+async def _run_simulation_shard(args: List[str], timeout: int) -> tuple[bool, List[Dict[str, Any]], str]:
+    """Run one simulator shard in its own process group without touching other Godot processes."""
+    success, stdout, stderr = await run_godot_async(args, timeout=timeout)
+    # Records printed before a timeout are still usable
+    return success, _parse_simulation_records(stdout), stderr
+
+
+async def _run_pooled_simulation_shard(pool: GodotWorkerPool, params: Dict[str, Any], timeout: int) -> tuple[bool, List[Dict[str, Any]], str]:
+    """Run one simulator shard on a warm worker."""
+    try:
+        response = await pool.submit("simulate", params, timeout=timeout)
+    except GodotWorkerError as e:
+        return False, [], str(e)
+    if not response.get("ok"):
+        return False, [], response.get("error", "unknown error")
+    return True, response["result"]["records"], ""
+
+
+def _parse_simulation_records(stdout: str) -> List[Dict[str, Any]]:
+    records = []
+    for line in stdout.splitlines():
+        if line.startswith(SIMULATION_RESULT_PREFIX):
+            try:
+                records.append(json.loads(line[len(SIMULATION_RESULT_PREFIX):]))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def _wilson_interval(successes: int, total: int, z: float = 1.96) -> List[float]:
+    """95% Wilson score interval for a proportion."""
+    if total == 0:
+        return [0.0, 0.0]
+    p = successes / total
+    denominator = 1 + z * z / total
+    centre = (p + z * z / (2 * total)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / denominator
+    return [round(max(0.0, centre - margin), 4), round(min(1.0, centre + margin), 4)]
+
+
+def _mean_with_interval(values: List[float], z: float = 1.96) -> Dict[str, Any]:
+    """Mean with a normal-approximation 95% confidence interval."""
+    n = len(values)
+    if n == 0:
+        return {"mean": 0.0, "ci95": [0.0, 0.0]}
+    mean = sum(values) / n
+    if n == 1:
+        return {"mean": round(mean, 3), "ci95": [round(mean, 3), round(mean, 3)]}
+    variance = sum((v - mean) ** 2 for v in values) / (n - 1)
+    margin = z * math.sqrt(variance / n)
+    return {"mean": round(mean, 3), "ci95": [round(mean - margin, 3), round(mean + margin, 3)]}
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _aggregate_simulation(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate per-run simulator records into encounter balance statistics."""
+    runs = len(records)
+    wins = sum(1 for record in records if record.get("victory"))
+    rounds = sorted(float(record.get("rounds", 0)) for record in records)
+
+    per_unit: Dict[str, Dict[str, Any]] = {}
+    for record in records:
+        for key, (count, dealt, taken, survived) in record.get("units", {}).items():
+            entry = per_unit.setdefault(key, {"instances": 0, "survived": 0, "dealt": [], "taken": []})
+            entry["instances"] += count
+            entry["survived"] += survived
+            if count > 0:
+                entry["dealt"].append(dealt / count)
+                entry["taken"].append(taken / count)
+
+    units = {}
+    for key in sorted(per_unit):
+        entry = per_unit[key]
+        units[key] = {
+            "samples": entry["instances"],
+            "damage_dealt": _mean_with_interval(entry["dealt"]),
+            "damage_taken": _mean_with_interval(entry["taken"]),
+            "survival_rate": round(entry["survived"] / entry["instances"], 4) if entry["instances"] else 0.0,
+            "survival_ci95": _wilson_interval(entry["survived"], entry["instances"]),
+        }
+
+    return {
+        "runs": runs,
+        "win_rate": round(wins / runs, 4) if runs else 0.0,
+        "win_rate_ci95": _wilson_interval(wins, runs),
+        "battle_rounds": {
+            **_mean_with_interval(rounds),
+            "p50": _percentile(rounds, 0.5),
+            "p90": _percentile(rounds, 0.9),
+            "p99": _percentile(rounds, 0.99),
+        },
+        "waves_cleared": _mean_with_interval([float(record.get("waves_cleared", 0)) for record in records]),
+        "units": units,
+    }
+
+
+@mcp.tool()
+async def simulate_encounter(
+    encounter_id: str,
+    difficulty: str = "normal",
+    runs: int = 1000,
+    seed: int = 0,
+    team: Optional[List[str]] = None,
+    level: int = 1,
+    workers: int = 0
+) -> str:
+    """
+    Run many headless battles of an encounter in parallel and report balance statistics.
     
-    if save_json_file(encounters_file, data):
-        return f"Successfully created encounter '{name}' with {len(wave_configs)} waves"
-    else:
-        return "Failed to save encounter"
+    Runs are sharded across Godot processes, one per CPU core by default. Shards go to
+    the warm worker pool when it is enabled; those beyond its size run as one-shot
+    processes. Run i always uses seed + i, so results
+    do not depend on the number of workers.
+    
+    Args:
+        encounter_id: Encounter ID from encounters.json (e.g., "forest_ambush")
+        difficulty: Difficulty mode (easy, normal, hard, nightmare, adaptive)
+        runs: Number of simulated encounters (max 20000)
+        seed: Base seed for the per-run RNG
+        team: Player unit template IDs (default: warrior, archer, healer, mage)
+        level: Level of the player units
+        workers: Number of Godot processes to use (0 = CPU count)
+    """
+    runs = max(1, min(runs, 20000))
+    pool = get_worker_pool()
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+
+    user_args = [
+        f"--encounter={encounter_id}",
+        f"--difficulty={difficulty}",
+        f"--seed={seed}",
+        f"--level={level}",
+    ]
+    if team:
+        user_args.append(f"--team={','.join(team)}")
+
+    started = time.monotonic()
+    shards = _plan_simulation_shards(runs, workers)
+    params = {"encounter": encounter_id, "difficulty": difficulty, "seed": seed, "level": level}
+    if team:
+        params["team"] = team
+    pooled_shards = pool.size if pool is not None else 0
+    results = await asyncio.gather(*[
+        _run_pooled_simulation_shard(pool, {**params, "first-run": first_run, "runs": count}, 300)
+        if index < pooled_shards else
+        _run_simulation_shard(
+            ["--script", SIMULATOR_SCRIPT, "--"] + user_args + [f"--first-run={first_run}", f"--runs={count}"],
+            300,
+        )
+        for index, (first_run, count) in enumerate(shards)
+    ])
+
+    records: List[Dict[str, Any]] = []
+    errors = []
+    for (first_run, count), (success, shard_records, stderr) in zip(shards, results):
+        records.extend(shard_records)
+        if not success or len(shard_records) != count:
+            errors.append(f"runs {first_run}-{first_run + count - 1}: {stderr.strip()[-500:] or 'incomplete output'}")
+
+    if not records:
+        return "Simulation failed:\n" + "\n".join(errors)
+
+    records.sort(key=lambda record: record.get("run", 0))
+    summary = {
+        "encounter_id": encounter_id,
+        "difficulty": difficulty,
+        "seed": seed,
+        "workers": len(shards),
+        "elapsed_seconds": round(time.monotonic() - started, 2),
+        **_aggregate_simulation(records),
+    }
+    if errors:
+        summary["errors"] = errors
+    return json.dumps(summary, indent=2)
+
+
+def _summarize_battle_profiles(battles: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge per-battle BattleProfiler dumps into one summary."""
+    functions: Dict[str, Dict[str, Any]] = {}
+    subsystems: Dict[str, Dict[str, int]] = {}
+    counters: Dict[str, int] = {}
+    rounds = []
+    for index, battle in enumerate(battles):
+        for entry in battle.get("top_functions", []):
+            merged = functions.setdefault(entry["function"], {"calls": 0, "total_usec": 0, "max_usec": 0})
+            merged["calls"] += entry.get("calls", 0)
+            merged["total_usec"] += entry.get("total_usec", 0)
+            merged["max_usec"] = max(merged["max_usec"], entry.get("max_usec", 0))
+        for name, totals in battle.get("subsystems", {}).items():
+            merged = subsystems.setdefault(name, {"calls": 0, "total_usec": 0})
+            merged["calls"] += totals.get("calls", 0)
+            merged["total_usec"] += totals.get("total_usec", 0)
+        for name, value in battle.get("counters", {}).items():
+            counters[name] = counters.get(name, 0) + value
+        rounds.extend({"battle": index, **entry} for entry in battle.get("rounds", []))
+
+    hits = counters.get("stat_cache_hits", 0)
+    lookups = hits + counters.get("stat_cache_misses", 0)
+    top = sorted(
+        ({"function": name, **totals} for name, totals in functions.items()),
+        key=lambda entry: entry["total_usec"],
+        reverse=True,
+    )
+    allocations = [entry.get("objects_allocated", 0) for entry in rounds]
+    return {
+        "battles": len(battles),
+        "rounds": len(rounds),
+        "battle_usec": sum(battle.get("battle_usec", 0) for battle in battles),
+        "top_functions": top[:10],
+        "subsystems": subsystems,
+        "counters": counters,
+        "stat_cache_hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        "event_log_size": max((battle.get("gauges", {}).get("event_log_size", 0) for battle in battles), default=0),
+        "objects_allocated_per_round": _mean_with_interval([float(value) for value in allocations]),
+        "slowest_rounds": sorted(rounds, key=lambda entry: entry.get("usec", 0), reverse=True)[:5],
+    }
+
+
+@mcp.tool()
+async def profile_battle(
+    scene_or_encounter: str,
+    difficulty: str = "normal",
+    seed: int = 0,
+    team: Optional[List[str]] = None,
+    level: int = 1,
+    timeout_seconds: int = 120
+) -> str:
+    """
+    Run a headless battle with BattleProfiler enabled and summarize where the time went.
+    
+    An encounter id plays every wave of that encounter once, like one simulate_encounter
+    run. A scene path (res://....tscn) runs the scene until it quits or the timeout, and
+    profiles every battle finished in that time. Always uses a fresh Godot process, so
+    object counts per round are not skewed by earlier jobs.
+    
+    Args:
+        scene_or_encounter: Encounter ID from encounters.json, or a scene path
+        difficulty: Difficulty mode for encounters (easy, normal, hard, nightmare, adaptive)
+        seed: Battle seed for encounters
+        team: Player unit template IDs for encounters (default: warrior, archer, healer, mage)
+        level: Level of the player units for encounters
+        timeout_seconds: How long to let the run go (max 300 seconds)
+    """
+    timeout_seconds = max(1, min(timeout_seconds, 300))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        profile_path = Path(temp_dir) / "battle_profile.json"
+        profile_arg = BATTLE_PROFILE_FLAG + str(profile_path)
+        if scene_or_encounter.endswith(".tscn"):
+            args = [scene_or_encounter, "--", profile_arg]
+        else:
+            args = ["--script", SIMULATOR_SCRIPT, "--",
+                    f"--encounter={scene_or_encounter}", f"--difficulty={difficulty}",
+                    f"--seed={seed}", f"--level={level}", "--runs=1", profile_arg]
+            if team:
+                args.append(f"--team={','.join(team)}")
+
+        success, stdout, stderr = await run_godot_async(args, timeout=timeout_seconds)
+        try:
+            battles = json.loads(profile_path.read_text()).get("battles", [])
+        except (OSError, json.JSONDecodeError):
+            battles = []
+
+    if not battles:
+        return f"No battle finished while profiling {scene_or_encounter}:\n{stderr.strip()[-2000:] or stdout[-2000:]}"
+
+    summary = {"target": scene_or_encounter, **_summarize_battle_profiles(battles)}
+    if not success:
+        summary["warning"] = stderr.strip()[-500:] or "run did not exit cleanly"
+    return json.dumps(summary, indent=2)
+
+
+@mcp.tool()
+async def run_benchmarks(
+    case_filter: str = "",
+    trials: int = benchmark_check.DEFAULT_TRIALS,
+    threshold: float = benchmark_check.DEFAULT_THRESHOLD,
+    update_baseline: bool = False,
+    timeout_seconds: int = 600,
+    ctx: Context = None
+) -> str:
+    """
+    Run the benchmark suite headless and compare each case with tests/benchmarks/baseline.json.
+    
+    Every case is warmed up once and then timed `trials` times; the median is compared with
+    the baseline's. Cases more than `threshold` slower (and above a small absolute noise
+    floor) are reported as regressions. Always uses a fresh Godot process.
+    
+    Args:
+        case_filter: Only cases whose name contains this text (e.g. "rule_processor", "battle/")
+        trials: Timed runs per case (1-50)
+        threshold: Allowed slowdown before a case counts as a regression (0.15 = 15%)
+        update_baseline: Record this run as the baseline instead of comparing. Only do this
+            on the reference machine; timings from other hardware are not comparable.
+        timeout_seconds: Timeout for the whole run (max 1800 seconds)
+    """
+    trials = max(1, min(trials, 50))
+    timeout_seconds = max(1, min(timeout_seconds, 1800))
+    args = ["--script", benchmark_check.BENCHMARK_SCRIPT, "--", f"--trials={trials}"]
+    if case_filter:
+        args.append(f"--filter={case_filter}")
+    success, stdout, stderr = await run_godot_async(args, timeout=timeout_seconds, on_output=_progress_reporter(ctx))
+    run = benchmark_check.parse_benchmark_output(stdout)
+    if not run["cases"]:
+        return f"Benchmark run failed:\n{stderr.strip()[-2000:] or stdout[-2000:]}"
+    warning = "" if success else f"\nWarning: {stderr.strip()[-500:] or 'run did not exit cleanly'}"
+    
+    if update_baseline:
+        baseline = benchmark_check.write_baseline(run)
+        return (f"Recorded {len(run['cases'])} case(s) in {benchmark_check.BASELINE_FILE.relative_to(PROJECT_ROOT)} "
+                f"({len(baseline['cases'])} total, Godot {run['godot_version']}){warning}")
+    
+    baseline, error = benchmark_check.load_baseline()
+    if error:
+        return error
+    if baseline is None:
+        lines = [f"{name}: median {result['median_usec']:.0f} us ({result['usec_per_op']:.2f} us/op)"
+                 for name, result in run["cases"].items()]
+        return "No baseline recorded yet; run with update_baseline=True to record one.\n" + "\n".join(lines) + warning
+    comparisons = benchmark_check.compare_runs(baseline, run, threshold)
+    return benchmark_check.format_comparison(comparisons, threshold) + warning
 
 
 @mcp.tool()
@@ -583,11 +1291,22 @@ async def get_project_structure() -> str:
 @mcp.tool()
 async def cleanup_processes() -> str:
     """
-    Manually trigger cleanup of any lingering Godot processes.
-    This is useful if processes were left running from previous operations.
+    Manually trigger cleanup of Godot processes started by this server, including warm workers.
+    Godot instances started elsewhere are left alone; use ./cleanup_godot.sh for a host-wide sweep.
     """
     cleanup_godot_processes()
-    return "Cleanup completed. Any lingering Godot processes have been terminated."
+    return "Cleanup completed. Godot processes started by this server have been terminated."
+
+
+@mcp.tool()
+async def worker_pool_status() -> str:
+    """
+    Show the warm Godot worker pool: configured size, live and idle workers, and jobs per worker.
+    """
+    pool = get_worker_pool()
+    if pool is None:
+        return "Worker pool disabled (GODOT_WORKER_POOL_SIZE=0)"
+    return json.dumps(pool.status(), indent=2)
 
 
 @mcp.tool()
@@ -602,8 +1321,7 @@ async def validate_battle_rules() -> str:
         return f"Battle rules file not found at {rules_file}"
 
     try:
-        with open(rules_file, "r", encoding="utf-8") as handle:
-            raw_rules = json.load(handle)
+        raw_rules = data_store.json(rules_file)
     except Exception as exc:
         return f"Failed to load battle rules: {exc}"
 
@@ -643,6 +1361,40 @@ async def validate_battle_rules() -> str:
     return "\n".join(validation_results)
 
 
+@mcp.tool()
+async def validate_game_data(max_issues: int = 100, include_warnings: bool = True) -> str:
+    """
+    Validate all game data files and the references between them.
+    
+    Checks battle rules and encounter modifiers against data/battle_rules.schema.json,
+    encounter waves against unit template ids, unit template skills against the skills
+    UnitFactory can create, encounter links against encounter ids, and warns about rule
+    conditions on context properties no caller ever provides. Each issue is reported with
+    its file and JSON path. Only files changed since the previous call are re-read.
+    
+    Args:
+        max_issues: Maximum number of issues to list
+        include_warnings: Also list warnings (unreachable rule conditions)
+    """
+    rules_file = resolve_res_path(get_project_setting("game", "battle_rules_path", "res://data/battle_rules.json"))
+    try:
+        rules_relative = rules_file.relative_to(PROJECT_ROOT).as_posix()
+    except ValueError:
+        return f"Battle rules file {rules_file} is outside the project"
+    
+    report = await asyncio.to_thread(data_validator.validate, rules_relative)
+    issues = report["errors"] + (report["warnings"] if include_warnings else [])
+    
+    lines = [
+        f"{len(report['errors'])} errors, {len(report['warnings'])} warnings in {report['files']} files "
+        f"({len(set(report['reparsed']))} re-read since the last check)"
+    ]
+    lines.extend(format_issue(issue) for issue in issues[:max(0, max_issues)])
+    if len(issues) > max_issues:
+        lines.append(f"... {len(issues) - max_issues} more")
+    return "\n".join(lines)
+
+
 if __name__ == "__main__":
     # Check if we're in the right directory
     if not GODOT_PROJECT_FILE.exists():
@@ -6,6 +6,40 @@ echo "Running Godot unit tests..."
 LOG_DIR="${LOG_DIR:-$(pwd)/.godot_logs}"
 mkdir -p "$LOG_DIR"
 
+# Usage: ./run_tests.sh [-j N | --shards N] [--full] [-gtest=res://tests/...gd] [-gselect=text]
+# With more than one shard the test scripts run in parallel Godot processes
+# (see gut_shard_runner.py); merged reports are written to $LOG_DIR. The sharded
+# runner skips scripts whose dependencies are unchanged since they last passed;
+# --full runs them all.
+SHARDS="${GUT_SHARDS:-1}"
+RUNNER_ARGS=()
+GUT_ARGS=()
+while [ $# -gt 0 ]; do
+    case "$1" in
+        -j|--shards)
+            SHARDS="$2"
+            shift 2
+            ;;
+        -j*)
+            SHARDS="${1#-j}"
+            shift
+            ;;
+        --full)
+            RUNNER_ARGS+=("$1")
+            shift
+            ;;
+        *)
+            GUT_ARGS+=("$1")
+            shift
+            ;;
+    esac
+done
+
+if [ "$SHARDS" -gt 1 ]; then
+    # The sharded runner only terminates its own process groups, so skip the global cleanup below
+    exec python3 "$(dirname "$0")/gut_shard_runner.py" --shards "$SHARDS" --output-dir "$LOG_DIR" "${RUNNER_ARGS[@]}" "${GUT_ARGS[@]}"
+fi
+
 # Function to cleanup on exit
 cleanup() {
     echo "Cleaning up Godot processes..."
@@ -28,7 +62,7 @@ fi
 # Run tests using GUT command line with additional flags
 # Note: macOS doesn't have timeout by default, so we'll use a background process
 # --quit-after 1 ensures Godot exits after one frame when tests complete
-godot --headless --log-file "$LOG_DIR/godot-test.log" --quit-after 1 -s res://addons/gut/gut_cmdln.gd -gdir=res://tests -gexit &
+godot --headless --log-file "$LOG_DIR/godot-test.log" --quit-after 1 -s res://addons/gut/gut_cmdln.gd -gdir=res://tests -gexit "${GUT_ARGS[@]}" &
 GODOT_PID=$!
 
 # Wait for process or timeout
@@ -105,10 +105,6 @@ func create_test_unit(unit_name: String, resources: Dictionary) -> Node:
 	for resource in resources:
 		unit.stats[resource] = resources[resource]
 	
-	# Initialize projectors
-	for stat_name in unit.stats:
-		unit.stat_projectors[stat_name] = load("res://src/skills/stat_projector.gd").new()
-	
 	# Initialize other required properties
 	unit.skills = []
 	unit.status_effects = []
@@ -2,6 +2,8 @@ class_name AutoBattler
 extends Node2D
 
 const UnitVisual = preload("res://src/shared/unit_visual.gd")
+const StatProjector = preload("res://src/skills/stat_projector.gd")
+const BattleReplay = preload("res://src/battle/battle_replay.gd")
 
 signal battle_started
 signal battle_ended(winner_team: int)
@@ -15,9 +17,20 @@ signal action_performed(unit: BattleUnit, action: Dictionary)
 @export var max_rounds: int = 100
 # Feature flag for new system
 @export var use_observer_system: bool = false
+# Run the turn loop without scene timers or unit visuals, as fast as possible
+@export var headless: bool = false
+# Seed for the battle RNG; negative picks a random seed per battle
+@export var battle_seed: int = -1
+# Record a BattleReplay of each battle into `replay`. Playback is simulated, so
+# record headless battles or ones driven by battle_clock.
+@export var record_replay: bool = false
+# Rounds between replay checkpoints; seeking replays from the nearest one
+@export var replay_checkpoint_interval: int = BattleReplay.DEFAULT_CHECKPOINT_INTERVAL
 
 var team1: Array[BattleUnit] = []
 var team2: Array[BattleUnit] = []
+# Alive units of team1 (key 1) and team2 (key 2)
+var roster: BattleRoster = BattleRoster.new()
 
 var is_battle_active: bool = false
 var current_round: int = 0
@@ -26,6 +39,25 @@ var active_unit: BattleUnit = null
 
 var rule_processor
 var battle_context: Dictionary = {}
+var winner: int = -1
+var rng: RandomNumberGenerator = RandomNumberGenerator.new()
+
+var _ai: BattleAI = BattleAI.new()
+var _simulated_time: float = 0.0
+
+# Replay of the current or last battle when record_replay is set
+var replay: BattleReplay = null
+# When positive, the turn loop stops before this round starts; resume_battle()
+# continues from there
+var pause_at_round: int = -1
+var is_paused: bool = false
+
+# Clock used for modifier and status expiry. Defaults to wall-clock unix time;
+# assign a Callable returning seconds to drive expiry from a simulated clock.
+var battle_clock: Callable = Callable()
+# Simulated time a headless battle starts at. Multi-wave runs pass the previous
+# wave's end time so cooldowns and expiry carry over on one continuous clock.
+var simulated_start_time: float = 0.0
 
 # New observer system components
 var skill_observer = null  # SkillActivationObserver
@@ -45,36 +77,114 @@ func start_battle(_team1: Array[BattleUnit], _team2: Array[BattleUnit]) -> void:
         push_error("Battle already in progress")
         return
     
+    _prepare_battle(_team1, _team2)
+    
+    if battle_seed >= 0:
+        rng.seed = battle_seed
+    else:
+        rng.randomize()
+    _ai.rng = rng
+    _simulated_time = simulated_start_time
+    winner = -1
+    
+    if record_replay:
+        if not headless and not battle_clock.is_valid():
+            push_warning("AutoBattler: recording a replay on the wall clock; playback is simulated and may diverge. Record headless or assign battle_clock.")
+        replay = BattleReplay.new()
+        replay.checkpoint_interval = replay_checkpoint_interval
+        replay.begin(team1, team2, rng.seed, rule_processor, max_rounds, get_battle_time())
+    
+    is_battle_active = true
+    current_round = 0
+    if BattleProfiler.enabled:
+        BattleProfiler.begin_battle()
+    battle_started.emit()
+    
+    if use_observer_system and not headless:
+        _start_observer_battle()
+    else:
+        _run_battle_loop()
+
+# Continues a battle from a replay checkpoint: units must already be in the
+# checkpoint's state (see BattleReplay.build_unit). Runs the turn loop like
+# start_battle, beginning with the checkpoint's round.
+func restore_battle(_team1: Array[BattleUnit], _team2: Array[BattleUnit], checkpoint: Dictionary) -> void:
+    if is_battle_active:
+        push_error("Battle already in progress")
+        return
+    
+    _prepare_battle(_team1, _team2)
+    
+    _ai.rng = rng
+    rng.state = checkpoint.rng_state
+    _simulated_time = checkpoint.time
+    winner = -1
+    if record_replay:
+        replay = BattleReplay.new()
+        replay.checkpoint_interval = replay_checkpoint_interval
+        replay.begin(team1, team2, battle_seed, rule_processor, max_rounds, get_battle_time())
+    
+    is_battle_active = true
+    current_round = checkpoint.round - 1
+    if BattleProfiler.enabled:
+        BattleProfiler.begin_battle()
+    _run_rounds()
+
+# Continues a battle stopped by pause_at_round
+func resume_battle() -> void:
+    if not is_paused:
+        return
+    is_paused = false
+    pause_at_round = -1
+    _run_rounds()
+
+func _prepare_battle(_team1: Array[BattleUnit], _team2: Array[BattleUnit]) -> void:
     team1 = _team1
     team2 = _team2
+    is_paused = false
     
     # Add units to scene tree and create visuals
     for i in range(team1.size()):
         var unit = team1[i]
-        add_child(unit)
-        _setup_unit_visual(unit)
+        # Units kept from the previous wave are already children
+        if unit.get_parent() != self:
+            add_child(unit)
+        if not headless:
+            _setup_unit_visual(unit)
         # Position team1 units on the left
         unit.position = Vector2(100, 100 + i * 120)
         
     for i in range(team2.size()):
         var unit = team2[i]
-        add_child(unit)
-        _setup_unit_visual(unit)
+        # Units kept from the previous wave are already children
+        if unit.get_parent() != self:
+            add_child(unit)
+        if not headless:
+            _setup_unit_visual(unit)
         # Position team2 units on the right
         unit.position = Vector2(700, 100 + i * 120)
     
+    # Registered before _on_unit_died so the counts are current when it runs
+    roster.clear()
+    for unit in team1:
+        roster.add_unit(unit, 1)
+    for unit in team2:
+        roster.add_unit(unit, 2)
+    
     for unit in team1 + team2:
         unit.unit_died.connect(_on_unit_died.bind(unit))
-    
-    is_battle_active = true
-    current_round = 0
-    battle_started.emit()
-    
-    if use_observer_system:
-        _start_observer_battle()
-    else:
-        await get_tree().create_timer(0.1).timeout
-        _start_round()
+        unit.clock = get_battle_time
+        for skill in unit.skills:
+            skill.clock = get_battle_time
+
+# Runs a whole battle without scene timers or visuals and returns the winning
+# team (0 when max_rounds is reached). The same seed and teams always produce
+# the same result and signal sequence.
+func simulate_battle(_team1: Array[BattleUnit], _team2: Array[BattleUnit], _seed: int) -> int:
+    headless = true
+    battle_seed = _seed
+    start_battle(_team1, _team2)
+    return winner
 
 func _setup_unit_visual(unit: BattleUnit) -> void:
     if not is_instance_valid(unit):
@@ -86,98 +196,110 @@ func _setup_unit_visual(unit: BattleUnit) -> void:
         visual = UnitVisual.new()
         visual.name = "UnitVisual"
         unit.add_child(visual)
+    # Visuals of pooled units were released along with them
+    if visual.battle_unit != unit:
         visual.setup(unit)
 
-func _start_round() -> void:
-    if not is_battle_active:
+# Waits on a scene timer, or only advances the simulated clock when headless
+func _pause(seconds: float) -> void:
+    if headless:
+        _simulated_time += seconds
         return
+    await get_tree().create_timer(seconds).timeout
+
+func _run_battle_loop() -> void:
+    await _pause(0.1)
+    await _run_rounds()
+
+func _run_rounds() -> void:
+    while is_battle_active:
+        if pause_at_round > 0 and current_round + 1 >= pause_at_round:
+            is_paused = true
+            return
+        if not _start_round():
+            return
+        await _pause(0.1)
+        
+        while is_battle_active and not turn_queue.is_empty():
+            var turn_data = turn_queue.pop_front()
+            active_unit = turn_data.unit
+            if not is_instance_valid(active_unit) or not active_unit.is_alive():
+                continue
+            await _process_turn(active_unit)
+        
+        if not is_battle_active:
+            return
+        
+        round_ended.emit(current_round)
+        if _check_battle_end():
+            return
+        await _pause(0.2)
+
+func _start_round() -> bool:
+    if not is_battle_active:
+        return false
     
     current_round += 1
     
     if current_round > max_rounds:
         _end_battle(0)
-        return
+        return false
+    
+    if BattleProfiler.enabled:
+        BattleProfiler.mark_round(current_round)
+    
+    # Taken before any randomness of the round so playback can start here
+    if replay and (current_round - 1) % maxi(replay.checkpoint_interval, 1) == 0:
+        replay.record_checkpoint(current_round, rng, get_battle_time(), team1 + team2)
     
     round_started.emit(current_round)
     
     turn_queue.clear()
     for unit in team1 + team2:
         if is_instance_valid(unit) and unit.is_alive():
-            var initiative = unit.roll_initiative()
+            var initiative = unit.roll_initiative(rng)
             turn_queue.append({"unit": unit, "initiative": initiative})
     
     turn_queue.sort_custom(_sort_by_initiative)
-    
-    await get_tree().create_timer(0.1).timeout
-    _process_next_turn()
+    return true
 
 func _sort_by_initiative(a: Dictionary, b: Dictionary) -> bool:
     return a.initiative > b.initiative
 
-func _process_next_turn() -> void:
-    if not is_battle_active:
-        return
-    
-    if turn_queue.is_empty():
-        round_ended.emit(current_round)
-        if _check_battle_end():
-            return
-        await get_tree().create_timer(0.2).timeout
-        _start_round()
-        return
-    
-    var turn_data = turn_queue.pop_front()
-    active_unit = turn_data.unit
-    
-    if not is_instance_valid(active_unit) or not active_unit.is_alive():
-        _process_next_turn()
-        return
-    
-    turn_started.emit(active_unit)
+func _process_turn(unit: BattleUnit) -> void:
+    turn_started.emit(unit)
     
-    _process_status_effects(active_unit)
+    _process_status_effects(unit)
     
-    if not is_instance_valid(active_unit) or not active_unit.is_alive():
-        turn_ended.emit(active_unit)
-        await get_tree().create_timer(turn_delay).timeout
-        _process_next_turn()
-        return
-    
-    var allies = _get_allies(active_unit)
-    var enemies = _get_enemies(active_unit)
-    
-    if enemies.is_empty():
-        turn_ended.emit(active_unit)
-        await get_tree().create_timer(turn_delay).timeout
-        _process_next_turn()
-        return
-    
-    var ai = BattleAI.new()
-    var action = ai.choose_action(active_unit, allies, enemies)
-    
-    if action.has("skill") and action.skill != null:
-        await _execute_skill(active_unit, action.skill, action.target)
-    elif action.has("type") and action.type == "defend":
-        await _execute_defend(active_unit)
-    else:
-        await _execute_basic_attack(active_unit, action.target)
-    
-    turn_ended.emit(active_unit)
-    
-    await get_tree().create_timer(turn_delay).timeout
-    _process_next_turn()
+    if is_instance_valid(unit) and unit.is_alive():
+        var allies = _get_allies(unit)
+        var enemies = _get_enemies(unit)
+        
+        if not enemies.is_empty():
+            var action = _ai.choose_action(unit, allies, enemies)
+            if replay:
+                replay.record_decision(current_round, unit, action)
+            
+            if action.has("skill") and action.skill != null:
+                await _execute_skill(unit, action.skill, action.target)
+            elif action.has("type") and action.type == "defend":
+                await _execute_defend(unit)
+            else:
+                await _execute_basic_attack(unit, action.target)
+    
+    turn_ended.emit(unit)
+    
+    await _pause(turn_delay)
 
 func _get_allies(unit: BattleUnit) -> Array[BattleUnit]:
-    if team1.has(unit):
-        return team1.filter(func(u): return is_instance_valid(u) and u.is_alive())
-    else:
-        return team2.filter(func(u): return is_instance_valid(u) and u.is_alive())
+    return roster.get_allies(_side_of(unit))
 
 func _get_enemies(unit: BattleUnit) -> Array[BattleUnit]:
-    if team1.has(unit):
-        return team2.filter(func(u): return is_instance_valid(u) and u.is_alive())
-    else:
-        return team1.filter(func(u): return is_instance_valid(u) and u.is_alive())
+    return roster.get_enemies(_side_of(unit))
+
+func _side_of(unit: BattleUnit) -> int:
+    var side = roster.team_of(unit)
+    return side if side != -1 else 2
 
 func _execute_skill(caster: BattleUnit, skill: BattleSkill, target) -> void:
     action_performed.emit(caster, {"type": "skill", "skill": skill, "target": target})
@@ -191,7 +313,7 @@ func _execute_skill(caster: BattleUnit, skill: BattleSkill, target) -> void:
             if t is BattleUnit and is_instance_valid(t) and t.is_alive():
                 skill.execute_on_target(caster, t, rule_processor)
     
-    await get_tree().create_timer(0.3).timeout
+    await _pause(0.3)
 
 func _execute_basic_attack(attacker: BattleUnit, target: BattleUnit) -> void:
     if not is_instance_valid(target) or not target.is_alive():
@@ -199,32 +321,37 @@ func _execute_basic_attack(attacker: BattleUnit, target: BattleUnit) -> void:
     
     action_performed.emit(attacker, {"type": "attack", "target": target})
     
-    var damage = attacker.get_projected_stat("attack")
+    var damage = attacker.get_projected_stat(BattleUnit.STAT_ATTACK)
     target.take_damage(damage)
     
-    await get_tree().create_timer(0.2).timeout
+    await _pause(0.2)
 
 func _execute_defend(unit: BattleUnit) -> void:
     action_performed.emit(unit, {"type": "defend"})
     
-    var StatProjector = load("res://src/skills/stat_projector.gd")
     var defense_mod = StatProjector.StatModifier.new(
         "defend_action",
-        StatProjector.StatModifier.Op.MUL,
+        StatProjector.ModifierOp.MUL,
         1.5,
         50,
         ["defense"],
-        Time.get_unix_time_from_system() + 1.0
+        get_battle_time() + 1.0
     )
-    unit.stat_projectors["defense"].add_modifier(defense_mod)
+    unit.get_stat_projector("defense").add_modifier(defense_mod)
     
-    await get_tree().create_timer(0.2).timeout
+    await _pause(0.2)
+
+func get_battle_time() -> float:
+    if battle_clock.is_valid():
+        return battle_clock.call()
+    if headless:
+        return _simulated_time
+    return Time.get_unix_time_from_system()
 
 func _process_status_effects(unit: BattleUnit) -> void:
-    var now = Time.get_unix_time_from_system()
+    var now = get_battle_time()
     
-    for projector in unit.stat_projectors.values():
-        projector.prune_expired(now)
+    unit.prune_expired_modifiers(now)
     
     var to_remove: Array[StatusEffect] = []
     for status in unit.status_effects:
@@ -237,23 +364,45 @@ func _process_status_effects(unit: BattleUnit) -> void:
         unit.remove_status_effect(status)
 
 func _check_battle_end() -> bool:
-    var team1_alive_count = team1.filter(func(u): return is_instance_valid(u) and u.is_alive()).size()
-    var team2_alive_count = team2.filter(func(u): return is_instance_valid(u) and u.is_alive()).size()
+    var team1_alive_count = roster.alive_count(1)
+    var team2_alive_count = roster.alive_count(2)
     
     if team1_alive_count == 0 or team2_alive_count == 0:
-        var winner = 1 if team1_alive_count > 0 else 2
-        _end_battle(winner)
+        _end_battle(1 if team1_alive_count > 0 else 2)
         return true
     
     return false
 
 func _end_battle(winner_team: int) -> void:
     is_battle_active = false
+    winner = winner_team
+    if replay:
+        replay.finish(winner_team, current_round)
+    if BattleProfiler.enabled:
+        BattleProfiler.end_battle()
     battle_ended.emit(winner_team)
     
     for unit in team1 + team2:
-        if unit.unit_died.is_connected(_on_unit_died):
-            unit.unit_died.disconnect(_on_unit_died)
+        if unit.unit_died.is_connected(_on_unit_died.bind(unit)):
+            unit.unit_died.disconnect(_on_unit_died.bind(unit))
+
+# Takes units of a finished battle out of the battler, e.g. to return them to
+# a BattleUnitPool between waves
+func detach_units(units: Array[BattleUnit]) -> void:
+    if is_battle_active:
+        push_error("Cannot detach units during a battle")
+        return
+    
+    turn_queue.clear()
+    active_unit = null
+    for unit in units.duplicate():
+        roster.remove_unit(unit)
+        if is_instance_valid(unit) and unit.unit_died.is_connected(_on_unit_died.bind(unit)):
+            unit.unit_died.disconnect(_on_unit_died.bind(unit))
+        team1.erase(unit)
+        team2.erase(unit)
+        if is_instance_valid(unit) and unit.get_parent() == self:
+            remove_child(unit)
 
 func _on_unit_died(unit: BattleUnit) -> void:
     if _check_battle_end():
@@ -264,6 +413,8 @@ func _setup_observer_system() -> void:
     skill_observer = SkillActivationObserver.new()
     skill_observer.name = "SkillObserver"
     add_child(skill_observer)
+    # Schedule actions on the battle's clock, so headless battles run on simulated time
+    skill_observer.action_queue.battle_clock = get_battle_time
     
     observer_battle_context = BattleContext.new()
     observer_battle_context.rule_processor = rule_processor
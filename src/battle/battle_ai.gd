@@ -14,6 +14,9 @@ enum AIType {
 @export var target_lowest_health: float = 0.6
 @export var heal_threshold: float = 0.5
 
+# Optional seeded generator; falls back to the global RNG when unset
+var rng: RandomNumberGenerator = null
+
 func choose_action(unit: BattleUnit, allies: Array[BattleUnit], enemies: Array[BattleUnit]) -> Dictionary:
     var valid_enemies = enemies.filter(func(u): return u.is_alive())
     var valid_allies = allies.filter(func(u): return u.is_alive())
@@ -23,7 +26,7 @@ func choose_action(unit: BattleUnit, allies: Array[BattleUnit], enemies: Array[B
     
     var available_skills = _get_available_skills(unit)
     
-    if available_skills.is_empty() or randf() > skill_preference:
+    if available_skills.is_empty() or _randf() > skill_preference:
         return {
             "type": "attack",
             "target": _choose_target(valid_enemies, unit)
@@ -44,7 +47,7 @@ func _choose_skill_action(unit: BattleUnit, skills: Array[BattleSkill], enemies:
     var best_score = -INF
     
     for skill in skills:
-        var targets = skill.get_targets(unit, allies, enemies)
+        var targets = skill.get_targets(unit, allies, enemies, rng)
         if targets.is_empty():
             continue
         
@@ -121,29 +124,42 @@ func _choose_target(enemies: Array[BattleUnit], unit: BattleUnit) -> BattleUnit:
     
     match ai_type:
         AIType.AGGRESSIVE:
-            if randf() < target_lowest_health:
+            if _randf() < target_lowest_health:
                 enemies.sort_custom(func(a, b): return a.stats.health < b.stats.health)
             else:
-                enemies.sort_custom(func(a, b): return a.get_projected_stat("attack") > b.get_projected_stat("attack"))
+                enemies.sort_custom(func(a, b): return a.get_projected_stat(BattleUnit.STAT_ATTACK) > b.get_projected_stat(BattleUnit.STAT_ATTACK))
         
         AIType.DEFENSIVE:
-            enemies.sort_custom(func(a, b): return a.get_projected_stat("attack") > b.get_projected_stat("attack"))
+            enemies.sort_custom(func(a, b): return a.get_projected_stat(BattleUnit.STAT_ATTACK) > b.get_projected_stat(BattleUnit.STAT_ATTACK))
         
         AIType.BALANCED:
-            if randf() < 0.5:
+            if _randf() < 0.5:
                 enemies.sort_custom(func(a, b): return a.stats.health < b.stats.health)
             else:
                 enemies.sort_custom(func(a, b): return _threat_score(a) > _threat_score(b))
         
         AIType.RANDOM:
-            enemies.shuffle()
+            _shuffle(enemies)
     
     return enemies[0]
 
+func _randf() -> float:
+    return rng.randf() if rng else randf()
+
+func _shuffle(array: Array) -> void:
+    if not rng:
+        array.shuffle()
+        return
+    for i in range(array.size() - 1, 0, -1):
+        var j = rng.randi_range(0, i)
+        var tmp = array[i]
+        array[i] = array[j]
+        array[j] = tmp
+
 func _threat_score(unit: BattleUnit) -> float:
-    var attack = unit.get_projected_stat("attack")
+    var attack = unit.get_projected_stat(BattleUnit.STAT_ATTACK)
     var health_percent = unit.get_health_percentage()
-    var speed = unit.get_projected_stat("speed")
+    var speed = unit.get_projected_stat(BattleUnit.STAT_SPEED)
     
     return attack * (1.0 + health_percent) * (1.0 + speed * 0.1)
 
@@ -16,12 +16,31 @@ var environmental_effects: Dictionary = {}
 # References
 var rule_processor = null
 
-# Cached computations (invalidated on update)
-var _cache_valid: bool = false
+# Debug: rebuild the team aggregates from scratch on every update and report drift
+var verify_aggregates_on_update: bool = false
+
+# Team aggregates are maintained incrementally. Each tracked unit's last
+# contribution is kept, and unit signals swap it for a fresh one, so the team sums
+# change by deltas instead of being recomputed every evaluation tick.
+const TRACKED_STATS = ["health", "max_health", "attack", "defense", "speed"]
+const ROLES = ["healer", "tank"]
+
+var _contributions: Dictionary = {}  # BattleUnit -> last contribution
+var _team_totals: Dictionary = {}  # team -> running sums
+var _synced_units: Array[BattleUnit] = []
+var _synced_size: int = 0
+
+# Derived state, rebuilt from the totals when they change
+var _derived_valid: bool = false
 var _team_states: Dictionary = {}
+var _enemy_team_states: Dictionary = {}
 var _battle_phase: String = ""
 var _team_advantages: Dictionary = {}
 
+# Alive units per team (by unit.team), shared with anything targeting from this context
+var roster: BattleRoster = BattleRoster.new()
+var _unit_contexts: Dictionary = {}
+
 func _init() -> void:
 	battle_start_time = Time.get_unix_time_from_system()
 
@@ -29,86 +48,119 @@ func update_state(units: Array[BattleUnit], casts: Array[SkillCast], history: Ar
 	all_units = units
 	active_casts = casts
 	skill_history = history
-	_cache_valid = false
+	_sync_units()
+	if verify_aggregates_on_update:
+		verify_aggregates()
 
+# Returns the evaluation context for a unit. The dictionary is owned by the
+# context and refilled in place on every call for the same unit, so it aliases
+# earlier results: callers must not write into it or any of its values
+# ("allies", "enemies", "team_state", "skill_history" are the context's live
+# state). duplicate() it to add or override entries.
 func get_unit_context(unit: BattleUnit) -> Dictionary:
-	if not _cache_valid:
-		_rebuild_cache()
+	_ensure_current()
 	
-	var allies = all_units.filter(func(u): return u.team == unit.team and u.is_alive())
-	var enemies = all_units.filter(func(u): return u.team != unit.team and u.is_alive())
-	
-	return {
-		"unit": unit,
-		"allies": allies,
-		"enemies": enemies,
-		"team_state": _team_states.get(unit.team, {}),
-		"enemy_team_state": _get_enemy_team_state(unit.team),
-		"battle_phase": _battle_phase,
-		"battle_time": get_battle_elapsed_time(),
-		"round": current_round,
-		"encounter_id": encounter_id,
-		"encounter_modifiers": encounter_modifiers,
-		"environmental_effects": environmental_effects,
-		"rule_processor": rule_processor,
-		"active_casts": _get_relevant_casts(unit),
-		"recent_skills": _get_recent_skills(5),
-		"team_advantage": _team_advantages.get(unit.team, 0.0)
-	}
+	var context: Dictionary = _unit_contexts.get(unit, {})
+	if context.is_empty():
+		_unit_contexts[unit] = context
+	context["unit"] = unit
+	context["allies"] = get_alive_allies(unit.team)
+	context["enemies"] = get_alive_enemies(unit.team)
+	context["team_state"] = _team_states.get(unit.team, {})
+	context["enemy_team_state"] = _get_enemy_team_state(unit.team)
+	context["battle_phase"] = _calculate_battle_phase()
+	context["battle_time"] = get_battle_elapsed_time()
+	context["round"] = current_round
+	context["encounter_id"] = encounter_id
+	context["encounter_modifiers"] = encounter_modifiers
+	context["environmental_effects"] = environmental_effects
+	context["rule_processor"] = rule_processor
+	context["active_casts"] = _get_relevant_casts(unit)
+	context["recent_skills"] = _get_recent_skills(5)
+	context["skill_history"] = skill_history
+	context["team_advantage"] = _team_advantages.get(unit.team, 0.0)
+	return context
+
+func get_alive_allies(team: int) -> Array[BattleUnit]:
+	_ensure_synced()
+	return roster.get_allies(team)
+
+func get_alive_enemies(team: int) -> Array[BattleUnit]:
+	_ensure_synced()
+	return roster.get_enemies(team)
 
 func get_battle_elapsed_time() -> float:
 	return Time.get_unix_time_from_system() - battle_start_time
 
 func get_battle_phase() -> String:
-	if not _cache_valid:
-		_rebuild_cache()
-	return _battle_phase
+	_ensure_current()
+	return _calculate_battle_phase()
 
 func get_team_state(team: int) -> Dictionary:
-	if not _cache_valid:
-		_rebuild_cache()
+	_ensure_current()
 	return _team_states.get(team, {})
 
 func add_environmental_effect(effect_id: String, effect_data: Dictionary) -> void:
 	environmental_effects[effect_id] = effect_data
-	_cache_valid = false
 
 func remove_environmental_effect(effect_id: String) -> void:
 	environmental_effects.erase(effect_id)
-	_cache_valid = false
 
 # Analysis methods
 func count_units_with_status(status: String, team: int = -1) -> int:
+	_ensure_synced()
 	var count = 0
-	for unit in all_units:
-		if unit.is_alive() and (team == -1 or unit.team == team):
-			if unit.has_status(status):
-				count += 1
+	for totals_team in _team_totals:
+		if team == -1 or totals_team == team:
+			count += _team_totals[totals_team].status_units.get(status, 0)
 	return count
 
 func get_average_health_percentage(team: int = -1) -> float:
+	_ensure_synced()
 	var total_health_percent = 0.0
 	var unit_count = 0
 	
-	for unit in all_units:
-		if unit.is_alive() and (team == -1 or unit.team == team):
-			total_health_percent += unit.get_health_percentage()
-			unit_count += 1
+	for totals_team in _team_totals:
+		if team == -1 or totals_team == team:
+			total_health_percent += _team_totals[totals_team].health_percent
+			unit_count += _team_totals[totals_team].unit_count
 	
 	return total_health_percent / max(1, unit_count)
 
 func get_team_dps_estimate(team: int) -> float:
-	var total_dps = 0.0
+	_ensure_synced()
+	if not _team_totals.has(team):
+		return 0.0
+	return _team_totals[team].dps
+
+# Rebuilds every team aggregate from scratch and compares it with the
+# incrementally maintained one. Returns false (and reports each drifted value)
+# on mismatch. Meant for debugging; the battle loop never needs it.
+func verify_aggregates() -> bool:
+	_ensure_current()
+	var expected = _calculate_team_states()
+	var consistent = true
 	
-	for unit in all_units:
-		if unit.team == team and unit.is_alive():
-			var attack = unit.get_projected_stat("attack")
-			var speed = unit.get_projected_stat("speed")
-			# Rough DPS estimate
-			var attacks_per_second = speed / 10.0  # Assuming base attack rate
-			total_dps += attack * attacks_per_second
+	var teams = {}
+	for team in expected:
+		teams[team] = true
+	for team in _team_states:
+		if _team_states[team].unit_count > 0:
+			teams[team] = true
 	
-	return total_dps
+	for team in teams:
+		var want: Dictionary = expected.get(team, {})
+		var have: Dictionary = _team_states.get(team, {})
+		for key in want:
+			var matches: bool
+			if typeof(want[key]) == TYPE_FLOAT:
+				matches = abs(float(have.get(key, 0.0)) - want[key]) <= 0.001 * max(1.0, abs(want[key]))
+			else:
+				matches = have.get(key) == want[key]
+			if not matches:
+				push_error("BattleContext aggregate drift: team %d %s is %s, expected %s" % [team, key, str(have.get(key)), str(want[key])])
+				consistent = false
+	return consistent
 
 func find_combo_opportunities() -> Array[Dictionary]:
 	var opportunities: Array[Dictionary] = []
@@ -141,18 +193,189 @@ func find_combo_opportunities() -> Array[Dictionary]:
 	return opportunities
 
 # Private methods
-func _rebuild_cache() -> void:
-	_calculate_team_states()
-	_calculate_battle_phase()
-	_calculate_team_advantages()
-	_cache_valid = true
+func _ensure_synced() -> void:
+	# all_units may have been reassigned, or edited in place (the observer shares its roster)
+	if not is_same(all_units, _synced_units) or all_units.size() != _synced_size:
+		_sync_units()
+
+func _ensure_current() -> void:
+	_ensure_synced()
+	if not _derived_valid:
+		_rebuild_derived()
+
+func _sync_units() -> void:
+	var seen = {}
+	for unit in all_units:
+		if not is_instance_valid(unit) or seen.has(unit):
+			continue
+		seen[unit] = true
+		if not _contributions.has(unit):
+			_track_unit(unit)
+			continue
+		# Direct writes to health, team or the skill list emit no signal
+		var contribution: Dictionary = _contributions[unit]
+		if contribution.health != unit.stats.get("health", 0.0) or contribution.team != unit.team or contribution.skill_count != unit.skills.size():
+			_refresh_unit(unit)
+	
+	for unit in _contributions.keys():
+		if not seen.has(unit):
+			_untrack_unit(unit)
+	
+	_synced_units = all_units
+	_synced_size = all_units.size()
+
+func _track_unit(unit: BattleUnit) -> void:
+	var contribution = _contribution_of(unit)
+	_contributions[unit] = contribution
+	_apply_contribution(contribution, 1)
+	roster.add_unit(unit)
+	unit.stat_changed.connect(_on_unit_stat_changed.bind(unit))
+	unit.status_applied.connect(_on_unit_status_changed.bind(unit))
+	unit.status_removed.connect(_on_unit_status_changed.bind(unit))
+	unit.unit_died.connect(_on_unit_died.bind(unit))
+	unit.released.connect(_on_unit_released.bind(unit))
+	_derived_valid = false
+
+func _untrack_unit(unit) -> void:
+	_apply_contribution(_contributions[unit], -1)
+	_contributions.erase(unit)
+	_unit_contexts.erase(unit)
+	roster.remove_unit(unit)
+	# A unit reset for pooling has already dropped its connections
+	if is_instance_valid(unit) and unit.unit_died.is_connected(_on_unit_died.bind(unit)):
+		unit.stat_changed.disconnect(_on_unit_stat_changed.bind(unit))
+		unit.status_applied.disconnect(_on_unit_status_changed.bind(unit))
+		unit.status_removed.disconnect(_on_unit_status_changed.bind(unit))
+		unit.unit_died.disconnect(_on_unit_died.bind(unit))
+		unit.released.disconnect(_on_unit_released.bind(unit))
+	_derived_valid = false
+
+func _refresh_unit(unit: BattleUnit) -> void:
+	var previous: Dictionary = _contributions[unit]
+	var contribution = _contribution_of(unit)
+	_apply_contribution(previous, -1)
+	_apply_contribution(contribution, 1)
+	_contributions[unit] = contribution
+	if previous.team != contribution.team:
+		roster.add_unit(unit)
+	_derived_valid = false
+
+func _on_unit_stat_changed(stat_name: String, _new_value: float, unit: BattleUnit) -> void:
+	if stat_name in TRACKED_STATS and _contributions.has(unit):
+		_refresh_unit(unit)
+
+func _on_unit_status_changed(_status: StatusEffect, unit: BattleUnit) -> void:
+	if _contributions.has(unit):
+		_refresh_unit(unit)
+
+func _on_unit_died(unit: BattleUnit) -> void:
+	if _contributions.has(unit):
+		_refresh_unit(unit)
 
-func _calculate_team_states() -> void:
+# The unit goes back to its pool; if all_units still lists it, the next sync
+# tracks it again in its reset state
+func _on_unit_released(unit: BattleUnit) -> void:
+	if _contributions.has(unit):
+		_untrack_unit(unit)
+		_synced_size = -1
+
+func _contribution_of(unit: BattleUnit) -> Dictionary:
+	var contribution = {
+		"team": unit.team,
+		"alive": unit.is_alive(),
+		"health": unit.stats.get("health", 0.0),
+		"skill_count": unit.skills.size()
+	}
+	if not contribution.alive:
+		return contribution
+	
+	var attack = unit.get_projected_stat(BattleUnit.STAT_ATTACK)
+	var speed = unit.get_projected_stat(BattleUnit.STAT_SPEED)
+	contribution["health_percent"] = unit.get_health_percentage()
+	contribution["attack"] = attack
+	contribution["defense"] = unit.get_projected_stat(BattleUnit.STAT_DEFENSE)
+	contribution["speed"] = speed
+	contribution["dps"] = attack * speed / 10.0  # Assuming base attack rate
+	contribution["roles"] = ROLES.filter(func(role): return _team_has_role([unit], role))
+	contribution["statuses"] = unit.get_status_list()
+	return contribution
+
+func _apply_contribution(contribution: Dictionary, direction: int) -> void:
+	var team = contribution.team
+	if not _team_totals.has(team):
+		_team_totals[team] = {
+			"member_count": 0,
+			"unit_count": 0,
+			"total_health": 0.0,
+			"health_percent": 0.0,
+			"total_attack": 0.0,
+			"total_defense": 0.0,
+			"total_speed": 0.0,
+			"dps": 0.0,
+			"roles": {},
+			"status_counts": {},
+			"status_units": {}
+		}
+	var totals: Dictionary = _team_totals[team]
+	totals.member_count += direction
+	if not contribution.alive:
+		return
+	
+	totals.unit_count += direction
+	totals.total_health += direction * contribution.health
+	totals.health_percent += direction * contribution.health_percent
+	totals.total_attack += direction * contribution.attack
+	totals.total_defense += direction * contribution.defense
+	totals.total_speed += direction * contribution.speed
+	totals.dps += direction * contribution.dps
+	for role in contribution.roles:
+		_add_count(totals.roles, role, direction)
+	var counted = {}
+	for status in contribution.statuses:
+		_add_count(totals.status_counts, status, direction)
+		if not counted.has(status):
+			counted[status] = true
+			_add_count(totals.status_units, status, direction)
+
+func _add_count(counts: Dictionary, key, amount: int) -> void:
+	var count = counts.get(key, 0) + amount
+	if count == 0:
+		counts.erase(key)
+	else:
+		counts[key] = count
+
+func _rebuild_derived() -> void:
 	_team_states.clear()
+	_enemy_team_states.clear()
+	for team in _team_totals:
+		var totals: Dictionary = _team_totals[team]
+		if totals.member_count <= 0:
+			continue
+		var alive = totals.unit_count
+		var state = {
+			"unit_count": alive,
+			"total_health": totals.total_health if alive > 0 else 0.0,
+			"average_health_percent": totals.health_percent / max(1, alive),
+			"total_attack": totals.total_attack if alive > 0 else 0.0,
+			"total_defense": totals.total_defense if alive > 0 else 0.0,
+			"average_speed": totals.total_speed / alive if alive > 0 else 0.0,
+			"has_healer": totals.roles.has("healer"),
+			"has_tank": totals.roles.has("tank"),
+			"status_counts": totals.status_counts.duplicate()
+		}
+		state.make_read_only()
+		_team_states[team] = state
+	_calculate_team_advantages()
+	_derived_valid = true
+
+func _calculate_team_states() -> Dictionary:
+	var states: Dictionary = {}
 	
 	# Group units by team
 	var teams: Dictionary = {}
 	for unit in all_units:
+		if not is_instance_valid(unit):
+			continue
 		if not teams.has(unit.team):
 			teams[unit.team] = []
 		teams[unit.team].append(unit)
@@ -161,11 +384,14 @@ func _calculate_team_states() -> void:
 	for team in teams:
 		var team_units = teams[team]
 		var alive_units = team_units.filter(func(u): return u.is_alive())
+		var health_percent = 0.0
+		for unit in alive_units:
+			health_percent += unit.get_health_percentage()
 		
-		_team_states[team] = {
+		states[team] = {
 			"unit_count": alive_units.size(),
 			"total_health": _calculate_total_health(alive_units),
-			"average_health_percent": get_average_health_percentage(team),
+			"average_health_percent": health_percent / max(1, alive_units.size()),
 			"total_attack": _calculate_total_stat(alive_units, "attack"),
 			"total_defense": _calculate_total_stat(alive_units, "defense"),
 			"average_speed": _calculate_average_stat(alive_units, "speed"),
@@ -173,6 +399,7 @@ func _calculate_team_states() -> void:
 			"has_tank": _team_has_role(alive_units, "tank"),
 			"status_counts": _count_team_statuses(alive_units)
 		}
+	return states
 
 func _calculate_battle_phase() -> String:
 	var elapsed_time = get_battle_elapsed_time()
@@ -187,10 +414,13 @@ func _calculate_battle_phase() -> String:
 		_battle_phase = "mid_game"
 	
 	# Override based on unit counts
-	var total_alive = all_units.filter(func(u): return u.is_alive()).size()
-	var total_units = all_units.size()
+	var total_alive = 0
+	var total_units = 0
+	for team in _team_totals:
+		total_alive += _team_totals[team].unit_count
+		total_units += _team_totals[team].member_count
 	
-	if float(total_alive) / float(total_units) < 0.5:
+	if total_units > 0 and float(total_alive) / float(total_units) < 0.5:
 		_battle_phase = "end_game"
 	
 	return _battle_phase
@@ -198,11 +428,7 @@ func _calculate_battle_phase() -> String:
 func _calculate_team_advantages() -> void:
 	_team_advantages.clear()
 	
-	# Get unique teams
-	var teams: Array[int] = []
-	for unit in all_units:
-		if not teams.has(unit.team):
-			teams.append(unit.team)
+	var teams: Array = _team_states.keys()
 	
 	# Calculate relative advantages
 	for team in teams:
@@ -251,6 +477,9 @@ func _calculate_team_advantages() -> void:
 		_team_advantages[team] = clamp(advantage, 0.1, 10.0)
 
 func _get_enemy_team_state(unit_team: int) -> Dictionary:
+	if _enemy_team_states.has(unit_team):
+		return _enemy_team_states[unit_team]
+	
 	var enemy_state = {}
 	
 	for team in _team_states:
@@ -265,6 +494,8 @@ func _get_enemy_team_state(unit_team: int) -> Dictionary:
 					if typeof(state[key]) == TYPE_INT or typeof(state[key]) == TYPE_FLOAT:
 						enemy_state[key] += state[key]
 	
+	enemy_state.make_read_only()
+	_enemy_team_states[unit_team] = enemy_state
 	return enemy_state
 
 func _get_relevant_casts(for_unit: BattleUnit) -> Array[SkillCast]:
@@ -345,6 +576,8 @@ func _check_combo_potential(skill1: BattleSkill, skill2: BattleSkill) -> float:
 
 # Debugging
 func debug_print_state() -> void:
+	_ensure_current()
+	_calculate_battle_phase()
 	print("\n=== Battle Context ===")
 	print("Phase: %s, Time: %.1fs, Round: %d" % [_battle_phase, get_battle_elapsed_time(), current_round])
 	print("\nTeam States:")
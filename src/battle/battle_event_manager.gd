@@ -5,24 +5,53 @@ const BattleEvent = preload("res://src/battle/battle_event.gd")
 const BattleUnit = preload("res://src/battle/battle_unit.gd")
 const BattleContext = preload("res://src/battle/battle_context.gd")
 const BattleSkill = preload("res://src/battle/battle_skill.gd")
+const BattleEventStore = preload("res://src/battle/battle_event_store.gd")
 const SkillActivationObserver = preload("res://src/skills/skill_activation_observer.gd")
 const SkillCast = preload("res://src/skills/skill_cast.gd")
 
+const DEFAULT_MAX_EVENTS := 4096
+
+# Events kept in memory; the oldest are evicted first (after being written
+# out when an event stream is open). 0 keeps every event.
+@export var max_events: int = DEFAULT_MAX_EVENTS:
+    set(value):
+        max_events = maxi(value, 0)
+        _store.max_events = max_events
+# Unit snapshots between full keyframes; the ones in between are deltas
+@export var keyframe_interval: int = 16:
+    set(value):
+        keyframe_interval = maxi(value, 1)
+        _store.keyframe_interval = keyframe_interval
+
 var _context: BattleContext = null
 var _skill_observer: SkillActivationObserver = null
-var _events: Array[BattleEvent] = []
+var _store := BattleEventStore.new()
 
-func _build_read_payload(source: BattleUnit, targets: Array[BattleUnit]) -> Dictionary:
-    var target_snapshots: Array[Dictionary] = []
-    for target in targets:
-        if target == null or not target is BattleUnit:
-            continue
-        target_snapshots.append(target.capture_battle_state())
+func _init() -> void:
+    _store.max_events = max_events
+    _store.keyframe_interval = keyframe_interval
+
+func _exit_tree() -> void:
+    _store.close_stream()
 
-    return {
-        "source": source.capture_battle_state() if source else {},
-        "targets": target_snapshots
-    }
+func _record(type: BattleEvent.EventType, source: BattleUnit, targets: Array[BattleUnit], write: Dictionary) -> void:
+    _store.record(
+        type,
+        source,
+        targets,
+        write,
+        _context.current_round if _context else -1,
+        source.get_turn_order() if source else -1
+    )
+    if BattleProfiler.enabled:
+        BattleProfiler.set_gauge(BattleProfiler.EVENT_LOG_SIZE, _store.size())
+
+func _normalize_targets(targets: Array) -> Array[BattleUnit]:
+    var normalized_targets: Array[BattleUnit] = []
+    for target in targets:
+        if target is BattleUnit:
+            normalized_targets.append(target)
+    return normalized_targets
 
 func _duplicate_dictionary(values: Dictionary) -> Dictionary:
     if values.is_empty():
@@ -48,110 +77,62 @@ func connect_skill_observer(observer: SkillActivationObserver) -> void:
 
 
 
+# Builds BattleEvent objects for every retained event; prefer
+# get_events_in_turn_order or get_event_count on long battles
 func get_events() -> Array[BattleEvent]:
-    return _events.duplicate()
+    return _store.get_events()
+
+func get_event_count() -> int:
+    return _store.size()
 
 func get_events_in_turn_order(round: int) -> Array[BattleEvent]:
-    var round_events = _events.filter(func(e): return e.round == round)
-    round_events.sort_custom(func(a, b): return a.turn_order > b.turn_order)
-    return round_events
+    return _store.get_events_in_turn_order(round)
 
-func record_skill_cast_start(source: BattleUnit, targets: Array, skill: BattleSkill, resources_claimed: Dictionary = {}) -> void:
-    var normalized_targets: Array[BattleUnit] = []
-    for target in targets:
-        if target is BattleUnit:
-            normalized_targets.append(target)
+func clear_events() -> void:
+    _store.clear()
+
+# Writes recorded events to a JSON-lines file under user:// as they are
+# recorded, so evicted events are kept on disk. The line format is described
+# in battle_event_store.gd.
+func open_event_stream(path: String) -> Error:
+    return _store.open_stream(path)
 
-    var first_target_name: String = ""
-    if normalized_targets.size() > 0:
-        first_target_name = normalized_targets[0].name
-
-    var event = BattleEvent.new()
-    event.setup(
-        BattleEvent.EventType.SKILL_CAST_STARTED,
-        source.name,
-        first_target_name,
-        {
-            "read": _build_read_payload(source, normalized_targets),
-            "write": {
-                "skill": {
-                    "name": skill.skill_name,
-                    "path": skill.resource_path
-                },
-                "resources_claimed": _duplicate_dictionary(resources_claimed)
-            }
+func close_event_stream() -> void:
+    _store.close_stream()
+
+func flush_event_stream() -> void:
+    _store.flush()
+
+func record_skill_cast_start(source: BattleUnit, targets: Array, skill: BattleSkill, resources_claimed: Dictionary = {}) -> void:
+    _record(BattleEvent.EventType.SKILL_CAST_STARTED, source, _normalize_targets(targets), {
+        "skill": {
+            "name": skill.skill_name,
+            "path": skill.resource_path
         },
-        _context.current_round if _context else -1,
-        source.get_turn_order() if source else -1
-    )
-    _events.append(event)
+        "resources_claimed": _duplicate_dictionary(resources_claimed)
+    })
 
 func record_skill_cast_progress(source: BattleUnit, progress: float) -> void:
     var empty_targets: Array[BattleUnit] = []
-    var event = BattleEvent.new()
-    event.setup(
-        BattleEvent.EventType.SKILL_CAST_PROGRESS,
-        source.name,
-        "",
-        {
-            "read": _build_read_payload(source, empty_targets),
-            "write": {
-                "progress": progress
-            }
-        },
-        _context.current_round if _context else -1,
-        source.get_turn_order() if source else -1
-    )
-    _events.append(event)
+    _record(BattleEvent.EventType.SKILL_CAST_PROGRESS, source, empty_targets, {
+        "progress": progress
+    })
 
 func record_skill_cast_complete(source: BattleUnit, targets: Array, skill: BattleSkill, execution_log: Array[Dictionary]) -> void:
-    var normalized_targets: Array[BattleUnit] = []
-    for target in targets:
-        if target is BattleUnit:
-            normalized_targets.append(target)
-
-    var first_target_name: String = ""
-    if normalized_targets.size() > 0:
-        first_target_name = normalized_targets[0].name
-
-    var event = BattleEvent.new()
-    event.setup(
-        BattleEvent.EventType.SKILL_CAST_COMPLETE,
-        source.name,
-        first_target_name,
-        {
-            "read": _build_read_payload(source, normalized_targets),
-            "write": {
-                "skill": {
-                    "name": skill.skill_name,
-                    "path": skill.resource_path
-                },
-                "execution": execution_log.duplicate(true)
-            }
+    _record(BattleEvent.EventType.SKILL_CAST_COMPLETE, source, _normalize_targets(targets), {
+        "skill": {
+            "name": skill.skill_name,
+            "path": skill.resource_path
         },
-        _context.current_round if _context else -1,
-        source.get_turn_order() if source else -1
-    )
-    _events.append(event)
+        "execution": execution_log.duplicate(true)
+    })
 
 func record_skill_cast_interrupt(source: BattleUnit, progress: float, resources_refunded: Dictionary = {}) -> void:
     var empty_targets: Array[BattleUnit] = []
-    var event = BattleEvent.new()
-    event.setup(
-        BattleEvent.EventType.SKILL_CAST_INTERRUPT,
-        source.name,
-        "",
-        {
-            "read": _build_read_payload(source, empty_targets),
-            "write": {
-                "progress": progress,
-                "resources_refunded": _duplicate_dictionary(resources_refunded)
-            }
-        },
-        _context.current_round if _context else -1,
-        source.get_turn_order() if source else -1
-    )
-    _events.append(event)
+    _record(BattleEvent.EventType.SKILL_CAST_INTERRUPT, source, empty_targets, {
+        "progress": progress,
+        "resources_refunded": _duplicate_dictionary(resources_refunded)
+    })
 
 func _on_skill_initiated(cast: SkillCast) -> void:
     record_skill_cast_start(cast.caster, cast.targets, cast.skill, cast.claimed_resources)
@@ -166,31 +147,10 @@ func _on_skill_interrupted(cast: SkillCast) -> void:
     record_skill_cast_interrupt(cast.caster, cast.get_cast_progress(), cast.get_refunded_resources())
 
 func record_skill_cast(source: BattleUnit, targets: Array, skill: BattleSkill, skill_data: Dictionary) -> void:
-    var normalized_targets: Array[BattleUnit] = []
-    for target in targets:
-        if target is BattleUnit:
-            normalized_targets.append(target)
-
-    var first_target_name: String = ""
-    if normalized_targets.size() > 0:
-        first_target_name = normalized_targets[0].name
-
-    var event = BattleEvent.new()
-    event.setup(
-        BattleEvent.EventType.SKILL_CAST,
-        source.name,
-        first_target_name,
-        {
-            "read": _build_read_payload(source, normalized_targets),
-            "write": {
-                "skill": {
-                    "name": skill.skill_name,
-                    "path": skill.resource_path
-                },
-                "data": _duplicate_dictionary(skill_data)
-            }
+    _record(BattleEvent.EventType.SKILL_CAST, source, _normalize_targets(targets), {
+        "skill": {
+            "name": skill.skill_name,
+            "path": skill.resource_path
         },
-        _context.current_round if _context else -1,
-        source.get_turn_order() if source else -1
-    )
-    _events.append(event)
+        "data": _duplicate_dictionary(skill_data)
+    })
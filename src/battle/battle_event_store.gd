@@ -0,0 +1,468 @@
+class_name BattleEventStore
+extends RefCounted
+
+# Compact, bounded storage for BattleEventManager.
+#
+# Event headers live in packed columns (type, round, turn order, interned
+# source/target names, timestamp); only the write payload is kept as a
+# Dictionary. Unit state captured for the read payload is stored per unit as
+# a keyframe every `keyframe_interval` snapshots and as field-level deltas in
+# between, so an unchanged unit costs one small record per event. The columns
+# form a ring buffer of `max_events` entries (0 keeps everything); snapshots
+# that no retained event can reach are pruned as the ring wraps. BattleEvent
+# objects are only built when a query asks for them.
+#
+# Stream format (one JSON object per line, in recording order):
+#   {"snapshot": id, "unit": name, "keyframe": id, "state": {...}}        keyframe
+#   {"snapshot": id, "unit": name, "keyframe": id, "set": {...}, "erase": [...]}
+#   {"seq": n, "type": t, "round": r, "turn_order": o, "timestamp": s,
+#    "source": name, "target": name, "read": [ids], "write": {...}}
+# State fields are flattened as "group/field" (e.g. "base_stats/attack").
+
+const BattleEvent = preload("res://src/battle/battle_event.gd")
+const BattleUnit = preload("res://src/battle/battle_unit.gd")
+
+const FIELD_SEPARATOR := "/"
+const DEFAULT_STREAM_FLUSH_INTERVAL := 64
+
+var max_events: int = 0:
+    set(value):
+        _resize(maxi(value, 0))
+    get:
+        return _capacity
+var keyframe_interval: int = 16
+var stream_flush_interval: int = DEFAULT_STREAM_FLUSH_INTERVAL
+
+# Event columns, indexed by physical slot
+var _seqs := PackedInt64Array()
+var _types := PackedInt32Array()
+var _rounds := PackedInt32Array()
+var _turn_orders := PackedInt32Array()
+var _sources := PackedInt32Array()
+var _targets := PackedInt32Array()
+var _timestamps := PackedFloat64Array()
+var _writes: Array[Dictionary] = []
+var _read_refs: Array[PackedInt64Array] = []  # [source id or -1, target ids...]
+
+var _capacity: int = 0
+var _start: int = 0
+var _count: int = 0
+var _next_seq: int = 0
+
+var _names := PackedStringArray()
+var _name_ids: Dictionary = {}  # String -> index into _names
+
+# Snapshot id -> [chain key, keyframe id, payload, name id]; payload is the
+# flat state for keyframes, null when nothing changed, else {"set", "erase"}
+var _snapshots: Dictionary = {}
+var _chains: Dictionary = {}  # chain key -> PackedInt64Array of snapshot ids
+var _last_states: Dictionary = {}  # chain key -> flat state of the newest snapshot
+var _chain_keyframes: Dictionary = {}  # chain key -> current keyframe id
+var _since_keyframe: Dictionary = {}  # chain key -> snapshots since that keyframe
+var _next_snapshot_id: int = 0
+var _evicted_since_prune: int = 0
+
+var _stream: FileAccess = null
+var _stream_path: String = ""
+var _flushed_seq: int = -1
+var _flushed_snapshot_id: int = -1
+
+func record(type: int, source: BattleUnit, targets: Array[BattleUnit], write: Dictionary, round: int, turn_order: int) -> void:
+    var refs := PackedInt64Array()
+    refs.append(_capture(source) if source else -1)
+    for target in targets:
+        refs.append(_capture(target))
+
+    var slot := _claim_slot()
+    _seqs[slot] = _next_seq
+    _types[slot] = type
+    _rounds[slot] = round
+    _turn_orders[slot] = turn_order
+    _sources[slot] = _intern(source.name if source else "")
+    _targets[slot] = _intern(targets[0].name if targets.size() > 0 else "")
+    _timestamps[slot] = Time.get_unix_time_from_system()
+    _writes[slot] = write
+    _read_refs[slot] = refs
+    _next_seq += 1
+
+    if _stream and _next_seq - 1 - _flushed_seq >= stream_flush_interval:
+        flush()
+
+func size() -> int:
+    return _count
+
+func clear() -> void:
+    if _stream:
+        flush()
+    _seqs.clear()
+    _types.clear()
+    _rounds.clear()
+    _turn_orders.clear()
+    _sources.clear()
+    _targets.clear()
+    _timestamps.clear()
+    _writes.clear()
+    _read_refs.clear()
+    _start = 0
+    _count = 0
+    _snapshots.clear()
+    _chains.clear()
+    _last_states.clear()
+    _chain_keyframes.clear()
+    _since_keyframe.clear()
+    _evicted_since_prune = 0
+
+func get_event(index: int) -> BattleEvent:
+    if index < 0 or index >= _count:
+        return null
+    return _materialize(_slot(index))
+
+func get_events() -> Array[BattleEvent]:
+    var events: Array[BattleEvent] = []
+    for i in range(_count):
+        events.append(_materialize(_slot(i)))
+    return events
+
+# Events of one round, highest turn order first and in recording order
+# within a turn order; only the matching events are materialized
+func get_events_in_turn_order(round: int) -> Array[BattleEvent]:
+    var slots: Array[int] = []
+    for i in range(_count):
+        var slot := _slot(i)
+        if _rounds[slot] == round:
+            slots.append(slot)
+    slots.sort_custom(func(a, b):
+        if _turn_orders[a] != _turn_orders[b]:
+            return _turn_orders[a] > _turn_orders[b]
+        return _seqs[a] < _seqs[b]
+    )
+
+    var events: Array[BattleEvent] = []
+    for slot in slots:
+        events.append(_materialize(slot))
+    return events
+
+func get_snapshot_count() -> int:
+    return _snapshots.size()
+
+# Streams every event recorded from now on (and those still retained) to a
+# JSON-lines file under user://
+func open_stream(path: String) -> Error:
+    if not path.begins_with("user://"):
+        push_error("Event stream path must be under user://: " + path)
+        return ERR_INVALID_PARAMETER
+    close_stream()
+    var file = FileAccess.open(path, FileAccess.WRITE)
+    if not file:
+        push_error("Failed to open event stream for writing: " + path)
+        return FileAccess.get_open_error()
+    _stream = file
+    _stream_path = path
+    _flushed_seq = _seqs[_slot(0)] - 1 if _count > 0 else _next_seq - 1
+    _flushed_snapshot_id = _oldest_snapshot_id() - 1
+    return OK
+
+func close_stream() -> void:
+    if not _stream:
+        return
+    flush()
+    _stream.close()
+    _stream = null
+    _stream_path = ""
+
+func is_streaming() -> bool:
+    return _stream != null
+
+func get_stream_path() -> String:
+    return _stream_path
+
+func flush() -> void:
+    if not _stream:
+        return
+    for i in range(_count):
+        var slot := _slot(i)
+        if _seqs[slot] > _flushed_seq:
+            _flush_slot(slot)
+    _stream.flush()
+
+func _flush_slot(slot: int) -> void:
+    var refs: PackedInt64Array = _read_refs[slot]
+    var ref_list: Array = []
+    for snapshot_id in refs:
+        ref_list.append(snapshot_id)
+        if snapshot_id > _flushed_snapshot_id:
+            _flush_snapshots_through(snapshot_id)
+
+    _stream.store_line(JSON.stringify({
+        "seq": _seqs[slot],
+        "type": _types[slot],
+        "round": _rounds[slot],
+        "turn_order": _turn_orders[slot],
+        "timestamp": _timestamps[slot],
+        "source": _name_at(_sources[slot]),
+        "target": _name_at(_targets[slot]),
+        "read": ref_list,
+        "write": _writes[slot]
+    }))
+    _flushed_seq = _seqs[slot]
+
+func _flush_snapshots_through(last_id: int) -> void:
+    for snapshot_id in range(_flushed_snapshot_id + 1, last_id + 1):
+        if not _snapshots.has(snapshot_id):
+            continue
+        var record: Array = _snapshots[snapshot_id]
+        var line := {
+            "snapshot": snapshot_id,
+            "unit": _name_at(record[3]),
+            "keyframe": record[1]
+        }
+        if record[1] == snapshot_id:
+            line["state"] = record[2]
+        elif record[2] == null:
+            line["set"] = {}
+            line["erase"] = []
+        else:
+            line["set"] = record[2]["set"]
+            line["erase"] = Array(record[2]["erase"])
+        _stream.store_line(JSON.stringify(line))
+    _flushed_snapshot_id = last_id
+
+func _oldest_snapshot_id() -> int:
+    var oldest := _next_snapshot_id
+    for key in _chains:
+        var chain: PackedInt64Array = _chains[key]
+        if chain.size() > 0:
+            oldest = mini(oldest, chain[0])
+    return oldest
+
+func _slot(index: int) -> int:
+    if _capacity == 0:
+        return index
+    return (_start + index) % _capacity
+
+func _claim_slot() -> int:
+    if _capacity == 0 or _count < _capacity:
+        var slot := _seqs.size()
+        _seqs.append(0)
+        _types.append(0)
+        _rounds.append(0)
+        _turn_orders.append(0)
+        _sources.append(-1)
+        _targets.append(-1)
+        _timestamps.append(0.0)
+        _writes.append({})
+        _read_refs.append(PackedInt64Array())
+        _count += 1
+        return slot
+
+    # Full ring: the oldest event makes room
+    var slot := _start
+    if _stream and _seqs[slot] > _flushed_seq:
+        flush()
+    _start = (_start + 1) % _capacity
+    _read_refs[slot] = PackedInt64Array()
+    _evicted_since_prune += 1
+    if _evicted_since_prune >= maxi(keyframe_interval, _capacity / 4):
+        _prune_snapshots()
+    return slot
+
+func _resize(capacity: int) -> void:
+    if capacity == _capacity:
+        return
+    # Unroll into logical order, dropping the oldest events that no longer fit
+    var keep := _count if capacity == 0 else mini(_count, capacity)
+    var first := _count - keep
+    if _stream and first > 0:
+        flush()
+
+    var seqs := PackedInt64Array()
+    var types := PackedInt32Array()
+    var rounds := PackedInt32Array()
+    var turn_orders := PackedInt32Array()
+    var sources := PackedInt32Array()
+    var targets := PackedInt32Array()
+    var timestamps := PackedFloat64Array()
+    var writes: Array[Dictionary] = []
+    var read_refs: Array[PackedInt64Array] = []
+    for i in range(first, _count):
+        var slot := _slot(i)
+        seqs.append(_seqs[slot])
+        types.append(_types[slot])
+        rounds.append(_rounds[slot])
+        turn_orders.append(_turn_orders[slot])
+        sources.append(_sources[slot])
+        targets.append(_targets[slot])
+        timestamps.append(_timestamps[slot])
+        writes.append(_writes[slot])
+        read_refs.append(_read_refs[slot])
+
+    _seqs = seqs
+    _types = types
+    _rounds = rounds
+    _turn_orders = turn_orders
+    _sources = sources
+    _targets = targets
+    _timestamps = timestamps
+    _writes = writes
+    _read_refs = read_refs
+    _capacity = capacity
+    _start = 0
+    _count = keep
+    if first > 0:
+        _prune_snapshots()
+
+func _intern(unit_name: String) -> int:
+    if unit_name.is_empty():
+        return -1
+    var id = _name_ids.get(unit_name, -1)
+    if id == -1:
+        id = _names.size()
+        _names.append(unit_name)
+        _name_ids[unit_name] = id
+    return id
+
+func _name_at(id: int) -> String:
+    return _names[id] if id >= 0 else ""
+
+# Snapshot recording
+
+func _capture(unit: BattleUnit) -> int:
+    var key := unit.get_instance_id()
+    var state := _flatten(unit.capture_battle_state())
+    var snapshot_id := _next_snapshot_id
+    _next_snapshot_id += 1
+
+    if not _chains.has(key):
+        _chains[key] = PackedInt64Array()
+        _since_keyframe[key] = keyframe_interval
+
+    var payload
+    var keyframe_id: int
+    if _since_keyframe[key] >= keyframe_interval:
+        payload = state
+        keyframe_id = snapshot_id
+        _chain_keyframes[key] = snapshot_id
+        _since_keyframe[key] = 0
+    else:
+        payload = _diff(_last_states[key], state)
+        keyframe_id = _chain_keyframes[key]
+        _since_keyframe[key] += 1
+
+    _snapshots[snapshot_id] = [key, keyframe_id, payload, _intern(unit.name)]
+    _chains[key].append(snapshot_id)
+    _last_states[key] = state
+    return snapshot_id
+
+func _diff(previous: Dictionary, current: Dictionary):
+    var changed: Dictionary = {}
+    for field in current:
+        if not previous.has(field) or typeof(previous[field]) != typeof(current[field]) \
+                or previous[field] != current[field]:
+            changed[field] = current[field]
+    var erased := PackedStringArray()
+    for field in previous:
+        if not current.has(field):
+            erased.append(field)
+    if changed.is_empty() and erased.is_empty():
+        return null
+    return {"set": changed, "erase": erased}
+
+# Drops snapshots older than the keyframe each chain needs for the oldest
+# retained event. Snapshot ids grow with recording order, so the oldest
+# event's smallest reference bounds every retained reference from below.
+func _prune_snapshots() -> void:
+    _evicted_since_prune = 0
+    var min_needed := _next_snapshot_id
+    for i in range(_count):
+        var refs: PackedInt64Array = _read_refs[_slot(i)]
+        var found := false
+        for snapshot_id in refs:
+            if snapshot_id >= 0:
+                min_needed = mini(min_needed, snapshot_id)
+                found = true
+        if found:
+            break
+
+    for key in _chains:
+        var chain: PackedInt64Array = _chains[key]
+        var idx := chain.bsearch(min_needed)
+        var keep_from: int = _chain_keyframes[key]
+        if idx < chain.size():
+            keep_from = _snapshots[chain[idx]][1]
+        var cut := chain.bsearch(keep_from)
+        if cut == 0:
+            continue
+        for j in range(cut):
+            _snapshots.erase(chain[j])
+        _chains[key] = chain.slice(cut)
+
+# Event materialization
+
+func _materialize(slot: int) -> BattleEvent:
+    var refs: PackedInt64Array = _read_refs[slot]
+    var target_states: Array[Dictionary] = []
+    for i in range(1, refs.size()):
+        target_states.append(_reconstruct(refs[i]))
+
+    var event = BattleEvent.new()
+    event.event_type = _types[slot]
+    event.timestamp = _timestamps[slot]
+    event.source_unit_id = _name_at(_sources[slot])
+    event.target_unit_id = _name_at(_targets[slot])
+    event.round = _rounds[slot]
+    event.turn_order = _turn_orders[slot]
+    event.data = {
+        "read": {
+            "source": _reconstruct(refs[0]) if refs[0] >= 0 else {},
+            "targets": target_states
+        },
+        "write": _writes[slot].duplicate(true)
+    }
+    return event
+
+func _reconstruct(snapshot_id: int) -> Dictionary:
+    var record: Array = _snapshots.get(snapshot_id, [])
+    if record.is_empty():
+        return {}
+    var keyframe_id: int = record[1]
+    var chain: PackedInt64Array = _chains[record[0]]
+    var state: Dictionary = _snapshots[keyframe_id][2].duplicate()
+    for i in range(chain.bsearch(keyframe_id) + 1, chain.bsearch(snapshot_id) + 1):
+        var delta = _snapshots[chain[i]][2]
+        if delta == null:
+            continue
+        state.merge(delta["set"], true)
+        for field in delta["erase"]:
+            state.erase(field)
+    return _unflatten(state)
+
+func _flatten(state: Dictionary) -> Dictionary:
+    var flat: Dictionary = {}
+    for key in state:
+        var value = state[key]
+        if value is Dictionary:
+            # Marker keeps empty groups (e.g. no locked resources) on rebuild
+            flat[key] = {}
+            for field in value:
+                flat[key + FIELD_SEPARATOR + String(field)] = value[field]
+        else:
+            flat[key] = value
+    return flat
+
+func _unflatten(flat: Dictionary) -> Dictionary:
+    var state: Dictionary = {}
+    for field in flat:
+        var value = flat[field]
+        if value is Array or value is Dictionary:
+            value = value.duplicate(true)
+        var split: int = field.find(FIELD_SEPARATOR)
+        if split == -1:
+            if value is Dictionary and state.has(field):
+                continue
+            state[field] = value
+            continue
+        var group: String = field.substr(0, split)
+        if not state.has(group):
+            state[group] = {}
+        state[group][field.substr(split + 1)] = value
+    return state
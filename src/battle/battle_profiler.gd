@@ -0,0 +1,259 @@
+class_name BattleProfiler
+extends RefCounted
+
+# Opt-in instrumentation for the battle hot paths. Instrumented code checks
+# `enabled` before reading the clock, so a disabled profiler costs one static
+# read per call:
+#
+#   var profile_start := Time.get_ticks_usec() if BattleProfiler.enabled else 0
+#   ...
+#   if BattleProfiler.enabled:
+#       BattleProfiler.record(BattleProfiler.RULE_LOOKUP, profile_start)
+#
+# enable() also registers the timers and counters as custom Performance
+# monitors, shown in the debugger's Monitors tab. AutoBattler brackets each
+# battle with begin_battle()/end_battle(); get_profile() then summarises it
+# and dump_profile() writes the summary as JSON. Running the game with
+# `-- --battle-profile=<path>` enables the profiler from startup and writes
+# every finished battle's profile to that file.
+
+const COMMAND_LINE_FLAG := "--battle-profile="
+const MONITOR_PREFIX := "battle_profiler/"
+# Bucket i counts samples that took less than 2^i microseconds
+const HISTOGRAM_BUCKETS := 24
+const TOP_FUNCTIONS := 10
+
+# Timed functions
+const RULE_LOOKUP := &"BattleRuleProcessor.get_modifiers_for_context"
+const SKILL_EVALUATION := &"SkillEvaluator.evaluate_skills"
+const OBSERVER_TICK := &"SkillActivationObserver._process"
+const BATTLE_ROUND := &"AutoBattler.round"
+
+# Counters and gauges
+const STAT_REBUILDS := &"stat_projector_rebuilds"
+const STAT_CACHE_HITS := &"stat_cache_hits"
+const STAT_CACHE_MISSES := &"stat_cache_misses"
+const EVENT_LOG_SIZE := &"event_log_size"
+
+const SUBSYSTEMS := {
+    RULE_LOOKUP: "rules",
+    SKILL_EVALUATION: "ai",
+    OBSERVER_TICK: "observer",
+    BATTLE_ROUND: "battle"
+}
+
+# Monitor name -> [timer or counter, field]
+const MONITORS := {
+    "rules/lookups": [RULE_LOOKUP, "calls"],
+    "rules/lookup_total_ms": [RULE_LOOKUP, "total_ms"],
+    "rules/lookup_p95_usec": [RULE_LOOKUP, "p95_usec"],
+    "ai/evaluations": [SKILL_EVALUATION, "calls"],
+    "ai/evaluation_mean_usec": [SKILL_EVALUATION, "mean_usec"],
+    "ai/evaluation_p95_usec": [SKILL_EVALUATION, "p95_usec"],
+    "observer/tick_mean_usec": [OBSERVER_TICK, "mean_usec"],
+    "observer/tick_p95_usec": [OBSERVER_TICK, "p95_usec"],
+    "stats/projector_rebuilds": [STAT_REBUILDS, "count"],
+    "stats/cache_hit_rate": [STAT_CACHE_HITS, "hit_rate"],
+    "events/log_size": [EVENT_LOG_SIZE, "gauge"]
+}
+
+static var enabled: bool = not _command_line_path().is_empty()
+
+static var _timers: Dictionary = {}  # function -> [calls, total usec, max usec, PackedInt64Array histogram]
+static var _counters: Dictionary = {}  # name -> int
+static var _gauges: Dictionary = {}  # name -> float
+static var _rounds: Array[Dictionary] = []
+static var _round_start: Dictionary = {}
+static var _battle_start_usec: int = 0
+static var _battle_usec: int = 0
+static var _monitors_registered: bool = false
+# Profiles of finished battles when enabled from the command line
+static var _battle_profiles: Array = []
+
+static func enable() -> void:
+    enabled = true
+    reset()
+    _register_monitors()
+
+static func disable() -> void:
+    enabled = false
+    if not _monitors_registered:
+        return
+    for monitor in MONITORS:
+        if Performance.has_custom_monitor(MONITOR_PREFIX + monitor):
+            Performance.remove_custom_monitor(MONITOR_PREFIX + monitor)
+    _monitors_registered = false
+
+static func reset() -> void:
+    _timers.clear()
+    _counters.clear()
+    _gauges.clear()
+    _rounds.clear()
+    _round_start = {}
+    _battle_start_usec = Time.get_ticks_usec()
+    _battle_usec = 0
+
+# Adds the time since `start_usec` to a timed function
+static func record(function_name: StringName, start_usec: int) -> void:
+    var elapsed: int = Time.get_ticks_usec() - start_usec
+    var timer = _timers.get(function_name)
+    if timer == null:
+        var histogram := PackedInt64Array()
+        histogram.resize(HISTOGRAM_BUCKETS)
+        timer = [0, 0, 0, histogram]
+        _timers[function_name] = timer
+    timer[0] += 1
+    timer[1] += elapsed
+    timer[2] = maxi(timer[2], elapsed)
+    var bucket := 0
+    var remaining := elapsed
+    while remaining > 0 and bucket < HISTOGRAM_BUCKETS - 1:
+        remaining >>= 1
+        bucket += 1
+    timer[3][bucket] += 1
+
+static func count(counter: StringName, amount: int = 1) -> void:
+    _counters[counter] = _counters.get(counter, 0) + amount
+
+static func set_gauge(gauge: StringName, value: float) -> void:
+    _gauges[gauge] = value
+
+static func begin_battle() -> void:
+    if not _monitors_registered:
+        _register_monitors()
+    reset()
+
+# Closes the previous round's entry and opens one for `round`
+static func mark_round(round: int) -> void:
+    _close_round()
+    _round_start = {
+        "round": round,
+        "usec": Time.get_ticks_usec(),
+        "objects": Performance.get_monitor(Performance.OBJECT_COUNT),
+        "memory": Performance.get_monitor(Performance.MEMORY_STATIC)
+    }
+
+static func end_battle() -> void:
+    _close_round()
+    _battle_usec = Time.get_ticks_usec() - _battle_start_usec
+    var path := _command_line_path()
+    if not path.is_empty():
+        _battle_profiles.append(get_profile())
+        _write_json(path, {"battles": _battle_profiles})
+
+# Summary of the current or last battle
+static func get_profile() -> Dictionary:
+    var functions: Array = []
+    var subsystems: Dictionary = {}
+    for function_name in _timers:
+        var entry := _timer_summary(function_name)
+        entry["function"] = String(function_name)
+        functions.append(entry)
+        var subsystem: String = SUBSYSTEMS.get(function_name, "other")
+        if not subsystems.has(subsystem):
+            subsystems[subsystem] = {"calls": 0, "total_usec": 0}
+        subsystems[subsystem].calls += entry.calls
+        subsystems[subsystem].total_usec += entry.total_usec
+    functions.sort_custom(func(a, b): return a.total_usec > b.total_usec)
+
+    var counters: Dictionary = {}
+    for counter in _counters:
+        counters[String(counter)] = _counters[counter]
+    var gauges: Dictionary = {}
+    for gauge in _gauges:
+        gauges[String(gauge)] = _gauges[gauge]
+
+    return {
+        "battle_usec": _battle_usec if _battle_usec > 0 else Time.get_ticks_usec() - _battle_start_usec,
+        "top_functions": functions.slice(0, TOP_FUNCTIONS),
+        "subsystems": subsystems,
+        "counters": counters,
+        "stat_cache_hit_rate": _hit_rate(),
+        "gauges": gauges,
+        "rounds": _rounds.duplicate()
+    }
+
+static func dump_profile(path: String) -> Error:
+    return _write_json(path, get_profile())
+
+# Profiles of the battles finished since startup when enabled with --battle-profile
+static func get_battle_profiles() -> Array:
+    return _battle_profiles
+
+static func _timer_summary(function_name: StringName) -> Dictionary:
+    var timer = _timers.get(function_name)
+    if timer == null:
+        return {"calls": 0, "total_usec": 0, "mean_usec": 0.0, "max_usec": 0, "p50_usec": 0, "p95_usec": 0}
+    return {
+        "calls": timer[0],
+        "total_usec": timer[1],
+        "mean_usec": float(timer[1]) / timer[0],
+        "max_usec": timer[2],
+        "p50_usec": _percentile(timer[3], timer[0], 0.5),
+        "p95_usec": _percentile(timer[3], timer[0], 0.95)
+    }
+
+# Upper bound of the histogram bucket holding the given fraction of samples
+static func _percentile(histogram: PackedInt64Array, samples: int, fraction: float) -> int:
+    var target := ceili(samples * fraction)
+    var seen := 0
+    for bucket in range(histogram.size()):
+        seen += histogram[bucket]
+        if seen >= target:
+            return 1 << bucket
+    return 1 << (histogram.size() - 1)
+
+static func _hit_rate() -> float:
+    var hits: int = _counters.get(STAT_CACHE_HITS, 0)
+    var total: int = hits + _counters.get(STAT_CACHE_MISSES, 0)
+    return float(hits) / total if total > 0 else 0.0
+
+static func _monitor_value(key: StringName, field: String) -> float:
+    match field:
+        "count":
+            return _counters.get(key, 0)
+        "gauge":
+            return _gauges.get(key, 0.0)
+        "hit_rate":
+            return _hit_rate()
+        "total_ms":
+            return _timer_summary(key).total_usec / 1000.0
+    return _timer_summary(key)[field]
+
+static func _register_monitors() -> void:
+    for monitor in MONITORS:
+        var id: String = MONITOR_PREFIX + monitor
+        if Performance.has_custom_monitor(id):
+            continue
+        var key: StringName = MONITORS[monitor][0]
+        var field: String = MONITORS[monitor][1]
+        Performance.add_custom_monitor(id, func(): return _monitor_value(key, field))
+    _monitors_registered = true
+
+static func _close_round() -> void:
+    if _round_start.is_empty():
+        return
+    record(BATTLE_ROUND, _round_start.usec)
+    # Net object and memory growth; the engine does not count individual allocations
+    _rounds.append({
+        "round": _round_start.round,
+        "usec": Time.get_ticks_usec() - _round_start.usec,
+        "objects_allocated": int(Performance.get_monitor(Performance.OBJECT_COUNT) - _round_start.objects),
+        "memory_delta": int(Performance.get_monitor(Performance.MEMORY_STATIC) - _round_start.memory)
+    })
+    _round_start = {}
+
+static func _command_line_path() -> String:
+    for arg in OS.get_cmdline_user_args():
+        if arg.begins_with(COMMAND_LINE_FLAG):
+            return arg.substr(COMMAND_LINE_FLAG.length())
+    return ""
+
+static func _write_json(path: String, data: Dictionary) -> Error:
+    var file := FileAccess.open(path, FileAccess.WRITE)
+    if file == null:
+        push_error("BattleProfiler: cannot write %s: %s" % [path, error_string(FileAccess.get_open_error())])
+        return FileAccess.get_open_error()
+    file.store_string(JSON.stringify(data, "\t"))
+    file.close()
+    return OK
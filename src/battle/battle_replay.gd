@@ -0,0 +1,345 @@
+class_name BattleReplay
+extends RefCounted
+
+# Compact record of one AutoBattler battle: the RNG seed, a hash of the rule
+# set, the units as they entered the battle, every AI decision, and periodic
+# checkpoints (RNG state, battle clock and unit state at the start of a round).
+# Checkpoint times, skill last_used_time and status expires_at_unix are all
+# readings of the battler's get_battle_time(), so playback restores the clock
+# they were taken on rather than mixing simulated and wall time.
+# Battles are deterministic for a given seed and starting state, so a replay is
+# re-simulated rather than stored event by event; the decisions are kept to
+# detect divergence. See BattleReplayPlayer for playback and seeking.
+#
+# Unit descriptors extend capture_battle_state() with what is needed to rebuild
+# the unit: skills, status effects, and a modifier table that keeps modifiers
+# shared between stats and statuses as single instances. Equipment objects are
+# not rebuilt; the modifiers they applied are part of the table.
+
+const StatProjector = preload("res://src/skills/stat_projector.gd")
+
+const FORMAT_VERSION := 1
+const DEFAULT_CHECKPOINT_INTERVAL := 10
+
+enum Action { ATTACK, SKILL, DEFEND, WAIT }
+
+var version: int = FORMAT_VERSION
+var battle_seed: int = 0
+var rules_hash: String = ""
+var max_rounds: int = 0
+var start_time: float = 0.0  # Battle clock when the battle started
+var checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL
+var units: Array[Dictionary] = []  # Initial unit descriptors, team1 then team2
+var team1_size: int = 0
+# Per decision: round, unit index, action, skill index (-1 for none), target
+# count, then the target unit indices
+var decisions := PackedInt32Array()
+var checkpoints: Array[Dictionary] = []  # {round, rng_state, time, units}
+var winner: int = -1
+var rounds: int = 0
+
+var _unit_indices: Dictionary = {}  # BattleUnit -> index, while recording
+var _decision_count: int = 0
+
+func begin(_team1: Array[BattleUnit], _team2: Array[BattleUnit], _seed: int, rule_processor, _max_rounds: int, _start_time: float = 0.0) -> void:
+    battle_seed = _seed
+    start_time = _start_time
+    rules_hash = hash_rules(rule_processor)
+    max_rounds = _max_rounds
+    team1_size = _team1.size()
+    units.clear()
+    checkpoints.clear()
+    decisions.clear()
+    _unit_indices.clear()
+    _decision_count = 0
+    winner = -1
+    rounds = 0
+    for unit in _team1 + _team2:
+        _unit_indices[unit] = units.size()
+        units.append(capture_unit(unit))
+
+func record_checkpoint(round: int, rng: RandomNumberGenerator, time: float, battle_units: Array) -> void:
+    var states: Array[Dictionary] = []
+    for unit in battle_units:
+        states.append(capture_unit(unit))
+    checkpoints.append({
+        "round": round,
+        "rng_state": rng.state,
+        "time": time,
+        "units": states
+    })
+
+func record_decision(round: int, unit: BattleUnit, action: Dictionary) -> void:
+    var code: int = Action.WAIT
+    var skill_index := -1
+    var target_indices := PackedInt32Array()
+    var skill = action.get("skill")
+    if skill != null:
+        code = Action.SKILL
+        skill_index = unit.skills.find(skill)
+    elif action.get("type") == "defend":
+        code = Action.DEFEND
+    elif action.get("type") == "attack":
+        code = Action.ATTACK
+
+    var target = action.get("target")
+    if target is BattleUnit:
+        target_indices.append(_unit_indices.get(target, -1))
+    elif target is Array:
+        for t in target:
+            target_indices.append(_unit_indices.get(t, -1))
+
+    decisions.append(round)
+    decisions.append(_unit_indices.get(unit, -1))
+    decisions.append(code)
+    decisions.append(skill_index)
+    decisions.append(target_indices.size())
+    decisions.append_array(target_indices)
+    _decision_count += 1
+
+func finish(_winner: int, _rounds: int) -> void:
+    winner = _winner
+    rounds = _rounds
+    _unit_indices.clear()
+
+func get_decision_count() -> int:
+    return _decision_count
+
+# Decision offsets into `decisions`, in recording order
+func get_decision_offsets() -> PackedInt32Array:
+    var offsets := PackedInt32Array()
+    var i := 0
+    while i < decisions.size():
+        offsets.append(i)
+        i += 5 + decisions[i + 4]
+    return offsets
+
+func get_decision(index: int) -> Dictionary:
+    var offsets := get_decision_offsets()
+    if index < 0 or index >= offsets.size():
+        return {}
+    var i: int = offsets[index]
+    var targets: Array[int] = []
+    for j in range(decisions[i + 4]):
+        targets.append(decisions[i + 5 + j])
+    return {
+        "round": decisions[i],
+        "unit": decisions[i + 1],
+        "action": decisions[i + 2],
+        "skill": decisions[i + 3],
+        "targets": targets
+    }
+
+# Latest checkpoint taken at or before the start of `round`
+func find_checkpoint(round: int) -> Dictionary:
+    var best: Dictionary = {}
+    for checkpoint in checkpoints:
+        if checkpoint.round > round:
+            break
+        best = checkpoint
+    return best
+
+func to_dict() -> Dictionary:
+    return {
+        "version": version,
+        "seed": battle_seed,
+        "rules_hash": rules_hash,
+        "max_rounds": max_rounds,
+        "start_time": start_time,
+        "checkpoint_interval": checkpoint_interval,
+        "team1_size": team1_size,
+        "units": units,
+        "decisions": decisions,
+        "decision_count": _decision_count,
+        "checkpoints": checkpoints,
+        "winner": winner,
+        "rounds": rounds
+    }
+
+static func from_dict(data: Dictionary) -> BattleReplay:
+    var replay := BattleReplay.new()
+    replay.version = data.get("version", 0)
+    if replay.version > FORMAT_VERSION:
+        push_error("Unsupported replay version: %d" % replay.version)
+        return null
+    replay.battle_seed = data.get("seed", 0)
+    replay.rules_hash = data.get("rules_hash", "")
+    replay.max_rounds = data.get("max_rounds", 0)
+    replay.start_time = data.get("start_time", 0.0)
+    replay.checkpoint_interval = data.get("checkpoint_interval", DEFAULT_CHECKPOINT_INTERVAL)
+    replay.team1_size = data.get("team1_size", 0)
+    replay.units.assign(data.get("units", []))
+    replay.decisions = data.get("decisions", PackedInt32Array())
+    replay._decision_count = data.get("decision_count", 0)
+    replay.checkpoints.assign(data.get("checkpoints", []))
+    replay.winner = data.get("winner", -1)
+    replay.rounds = data.get("rounds", 0)
+    return replay
+
+func save(path: String) -> Error:
+    var file = FileAccess.open_compressed(path, FileAccess.WRITE, FileAccess.COMPRESSION_ZSTD)
+    if not file:
+        push_error("Failed to open replay for writing: " + path)
+        return FileAccess.get_open_error()
+    file.store_var(to_dict())
+    return OK
+
+static func load_from(path: String) -> BattleReplay:
+    var file = FileAccess.open_compressed(path, FileAccess.READ, FileAccess.COMPRESSION_ZSTD)
+    if not file:
+        push_error("Failed to open replay for reading: " + path)
+        return null
+    var data = file.get_var()
+    if not data is Dictionary:
+        push_error("Invalid replay file: " + path)
+        return null
+    return from_dict(data)
+
+static func hash_rules(rule_processor) -> String:
+    if rule_processor == null:
+        return ""
+    return JSON.stringify(rule_processor.rules, "", true).sha256_text()
+
+# Unit descriptors
+
+static func capture_unit(unit: BattleUnit) -> Dictionary:
+    var descriptor := unit.capture_battle_state()
+    # Replaced by the modifier table below, which keeps modifier identity
+    descriptor.erase("modifiers")
+    descriptor.erase("projected_stats")
+    descriptor["script"] = unit.get_script().resource_path
+    descriptor["tags"] = unit.get_meta("tags", [])
+
+    var table: Array = []
+    var table_index: Dictionary = {}  # StatModifier -> index into table
+    var stat_modifiers: Dictionary = {}
+    for stat_name in unit.stats.keys():
+        var projector: StatProjector = unit.get_stat_projector(stat_name, false)
+        if projector == null:
+            continue
+        var refs := PackedInt32Array()
+        for mod in projector.list_modifiers():
+            refs.append(_modifier_ref(mod, table, table_index))
+        if not refs.is_empty():
+            stat_modifiers[String(stat_name)] = refs
+    descriptor["modifier_table"] = table
+    descriptor["stat_modifiers"] = stat_modifiers
+
+    var statuses: Array[Dictionary] = []
+    for status in unit.status_effects:
+        var applied: Array = []
+        for entry in status.applied_modifiers:
+            applied.append([_modifier_ref(entry["modifier"], table, table_index), entry["stat"]])
+        statuses.append({
+            "id": status.id,
+            "effect_name": status.effect_name,
+            "description": status.description,
+            "duration": status.duration,
+            "is_debuff": status.is_debuff,
+            "stack_type": status.stack_type,
+            "max_stacks": status.max_stacks,
+            "expires_at": status.expires_at,
+            "stacks": status.stacks,
+            "applied": applied
+        })
+    descriptor["statuses"] = statuses
+
+    var skills: Array[Dictionary] = []
+    for skill in unit.skills:
+        skills.append(_capture_skill(skill))
+    descriptor["skills"] = skills
+    return descriptor
+
+static func build_unit(descriptor: Dictionary) -> BattleUnit:
+    var script_path: String = descriptor.get("script", "")
+    var unit: BattleUnit
+    if script_path.is_empty():
+        unit = BattleUnit.new()
+    else:
+        unit = load(script_path).new()
+    unit.name = descriptor.get("unit_id", "Unit")
+    unit.unit_name = descriptor.get("unit_name", "Unit")
+    for skill_data in descriptor.get("skills", []):
+        var skill_script: String = skill_data.get("script", "")
+        var skill: BattleSkill = BattleSkill.new() if skill_script.is_empty() else load(skill_script).new()
+        unit.add_skill(skill)
+    restore_unit(unit, descriptor)
+    return unit
+
+# Puts an existing unit, built from the same descriptor lineage, back into the
+# described state
+static func restore_unit(unit: BattleUnit, descriptor: Dictionary) -> void:
+    unit.team = descriptor.get("team", unit.team)
+    unit.stats = descriptor.get("base_stats", {}).duplicate(true)
+    unit.locked_resources = descriptor.get("locked_resources", {}).duplicate(true)
+    var tags: Array = descriptor.get("tags", [])
+    if tags.is_empty():
+        unit.remove_meta("tags")
+    else:
+        unit.set_meta("tags", tags.duplicate())
+
+    var skill_data: Array = descriptor.get("skills", [])
+    for i in range(mini(skill_data.size(), unit.skills.size())):
+        _restore_skill(unit.skills[i], skill_data[i])
+
+    unit.begin_stat_batch()
+    for stat_name in unit.stats.keys():
+        var projector: StatProjector = unit.get_stat_projector(stat_name, false)
+        if projector != null:
+            projector.clear()
+
+    var modifiers: Array = []
+    for entry in descriptor.get("modifier_table", []):
+        modifiers.append(StatProjector.StatModifier.new(entry[0], entry[1], entry[2], entry[3], entry[4].duplicate(), entry[5]))
+    var stat_modifiers: Dictionary = descriptor.get("stat_modifiers", {})
+    for stat_name in stat_modifiers:
+        var projector: StatProjector = unit.get_stat_projector(stat_name)
+        if projector == null:
+            continue
+        for ref in stat_modifiers[stat_name]:
+            projector.add_modifier(modifiers[ref])
+
+    unit.status_effects.clear()
+    for data in descriptor.get("statuses", []):
+        var status := StatusEffect.new(data["id"], data["effect_name"], data["description"])
+        status.duration = data["duration"]
+        status.is_debuff = data["is_debuff"]
+        status.stack_type = data["stack_type"]
+        status.max_stacks = data["max_stacks"]
+        status.expires_at = data["expires_at"]
+        status.stacks = data["stacks"]
+        # The modifiers are already on the projectors; only relink them
+        for applied in data["applied"]:
+            status.applied_modifiers.append({"modifier": modifiers[applied[0]], "stat": applied[1]})
+        unit.status_effects.append(status)
+    unit.commit_stat_batch()
+
+static func _modifier_ref(mod: StatProjector.StatModifier, table: Array, table_index: Dictionary) -> int:
+    if table_index.has(mod):
+        return table_index[mod]
+    var index := table.size()
+    table.append([mod.id, mod.op, mod.value, mod.priority, mod.applies_to.duplicate(), mod.expires_at_unix])
+    table_index[mod] = index
+    return index
+
+static func _capture_skill(skill: BattleSkill) -> Dictionary:
+    var properties: Dictionary = {}
+    for property in skill.get_property_list():
+        if not (property.usage & PROPERTY_USAGE_SCRIPT_VARIABLE) or not (property.usage & PROPERTY_USAGE_STORAGE):
+            continue
+        var value = skill.get(property.name)
+        if typeof(value) in [TYPE_OBJECT, TYPE_CALLABLE, TYPE_SIGNAL]:
+            continue
+        properties[property.name] = value
+    return {
+        "script": skill.get_script().resource_path,
+        "properties": properties,
+        "last_used_time": skill.last_used_time
+    }
+
+static func _restore_skill(skill: BattleSkill, data: Dictionary) -> void:
+    var properties: Dictionary = data.get("properties", {})
+    for property_name in properties:
+        var value = properties[property_name]
+        skill.set(property_name, value.duplicate() if value is Array else value)
+    skill.last_used_time = data.get("last_used_time", 0.0)
@@ -0,0 +1,112 @@
+class_name BattleReplayPlayer
+extends RefCounted
+
+# Re-simulates a BattleReplay on a headless AutoBattler. play() runs the whole
+# battle from the recorded starting state and compares every AI decision with
+# the recording; seek() rebuilds the units from the nearest checkpoint and
+# simulates only the rounds after it, leaving the battle paused at the start of
+# the requested round.
+#
+#   var player = BattleReplayPlayer.new(BattleReplay.load_from(path), rule_processor)
+#   var result = player.play(self)   # {"winner", "rounds", "matches", "diverged_at_round"}
+#   var battler = player.seek(12, self)
+#   battler.resume_battle()
+#   player.release()
+
+const BattleReplay = preload("res://src/battle/battle_replay.gd")
+
+var replay: BattleReplay
+var rule_processor = null
+# Battler of the last play()/seek(); freed by release() or the next call
+var battler: AutoBattler = null
+
+func _init(_replay: BattleReplay, _rule_processor = null) -> void:
+    replay = _replay
+    rule_processor = _rule_processor
+
+# Plays the battle to the end from its first round. `host` is the node the
+# battler is added under; it needs to be inside the scene tree.
+func play(host: Node) -> Dictionary:
+    _check_rules()
+    var battle = _create_battler(host)
+    var units: Array[BattleUnit] = []
+    for descriptor in replay.units:
+        units.append(BattleReplay.build_unit(descriptor))
+    battle.battle_seed = replay.battle_seed
+    battle.simulated_start_time = replay.start_time
+    battle.start_battle(_team_slice(units, true), _team_slice(units, false))
+
+    var diverged_at := _first_divergence(battle.replay)
+    return {
+        "winner": battle.winner,
+        "rounds": battle.current_round,
+        "matches": diverged_at == -1 and battle.winner == replay.winner,
+        "diverged_at_round": diverged_at
+    }
+
+# Returns a battler paused at the start of `round`, simulated from the
+# nearest checkpoint at or before it
+func seek(round: int, host: Node) -> AutoBattler:
+    _check_rules()
+    var checkpoint := replay.find_checkpoint(round)
+    if checkpoint.is_empty():
+        push_error("BattleReplayPlayer: no checkpoint at or before round %d" % round)
+        return null
+
+    var battle = _create_battler(host)
+    var units: Array[BattleUnit] = []
+    for i in range(replay.units.size()):
+        # Skills and scripts come from the initial descriptor; the state from the checkpoint
+        var unit := BattleReplay.build_unit(replay.units[i])
+        BattleReplay.restore_unit(unit, checkpoint.units[i])
+        units.append(unit)
+    battle.battle_seed = replay.battle_seed
+    battle.pause_at_round = round
+    battle.restore_battle(_team_slice(units, true), _team_slice(units, false), checkpoint)
+    return battle
+
+func release() -> void:
+    if battler and is_instance_valid(battler):
+        battler.queue_free()
+    battler = null
+
+func _create_battler(host: Node) -> AutoBattler:
+    release()
+    battler = AutoBattler.new()
+    battler.headless = true
+    battler.record_replay = true
+    battler.replay_checkpoint_interval = replay.checkpoint_interval
+    battler.max_rounds = replay.max_rounds
+    battler.rule_processor = rule_processor
+    host.add_child(battler)
+    return battler
+
+func _team_slice(units: Array[BattleUnit], first_team: bool) -> Array[BattleUnit]:
+    var team: Array[BattleUnit] = []
+    if first_team:
+        team.assign(units.slice(0, replay.team1_size))
+    else:
+        team.assign(units.slice(replay.team1_size))
+    return team
+
+func _check_rules() -> void:
+    var current_hash := BattleReplay.hash_rules(rule_processor)
+    if current_hash != replay.rules_hash:
+        push_warning("BattleReplayPlayer: rule set differs from the recording; playback may diverge")
+
+# Round of the first decision that differs from the recording, or -1
+func _first_divergence(played: BattleReplay) -> int:
+    var expected := replay.get_decision_offsets()
+    var actual := played.get_decision_offsets()
+    for i in range(mini(expected.size(), actual.size())):
+        var a: int = expected[i]
+        var b: int = actual[i]
+        var length: int = 5 + replay.decisions[a + 4]
+        if length != 5 + played.decisions[b + 4] \
+                or replay.decisions.slice(a, a + length) != played.decisions.slice(b, b + length):
+            return replay.decisions[a]
+    if expected.size() > actual.size():
+        return replay.decisions[expected[actual.size()]]
+    if actual.size() > expected.size():
+        return played.decisions[actual[expected.size()]]
+    return -1
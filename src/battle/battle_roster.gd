@@ -0,0 +1,136 @@
+class_name BattleRoster
+extends RefCounted
+
+# Alive units per team, kept current from unit_died and health changes so
+# callers can ask for allies, enemies and alive counts without scanning armies.
+# Views are read-only arrays in roster order; the same array is handed out
+# until the team's alive set changes, so callers must not hold on to one
+# across deaths.
+
+var _teams: Dictionary = {}  # Unit -> team key
+var _members: Dictionary = {}  # team -> Array[BattleUnit] in roster order
+var _alive: Dictionary = {}  # Unit -> true while counted as alive
+var _alive_counts: Dictionary = {}  # team -> int
+
+var _ally_views: Dictionary = {}  # team -> read-only Array[BattleUnit]
+var _enemy_views: Dictionary = {}  # team -> read-only Array[BattleUnit]
+var _empty_view: Array[BattleUnit] = []
+
+func _init() -> void:
+    _empty_view.make_read_only()
+
+# Adds a unit under `team`, or under unit.team when no team is given
+func add_unit(unit: BattleUnit, team = null) -> void:
+    if _teams.has(unit):
+        remove_unit(unit)
+    var key: int = unit.team if team == null else team
+    _teams[unit] = key
+    if not _members.has(key):
+        var members: Array[BattleUnit] = []
+        _members[key] = members
+        _alive_counts[key] = 0
+    _members[key].append(unit)
+    unit.unit_died.connect(_on_unit_died.bind(unit))
+    unit.stat_changed.connect(_on_unit_stat_changed.bind(unit))
+    if unit.is_alive():
+        _set_alive(unit, true)
+    else:
+        _invalidate_views(key)
+
+func remove_unit(unit) -> void:
+    if not _teams.has(unit):
+        return
+    var key: int = _teams[unit]
+    if _alive.has(unit):
+        _set_alive(unit, false)
+    _teams.erase(unit)
+    _members[key].erase(unit)
+    _invalidate_views(key)
+    # A unit reset for pooling has already dropped its connections
+    if is_instance_valid(unit) and unit.unit_died.is_connected(_on_unit_died.bind(unit)):
+        unit.unit_died.disconnect(_on_unit_died.bind(unit))
+        unit.stat_changed.disconnect(_on_unit_stat_changed.bind(unit))
+
+func clear() -> void:
+    for unit in _teams.keys():
+        remove_unit(unit)
+    _members.clear()
+    _alive_counts.clear()
+
+func has_unit(unit) -> bool:
+    return _teams.has(unit)
+
+func team_of(unit) -> int:
+    return _teams.get(unit, -1)
+
+func get_teams() -> Array:
+    return _members.keys()
+
+func alive_count(team: int) -> int:
+    return _alive_counts.get(team, 0)
+
+func total_alive() -> int:
+    return _alive.size()
+
+func total_units() -> int:
+    return _teams.size()
+
+func get_allies(team: int) -> Array[BattleUnit]:
+    if _ally_views.has(team):
+        return _ally_views[team]
+    if not _members.has(team):
+        return _empty_view
+    var view: Array[BattleUnit] = []
+    for unit in _members[team]:
+        if _alive.has(unit):
+            view.append(unit)
+    view.make_read_only()
+    _ally_views[team] = view
+    return view
+
+func get_enemies(team: int) -> Array[BattleUnit]:
+    if _enemy_views.has(team):
+        return _enemy_views[team]
+    var view: Array[BattleUnit] = []
+    for other_team in _members:
+        if other_team == team:
+            continue
+        for unit in _members[other_team]:
+            if _alive.has(unit):
+                view.append(unit)
+    view.make_read_only()
+    _enemy_views[team] = view
+    return view
+
+# Re-reads every unit's alive state, for units whose health was written
+# directly instead of through take_damage/heal
+func refresh() -> void:
+    for unit in _teams.keys():
+        _refresh_unit(unit)
+
+func _on_unit_died(unit: BattleUnit) -> void:
+    _refresh_unit(unit)
+
+func _on_unit_stat_changed(stat_name: String, _new_value, unit: BattleUnit) -> void:
+    if stat_name == "health" or stat_name == "max_health":
+        _refresh_unit(unit)
+
+func _refresh_unit(unit) -> void:
+    var alive = is_instance_valid(unit) and unit.is_alive()
+    if alive != _alive.has(unit):
+        _set_alive(unit, alive)
+
+func _set_alive(unit, alive: bool) -> void:
+    var key: int = _teams[unit]
+    if alive:
+        _alive[unit] = true
+        _alive_counts[key] += 1
+    else:
+        _alive.erase(unit)
+        _alive_counts[key] -= 1
+    _invalidate_views(key)
+
+func _invalidate_views(team: int) -> void:
+    _ally_views.erase(team)
+    # Every other team's enemy view includes this team
+    _enemy_views.clear()
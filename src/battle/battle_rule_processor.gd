@@ -4,11 +4,98 @@ extends Node
 const StatProjector = preload("res://src/skills/stat_projector.gd")
 const PROJECT_SETTING_RULES_PATH: String = "game/battle_rules_path"
 
-var rules: Array = []
+# Context keys whose eq/in conditions are used to bucket rules. Most rules are
+# gated on one of these, so a lookup only evaluates the rules that can match.
+const INDEXED_CONTEXT_KEYS: Array[String] = ["skill_name", "status_id", "skill_damage_type"]
+const DEFAULT_LOOKUP_CACHE_SIZE: int = 256
+const LOOKUP_KEY_ABSENT: int = 0
+const LOOKUP_KEY_VALUE: int = 1
+const LOOKUP_KEY_BUCKET: int = 2
+
+enum ConditionKind { INVALID, AND, OR, NOT, PROPERTY }
+enum ConditionOp { EQ, NEQ, GT, GTE, LT, LTE, CONTAINS, IN, REGEX }
+
+# Ops whose result against a numeric literal only depends on which side of the
+# literal the value falls
+const NUMERIC_THRESHOLD_OPS: Array = [ConditionOp.EQ, ConditionOp.NEQ, ConditionOp.GT, ConditionOp.GTE, ConditionOp.LT, ConditionOp.LTE]
+
+const CONDITION_OPS: Dictionary = {
+    "eq": ConditionOp.EQ,
+    "neq": ConditionOp.NEQ,
+    "gt": ConditionOp.GT,
+    "gte": ConditionOp.GTE,
+    "lt": ConditionOp.LT,
+    "lte": ConditionOp.LTE,
+    "contains": ConditionOp.CONTAINS,
+    "in": ConditionOp.IN,
+    "regex": ConditionOp.REGEX
+}
+
+class CompiledCondition:
+    var kind: int = 0
+    var children: Array = []
+    var property: String = ""
+    var op: int = 0
+    var value: Variant = null
+    var value_ref: String = ""
+    var regex: RegEx = null
+
+class ModifierSpec:
+    var id: String
+    var op: int
+    var value: float
+    var priority: int
+    var applies_to: Array
+    var expires_at: float
+    var duration: float
+    var has_duration: bool
+    # Shared StatModifier handed out by get_modifier_templates_for_context
+    var template: StatProjector.StatModifier = null
+
+class CompiledRule:
+    var order: int
+    var source: Dictionary
+    var condition: CompiledCondition
+    var modifier_specs: Array = []
+
+# Rule dictionaries, compiled into a lookup plan on first use. Assigning a new
+# array, add_temporary_rule() and load_rules_from_path() recompile it. Code
+# that changes the array or a rule in place (rules[i] = rule, or editing a
+# rule's conditions or modifiers) must call invalidate_rules() afterwards, or
+# lookups keep using the old plan and cached results.
+var rules: Array = []:
+    set(value):
+        rules = value
+        _plan_dirty = true
 var skip_auto_load: bool = false
 var rules_path_override: String = ""
 static var test_instance: Node = null
 
+# Lookups are memoized on the context properties the rules reference, least
+# recently used first. Properties only compared with numeric literals (health
+# percentages, round number, elapsed time) are keyed by where they fall
+# between those literals, so continuous values share entries. 0 disables the
+# cache.
+var lookup_cache_size: int = DEFAULT_LOOKUP_CACHE_SIZE
+
+# Compiled rule plan, rebuilt whenever `rules` is replaced, reloaded or invalidated
+var _plan_dirty: bool = true
+var _compiled_rule_count: int = 0
+var _compiled_rules: Array = []
+var _unindexed_rules: Array = []
+var _rule_index: Dictionary = {}  # context key -> { value -> Array[CompiledRule] }
+var _regex_cache: Dictionary = {}
+# Context key -> sorted PackedFloat64Array of the numeric literals it is
+# compared with, or null when a condition needs its exact value
+var _referenced_properties: Dictionary = {}
+var _temporary_rules: Array = []
+
+# Lookup key -> [read-only Array[ModifierSpec], read-only Array of templates].
+# Cleared whenever the plan changes.
+var _lookup_cache: Dictionary = {}
+var _lookup_hits: int = 0
+var _lookup_misses: int = 0
+
 func _ready() -> void:
     test_instance = self
     if skip_auto_load:
@@ -31,23 +118,157 @@ func add_temporary_rule(rule: Dictionary) -> void:
         push_warning("BattleRuleProcessor: Rule missing required fields ('conditions' and/or 'modifiers'). Rule data: " + str(rule))
         return
     rules.append(rule)
+    _temporary_rules.append(rule)
+    _lookup_cache.clear()
+    if not _plan_dirty and _compiled_rule_count == rules.size() - 1:
+        _add_to_plan(rule, rules.size() - 1)
+        _compiled_rule_count = rules.size()
 
-func get_modifiers_for_context(context: Dictionary) -> Array:
-    var modifiers: Array = []
-    
+# Recompiles the plan and empties the lookup cache on the next lookup
+func invalidate_rules() -> void:
+    _plan_dirty = true
+    _lookup_cache.clear()
+
+# Removes every rule added with add_temporary_rule, keeping the loaded rules
+func clear_temporary_rules() -> void:
+    if _temporary_rules.is_empty():
+        return
+    var kept: Array = []
     for rule in rules:
-        if not _validate_rule(rule):
-            push_warning("BattleRuleProcessor: Rule missing required fields ('conditions' and/or 'modifiers'). Rule data: " + str(rule))
-            continue
-        
-        if _eval_conditions(rule.conditions, context):
-            for modifier_data in rule.modifiers:
-                var mod = _create_modifier_from_data(modifier_data)
-                if mod != null:
-                    modifiers.append(mod)
-    
+        if not _temporary_rules.any(func(temporary): return is_same(temporary, rule)):
+            kept.append(rule)
+    _temporary_rules.clear()
+    rules = kept
+
+# Returns new StatModifier instances the caller owns and may change, e.g. to
+# set expires_at_unix or add them to a StatProjector. Durations count from
+# `now` on the caller's battle clock, or from wall-clock time when omitted.
+func get_modifiers_for_context(context: Dictionary, now: float = -1.0) -> Array:
+    var profile_start := Time.get_ticks_usec() if BattleProfiler.enabled else 0
+    var modifiers: Array = []
+    for spec in _lookup(context)[0]:
+        modifiers.append(_instantiate_modifier(spec, now))
+
+    if BattleProfiler.enabled:
+        BattleProfiler.record(BattleProfiler.RULE_LOOKUP, profile_start)
     return modifiers
 
+# Returns a read-only array of modifiers shared by every caller, for callers
+# that only read them. The modifiers must not be changed or added to a
+# StatProjector; duration-based expiry is only resolved on the instances from
+# get_modifiers_for_context.
+func get_modifier_templates_for_context(context: Dictionary) -> Array:
+    var profile_start := Time.get_ticks_usec() if BattleProfiler.enabled else 0
+    var templates: Array = _lookup(context)[1]
+    if BattleProfiler.enabled:
+        BattleProfiler.record(BattleProfiler.RULE_LOOKUP, profile_start)
+    return templates
+
+func clear_lookup_cache() -> void:
+    _lookup_cache.clear()
+    _lookup_hits = 0
+    _lookup_misses = 0
+
+func get_lookup_cache_stats() -> Dictionary:
+    var lookups: int = _lookup_hits + _lookup_misses
+    return {
+        "size": _lookup_cache.size(),
+        "capacity": lookup_cache_size,
+        "hits": _lookup_hits,
+        "misses": _lookup_misses,
+        "hit_rate": float(_lookup_hits) / lookups if lookups > 0 else 0.0
+    }
+
+func get_plan_summary() -> Dictionary:
+    _ensure_plan()
+    var indexed_keys: Dictionary = {}
+    for key in _rule_index:
+        indexed_keys[key] = _rule_index[key].size()
+    return {
+        "compiled_rules": _compiled_rules.size(),
+        "unindexed_rules": _unindexed_rules.size(),
+        "indexed_keys": indexed_keys
+    }
+
+func _lookup(context: Dictionary) -> Array:
+    _ensure_plan()
+    if lookup_cache_size <= 0:
+        return _evaluate_rules(context)
+
+    var key: Array = _lookup_key(context)
+    var cached = _lookup_cache.get(key)
+    if cached != null:
+        # Re-insert so the dictionary stays ordered from least to most recently used
+        _lookup_cache.erase(key)
+        _lookup_cache[key] = cached
+        _lookup_hits += 1
+        return cached
+
+    _lookup_misses += 1
+    var entry: Array = _evaluate_rules(context)
+    _lookup_cache[_own_key(key)] = entry
+    while _lookup_cache.size() > lookup_cache_size:
+        # Iteration starts at the least recently used entry
+        for oldest in _lookup_cache:
+            _lookup_cache.erase(oldest)
+            break
+    return entry
+
+# Two contexts with the same key match the same rules: conditions only read
+# the referenced properties, and a threshold comparison has the same result
+# for every value between two adjacent thresholds. Each property adds a
+# LOOKUP_KEY_* tag and its value or threshold bucket.
+func _lookup_key(context: Dictionary) -> Array:
+    var key: Array = []
+    for property in _referenced_properties:
+        if not context.has(property):
+            key.append(LOOKUP_KEY_ABSENT)
+            key.append(null)
+            continue
+        var value = context[property]
+        var thresholds = _referenced_properties[property]
+        if thresholds != null and (value is float or value is int):
+            key.append(LOOKUP_KEY_BUCKET)
+            key.append(_threshold_bucket(thresholds, value))
+        else:
+            key.append(LOOKUP_KEY_VALUE)
+            key.append(value)
+    return key
+
+# Even buckets lie between thresholds, odd ones on a threshold
+func _threshold_bucket(thresholds: PackedFloat64Array, value: float) -> int:
+    var index: int = thresholds.bsearch(value)
+    if index < thresholds.size() and thresholds[index] == value:
+        return index * 2 + 1
+    return index * 2
+
+# Copies container values of a key before it is stored, so later changes to
+# the caller's context cannot alter it
+func _own_key(key: Array) -> Array:
+    for i in range(1, key.size(), 2):
+        if key[i] is Array or key[i] is Dictionary:
+            return key.duplicate(true)
+    return key
+
+func _evaluate_rules(context: Dictionary) -> Array:
+    var specs: Array = []
+    var templates: Array = []
+    for rule in _collect_candidate_rules(context):
+        if _evaluate_compiled(rule.condition, context):
+            for spec in rule.modifier_specs:
+                specs.append(spec)
+                templates.append(_get_template(spec))
+    specs.make_read_only()
+    templates.make_read_only()
+    return [specs, templates]
+
+func _get_template(spec: ModifierSpec) -> StatProjector.StatModifier:
+    if spec.template == null:
+        var applies_to: Array = spec.applies_to.duplicate()
+        applies_to.make_read_only()
+        spec.template = StatProjector.StatModifier.new(spec.id, spec.op, spec.value, spec.priority, applies_to, spec.expires_at)
+    return spec.template
+
 func _check_condition(cond: Dictionary, context: Dictionary) -> bool:
     return _eval_conditions(cond, context)
 
@@ -55,66 +276,248 @@ func _validate_rule(rule: Dictionary) -> bool:
     return rule.has("conditions") and rule.has("modifiers")
 
 func _eval_conditions(cond: Dictionary, context: Dictionary) -> bool:
+    return _evaluate_compiled(_compile_condition(cond), context)
+
+func _create_modifier_from_data(data: Dictionary) -> StatProjector.StatModifier:
+    var spec: ModifierSpec = _compile_modifier(data)
+    if spec == null:
+        return null
+    return _instantiate_modifier(spec)
+
+func _ensure_plan() -> void:
+    # Rules appended to the array directly bypass the setter; catch that by size
+    if _plan_dirty or _compiled_rule_count != rules.size():
+        _compile_plan()
+
+func _compile_plan() -> void:
+    _compiled_rules.clear()
+    _unindexed_rules.clear()
+    _rule_index.clear()
+    _referenced_properties.clear()
+    _lookup_cache.clear()
+    for i in range(rules.size()):
+        _add_to_plan(rules[i], i)
+    _compiled_rule_count = rules.size()
+    _plan_dirty = false
+
+func _add_to_plan(rule: Variant, order: int) -> void:
+    if not rule is Dictionary or not _validate_rule(rule):
+        push_warning("BattleRuleProcessor: Rule missing required fields ('conditions' and/or 'modifiers'). Rule data: " + str(rule))
+        return
+
+    var compiled := CompiledRule.new()
+    compiled.order = order
+    compiled.source = rule
+    if rule.conditions is Dictionary:
+        compiled.condition = _compile_condition(rule.conditions)
+    else:
+        push_error("BattleRuleProcessor: Rule 'conditions' must be a dictionary. Rule data: " + str(rule))
+        compiled.condition = CompiledCondition.new()
+
+    for modifier_data in rule.modifiers:
+        if not modifier_data is Dictionary:
+            push_error("BattleRuleProcessor: Invalid modifier data - expected dictionary. Modifier data: " + str(modifier_data))
+            continue
+        var spec: ModifierSpec = _compile_modifier(modifier_data)
+        if spec != null:
+            compiled.modifier_specs.append(spec)
+
+    _compiled_rules.append(compiled)
+    _collect_referenced_properties(compiled.condition)
+
+    var terms: Dictionary = _find_index_terms(compiled.condition)
+    if terms.is_empty():
+        _unindexed_rules.append(compiled)
+        return
+
+    var buckets: Dictionary = _rule_index.get(terms.key, {})
+    for key_value in terms.values:
+        if not buckets.has(key_value):
+            buckets[key_value] = []
+        buckets[key_value].append(compiled)
+    _rule_index[terms.key] = buckets
+
+func _find_index_terms(condition: CompiledCondition) -> Dictionary:
+    # A rule can be bucketed when a top-level conjunct requires one of the
+    # indexed keys to equal (or be in) literal strings.
+    var conjuncts: Array = []
+    _collect_conjuncts(condition, conjuncts)
+
+    for key in INDEXED_CONTEXT_KEYS:
+        for conjunct in conjuncts:
+            if conjunct.property != key or not conjunct.value_ref.is_empty():
+                continue
+            if conjunct.op == ConditionOp.EQ and conjunct.value is String:
+                return {"key": key, "values": [conjunct.value]}
+            if conjunct.op == ConditionOp.IN:
+                var values: Array = []
+                for entry in conjunct.value:
+                    if not entry is String:
+                        values.clear()
+                        break
+                    values.append(entry)
+                if not values.is_empty():
+                    return {"key": key, "values": values}
+    return {}
+
+func _collect_referenced_properties(condition: CompiledCondition) -> void:
+    for child in condition.children:
+        _collect_referenced_properties(child)
+    if condition.kind != ConditionKind.PROPERTY:
+        return
+    if not condition.value_ref.is_empty():
+        _referenced_properties[condition.value_ref] = null
+        _referenced_properties[condition.property] = null
+        return
+    var numeric: bool = condition.value is float or condition.value is int
+    if not numeric or not (condition.op in NUMERIC_THRESHOLD_OPS):
+        _referenced_properties[condition.property] = null
+        return
+    if _referenced_properties.has(condition.property) and _referenced_properties[condition.property] == null:
+        return
+    var thresholds: PackedFloat64Array = _referenced_properties.get(condition.property, PackedFloat64Array())
+    if not thresholds.has(condition.value):
+        thresholds.insert(thresholds.bsearch(condition.value), condition.value)
+    _referenced_properties[condition.property] = thresholds
+
+func _collect_conjuncts(condition: CompiledCondition, out: Array) -> void:
+    match condition.kind:
+        ConditionKind.PROPERTY:
+            out.append(condition)
+        ConditionKind.AND:
+            for child in condition.children:
+                _collect_conjuncts(child, out)
+
+func _collect_candidate_rules(context: Dictionary) -> Array:
+    var buckets: Array = []
+    if not _unindexed_rules.is_empty():
+        buckets.append(_unindexed_rules)
+
+    for key in _rule_index:
+        if not context.has(key):
+            continue
+        var actual = context[key]
+        if not (actual is String or actual is StringName):
+            continue
+        var bucket = _rule_index[key].get(String(actual))
+        if bucket != null:
+            buckets.append(bucket)
+
+    if buckets.is_empty():
+        return []
+    if buckets.size() == 1:
+        return buckets[0]
+
+    # Keep rule order so modifier insertion order matches the rules file
+    var merged: Array = []
+    for bucket in buckets:
+        merged.append_array(bucket)
+    merged.sort_custom(func(a, b): return a.order < b.order)
+    return merged
+
+func _compile_condition(cond: Dictionary) -> CompiledCondition:
+    var compiled := CompiledCondition.new()
+
     # Handle logical operators first
-    if cond.has("and"):
-        var conditions = cond["and"]
+    if cond.has("and") or cond.has("or"):
+        var key: String = "and" if cond.has("and") else "or"
+        var conditions = cond[key]
         if not conditions is Array:
-            push_error("BattleRuleProcessor: 'and' operator requires array of conditions. Got: " + str(conditions))
-            return false
+            push_error("BattleRuleProcessor: '%s' operator requires array of conditions. Got: %s" % [key, str(conditions)])
+            return compiled
+        compiled.kind = ConditionKind.AND if key == "and" else ConditionKind.OR
         for subcond in conditions:
-            if not _eval_conditions(subcond, context):
-                return false
-        return true
-    
-    if cond.has("or"):
-        var conditions = cond["or"]
-        if not conditions is Array:
-            push_error("BattleRuleProcessor: 'or' operator requires array of conditions. Got: " + str(conditions))
-            return false
-        for subcond in conditions:
-            if _eval_conditions(subcond, context):
-                return true
-        return false
-    
+            if not subcond is Dictionary:
+                push_error("BattleRuleProcessor: '%s' operator requires array of conditions. Got: %s" % [key, str(subcond)])
+                compiled.children.append(CompiledCondition.new())
+                continue
+            compiled.children.append(_compile_condition(subcond))
+        return compiled
+
     if cond.has("not"):
-        return not _eval_conditions(cond["not"], context)
-    
+        if not cond["not"] is Dictionary:
+            push_error("BattleRuleProcessor: 'not' operator requires a condition. Got: " + str(cond["not"]))
+            return compiled
+        compiled.kind = ConditionKind.NOT
+        compiled.children.append(_compile_condition(cond["not"]))
+        return compiled
+
     # Handle property checks
     var property = cond.get("property", "")
     var op = cond.get("op", "eq")
     var value = cond.get("value", null)
-    
-    if property.is_empty():
+
+    if not property is String or property.is_empty():
         push_error("BattleRuleProcessor: Missing 'property' in condition: " + str(cond))
-        return false
-    
+        return compiled
+
+    if not CONDITION_OPS.has(op):
+        push_error("BattleRuleProcessor: Unknown operator '%s' in condition. Valid operators: eq, neq, gt, gte, lt, lte, contains, in, regex. Full condition: %s" % [op, str(cond)])
+        return compiled
+
+    compiled.property = property
+    compiled.op = CONDITION_OPS[op]
+    compiled.value = value
+
     # Allow looking up values by property reference
     if value is String and value.begins_with("$"):
-        var ref_prop = value.substr(1)
-        if not context.has(ref_prop):
+        compiled.value_ref = value.substr(1)
+    elif compiled.op == ConditionOp.IN and not _is_collection(value):
+        push_error("BattleRuleProcessor: 'in' operator requires array value. Got: " + str(typeof(value)))
+        return compiled
+    elif compiled.op == ConditionOp.REGEX:
+        compiled.regex = _get_regex(value)
+        if compiled.regex == null:
+            return compiled
+
+    compiled.kind = ConditionKind.PROPERTY
+    return compiled
+
+func _evaluate_compiled(condition: CompiledCondition, context: Dictionary) -> bool:
+    match condition.kind:
+        ConditionKind.AND:
+            for child in condition.children:
+                if not _evaluate_compiled(child, context):
+                    return false
+            return true
+        ConditionKind.OR:
+            for child in condition.children:
+                if _evaluate_compiled(child, context):
+                    return true
+            return false
+        ConditionKind.NOT:
+            return not _evaluate_compiled(condition.children[0], context)
+        ConditionKind.PROPERTY:
+            return _evaluate_property(condition, context)
+    return false
+
+func _evaluate_property(condition: CompiledCondition, context: Dictionary) -> bool:
+    var value = condition.value
+    if not condition.value_ref.is_empty():
+        if not context.has(condition.value_ref):
             return false
-        value = context[ref_prop]
-    
-    if not context.has(property):
+        value = context[condition.value_ref]
+
+    if not context.has(condition.property):
         # Property not present in this context; treat as non-match
         return false
-    
-    var actual = context[property]
-    
-    match op:
-        "eq":
+
+    var actual = context[condition.property]
+
+    match condition.op:
+        ConditionOp.EQ:
             return actual == value
-        "neq":
+        ConditionOp.NEQ:
             return actual != value
-        "gt":
+        ConditionOp.GT:
             return actual > value
-        "gte":
+        ConditionOp.GTE:
             return actual >= value
-        "lt":
+        ConditionOp.LT:
             return actual < value
-        "lte":
+        ConditionOp.LTE:
             return actual <= value
-        "contains":
+        ConditionOp.CONTAINS:
             if _is_collection(actual):
                 return _collection_contains(actual, value)
             if actual is String:
@@ -123,41 +526,66 @@ func _eval_conditions(cond: Dictionary, context: Dictionary) -> bool:
                 return actual == value
             push_error("BattleRuleProcessor: 'contains' operator requires array or string. Got: " + str(typeof(actual)))
             return false
-        "in":
+        ConditionOp.IN:
             if not _is_collection(value):
                 push_error("BattleRuleProcessor: 'in' operator requires array value. Got: " + str(typeof(value)))
                 return false
             return value.has(actual)
-        "regex":
+        ConditionOp.REGEX:
             if not actual is String:
                 push_error("BattleRuleProcessor: 'regex' operator requires string value. Got: " + str(typeof(actual)))
                 return false
-            var regex = RegEx.new()
-            regex.compile(value)
+            var regex: RegEx = condition.regex
+            if regex == null:
+                regex = _get_regex(value)
+                if regex == null:
+                    return false
             return regex.search(actual) != null
-        _:
-            push_error("BattleRuleProcessor: Unknown operator '%s' in condition. Valid operators: eq, neq, gt, gte, lt, lte, contains, in, regex. Full condition: %s" % [op, str(cond)])
-            return false
+    return false
 
-func _create_modifier_from_data(data: Dictionary) -> StatProjector.StatModifier:
+func _get_regex(pattern: Variant) -> RegEx:
+    if not pattern is String:
+        push_error("BattleRuleProcessor: 'regex' operator requires string pattern. Got: " + str(typeof(pattern)))
+        return null
+    if _regex_cache.has(pattern):
+        return _regex_cache[pattern]
+    var regex := RegEx.new()
+    if regex.compile(pattern) != OK:
+        push_error("BattleRuleProcessor: Invalid regex pattern '%s'" % pattern)
+        regex = null
+    _regex_cache[pattern] = regex
+    return regex
+
+func _compile_modifier(data: Dictionary) -> ModifierSpec:
     # Validate required fields
     var required = ["id", "op", "value"]
     var missing = required.filter(func(f): return not data.has(f))
     if not missing.is_empty():
         push_error("BattleRuleProcessor: Invalid modifier data - missing required fields: " + str(missing) + ". Modifier data: " + str(data))
         return null
-    
-    # Create modifier
-    var expires_at: float = data.get("expires_at", -1.0)
-    if expires_at < 0.0 and data.has("duration"):
-        expires_at = Time.get_unix_time_from_system() + float(data.get("duration", 0.0))
+
+    var spec := ModifierSpec.new()
+    spec.id = data.id
+    spec.op = _string_to_op(data.op)
+    spec.value = float(data.value)
+    spec.priority = data.get("priority", 0)
+    spec.applies_to = data.get("applies_to", [])
+    spec.expires_at = data.get("expires_at", -1.0)
+    spec.has_duration = data.has("duration")
+    spec.duration = float(data.get("duration", 0.0))
+    return spec
+
+func _instantiate_modifier(spec: ModifierSpec, now: float = -1.0) -> StatProjector.StatModifier:
+    var expires_at: float = spec.expires_at
+    if expires_at < 0.0 and spec.has_duration:
+        expires_at = (now if now >= 0.0 else Time.get_unix_time_from_system()) + spec.duration
 
     return StatProjector.StatModifier.new(
-        data.id,
-        _string_to_op(data.op),
-        float(data.value),
-        data.get("priority", 0),
-        data.get("applies_to", []),
+        spec.id,
+        spec.op,
+        spec.value,
+        spec.priority,
+        spec.applies_to,
         expires_at
     )
 
@@ -193,8 +621,10 @@ func load_rules_from_path(path: String) -> bool:
         return false
 
     rules.clear()
+    _temporary_rules.clear()
     var rule_array: Array = json_data
     rules.append_array(rule_array)
+    _compile_plan()
     print("Loaded %d battle rules from %s" % [rules.size(), path])
     return true
 
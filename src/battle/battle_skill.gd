@@ -17,6 +17,8 @@ const StatProjector = preload("res://src/skills/stat_projector.gd")
 @export var reaction_chance: float = 0.0  # For reaction skills
 
 var last_used_time: float = 0.0
+# Time source for cooldowns; AutoBattler points this at its battle clock
+var clock: Callable = Callable()
 
 func _serialize_modifier(mod: StatProjector.StatModifier) -> Dictionary:
     return {
@@ -39,10 +41,16 @@ func _modifier_op_to_string(op: int) -> String:
         _:
             return "UNKNOWN"
 
+func get_current_time() -> float:
+    if clock.is_valid():
+        return clock.call()
+    return Time.get_unix_time_from_system()
+
 func is_on_cooldown() -> bool:
-    if cooldown <= 0:
+    # last_used_time of 0 means the skill has not been used yet
+    if cooldown <= 0 or last_used_time <= 0.0:
         return false
-    var now = Time.get_unix_time_from_system()
+    var now = get_current_time()
     return now < (last_used_time + cooldown)
 
 func can_use(caster: BattleUnit) -> bool:
@@ -60,7 +68,7 @@ func can_use(caster: BattleUnit) -> bool:
 
 func get_unusable_reason(caster: BattleUnit) -> String:
     if is_on_cooldown():
-        var now = Time.get_unix_time_from_system()
+        var now = get_current_time()
         var remaining = last_used_time + cooldown - now
         return "on cooldown for %.1f more seconds (last_used: %.1f, now: %.1f, cooldown: %.1f)" % [remaining, last_used_time, now, cooldown]
     
@@ -96,7 +104,7 @@ func use(caster: BattleUnit) -> void:
             return
     
     # Always set last_used_time if we successfully use the skill
-    last_used_time = Time.get_unix_time_from_system()
+    last_used_time = get_current_time()
 
 func prepare_cast(caster: BattleUnit) -> SkillCast:
     var cast = SkillCast.new(self, caster)
@@ -111,12 +119,13 @@ func execute_on_target(caster: BattleUnit, target: BattleUnit, rule_processor =
     var context: Dictionary = _build_context(caster, target)
     var contextual_modifiers: Array = []
     if rule_processor != null:
-        contextual_modifiers = rule_processor.get_modifiers_for_context(context)
+        contextual_modifiers = rule_processor.get_modifiers_for_context(context, get_current_time())
 
     var damage_projector: StatProjector = StatProjector.new()
 
-    if caster.stat_projectors.has("attack"):
-        for mod in caster.stat_projectors["attack"].list_modifiers():
+    var attack_projector: StatProjector = caster.get_stat_projector("attack", false)
+    if attack_projector != null:
+        for mod in attack_projector.list_modifiers():
             var cloned_mod := StatProjector.StatModifier.new(
                 mod.id,
                 mod.op,
@@ -221,7 +230,7 @@ func _apply_effects(caster: BattleUnit, target: BattleUnit, amount: float) -> Di
     effect["target_id"] = target.name if target else caster.name
     return effect
 
-func get_targets(caster: BattleUnit, allies: Array[BattleUnit], enemies: Array[BattleUnit]) -> Array[BattleUnit]:
+func get_targets(caster: BattleUnit, allies: Array[BattleUnit], enemies: Array[BattleUnit], rng: RandomNumberGenerator = null) -> Array[BattleUnit]:
     var valid_targets: Array[BattleUnit] = []
     
     match target_type:
@@ -238,20 +247,27 @@ func get_targets(caster: BattleUnit, allies: Array[BattleUnit], enemies: Array[B
         "random_enemy":
             var alive_enemies = enemies.filter(func(u): return u.is_alive())
             if not alive_enemies.is_empty():
-                valid_targets = [alive_enemies[randi() % alive_enemies.size()]]
+                var roll = rng.randi() if rng else randi()
+                valid_targets = [alive_enemies[roll % alive_enemies.size()]]
         "lowest_health_enemy":
-            var alive_enemies = enemies.filter(func(u): return u.is_alive())
-            if not alive_enemies.is_empty():
-                alive_enemies.sort_custom(func(a, b): return a.stats.health < b.stats.health)
-                valid_targets = [alive_enemies[0]]
+            var lowest = _find_lowest_health(enemies)
+            if lowest != null:
+                valid_targets = [lowest]
         "lowest_health_ally":
-            var alive_allies = allies.filter(func(u): return u.is_alive())
-            if not alive_allies.is_empty():
-                alive_allies.sort_custom(func(a, b): return a.stats.health < b.stats.health)
-                valid_targets = [alive_allies[0]]
+            var lowest = _find_lowest_health(allies)
+            if lowest != null:
+                valid_targets = [lowest]
     
     return valid_targets
 
+# One pass over the candidates; the first of several equally hurt units wins
+func _find_lowest_health(candidates: Array[BattleUnit]) -> BattleUnit:
+    var lowest: BattleUnit = null
+    for candidate in candidates:
+        if candidate.is_alive() and (lowest == null or candidate.stats.health < lowest.stats.health):
+            lowest = candidate
+    return lowest
+
 func has_tag(tag: String) -> bool:
     return tags.has(tag)
 
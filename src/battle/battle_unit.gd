@@ -7,11 +7,13 @@ signal unit_died
 signal stat_changed(stat_name: String, new_value: float)
 signal status_applied(status: StatusEffect)
 signal status_removed(status: StatusEffect)
+# Emitted by BattleUnitPool.release() before reset() drops every connection
+signal released
 
 @export var unit_name: String = "Unit"
 @export var team: int = 1
 
-var stats: Dictionary = {
+const DEFAULT_STATS := {
     "health": 100.0,
     "max_health": 100.0,
     "attack": 10.0,
@@ -21,39 +23,182 @@ var stats: Dictionary = {
     "attacks_taken": 0,
     "damage_taken": 0.0
 }
+# Interned ids of DEFAULT_STATS. Hot paths pass these to get_projected_stat()
+# to skip the name lookups.
+const STAT_HEALTH := 0
+const STAT_MAX_HEALTH := 1
+const STAT_ATTACK := 2
+const STAT_DEFENSE := 3
+const STAT_SPEED := 4
+const STAT_INITIATIVE := 5
+const STAT_ATTACKS_TAKEN := 6
+const STAT_DAMAGE_TAKEN := 7
+const UNIT_SIGNALS := ["unit_died", "stat_changed", "status_applied", "status_removed", "released"]
+
+var stats: Dictionary = DEFAULT_STATS.duplicate()
+
+## @deprecated: Use get_stat_projector().
+# Compatibility view of the projectors by stat name. Reading it creates a
+# projector for every stat and makes every later projected-stat read check the
+# view for replaced projectors. get_stat_projector() only allocates one for the
+# stat that is actually being modified.
+var stat_projectors: Dictionary:
+    get:
+        for stat_key in stats.keys():
+            _ensure_stat_projector(stat_key)
+        _projector_table_exposed = true
+        return _projector_table
+    set(value):
+        _projector_table = value
+        _projector_table_exposed = true
+        _projectors.clear()
 
-var stat_projectors: Dictionary = {}
 var skills: Array[BattleSkill] = []
 var status_effects: Array[StatusEffect] = []
 var equipment: Dictionary = {}
 var locked_resources: Dictionary = {}  # Track reserved resources for pending skill casts
-
-func _init() -> void:
-    # Initialize stat projectors in _init so they're available before _ready
-    for stat_name in stats.keys():
-        stat_projectors[stat_name] = StatProjector.new()
+# Time source for status and modifier durations; AutoBattler points this at its battle clock
+var clock: Callable = Callable()
+
+var _stat_batch_depth: int = 0
+var _batched_projectors: Dictionary = {}
+var _committing_stat_batch: bool = false
+
+# Stat names are interned to small ids shared by all units; DEFAULT_STATS are
+# pre-interned to the STAT_* constants. Projectors exist only for stats that
+# have had modifiers; _projectors indexes them by id and _projector_table by
+# name. Projected values are cached per id in packed arrays, valid while both
+# the base value and the projector revision match. Base values stay in `stats`,
+# which callers read and write directly by name.
+static var _stat_ids: Dictionary = {
+    "health": STAT_HEALTH,
+    "max_health": STAT_MAX_HEALTH,
+    "attack": STAT_ATTACK,
+    "defense": STAT_DEFENSE,
+    "speed": STAT_SPEED,
+    "initiative": STAT_INITIATIVE,
+    "attacks_taken": STAT_ATTACKS_TAKEN,
+    "damage_taken": STAT_DAMAGE_TAKEN
+}
+static var _stat_names: PackedStringArray = PackedStringArray([
+    "health", "max_health", "attack", "defense", "speed", "initiative", "attacks_taken", "damage_taken"
+])
+
+var _projectors: Array = []
+var _projector_table: Dictionary = {}
+var _projector_table_exposed: bool = false
+var _cached_base: PackedFloat64Array = PackedFloat64Array()
+var _cached_projection: PackedFloat64Array = PackedFloat64Array()
+var _cached_revision: PackedInt64Array = PackedInt64Array()
+
+static func stat_id(stat_name) -> int:
+    var key_name: String = stat_name if stat_name is String else String(stat_name)
+    var id = _stat_ids.get(key_name, -1)
+    if id < 0:
+        id = _stat_ids.size()
+        _stat_ids[key_name] = id
+        _stat_names.append(key_name)
+    return id
 
 func _ready() -> void:
-    # Initialize any missing stat projectors (for dynamically added stats like mana)
-    for stat_name in stats.keys():
-        _ensure_stat_projector(stat_name)
-    
-    # Connect signals after node is in tree
-    for stat_name in stats.keys():
-        stat_projectors[stat_name].connect("stat_calculation_changed", _on_stat_calculation_changed.bind(stat_name))
+    # Connect the projectors created before the unit entered the tree; later ones connect on creation
+    for stat_name in _projector_table:
+        var on_changed := _on_stat_calculation_changed.bind(stat_name)
+        if not _projector_table[stat_name].is_connected("stat_calculation_changed", on_changed):
+            _projector_table[stat_name].connect("stat_calculation_changed", on_changed)
     
     recalculate_stats()
 
 func _on_stat_calculation_changed(payload: Dictionary, stat_name: String) -> void:
+    if _committing_stat_batch:
+        return
     stat_changed.emit(stat_name, get_projected_stat(stat_name))
 
+# Groups modifier changes across all stat projectors so each touched stat is
+# recomputed and reported through stat_changed once, on the outermost commit.
+func begin_stat_batch() -> void:
+    _stat_batch_depth += 1
+    if _stat_batch_depth > 1:
+        return
+    for stat_name in _projector_table:
+        var projector: StatProjector = _projector_table[stat_name]
+        projector.begin_batch()
+        _batched_projectors[stat_name] = projector
+
+func commit_stat_batch() -> void:
+    if _stat_batch_depth == 0:
+        push_error("commit_stat_batch called without a matching begin_stat_batch")
+        return
+
+    _stat_batch_depth -= 1
+    if _stat_batch_depth > 0:
+        return
+
+    var changed_stats: Array[String] = []
+    _committing_stat_batch = true
+    for stat_name in _batched_projectors:
+        if _batched_projectors[stat_name].commit_batch():
+            changed_stats.append(stat_name)
+    _committing_stat_batch = false
+    _batched_projectors.clear()
+
+    for stat_name in changed_stats:
+        stat_changed.emit(stat_name, get_projected_stat(stat_name))
+
+# Accepts a stat name or an id from stat_id() / the STAT_* constants. Ids skip
+# the interning lookup and read the base value by its String key only.
 func get_projected_stat(stat_name) -> float:
-    var key_name: String = String(stat_name)
-    if not _ensure_stat_projector(key_name):
-        push_error("Unknown stat: " + stat_name)
-        return 0.0
-    var raw_value = stats.get(key_name, stats.get(StringName(key_name), 0.0))
-    return stat_projectors[key_name].calculate_stat(raw_value)
+    if stat_name is int:
+        if stat_name < 0 or stat_name >= _stat_names.size():
+            push_error("Unknown stat id: %d" % stat_name)
+            return 0.0
+        var interned: String = _stat_names[stat_name]
+        return _project_stat(stat_name, interned, stats.get(interned))
+
+    var key_name: String = stat_name if stat_name is String else String(stat_name)
+    var raw_value = stats.get(key_name)
+    if raw_value == null:
+        raw_value = stats.get(StringName(key_name))
+    return _project_stat(stat_id(key_name), key_name, raw_value)
+
+func _project_stat(id: int, key_name: String, raw_value) -> float:
+    var projector: StatProjector = _projector_at(id, key_name)
+    if projector == null:
+        if raw_value == null:
+            push_error("Unknown stat: " + key_name)
+            return 0.0
+        return float(raw_value)
+
+    var base: float = 0.0 if raw_value == null else float(raw_value)
+    if _cached_revision[id] == projector.revision and _cached_base[id] == base:
+        if BattleProfiler.enabled:
+            BattleProfiler.count(BattleProfiler.STAT_CACHE_HITS)
+        return _cached_projection[id]
+    if BattleProfiler.enabled:
+        BattleProfiler.count(BattleProfiler.STAT_CACHE_MISSES)
+    var projected: float = projector.calculate_stat(base)
+    _cached_base[id] = base
+    _cached_projection[id] = projected
+    _cached_revision[id] = projector.revision
+    return projected
+
+# Returns the projector for a stat, creating it on first use unless `create` is
+# false. Returns null for stats the unit does not have.
+func get_stat_projector(stat_name, create: bool = true) -> StatProjector:
+    var key_name: String = stat_name if stat_name is String else String(stat_name)
+    if create:
+        return _ensure_stat_projector(key_name)
+    return _projector_at(stat_id(key_name), key_name)
+
+func get_current_time() -> float:
+    if clock.is_valid():
+        return clock.call()
+    return Time.get_unix_time_from_system()
+
+# Drops expired modifiers from every stat that has any
+func prune_expired_modifiers(now: float = -1.0) -> void:
+    for projector in _projector_table.values():
+        projector.prune_expired(now)
 
 func capture_battle_state() -> Dictionary:
     var base_stats: Dictionary = {}
@@ -82,12 +227,12 @@ func capture_battle_state() -> Dictionary:
     }
 
 func _serialize_stat_modifiers(stat_name: String) -> Array[Dictionary]:
-    var key_name: String = String(stat_name)
-    if not _ensure_stat_projector(key_name):
+    var projector: StatProjector = get_stat_projector(stat_name, false)
+    if projector == null:
         return []
 
     var serialized: Array[Dictionary] = []
-    for mod in stat_projectors[key_name].list_modifiers():
+    for mod in projector.list_modifiers():
         if not mod is StatProjector.StatModifier:
             continue
 
@@ -114,24 +259,57 @@ func _modifier_op_to_string(op: int) -> String:
             return "UNKNOWN"
 
 func _ensure_stat_projector(stat_name) -> StatProjector:
-    var key_name: String = String(stat_name)
-    if stat_projectors.has(key_name):
-        return stat_projectors[key_name]
+    var key_name: String = stat_name if stat_name is String else String(stat_name)
+    var id: int = stat_id(key_name)
+    var projector: StatProjector = _projector_at(id, key_name)
+    if projector != null:
+        return projector
 
-    var key_name_sn = StringName(key_name)
-
-    if not stats.has(key_name) and not stats.has(key_name_sn):
+    if not stats.has(key_name) and not stats.has(StringName(key_name)):
         return null
 
-    var projector: StatProjector = StatProjector.new()
-    stat_projectors[key_name] = projector
-    if is_inside_tree():
-        projector.connect("stat_calculation_changed", _on_stat_calculation_changed.bind(key_name))
+    projector = StatProjector.new()
+    _projector_table[key_name] = projector
+    _index_projector(id, key_name, projector)
     return projector
 
+func _projector_at(id: int, key_name: String) -> StatProjector:
+    if _projector_table_exposed:
+        # Code holding the stat_projectors view may have stored projectors into it
+        var listed = _projector_table.get(key_name)
+        if listed != (_projectors[id] if id < _projectors.size() else null):
+            _index_projector(id, key_name, listed)
+    if id < _projectors.size():
+        return _projectors[id]
+    return null
+
+func _index_projector(id: int, key_name: String, projector: StatProjector) -> void:
+    if _projectors.size() <= id:
+        _projectors.resize(id + 1)
+        var cached: int = _cached_revision.size()
+        _cached_base.resize(id + 1)
+        _cached_projection.resize(id + 1)
+        _cached_revision.resize(id + 1)
+        for i in range(cached, id + 1):
+            _cached_revision[i] = -1
+    var previous = _projectors[id]
+    _projectors[id] = projector
+    _cached_revision[id] = -1
+    var on_changed := _on_stat_calculation_changed.bind(key_name)
+    if previous != null and previous.is_connected("stat_calculation_changed", on_changed):
+        previous.disconnect("stat_calculation_changed", on_changed)
+    if projector == null:
+        return
+
+    if is_inside_tree() and not projector.is_connected("stat_calculation_changed", on_changed):
+        projector.connect("stat_calculation_changed", on_changed)
+    if _stat_batch_depth > 0:
+        projector.begin_batch()
+        _batched_projectors[key_name] = projector
+
 func take_damage(amount: float) -> void:
     var actual_damage = amount
-    var defense = get_projected_stat("defense")
+    var defense = get_projected_stat(STAT_DEFENSE)
     actual_damage = max(1.0, actual_damage - defense)
     
     var current_health: float = stats.get("health", 0.0)
@@ -155,7 +333,7 @@ func take_damage(amount: float) -> void:
     stat_changed.emit("damage_taken", stats.get("damage_taken", 0.0))
 
 func heal(amount: float) -> void:
-    var max_health = get_projected_stat("max_health")
+    var max_health = get_projected_stat(STAT_MAX_HEALTH)
     var new_health = min(stats.get("health", 0.0) + amount, max_health)
     stats["health"] = new_health
     stat_changed.emit("health", new_health)
@@ -183,21 +361,25 @@ func get_status_list() -> Array[String]:
     return result
 
 func clear_status_effects() -> void:
+    begin_stat_batch()
     for status in status_effects.duplicate():
         remove_status_effect(status)
     status_effects.clear()
+    commit_stat_batch()
 
 func add_skill(skill: BattleSkill) -> void:
     if not skills.has(skill):
         skills.append(skill)
 
 func equip_item(slot: String, item: Equipment) -> void:
+    begin_stat_batch()
     if equipment.has(slot):
         var old_item = equipment[slot]
         old_item.unequip_from(self)
     
     equipment[slot] = item
     item.equip_to(self)
+    commit_stat_batch()
 
 func unequip_item(slot: String) -> void:
     if equipment.has(slot):
@@ -211,7 +393,7 @@ func recalculate_stats() -> void:
         stat_changed.emit(stat_name, projected)
 
 func get_health_percentage() -> float:
-    var max_health = get_projected_stat("max_health")
+    var max_health = get_projected_stat(STAT_MAX_HEALTH)
     if max_health <= 0:
         return 0.0
     return stats.health / max_health
@@ -236,9 +418,10 @@ func is_alive() -> bool:
 func reset_initiative() -> void:
     stats.initiative = 0.0
 
-func roll_initiative() -> float:
-    var speed = get_projected_stat("speed")
-    stats.initiative = speed + randf_range(0, 2)
+func roll_initiative(rng: RandomNumberGenerator = null) -> float:
+    var speed = get_projected_stat(STAT_SPEED)
+    var roll = rng.randf_range(0, 2) if rng else randf_range(0, 2)
+    stats.initiative = speed + roll
     return stats.initiative
 
 func lock_resource(resource_type: String, amount: float) -> void:
@@ -264,5 +447,47 @@ func get_available_resource(resource_type: String) -> float:
 func clear_locked_resources() -> void:
     locked_resources.clear()
 
+# Returns the unit to the state of a newly created one so BattleUnitPool can
+# hand it out again. Projectors of DEFAULT_STATS are kept but emptied, those of
+# other stats are dropped, and every connection to the unit's own signals is
+# dropped.
+func reset() -> void:
+    for signal_name in UNIT_SIGNALS:
+        for connection in get_signal_connection_list(signal_name):
+            disconnect(signal_name, connection.callable)
+    
+    if _stat_batch_depth > 0:
+        push_warning("BattleUnit.reset called inside a stat batch")
+        _stat_batch_depth = 1
+        commit_stat_batch()
+    
+    for slot in equipment:
+        equipment[slot].equipped_to = null
+    equipment.clear()
+    status_effects.clear()
+    skills.clear()
+    locked_resources.clear()
+    clock = Callable()
+    for stat_name in _projector_table.keys():
+        if not DEFAULT_STATS.has(stat_name):
+            # Stats such as mana only exist on some units; a reused unit gets them again only if it is given them
+            _index_projector(stat_id(stat_name), stat_name, null)
+            _projector_table.erase(stat_name)
+            continue
+        _projector_table[stat_name].clear()
+        _projector_table[stat_name].time_source = Callable()
+    _cached_revision.fill(-1)
+    
+    stats = DEFAULT_STATS.duplicate()
+    unit_name = "Unit"
+    team = 1
+    position = Vector2.ZERO
+    rotation = 0.0
+    scale = Vector2.ONE
+    modulate = Color.WHITE
+    visible = true
+    for meta_name in get_meta_list():
+        remove_meta(meta_name)
+
 func get_turn_order() -> int:
     return floori(stats.initiative)
@@ -0,0 +1,85 @@
+class_name BattleUnitPool
+extends RefCounted
+
+# Reuses BattleUnit nodes, together with their UnitVisual child, across waves
+# and battles. acquire() hands out a unit in its newly created state;
+# release() takes it out of the scene tree, resets it and keeps it for the
+# next acquire(). Units that were acquired and never released are counted by
+# get_active_count(), which tests use as a leak check. Pooled units are
+# outside the scene tree, so the owner must call clear() to free them.
+#
+#   var unit = pool.acquire()
+#   ...
+#   battler.detach_units([unit])
+#   pool.release(unit)
+
+const DEFAULT_MAX_POOLED := 128
+
+# Released units beyond this are freed instead of kept
+var max_pooled: int = DEFAULT_MAX_POOLED
+
+var _pooled: Array[BattleUnit] = []
+var _active: Dictionary = {}  # BattleUnit -> true while handed out
+var _created: int = 0
+var _reused: int = 0
+
+func acquire() -> BattleUnit:
+    var unit: BattleUnit
+    if _pooled.is_empty():
+        unit = BattleUnit.new()
+        _created += 1
+    else:
+        unit = _pooled.pop_back()
+        _reused += 1
+    _active[unit] = true
+    return unit
+
+func release(unit: BattleUnit) -> void:
+    if not _active.has(unit):
+        push_error("BattleUnitPool: unit was not acquired from this pool or was already released")
+        return
+    _active.erase(unit)
+    if not is_instance_valid(unit):
+        return
+
+    var parent = unit.get_parent()
+    if parent:
+        parent.remove_child(unit)
+    var visual = unit.get_node_or_null("UnitVisual")
+    if visual:
+        visual.release()
+    # Battle contexts still tracking the unit untrack it before reset() drops their connections
+    unit.released.emit()
+    unit.reset()
+
+    if _pooled.size() >= max_pooled:
+        unit.free()
+    else:
+        _pooled.append(unit)
+
+func release_all(units: Array) -> void:
+    for unit in units:
+        release(unit)
+
+func is_active(unit) -> bool:
+    return _active.has(unit)
+
+func get_active_count() -> int:
+    return _active.size()
+
+func get_pooled_count() -> int:
+    return _pooled.size()
+
+func get_stats() -> Dictionary:
+    return {
+        "created": _created,
+        "reused": _reused,
+        "active": _active.size(),
+        "pooled": _pooled.size()
+    }
+
+# Frees every pooled unit. Units still handed out are left to their owners.
+func clear() -> void:
+    for unit in _pooled:
+        unit.free()
+    _pooled.clear()
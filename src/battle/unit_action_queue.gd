@@ -1,27 +1,38 @@
 class_name UnitActionQueue
 extends RefCounted
 
-# Priority queue for managing unit action order
-var priority_queue: Array[Dictionary] = []
+# Schedules unit actions on a binary heap keyed by next action time
 var registered_units: Array[BattleUnit] = []
 
 # Configuration
 var base_action_delay: float = 1.0  # Base time between actions
 var speed_scaling_factor: float = 0.1  # How much speed affects action rate
 
+# Optional clock returning the current battle time in seconds. Defaults to the
+# system clock; a simulated clock makes scheduling reproducible and lets it run
+# faster than real time.
+var battle_clock: Callable = Callable()
+
 # Internal state
-var _last_update_time: float = 0.0
 var _unit_timers: Dictionary = {}  # Unit -> next action time
+var _unit_delays: Dictionary = {}  # Unit -> action delay its current timer was scheduled with
+var _live_entries: Dictionary = {}  # Unit -> sequence number of its live heap entry
+
+# Min-heap of [next_action_time, sequence, unit] entries; the sequence breaks
+# ties in scheduling order. Rescheduling pushes a new entry and marks it live,
+# and stale entries are skipped when they reach the top.
+var _action_heap: Array = []
+var _next_sequence: int = 0
+# Units found dead when their turn came up; they rejoin the heap if revived
+var _dormant_units: Dictionary = {}
 
 func register_unit(unit: BattleUnit) -> void:
     if not registered_units.has(unit):
         registered_units.append(unit)
-        _unit_timers[unit] = 0.0
-        _update_unit_in_queue(unit)
+        _schedule(unit, 0.0, _calculate_action_delay(unit))
 
 func unregister_unit(unit: BattleUnit) -> void:
     registered_units.erase(unit)
-    _unit_timers.erase(unit)
     _remove_unit_from_queue(unit)
 
 func update_unit_priority(unit: BattleUnit) -> void:
@@ -29,33 +40,52 @@ func update_unit_priority(unit: BattleUnit) -> void:
         _update_unit_in_queue(unit)
 
 func get_action_order() -> Array[Dictionary]:
-    var current_time = Time.get_unix_time_from_system()
+    var current_time = get_current_time()
     var ready_units: Array[Dictionary] = []
+    _wake_revived_units(current_time)
     
-    # Update all unit timers
-    for unit in registered_units:
-        if not unit.is_alive():
+    # Pop every unit whose action time has come
+    var low_health_teams = null
+    while not _action_heap.is_empty() and _action_heap[0][0] <= current_time:
+        var entry = _heap_pop(_action_heap)
+        var unit = entry[2]
+        if _live_entries.get(unit, -1) != entry[1]:
+            continue
+        if not is_instance_valid(unit) or not unit.is_alive():
+            _dormant_units[unit] = true
             continue
         
-        if _is_unit_ready(unit, current_time):
-            var priority = calculate_action_priority(unit)
-            ready_units.append({
-                "unit": unit,
-                "priority": priority
-            })
+        if low_health_teams == null and _has_finisher(unit):
+            low_health_teams = _find_low_health_teams()
+        ready_units.append({
+            "unit": unit,
+            "priority": _calculate_priority(unit, low_health_teams),
+            "sequence": entry[1]
+        })
     
-    # Sort by priority (higher first)
-    ready_units.sort_custom(func(a, b): return a.priority > b.priority)
+    # Sort by priority (higher first), then by scheduling order for reproducibility
+    ready_units.sort_custom(func(a, b): return a.priority > b.priority or (a.priority == b.priority and a.sequence < b.sequence))
     
     # Update timers for units that will act
     for unit_data in ready_units:
         _reset_unit_timer(unit_data.unit, current_time)
+        unit_data.erase("sequence")
     
     return ready_units
 
+func get_current_time() -> float:
+    if battle_clock.is_valid():
+        return battle_clock.call()
+    return Time.get_unix_time_from_system()
+
 func calculate_action_priority(unit: BattleUnit) -> float:
-    var speed = unit.get_projected_stat("speed")
-    var initiative = unit.get_projected_stat("initiative")
+    return _calculate_priority(unit, null)
+
+# `low_health_teams` is the set of teams with a unit below 20% health; callers
+# scoring several units share one scan, and null means "scan if needed"
+func _calculate_priority(unit: BattleUnit, low_health_teams) -> float:
+    var speed = unit.get_projected_stat(BattleUnit.STAT_SPEED)
+    var initiative = unit.get_projected_stat(BattleUnit.STAT_INITIATIVE)
     
     # Base priority from stats
     var base_priority = speed * 2.0 + initiative
@@ -64,7 +94,7 @@ func calculate_action_priority(unit: BattleUnit) -> float:
     var condition_modifier = _calculate_condition_modifier(unit)
     
     # Factor in skill readiness
-    var skill_urgency = _calculate_skill_urgency(unit)
+    var skill_urgency = _calculate_skill_urgency(unit, low_health_teams)
     
     return (base_priority * condition_modifier + skill_urgency) / 3.0
 
@@ -78,7 +108,7 @@ func get_time_until_next_action(unit: BattleUnit) -> float:
     if not _unit_timers.has(unit):
         return INF
     
-    var current_time = Time.get_unix_time_from_system()
+    var current_time = get_current_time()
     var next_action_time = _unit_timers[unit]
     
     if current_time >= next_action_time:
@@ -89,7 +119,7 @@ func get_time_until_next_action(unit: BattleUnit) -> float:
 func force_unit_action(unit: BattleUnit) -> void:
     # Force a unit to act immediately (for reactions/interrupts)
     if registered_units.has(unit):
-        _unit_timers[unit] = Time.get_unix_time_from_system()
+        _schedule(unit, get_current_time(), _unit_delays.get(unit, _calculate_action_delay(unit)))
 
 # Internal methods
 func _is_unit_ready(unit: BattleUnit, current_time: float) -> bool:
@@ -99,7 +129,26 @@ func _is_unit_ready(unit: BattleUnit, current_time: float) -> bool:
     return current_time >= _unit_timers[unit]
 
 func _reset_unit_timer(unit: BattleUnit, current_time: float) -> void:
-    _unit_timers[unit] = current_time + _calculate_action_delay(unit)
+    var delay = _calculate_action_delay(unit)
+    _schedule(unit, current_time + delay, delay)
+
+func _schedule(unit: BattleUnit, next_time: float, delay: float) -> void:
+    _unit_timers[unit] = next_time
+    _unit_delays[unit] = delay
+    _live_entries[unit] = _next_sequence
+    _dormant_units.erase(unit)
+    _heap_push(_action_heap, [next_time, _next_sequence, unit])
+    _next_sequence += 1
+
+func _wake_revived_units(current_time: float) -> void:
+    if _dormant_units.is_empty():
+        return
+    for unit in _dormant_units.keys():
+        if not is_instance_valid(unit):
+            _dormant_units.erase(unit)
+        elif unit.is_alive():
+            # Its turn came while it was down, so it is ready at once
+            _schedule(unit, min(_unit_timers[unit], current_time), _unit_delays[unit])
 
 func _calculate_condition_modifier(unit: BattleUnit) -> float:
     var modifier: float = 1.0
@@ -117,7 +166,7 @@ func _calculate_condition_modifier(unit: BattleUnit) -> float:
     
     return modifier
 
-func _calculate_skill_urgency(unit: BattleUnit) -> float:
+func _calculate_skill_urgency(unit: BattleUnit, low_health_teams = null) -> float:
     var urgency: float = 0.0
     
     # Check if unit has important skills ready
@@ -132,9 +181,11 @@ func _calculate_skill_urgency(unit: BattleUnit) -> float:
             urgency = max(urgency, 40.0)
         elif skill.has_tag("finisher"):
             # Check if any enemy is low health
+            if low_health_teams == null:
+                low_health_teams = _find_low_health_teams()
             var has_low_health_enemy = false
-            for other_unit in registered_units:
-                if other_unit.team != unit.team and other_unit.get_health_percentage() < 0.2:
+            for team in low_health_teams:
+                if team != unit.team:
                     has_low_health_enemy = true
                     break
             
@@ -143,54 +194,118 @@ func _calculate_skill_urgency(unit: BattleUnit) -> float:
     
     return urgency
 
+func _has_finisher(unit: BattleUnit) -> bool:
+    for skill in unit.skills:
+        if skill.has_tag("finisher"):
+            return true
+    return false
+
+func _find_low_health_teams() -> Dictionary:
+    var teams = {}
+    for other_unit in registered_units:
+        if other_unit.get_health_percentage() < 0.2:
+            teams[other_unit.team] = true
+    return teams
+
 func _update_unit_in_queue(unit: BattleUnit) -> void:
-    # This is called when a unit's priority might have changed
-    # In our implementation, we recalculate on demand, so this is a no-op
-    pass
+    # Speed or status changed: rescale the remaining wait to the new action delay.
+    # Priority itself is computed when the unit comes up, so it is always current.
+    var current_time = get_current_time()
+    var next_time: float = _unit_timers.get(unit, current_time)
+    var old_delay: float = _unit_delays.get(unit, 0.0)
+    var new_delay = _calculate_action_delay(unit)
+    if next_time <= current_time or old_delay <= 0.0 or is_equal_approx(old_delay, new_delay):
+        _unit_delays[unit] = new_delay
+        return
+    _schedule(unit, current_time + (next_time - current_time) * new_delay / old_delay, new_delay)
 
 func _remove_unit_from_queue(unit: BattleUnit) -> void:
-    # Clean up any references to the unit
-    # In our implementation, we check unit validity on demand
-    pass
+    # Its heap entries become stale and are dropped when they reach the top
+    _unit_timers.erase(unit)
+    _unit_delays.erase(unit)
+    _live_entries.erase(unit)
+    _dormant_units.erase(unit)
+    if _action_heap.size() > 2 * registered_units.size() + 16:
+        _rebuild_heap()
+
+func _entry_before(a: Array, b: Array) -> bool:
+    if a[0] != b[0]:
+        return a[0] < b[0]
+    return a[1] < b[1]
+
+func _heap_push(heap: Array, entry: Array) -> void:
+    heap.append(entry)
+    var i: int = heap.size() - 1
+    while i > 0:
+        var parent: int = (i - 1) / 2
+        if not _entry_before(heap[i], heap[parent]):
+            break
+        var tmp = heap[i]
+        heap[i] = heap[parent]
+        heap[parent] = tmp
+        i = parent
+
+func _heap_pop(heap: Array) -> Array:
+    var top: Array = heap[0]
+    var last = heap.pop_back()
+    if heap.is_empty():
+        return top
+
+    heap[0] = last
+    var size: int = heap.size()
+    var i: int = 0
+    while true:
+        var smallest: int = i
+        var left: int = 2 * i + 1
+        var right: int = left + 1
+        if left < size and _entry_before(heap[left], heap[smallest]):
+            smallest = left
+        if right < size and _entry_before(heap[right], heap[smallest]):
+            smallest = right
+        if smallest == i:
+            break
+        var tmp = heap[i]
+        heap[i] = heap[smallest]
+        heap[smallest] = tmp
+        i = smallest
+    return top
+
+func _rebuild_heap() -> void:
+    _action_heap = _action_heap.filter(func(entry): return _live_entries.get(entry[2], -1) == entry[1])
+    _action_heap.sort_custom(_entry_before)  # A sorted array is a valid min-heap
 
 # Analysis methods for AI and debugging
 func get_action_timeline(duration: float = 5.0) -> Array[Dictionary]:
     var timeline: Array[Dictionary] = []
-    var current_time = Time.get_unix_time_from_system()
+    var current_time = get_current_time()
     var end_time = current_time + duration
     
-    # Create a copy of current timers
-    var simulated_timers = _unit_timers.duplicate()
-    var simulated_time = current_time
+    # Simulate on a copy of the current timers
+    var simulated_heap: Array = []
+    for unit in registered_units:
+        if unit.is_alive() and _unit_timers.has(unit):
+            simulated_heap.append([_unit_timers[unit], simulated_heap.size(), unit])
+    simulated_heap.sort_custom(_entry_before)  # A sorted array is a valid min-heap
+    var sequence = simulated_heap.size()
+    var low_health_teams = _find_low_health_teams()
     
-    while simulated_time < end_time:
-        # Find next unit to act
-        var next_unit = null
-        var next_time = INF
-        
-        for unit in registered_units:
-            if not unit.is_alive():
-                continue
-            
-            var unit_time = simulated_timers.get(unit, INF)
-            if unit_time < next_time:
-                next_time = unit_time
-                next_unit = unit
-        
-        if next_unit == null or next_time > end_time:
+    while not simulated_heap.is_empty():
+        # Next unit to act
+        var entry = _heap_pop(simulated_heap)
+        var next_unit: BattleUnit = entry[2]
+        if entry[0] > end_time:
             break
         
         # Record this action
         timeline.append({
-            "time": next_time - current_time,
+            "time": entry[0] - current_time,
             "unit": next_unit,
-            "priority": calculate_action_priority(next_unit)
+            "priority": _calculate_priority(next_unit, low_health_teams)
         })
         
         # Update simulation
-        simulated_time = next_time
-        var delay = _calculate_action_delay(next_unit)
-        simulated_timers[next_unit] = simulated_time + delay
+        _heap_push(simulated_heap, [entry[0] + _calculate_action_delay(next_unit), sequence, next_unit])
+        sequence += 1
     
     return timeline
 
@@ -209,7 +324,7 @@ func get_average_action_rate() -> float:
     return total_rate / registered_units.size()
 
 func _calculate_action_delay(unit: BattleUnit) -> float:
-    var speed = unit.get_projected_stat("speed")
+    var speed = unit.get_projected_stat(BattleUnit.STAT_SPEED)
     var action_delay = base_action_delay / (1.0 + speed * speed_scaling_factor)
 
     if unit.has_status("haste"):
@@ -233,7 +348,6 @@ func debug_print_queue() -> void:
             print("  %d. %s (Priority: %.1f)" % [i+1, data.unit.unit_name, data.priority])
     
     print("\nNext action times:")
-    var current_time = Time.get_unix_time_from_system()
     for unit in registered_units:
         if unit.is_alive():
             var time_until = get_time_until_next_action(unit)
@@ -118,51 +118,57 @@ static func get_adaptive_modifiers(player_performance: Dictionary) -> Dictionary
     return modifiers
 
 static func apply_difficulty_to_unit(unit: BattleUnit, modifiers: Dictionary) -> void:
+    for mod in build_difficulty_modifiers(modifiers):
+        # The health modifier is shared between max_health and health
+        for stat in mod.applies_to:
+            unit.get_stat_projector(stat).add_modifier(mod)
     if "enemy_health" in modifiers:
-        var health_mod = StatProjector.StatModifier.new(
+        unit.stats.health = unit.get_projected_stat("max_health")
+
+# Modifiers apply_difficulty_to_unit adds, in order; each one goes on every stat in its applies_to
+static func build_difficulty_modifiers(modifiers: Dictionary) -> Array[StatProjector.StatModifier]:
+    var result: Array[StatProjector.StatModifier] = []
+    if "enemy_health" in modifiers:
+        result.append(StatProjector.StatModifier.new(
             "difficulty_health",
             StatProjector.ModifierOp.MUL,
             modifiers.enemy_health,
             5,
             ["max_health", "health"],
             -1.0  # No expiration
-        )
-        unit.stat_projectors["max_health"].add_modifier(health_mod)
-        unit.stat_projectors["health"].add_modifier(health_mod)
-        unit.stats.health = unit.get_projected_stat("max_health")
+        ))
     
     if "enemy_damage" in modifiers:
-        var damage_mod = StatProjector.StatModifier.new(
+        result.append(StatProjector.StatModifier.new(
             "difficulty_damage",
             StatProjector.ModifierOp.MUL,
             modifiers.enemy_damage,
             5,
             ["attack"],
             -1.0  # No expiration
-        )
-        unit.stat_projectors["attack"].add_modifier(damage_mod)
+        ))
     
     if "enemy_defense" in modifiers:
-        var defense_mod = StatProjector.StatModifier.new(
+        result.append(StatProjector.StatModifier.new(
             "difficulty_defense",
             StatProjector.ModifierOp.MUL,
             modifiers.enemy_defense,
             5,
             ["defense"],
             -1.0  # No expiration
-        )
-        unit.stat_projectors["defense"].add_modifier(defense_mod)
+        ))
     
     if "enemy_speed" in modifiers:
-        var speed_mod = StatProjector.StatModifier.new(
+        result.append(StatProjector.StatModifier.new(
             "difficulty_speed",
             StatProjector.ModifierOp.MUL,
             modifiers.enemy_speed,
             5,
             ["speed"],
             -1.0  # No expiration
-        )
-        unit.stat_projectors["speed"].add_modifier(speed_mod)
+        ))
+    
+    return result
 
 static func get_difficulty_name(mode: DifficultyMode) -> String:
     match mode:
@@ -27,6 +27,8 @@ var progression_manager: Node
 
 var auto_battler: AutoBattler
 var is_encounter_active: bool = false
+# Enemy units are taken from here and returned at the end of each wave
+var unit_pool: BattleUnitPool = BattleUnitPool.new()
 
 func set_auto_battler(battler: AutoBattler) -> void:
     auto_battler = battler
@@ -57,6 +59,9 @@ func _ready() -> void:
             auto_battler.name = "AutoBattler"
             add_child(auto_battler)
 
+func _exit_tree() -> void:
+    unit_pool.clear()
+
 func load_encounters() -> void:
     var file = FileAccess.open(encounter_data_path, FileAccess.READ)
     if not file:
@@ -136,6 +141,7 @@ func stop_encounter() -> void:
     
     if auto_battler.is_battle_active:
         auto_battler.stop_battle()
+    _release_wave_units()
 
 func _start_next_wave() -> void:
     if not is_encounter_active:
@@ -157,16 +163,7 @@ func _start_next_wave() -> void:
 func _start_wave_battle(wave: Wave) -> void:
     var difficulty_modifiers = DifficultyScaler.get_difficulty_modifiers(difficulty_mode, encounter_history.size())
     
-    var enemy_team: Array[BattleUnit] = []
-    for unit_data in wave.enemy_units:
-        var units = UnitFactory.create_unit_group(
-            unit_data.template_id,
-            unit_data.get("count", 1),
-            unit_data.get("level", 1),
-            2,
-            difficulty_modifiers
-        )
-        enemy_team.append_array(units)
+    var enemy_team: Array[BattleUnit] = UnitFactory.create_wave(wave.enemy_units, 2, difficulty_modifiers, unit_pool)
     
     if "formation" in wave and not wave.formation.is_empty():
         UnitFactory.apply_formation(enemy_team, wave.formation, Vector2(600, 300))
@@ -219,6 +216,7 @@ func _on_wave_battle_ended(winner_team: int, wave: Wave) -> void:
         "health_remaining": health_percentage,
         "enemies_defeated": _count_defeated_enemies()
     })
+    _release_wave_units()
     
     if victory:
         session_stats.waves_completed += 1
@@ -322,6 +320,17 @@ func _calculate_score(completion_time: float) -> int:
     var base_score = time_bonus + health_bonus + perfect_bonus + no_death_bonus
     return int(base_score * difficulty_multiplier)
 
+# Returns the finished wave's enemies to the pool
+func _release_wave_units() -> void:
+    var enemies: Array[BattleUnit] = []
+    for unit in auto_battler.team2:
+        if unit_pool.is_active(unit):
+            enemies.append(unit)
+    if enemies.is_empty():
+        return
+    auto_battler.detach_units(enemies)
+    unit_pool.release_all(enemies)
+
 func _count_defeated_enemies() -> int:
     return total_enemy_count - _count_alive_enemies()
 
@@ -1,9 +1,75 @@
 class_name UnitFactory
 extends RefCounted
 
+# Spawning goes through prototypes: the first request for a (template, level,
+# difficulty) combination builds one reference unit and keeps its resolved stats
+# and skill/equipment definitions; later spawns copy those and only create the
+# per-instance modifiers. Prototypes live in a small LRU that is dropped
+# whenever the templates are reloaded.
+
+const PROTOTYPE_CACHE_SIZE := 64
+
+const SKILL_TEMPLATES := {
+	"basic_attack": {
+		"name": "Basic Attack",
+		"base_damage": 10.0,
+		"damage_type": "physical",
+		"target_type": "single_enemy"
+	},
+	"arrow_shot": {
+		"name": "Arrow Shot",
+		"base_damage": 15.0,
+		"damage_type": "physical",
+		"target_type": "single_enemy"
+	},
+	"fireball": {
+		"name": "Fireball",
+		"base_damage": 20.0,
+		"damage_type": "fire",
+		"target_type": "single_enemy",
+		"resource_cost": 10.0,
+		"resource_type": "mana"
+	},
+	"frost_bolt": {
+		"name": "Frost Bolt",
+		"base_damage": 18.0,
+		"damage_type": "ice",
+		"target_type": "single_enemy",
+		"resource_cost": 10.0,
+		"resource_type": "mana"
+	},
+	"poison_strike": {
+		"name": "Poison Strike",
+		"base_damage": 12.0,
+		"damage_type": "poison",
+		"target_type": "single_enemy",
+		"cooldown": 3.0
+	},
+	"cleave": {
+		"name": "Cleave",
+		"base_damage": 8.0,
+		"damage_type": "physical",
+		"target_type": "all_enemies",
+		"cooldown": 4.0
+	},
+	"heal": {
+		"name": "Heal",
+		"base_damage": -20.0,
+		"damage_type": "holy",
+		"target_type": "lowest_health_ally",
+		"resource_cost": 15.0,
+		"resource_type": "mana"
+	}
+}
+
 static var unit_templates: Dictionary = {}
 static var templates_loaded: bool = false
 
+# Prototype key -> read-only prototype, least recently used first
+static var _prototypes: Dictionary = {}
+static var _prototype_hits: int = 0
+static var _prototype_misses: int = 0
+
 static func load_templates(path: String = "res://data/unit_templates.json") -> void:
 	var file = FileAccess.open(path, FileAccess.READ)
 	if not file:
@@ -26,17 +92,132 @@ static func load_templates(path: String = "res://data/unit_templates.json") -> v
 			if "id" in template:
 				unit_templates[template.id] = template
 		templates_loaded = true
+		clear_prototype_cache()
 		print("Loaded ", unit_templates.size(), " unit templates")
 
 static func create_from_template(template_id: String, level: int, team: int, difficulty_modifiers: Dictionary = {}) -> BattleUnit:
+	var prototype = _get_prototype(template_id, level, difficulty_modifiers)
+	if prototype == null:
+		push_error("Unit template not found: " + template_id)
+		return _create_default_unit(team)
+	
+	return _instantiate(prototype, team)
+
+# Units come from `pool` when one is given; the caller releases them back to it
+static func create_unit_group(template_id: String, count: int, level: int, team: int, difficulty_modifiers: Dictionary = {}, pool: BattleUnitPool = null) -> Array[BattleUnit]:
+	var units: Array[BattleUnit] = []
+	_append_group(units, template_id, count, level, team, difficulty_modifiers, pool)
+	return units
+
+# Spawns a whole wave. `enemy_units` uses the encounter format:
+# [{"template_id": ..., "count": 1, "level": 1}, ...]
+static func create_wave(enemy_units: Array, team: int, difficulty_modifiers: Dictionary = {}, pool: BattleUnitPool = null) -> Array[BattleUnit]:
+	var units: Array[BattleUnit] = []
+	for unit_data in enemy_units:
+		_append_group(units, unit_data.template_id, unit_data.get("count", 1), unit_data.get("level", 1), team, difficulty_modifiers, pool)
+	return units
+
+static func clear_prototype_cache() -> void:
+	_prototypes.clear()
+	_prototype_hits = 0
+	_prototype_misses = 0
+
+static func get_prototype_cache_stats() -> Dictionary:
+	return {
+		"size": _prototypes.size(),
+		"hits": _prototype_hits,
+		"misses": _prototype_misses
+	}
+
+static func _append_group(units: Array[BattleUnit], template_id: String, count: int, level: int, team: int, difficulty_modifiers: Dictionary, pool: BattleUnitPool = null) -> void:
+	var prototype = _get_prototype(template_id, level, difficulty_modifiers)
+	if prototype == null:
+		push_error("Unit template not found: " + template_id)
+	
+	for i in range(count):
+		var unit = _instantiate(prototype, team, pool) if prototype != null else _create_default_unit(team, pool)
+		if count > 1:
+			unit.unit_name += " " + str(i + 1)
+		units.append(unit)
+
+static func _get_prototype(template_id: String, level: int, difficulty_modifiers: Dictionary):
 	if not templates_loaded:
 		load_templates()
 	
 	if template_id not in unit_templates:
-		push_error("Unit template not found: " + template_id)
-		return _create_default_unit(team)
+		return null
 	
-	var template = unit_templates[template_id]
+	var key = "%s|%d|%s" % [template_id, level, JSON.stringify(difficulty_modifiers, "", true)]
+	if _prototypes.has(key):
+		# Re-insert so the dictionary stays ordered from least to most recently used
+		var cached = _prototypes[key]
+		_prototypes.erase(key)
+		_prototypes[key] = cached
+		_prototype_hits += 1
+		return cached
+	
+	_prototype_misses += 1
+	var prototype = _compile_prototype(unit_templates[template_id], level, difficulty_modifiers)
+	_prototypes[key] = prototype
+	while _prototypes.size() > PROTOTYPE_CACHE_SIZE:
+		_prototypes.erase(_prototypes.keys()[0])
+	return prototype
+
+static func _compile_prototype(template: Dictionary, level: int, difficulty_modifiers: Dictionary) -> Dictionary:
+	var reference = _build_from_template(template, level, 0, difficulty_modifiers)
+	
+	var stats: Dictionary = reference.stats.duplicate()
+	stats.make_read_only()
+	
+	# Unequipped copies; every spawn clones them again so modifiers are never shared
+	var equipment: Dictionary = {}
+	for slot in reference.equipment:
+		equipment[slot] = reference.equipment[slot].clone()
+	
+	var prototype = {
+		"unit_name": reference.unit_name,
+		"stats": stats,
+		"skills": reference.skills.duplicate(),
+		"equipment": equipment,
+		"difficulty_modifiers": DifficultyScaler.build_difficulty_modifiers(difficulty_modifiers)
+	}
+	prototype.make_read_only()
+	reference.free()
+	return prototype
+
+static func _instantiate(prototype: Dictionary, team: int, pool: BattleUnitPool = null) -> BattleUnit:
+	var unit = pool.acquire() if pool else BattleUnit.new()
+	unit.unit_name = prototype.unit_name
+	unit.team = team
+	unit.stats = prototype.stats.duplicate()
+	
+	for skill in prototype.skills:
+		unit.add_skill(skill.clone())
+	
+	unit.begin_stat_batch()
+	for slot in prototype.equipment:
+		var item: Equipment = prototype.equipment[slot].clone()
+		unit.equipment[slot] = item
+		item.equip_to(unit)
+	
+	# Same order as DifficultyScaler.apply_difficulty_to_unit; the stats already hold the scaled health
+	for template_mod in prototype.difficulty_modifiers:
+		var mod = StatProjector.StatModifier.new(
+			template_mod.id,
+			template_mod.op,
+			template_mod.value,
+			template_mod.priority,
+			template_mod.applies_to.duplicate(),
+			template_mod.expires_at_unix
+		)
+		for stat in mod.applies_to:
+			unit.get_stat_projector(stat).add_modifier(mod)
+	unit.commit_stat_batch()
+	
+	return unit
+
+# Builds a unit straight from its template; prototypes are compiled from this
+static func _build_from_template(template: Dictionary, level: int, team: int, difficulty_modifiers: Dictionary = {}) -> BattleUnit:
 	var unit = BattleUnit.new()
 	
 	unit.unit_name = template.get("name_prefix", "Enemy") + " " + template.get("name", "Unit")
@@ -87,63 +268,10 @@ static func _calculate_stat(base_value: float, modifier: float, level: int, scal
 	return base_value * modifier * level_bonus
 
 static func _create_skill_from_id(skill_id: String, level: int) -> BattleSkill:
-	var skill_templates = {
-		"basic_attack": {
-			"name": "Basic Attack",
-			"base_damage": 10.0,
-			"damage_type": "physical",
-			"target_type": "single_enemy"
-		},
-		"arrow_shot": {
-			"name": "Arrow Shot",
-			"base_damage": 15.0,
-			"damage_type": "physical",
-			"target_type": "single_enemy"
-		},
-		"fireball": {
-			"name": "Fireball",
-			"base_damage": 20.0,
-			"damage_type": "fire",
-			"target_type": "single_enemy",
-			"resource_cost": 10.0,
-			"resource_type": "mana"
-		},
-		"frost_bolt": {
-			"name": "Frost Bolt",
-			"base_damage": 18.0,
-			"damage_type": "ice",
-			"target_type": "single_enemy",
-			"resource_cost": 10.0,
-			"resource_type": "mana"
-		},
-		"poison_strike": {
-			"name": "Poison Strike",
-			"base_damage": 12.0,
-			"damage_type": "poison",
-			"target_type": "single_enemy",
-			"cooldown": 3.0
-		},
-		"cleave": {
-			"name": "Cleave",
-			"base_damage": 8.0,
-			"damage_type": "physical",
-			"target_type": "all_enemies",
-			"cooldown": 4.0
-		},
-		"heal": {
-			"name": "Heal",
-			"base_damage": -20.0,
-			"damage_type": "holy",
-			"target_type": "lowest_health_ally",
-			"resource_cost": 15.0,
-			"resource_type": "mana"
-		}
-	}
-	
-	if skill_id not in skill_templates:
+	if skill_id not in SKILL_TEMPLATES:
 		return null
 	
-	var template = skill_templates[skill_id]
+	var template = SKILL_TEMPLATES[skill_id]
 	var skill = BattleSkill.new()
 	
 	skill.skill_name = template.get("name", "Skill")
@@ -171,8 +299,8 @@ static func _create_equipment_from_data(equipment_data: Dictionary, level: int)
 	
 	return equipment
 
-static func _create_default_unit(team: int) -> BattleUnit:
-	var unit = BattleUnit.new()
+static func _create_default_unit(team: int, pool: BattleUnitPool = null) -> BattleUnit:
+	var unit = pool.acquire() if pool else BattleUnit.new()
 	unit.unit_name = "Default Enemy"
 	unit.team = team
 	unit.stats = {
@@ -193,18 +321,6 @@ static func _create_default_unit(team: int) -> BattleUnit:
 	
 	return unit
 
-static func create_unit_group(template_id: String, count: int, level: int, team: int, difficulty_modifiers: Dictionary = {}) -> Array[BattleUnit]:
-	var units: Array[BattleUnit] = []
-	
-	for i in range(count):
-		var unit = create_from_template(template_id, level, team, difficulty_modifiers)
-		if unit:
-			if count > 1:
-				unit.unit_name += " " + str(i + 1)
-			units.append(unit)
-	
-	return units
-
 static func apply_formation(units: Array[BattleUnit], formation: String, base_position: Vector2 = Vector2.ZERO) -> void:
 	var formations = {
 		"line_horizontal": _formation_line_horizontal,
@@ -41,12 +41,13 @@ func equip_to(unit: BattleUnit) -> bool:
     
     equipped_to = unit
     
+    unit.begin_stat_batch()
     for mod in modifiers:
         for stat in mod.applies_to:
-            if unit.stat_projectors.has(stat):
-                unit.stat_projectors[stat].add_modifier(mod)
-    
-    unit.recalculate_stats()
+            var projector: StatProjector = unit.get_stat_projector(stat)
+            if projector != null:
+                projector.add_modifier(mod)
+    unit.commit_stat_batch()
     return true
 
 func unequip_from(unit: BattleUnit) -> void:
@@ -54,13 +55,15 @@ func unequip_from(unit: BattleUnit) -> void:
         push_error("Equipment not equipped to this unit")
         return
     
+    unit.begin_stat_batch()
     for mod in modifiers:
         for stat in mod.applies_to:
-            if unit.stat_projectors.has(stat):
-                unit.stat_projectors[stat].remove_modifier(mod)
+            var projector: StatProjector = unit.get_stat_projector(stat, false)
+            if projector != null:
+                projector.remove_modifier(mod)
+    unit.commit_stat_batch()
     
     equipped_to = null
-    unit.recalculate_stats()
 
 func get_stat_bonuses() -> Dictionary:
     var bonuses = {}
@@ -7,31 +7,82 @@ signal gold_changed(new_amount: int)
 signal unit_unlocked(unit_id: String)
 signal encounter_completed(encounter_id: String)
 
-@export var player_level: int = 1
-@export var current_experience: int = 0
-@export var gold: int = 0
-@export var team_size_limit: int = 3
-@export var unlocked_units: Array[String] = []
-@export var completed_encounters: Array[String] = []
-@export var unlocked_encounters: Array[String] = ["tutorial_battle"]
-@export var unit_roster: Array[UnitData] = []
-@export var inventory: Dictionary = {}
-@export var achievements: Dictionary = {}
+@export var player_level: int = 1:
+	set(value):
+		player_level = value
+		mark_dirty("profile")
+@export var current_experience: int = 0:
+	set(value):
+		current_experience = value
+		mark_dirty("profile")
+@export var gold: int = 0:
+	set(value):
+		gold = value
+		mark_dirty("profile")
+@export var team_size_limit: int = 3:
+	set(value):
+		team_size_limit = value
+		mark_dirty("profile")
+@export var unlocked_units: Array[String] = []:
+	set(value):
+		unlocked_units = value
+		mark_dirty("unlocks")
+@export var completed_encounters: Array[String] = []:
+	set(value):
+		completed_encounters = value
+		mark_dirty("unlocks")
+@export var unlocked_encounters: Array[String] = ["tutorial_battle"]:
+	set(value):
+		unlocked_encounters = value
+		mark_dirty("unlocks")
+@export var unit_roster: Array[UnitData] = []:
+	set(value):
+		unit_roster = value
+		mark_dirty("roster")
+@export var inventory: Dictionary = {}:
+	set(value):
+		inventory = value
+		mark_dirty("inventory")
+@export var achievements: Dictionary = {}:
+	set(value):
+		achievements = value
+		mark_dirty("achievements")
 @export var statistics: Dictionary = {
 	"battles_won": 0,
 	"battles_lost": 0,
 	"total_damage_dealt": 0,
 	"total_damage_taken": 0,
 	"units_lost": 0
-}
+}:
+	set(value):
+		statistics = value
+		mark_dirty("statistics")
 
 const MAX_TEAM_SIZE = 6
 const BASE_TEAM_SIZE = 3
 const TEAM_SIZE_UNLOCK_LEVELS = [1, 10, 20, 30, 40, 50]
 
+# Save sections and the to_save_dict() keys each one covers, in save order.
+# Mutators and property writes mark their section dirty; units track their
+# own changes (UnitData.is_dirty) within the roster section.
+const SAVE_SECTIONS = {
+	"profile": ["player_level", "current_experience", "gold", "team_size_limit"],
+	"unlocks": ["unlocked_units", "completed_encounters", "unlocked_encounters"],
+	"roster": ["unit_roster"],
+	"inventory": ["inventory"],
+	"achievements": ["achievements"],
+	"statistics": ["statistics"]
+}
+
+var _dirty_sections: Dictionary = {}
+# Serialized sections and units as of the last take_save_snapshot()
+var _section_snapshots: Dictionary = {}
+var _unit_snapshots: Dictionary = {}  # UnitData -> Dictionary
+
 func _init() -> void:
 	if unlocked_units.is_empty():
 		unlocked_units = ["player_warrior", "player_archer", "player_healer"]
+	mark_dirty()
 
 func get_experience_for_next_level() -> int:
 	return player_level * player_level * 100
@@ -79,16 +130,19 @@ func spend_gold(amount: int) -> bool:
 func unlock_unit(unit_id: String) -> void:
 	if unit_id not in unlocked_units:
 		unlocked_units.append(unit_id)
+		mark_dirty("unlocks")
 		unit_unlocked.emit(unit_id)
 
 func complete_encounter(encounter_id: String) -> void:
 	if encounter_id not in completed_encounters:
 		completed_encounters.append(encounter_id)
+		mark_dirty("unlocks")
 		encounter_completed.emit(encounter_id)
 
 func unlock_encounter(encounter_id: String) -> void:
 	if encounter_id not in unlocked_encounters:
 		unlocked_encounters.append(encounter_id)
+		mark_dirty("unlocks")
 
 func is_encounter_unlocked(encounter_id: String) -> bool:
 	return encounter_id in unlocked_encounters
@@ -121,22 +175,26 @@ func get_unit_data(unit_id: String) -> UnitData:
 func add_unit_to_roster(unit_data: UnitData) -> void:
 	if get_unit_data(unit_data.unit_id) == null:
 		unit_roster.append(unit_data)
+		mark_dirty("roster")
 
 func update_statistics(stat: String, value: int) -> void:
 	if statistics.has(stat):
 		statistics[stat] += value
+		mark_dirty("statistics")
 
 func add_item(item_id: String, quantity: int = 1) -> void:
 	if inventory.has(item_id):
 		inventory[item_id] += quantity
 	else:
 		inventory[item_id] = quantity
+	mark_dirty("inventory")
 
 func use_item(item_id: String, quantity: int = 1) -> bool:
 	if inventory.has(item_id) and inventory[item_id] >= quantity:
 		inventory[item_id] -= quantity
 		if inventory[item_id] <= 0:
 			inventory.erase(item_id)
+		mark_dirty("inventory")
 		return true
 	return false
 
@@ -145,6 +203,7 @@ func update_achievement_progress(achievement_id: String, progress: int) -> void:
 		achievements[achievement_id] += progress
 	else:
 		achievements[achievement_id] = progress
+	mark_dirty("achievements")
 
 func to_save_dict() -> Dictionary:
 	var roster_data = []
@@ -165,6 +224,69 @@ func to_save_dict() -> Dictionary:
 		"statistics": statistics
 	}
 
+# Marks a save section as changed; with no section, marks everything
+func mark_dirty(section: String = "") -> void:
+	if section.is_empty():
+		for key in SAVE_SECTIONS:
+			_dirty_sections[key] = true
+		return
+	_dirty_sections[section] = true
+
+func is_dirty() -> bool:
+	if not _dirty_sections.is_empty():
+		return true
+	for unit_data in unit_roster:
+		if unit_data.is_dirty():
+			return true
+	return false
+
+func get_dirty_sections() -> Array[String]:
+	var sections: Array[String] = []
+	for section in SAVE_SECTIONS:
+		if _dirty_sections.has(section):
+			sections.append(section)
+		elif section == "roster" and unit_roster.any(func(unit_data): return unit_data.is_dirty()):
+			sections.append(section)
+	return sections
+
+func clear_dirty() -> void:
+	_dirty_sections.clear()
+	for unit_data in unit_roster:
+		unit_data.clear_dirty()
+
+# Same contents as to_save_dict(), but only sections and units changed since
+# the previous snapshot are serialized again; the rest reuse the copies made
+# then. Everything in the result is a private copy that is never modified
+# afterwards, so it can be written out on another thread.
+func take_save_snapshot() -> Dictionary:
+	var save_dict = {}
+	for section in SAVE_SECTIONS:
+		if section == "roster":
+			save_dict["unit_roster"] = _snapshot_roster()
+			continue
+		if _dirty_sections.has(section) or not _section_snapshots.has(section):
+			var values = {}
+			for key in SAVE_SECTIONS[section]:
+				var value = get(key)
+				values[key] = value.duplicate(true) if value is Array or value is Dictionary else value
+			_section_snapshots[section] = values
+		save_dict.merge(_section_snapshots[section])
+	_dirty_sections.clear()
+	return save_dict
+
+func _snapshot_roster() -> Array:
+	var roster_data = []
+	var unit_snapshots = {}
+	for unit_data in unit_roster:
+		var unit_dict = _unit_snapshots.get(unit_data)
+		if unit_dict == null or unit_data.is_dirty():
+			unit_dict = unit_data.to_dict().duplicate(true)
+			unit_data.clear_dirty()
+		unit_snapshots[unit_data] = unit_dict
+		roster_data.append(unit_dict)
+	_unit_snapshots = unit_snapshots
+	return roster_data
+
 static func from_save_dict(data: Dictionary) -> PlayerData:
 	var player_data = PlayerData.new()
 	
@@ -197,4 +319,6 @@ static func from_save_dict(data: Dictionary) -> PlayerData:
 	player_data.achievements = data.get("achievements", {})
 	player_data.statistics = data.get("statistics", player_data.statistics)
 	
+	# Everything matches what is on disk
+	player_data.clear_dirty()
 	return player_data
\ No newline at end of file
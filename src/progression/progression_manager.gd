@@ -6,13 +6,26 @@ signal player_data_saved()
 var player_data: PlayerData
 var auto_save_timer: Timer
 var is_dirty: bool = false
+var save_slot: int = 0
 
 const AUTO_SAVE_INTERVAL = 60.0
 
+# Saves are serialized on the main thread from PlayerData.take_save_snapshot(),
+# which only re-serializes what changed, and written on a WorkerThreadPool task.
+# A save requested while one is in flight is coalesced into a single follow-up
+# save, taken when the current one finishes.
+var _save_task_id: int = -1
+var _save_queued: bool = false
+var _save_succeeded: bool = false
+
 func _init() -> void:
+    # Placeholder until load_player_data(); clean so flushing never writes it
+    # over the real save
     player_data = PlayerData.new()
+    player_data.clear_dirty()
 
 func _ready() -> void:
+    set_process(false)
     setup_auto_save()
     load_player_data()
     
@@ -28,14 +41,18 @@ func setup_auto_save() -> void:
     auto_save_timer.autostart = true
     add_child(auto_save_timer)
 
+# Reads the save back, so any save still being written is finished first
 func load_player_data() -> void:
-    var loaded_data = SaveManager.load_game()
+    flush_save()
+    var loaded_data = SaveManager.load_game(save_slot)
     
     if loaded_data != null:
         player_data = loaded_data
     else:
         player_data = PlayerData.new()
         create_starter_units()
+        # Nothing to save until the player makes progress
+        player_data.clear_dirty()
     
     player_data_loaded.emit()
 
@@ -51,12 +68,61 @@ func create_starter_units() -> void:
         player_data.add_unit_to_roster(unit_data)
 
 func save_player_data() -> void:
-    if SaveManager.save_game(player_data):
-        player_data_saved.emit()
+    if _save_task_id != -1:
+        _save_queued = true
+        return
+    
+    var snapshot = player_data.take_save_snapshot()
+    is_dirty = false
+    _save_task_id = WorkerThreadPool.add_task(
+        _write_save_snapshot.bind(snapshot, Time.get_unix_time_from_system()),
+        false,
+        "Save player data"
+    )
+    set_process(true)
+
+func is_save_in_flight() -> bool:
+    return _save_task_id != -1
+
+# Blocks until every requested save is written, then writes any remaining
+# changes on the calling thread
+func flush_save() -> void:
+    while _save_task_id != -1:
+        _finish_save_task()
+    if is_dirty or player_data.is_dirty():
         is_dirty = false
+        if SaveManager.save_player_dict(player_data.take_save_snapshot(), save_slot):
+            player_data_saved.emit()
+        else:
+            is_dirty = true
+
+func _write_save_snapshot(snapshot: Dictionary, timestamp: float) -> void:
+    # Runs on a worker thread; only touches the snapshot
+    _save_succeeded = SaveManager.save_player_dict(snapshot, save_slot, timestamp)
+
+func _process(_delta: float) -> void:
+    if _save_task_id == -1:
+        set_process(false)
+        return
+    if WorkerThreadPool.is_task_completed(_save_task_id):
+        _finish_save_task()
+
+func _finish_save_task() -> void:
+    WorkerThreadPool.wait_for_task_completion(_save_task_id)
+    _save_task_id = -1
+    if _save_succeeded:
+        player_data_saved.emit()
+    else:
+        is_dirty = true
+    
+    if _save_queued:
+        _save_queued = false
+        save_player_data()
+    else:
+        set_process(false)
 
 func _on_auto_save_timeout() -> void:
-    if is_dirty:
+    if is_dirty or player_data.is_dirty():
         save_player_data()
 
 func _on_player_level_up(new_level: int) -> void:
@@ -170,5 +236,4 @@ func create_battle_units_from_team() -> Array[BattleUnit]:
     return battle_units
 
 func _exit_tree() -> void:
-    if is_dirty:
-        save_player_data()
+    flush_save()
@@ -4,86 +4,223 @@ extends RefCounted
 const SAVE_DIR = "user://saves/"
 const SAVE_FILE = "autosave.sav"
 const BACKUP_FILE = "autosave.bak"
+const TEMP_SUFFIX = ".tmp"
 
-static func save_game(player_data: PlayerData, slot: int = 0) -> bool:
-	var save_path = SAVE_DIR + "save_slot_%d.sav" % slot
+# Save files since version 2 are a small container:
+#   magic "ABSV", u32 version, u32 header size, header (var bytes), payload
+# The header holds the slot metadata shown in the save menu plus the payload's
+# sizes and SHA-256, so list_saves never touches the payload. The payload is
+# the zstd-compressed var bytes of {"player_data": ...}. Version 1 files (one
+# plain store_var dictionary) are still read and rewritten as version 2.
+const SAVE_VERSION = 2
+const SAVE_MAGIC = "ABSV"
+const PAYLOAD_COMPRESSION = FileAccess.COMPRESSION_ZSTD
+
+static func _slot_path(slot: int) -> String:
 	if slot == 0:
-		save_path = SAVE_DIR + SAVE_FILE
-	
+		return SAVE_DIR + SAVE_FILE
+	return SAVE_DIR + "save_slot_%d.sav" % slot
+
+static func save_game(player_data: PlayerData, slot: int = 0) -> bool:
+	return _write_save(_slot_path(slot), player_data.to_save_dict(), Time.get_unix_time_from_system())
+
+# Writes an already serialized player dictionary (PlayerData.to_save_dict or
+# take_save_snapshot). Touches no shared state, so it may run on a worker thread.
+static func save_player_dict(player_dict: Dictionary, slot: int = 0, timestamp: float = -1.0) -> bool:
+	if timestamp < 0.0:
+		timestamp = Time.get_unix_time_from_system()
+	return _write_save(_slot_path(slot), player_dict, timestamp)
+
+# Writes to a temp file, then swaps it in: the previous save becomes the
+# backup, so a crash mid-write leaves either the old or the new save intact
+static func _write_save(save_path: String, player_dict: Dictionary, timestamp: float) -> bool:
 	var dir = DirAccess.open("user://")
 	if not dir.dir_exists(SAVE_DIR):
 		dir.make_dir_recursive(SAVE_DIR)
 	
-	if FileAccess.file_exists(save_path):
-		var backup_path = save_path.replace(".sav", ".bak")
-		dir.copy(save_path, backup_path)
+	var payload = var_to_bytes({"player_data": player_dict})
+	var compressed = payload.compress(PAYLOAD_COMPRESSION)
+	var header = {
+		"timestamp": timestamp,
+		"player_level": player_dict.get("player_level", 1),
+		"gold": player_dict.get("gold", 0),
+		"completed_encounters": player_dict.get("completed_encounters", []).size(),
+		"unit_count": player_dict.get("unit_roster", []).size(),
+		"payload_size": payload.size(),
+		"compressed_size": compressed.size(),
+		"checksum": _checksum(compressed)
+	}
+	var header_bytes = var_to_bytes(header)
 	
-	var save_file = FileAccess.open(save_path, FileAccess.WRITE)
+	var temp_path = save_path + TEMP_SUFFIX
+	var save_file = FileAccess.open(temp_path, FileAccess.WRITE)
 	if save_file == null:
-		push_error("Failed to open save file: " + save_path)
+		push_error("Failed to open save file: " + temp_path)
 		return false
 	
-	var save_data = {
-		"version": 1,
-		"timestamp": Time.get_unix_time_from_system(),
-		"player_data": player_data.to_save_dict()
-	}
-	
-	save_file.store_var(save_data)
+	save_file.store_buffer(SAVE_MAGIC.to_ascii_buffer())
+	save_file.store_32(SAVE_VERSION)
+	save_file.store_32(header_bytes.size())
+	save_file.store_buffer(header_bytes)
+	save_file.store_buffer(compressed)
+	var write_error = save_file.get_error()
 	save_file.close()
+	if write_error != OK:
+		push_error("Failed to write save file: " + temp_path)
+		DirAccess.remove_absolute(temp_path)
+		return false
+	
+	if FileAccess.file_exists(save_path):
+		var backup_path = save_path.replace(".sav", ".bak")
+		if FileAccess.file_exists(backup_path):
+			DirAccess.remove_absolute(backup_path)
+		DirAccess.rename_absolute(save_path, backup_path)
+	
+	if DirAccess.rename_absolute(temp_path, save_path) != OK:
+		push_error("Failed to move save file into place: " + save_path)
+		return false
 	
 	return true
 
 static func load_game(slot: int = 0) -> PlayerData:
-	var save_path = SAVE_DIR + "save_slot_%d.sav" % slot
-	if slot == 0:
-		save_path = SAVE_DIR + SAVE_FILE
+	var save_path = _slot_path(slot)
 	
-	if not FileAccess.file_exists(save_path):
+	var save_data = {}
+	var loaded_path = ""
+	for candidate in _load_candidates(save_path):
+		if not FileAccess.file_exists(candidate):
+			continue
+		save_data = _read_save(candidate)
+		if not save_data.is_empty():
+			loaded_path = candidate
+			break
+	if save_data.is_empty():
+		return null
+	if loaded_path != save_path:
+		push_warning("Save file missing or unreadable, loading " + loaded_path)
+	
+	var player_dict = save_data.get("player_data", {})
+	if player_dict.is_empty():
+		push_error("No player data in save file")
 		return null
 	
+	if loaded_path == save_path and save_data.version < SAVE_VERSION:
+		_write_save(save_path, player_dict, save_data.get("timestamp", Time.get_unix_time_from_system()))
+	
+	return PlayerData.from_save_dict(player_dict)
+
+# Files a slot can be loaded from, in order. _write_save moves the save to the
+# backup before the temp file takes its place, so a crash between the two
+# renames leaves only the backup and a complete temp file.
+static func _load_candidates(save_path: String) -> Array[String]:
+	return [save_path, save_path.replace(".sav", ".bak"), save_path + TEMP_SUFFIX]
+
+# Returns {"version", "timestamp", "player_data"} or {} when the file cannot be read
+static func _read_save(save_path: String) -> Dictionary:
 	var save_file = FileAccess.open(save_path, FileAccess.READ)
 	if save_file == null:
 		push_error("Failed to open save file: " + save_path)
-		return null
+		return {}
+	
+	var header = _read_header(save_file)
+	if header.get("version", 0) > SAVE_VERSION:
+		return {}
+	if header.is_empty():
+		# Version 1: a single dictionary written with store_var
+		save_file.seek(0)
+		var legacy_data = save_file.get_var()
+		save_file.close()
+		if not legacy_data is Dictionary:
+			push_warning("Invalid save file format: " + save_path)
+			return {}
+		var version = legacy_data.get("version", 0)
+		if version != 1:
+			push_error("Unsupported save file version: " + str(version))
+			return {}
+		return {
+			"version": 1,
+			"timestamp": legacy_data.get("timestamp", 0),
+			"player_data": legacy_data.get("player_data", {})
+		}
 	
-	var save_data = save_file.get_var()
+	var compressed = save_file.get_buffer(header.get("compressed_size", 0))
 	save_file.close()
+	if compressed.size() != header.get("compressed_size", -1) or _checksum(compressed) != header.get("checksum", ""):
+		push_warning("Save file payload is truncated or corrupt: " + save_path)
+		return {}
 	
-	if not save_data is Dictionary:
-		push_error("Invalid save file format")
-		return null
+	var payload = bytes_to_var(compressed.decompress(header.payload_size, PAYLOAD_COMPRESSION))
+	if not payload is Dictionary:
+		push_warning("Invalid save payload: " + save_path)
+		return {}
 	
-	var version = save_data.get("version", 0)
-	if version != 1:
-		push_error("Unsupported save file version: " + str(version))
-		return null
+	return {
+		"version": header.version,
+		"timestamp": header.get("timestamp", 0),
+		"player_data": payload.get("player_data", {})
+	}
+
+# Reads the container header, leaving the file at the start of the payload.
+# Returns {} for files that are not in the container format.
+static func _read_header(save_file: FileAccess) -> Dictionary:
+	if save_file.get_length() < 12:
+		return {}
+	if save_file.get_buffer(4).get_string_from_ascii() != SAVE_MAGIC:
+		return {}
 	
-	var player_dict = save_data.get("player_data", {})
-	if player_dict.is_empty():
-		push_error("No player data in save file")
-		return null
+	var version = save_file.get_32()
+	if version > SAVE_VERSION:
+		push_error("Unsupported save file version: " + str(version))
+		return {"version": version}
 	
-	return PlayerData.from_save_dict(player_dict)
+	var header_size = save_file.get_32()
+	var header = bytes_to_var(save_file.get_buffer(header_size))
+	if not header is Dictionary:
+		return {}
+	header["version"] = version
+	return header
+
+static func _checksum(bytes: PackedByteArray) -> String:
+	var context = HashingContext.new()
+	context.start(HashingContext.HASH_SHA256)
+	context.update(bytes)
+	return context.finish().hex_encode()
+
+# Rewrites a version 1 save in the current format, keeping its timestamp
+static func migrate_save(save_path: String) -> bool:
+	var save_data = _read_save(save_path)
+	if save_data.is_empty():
+		return false
+	if save_data.version >= SAVE_VERSION:
+		return true
+	return _write_save(save_path, save_data.get("player_data", {}), save_data.get("timestamp", 0))
+
+# Format version of a save file, or 0 when it cannot be read
+static func get_save_version(save_path: String) -> int:
+	var save_file = FileAccess.open(save_path, FileAccess.READ)
+	if save_file == null:
+		return 0
+	var header = _read_header(save_file)
+	if not header.is_empty():
+		return header.version
+	save_file.seek(0)
+	var legacy_data = save_file.get_var()
+	if legacy_data is Dictionary:
+		return legacy_data.get("version", 0)
+	return 0
 
 static func delete_save(slot: int = 0) -> bool:
-	var save_path = SAVE_DIR + "save_slot_%d.sav" % slot
-	if slot == 0:
-		save_path = SAVE_DIR + SAVE_FILE
+	var save_path = _slot_path(slot)
 	
-	if FileAccess.file_exists(save_path):
-		var dir = DirAccess.open(SAVE_DIR)
-		if dir != null:
-			dir.remove(save_path)
-			var backup_path = save_path.replace(".sav", ".bak")
-			if FileAccess.file_exists(backup_path):
-				dir.remove(backup_path)
-			return true
+	var deleted = false
+	for candidate in _load_candidates(save_path):
+		if FileAccess.file_exists(candidate):
+			deleted = DirAccess.remove_absolute(candidate) == OK or deleted
 	
-	return false
+	return deleted
 
 static func list_saves() -> Array[Dictionary]:
-	var saves = []
+	var saves: Array[Dictionary] = []
 	
 	var dir = DirAccess.open(SAVE_DIR)
 	if dir == null:
@@ -93,14 +230,16 @@ static func list_saves() -> Array[Dictionary]:
 	var file_name = dir.get_next()
 	
 	while file_name != "":
-		if file_name.ends_with(".sav") and not file_name.ends_with(".bak"):
+		if file_name.ends_with(".sav"):
 			var save_info = get_save_info(SAVE_DIR + file_name)
-			if save_info != null:
+			if not save_info.is_empty():
 				saves.append(save_info)
 		file_name = dir.get_next()
 	
 	return saves
 
+# Slot metadata from the save header. Version 1 saves are migrated first, so
+# they are only read in full once.
 static func get_save_info(save_path: String) -> Dictionary:
 	if not FileAccess.file_exists(save_path):
 		return {}
@@ -109,35 +248,39 @@ static func get_save_info(save_path: String) -> Dictionary:
 	if save_file == null:
 		return {}
 	
-	var save_data = save_file.get_var()
+	var header = _read_header(save_file)
 	save_file.close()
 	
-	if not save_data is Dictionary:
-		return {}
+	if header.is_empty():
+		if not migrate_save(save_path):
+			return {}
+		save_file = FileAccess.open(save_path, FileAccess.READ)
+		if save_file == null:
+			return {}
+		header = _read_header(save_file)
+		save_file.close()
+		if header.is_empty():
+			return {}
 	
-	var player_dict = save_data.get("player_data", {})
+	if header.version > SAVE_VERSION:
+		return {}
 	
 	return {
 		"path": save_path,
-		"timestamp": save_data.get("timestamp", 0),
-		"player_level": player_dict.get("player_level", 1),
-		"gold": player_dict.get("gold", 0),
-		"completed_encounters": player_dict.get("completed_encounters", []).size()
+		"timestamp": header.get("timestamp", 0),
+		"player_level": header.get("player_level", 1),
+		"gold": header.get("gold", 0),
+		"completed_encounters": header.get("completed_encounters", 0)
 	}
 
 static func has_save(slot: int = 0) -> bool:
-	var save_path = SAVE_DIR + "save_slot_%d.sav" % slot
-	if slot == 0:
-		save_path = SAVE_DIR + SAVE_FILE
-	
-	return FileAccess.file_exists(save_path)
+	return _load_candidates(_slot_path(slot)).any(func(path): return FileAccess.file_exists(path))
 
 static func restore_from_backup(slot: int = 0) -> bool:
-	var save_path = SAVE_DIR + "save_slot_%d.sav" % slot
+	var save_path = _slot_path(slot)
 	var backup_path = SAVE_DIR + "save_slot_%d.bak" % slot
 	
 	if slot == 0:
-		save_path = SAVE_DIR + SAVE_FILE
 		backup_path = SAVE_DIR + BACKUP_FILE
 	
 	if FileAccess.file_exists(backup_path):
@@ -146,4 +289,4 @@ static func restore_from_backup(slot: int = 0) -> bool:
 			dir.copy(backup_path, save_path)
 			return true
 	
-	return false
\ No newline at end of file
+	return false
@@ -4,21 +4,58 @@ extends Resource
 signal level_up(new_level: int)
 signal experience_gained(amount: int)
 
-@export var unit_id: String = ""
-@export var custom_name: String = ""
-@export var template_id: String = ""
-@export var unit_level: int = 1
-@export var current_experience: int = 0
+@export var unit_id: String = "":
+	set(value):
+		unit_id = value
+		_dirty = true
+@export var custom_name: String = "":
+	set(value):
+		custom_name = value
+		_dirty = true
+@export var template_id: String = "":
+	set(value):
+		template_id = value
+		_dirty = true
+@export var unit_level: int = 1:
+	set(value):
+		unit_level = value
+		_dirty = true
+@export var current_experience: int = 0:
+	set(value):
+		current_experience = value
+		_dirty = true
 @export var equipped_items: Dictionary = {
 	"weapon": "",
 	"armor": "",
 	"accessory": ""
-}
-@export var skill_points: int = 0
-@export var unlocked_skills: Array[String] = []
-@export var skill_levels: Dictionary = {}
-@export var total_battles: int = 0
-@export var total_kills: int = 0
+}:
+	set(value):
+		equipped_items = value
+		_dirty = true
+@export var skill_points: int = 0:
+	set(value):
+		skill_points = value
+		_dirty = true
+@export var unlocked_skills: Array[String] = []:
+	set(value):
+		unlocked_skills = value
+		_dirty = true
+@export var skill_levels: Dictionary = {}:
+	set(value):
+		skill_levels = value
+		_dirty = true
+@export var total_battles: int = 0:
+	set(value):
+		total_battles = value
+		_dirty = true
+@export var total_kills: int = 0:
+	set(value):
+		total_kills = value
+		_dirty = true
+
+# Set by every change that reaches the save data; cleared once the unit has
+# been serialized for a save (PlayerData.take_save_snapshot)
+var _dirty: bool = true
 
 const MAX_UNIT_LEVEL = 10
 const EXPERIENCE_PER_LEVEL = [
@@ -82,10 +119,12 @@ func _level_up() -> void:
 func equip_item(slot: String, item_id: String) -> void:
 	if equipped_items.has(slot):
 		equipped_items[slot] = item_id
+		_dirty = true
 
 func unequip_item(slot: String) -> void:
 	if equipped_items.has(slot):
 		equipped_items[slot] = ""
+		_dirty = true
 
 func get_equipped_item(slot: String) -> String:
 	return equipped_items.get(slot, "")
@@ -94,6 +133,7 @@ func unlock_skill(skill_id: String) -> void:
 	if skill_id not in unlocked_skills:
 		unlocked_skills.append(skill_id)
 		skill_levels[skill_id] = 1
+		_dirty = true
 
 func upgrade_skill(skill_id: String) -> bool:
 	if skill_id in unlocked_skills and skill_points > 0:
@@ -116,6 +156,12 @@ func record_battle() -> void:
 func record_kill() -> void:
 	total_kills += 1
 
+func is_dirty() -> bool:
+	return _dirty
+
+func clear_dirty() -> void:
+	_dirty = false
+
 func to_dict() -> Dictionary:
 	return {
 		"unit_id": unit_id,
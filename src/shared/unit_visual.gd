@@ -12,6 +12,9 @@ var animation_player: AnimationPlayer
 
 var battle_unit: BattleUnit
 
+# Tweens started by this visual; release() stops them
+var _tweens: Array[Tween] = []
+
 func _ready() -> void:
     # Get node references or create them if they don't exist
     sprite = get_node_or_null("Sprite2D")
@@ -94,9 +97,42 @@ func _create_animations() -> void:
 
 func setup(unit: BattleUnit) -> void:
     battle_unit = unit
-    if is_inside_tree():
+    # A visual reused from a BattleUnitPool is already ready but may be outside the tree
+    if is_inside_tree() or is_node_ready():
         _setup_from_unit()
 
+# Detaches the visual from its unit and restores its initial look, for units
+# returned to a BattleUnitPool. setup() attaches it again.
+func release() -> void:
+    for tween in _tweens:
+        if tween.is_valid():
+            tween.kill()
+    _tweens.clear()
+    
+    if battle_unit:
+        if battle_unit.stat_changed.is_connected(_on_stat_changed):
+            battle_unit.stat_changed.disconnect(_on_stat_changed)
+        if battle_unit.unit_died.is_connected(_on_unit_died):
+            battle_unit.unit_died.disconnect(_on_unit_died)
+        if battle_unit.status_applied.is_connected(_on_status_applied):
+            battle_unit.status_applied.disconnect(_on_status_applied)
+        if battle_unit.status_removed.is_connected(_on_status_removed):
+            battle_unit.status_removed.disconnect(_on_status_removed)
+    battle_unit = null
+    
+    if not is_node_ready():
+        return
+    animation_player.stop()
+    sprite.position = Vector2.ZERO
+    sprite.rotation = 0.0
+    sprite.modulate = Color.WHITE
+    for child in status_container.get_children():
+        child.free()
+    # Damage numbers whose tweens were stopped above
+    for child in get_children():
+        if child is Label and child != name_label:
+            child.free()
+
 func _setup_from_unit() -> void:
     if not battle_unit:
         return
@@ -167,7 +203,7 @@ func play_hurt_animation() -> void:
         animation_player.play("hurt")
 
 func play_heal_animation() -> void:
-    var tween = get_tree().create_tween()
+    var tween = _start_tween()
     tween.tween_property(sprite, "modulate", Color.GREEN, 0.2)
     tween.tween_property(sprite, "modulate", team_color, 0.2)
 
@@ -183,12 +219,12 @@ func play_skill_animation(skill_name: String) -> void:
             play_attack_animation()
 
 func _play_fire_effect() -> void:
-    var tween = get_tree().create_tween()
+    var tween = _start_tween()
     tween.tween_property(sprite, "modulate", Color.ORANGE_RED, 0.1)
     tween.tween_property(sprite, "modulate", team_color, 0.3)
 
 func _play_ice_effect() -> void:
-    var tween = get_tree().create_tween()
+    var tween = _start_tween()
     tween.tween_property(sprite, "modulate", Color.LIGHT_BLUE, 0.1)
     tween.tween_property(sprite, "modulate", team_color, 0.3)
 
@@ -206,7 +242,7 @@ func show_damage_number(damage: float) -> void:
     add_child(damage_label)
     
     # Animate the damage number
-    var tween = get_tree().create_tween()
+    var tween = _start_tween()
     tween.tween_property(damage_label, "position", Vector2(0, -60), 0.5)
     tween.parallel().tween_property(damage_label, "modulate:a", 0.0, 0.5)
     tween.tween_callback(damage_label.queue_free)
@@ -216,7 +252,7 @@ func _on_stat_changed(stat_name: String, new_value: float) -> void:
         update_health_bar()
 
 func _on_unit_died() -> void:
-    var tween = get_tree().create_tween()
+    var tween = _start_tween()
     tween.tween_property(sprite, "modulate", Color(0.3, 0.3, 0.3), 0.5)
     tween.parallel().tween_property(sprite, "rotation", PI/4, 0.5)
 
@@ -225,3 +261,10 @@ func _on_status_applied(status: StatusEffect) -> void:
 
 func _on_status_removed(status: StatusEffect) -> void:
     update_status_display()
+
+func _start_tween() -> Tween:
+    var tween = get_tree().create_tween()
+    _tweens.append(tween)
+    # Forget finished tweens so the list only holds running ones
+    tween.finished.connect(func(): _tweens.erase(tween))
+    return tween
@@ -38,6 +38,7 @@ func _process(delta: float) -> void:
 	if observed_units.is_empty():
 		return
 	
+	var profile_start := Time.get_ticks_usec() if BattleProfiler.enabled else 0
 	var scaled_delta = delta * time_scale
 	
 	# Update active casts
@@ -48,6 +49,9 @@ func _process(delta: float) -> void:
 	if _evaluation_timer >= evaluation_interval:
 		_evaluation_timer = 0.0
 		_check_skill_activations()
+	
+	if BattleProfiler.enabled:
+		BattleProfiler.record(BattleProfiler.OBSERVER_TICK, profile_start)
 
 func observe_unit(unit: BattleUnit) -> void:
 	if not observed_units.has(unit):
@@ -102,6 +106,8 @@ func _check_skill_activations() -> void:
 	# Get action order from queue
 	var unit_order = action_queue.get_action_order()
 	
+	# Every unit evaluated below sees the same stats, so scoring work is shared for the tick
+	skill_evaluator.begin_tick()
 	for unit_data in unit_order:
 		var unit = unit_data["unit"]
 		if not is_instance_valid(unit) or not unit.is_alive():
@@ -120,21 +126,14 @@ func _check_skill_activations() -> void:
 		var best_skill = _evaluate_unit_skills(unit)
 		if best_skill:
 			_initiate_skill_cast(unit, best_skill)
+	
+	skill_evaluator.end_tick()
 
 
 
 func _evaluate_unit_skills(unit: BattleUnit) -> BattleSkill:
-	# Build evaluation context
+	# The context's own dictionary; its skill_history is the one passed to update_state()
 	var context = battle_context.get_unit_context(unit)
-	context["skill_history"] = _skill_history
-	
-	# Get allies and enemies
-	var allies = observed_units.filter(func(u): return is_instance_valid(u) and u.team == unit.team and u.is_alive())
-	var enemies = observed_units.filter(func(u): return is_instance_valid(u) and u.team != unit.team and u.is_alive())
-	
-	context["allies"] = allies
-	context["enemies"] = enemies
-	context["unit"] = unit
 	
 	# Evaluate skills
 	return skill_evaluator.evaluate_skills(unit, context)
@@ -147,11 +146,8 @@ func _initiate_skill_cast(unit: BattleUnit, skill: BattleSkill) -> void:
 	if not cast.claim_resources():
 		return
 	
-	# Get targets
-	var allies = observed_units.filter(func(u): return is_instance_valid(u) and u.team == unit.team and u.is_alive())
-	var enemies = observed_units.filter(func(u): return is_instance_valid(u) and u.team != unit.team and u.is_alive())
-	
-	cast.targets = skill.get_targets(unit, allies, enemies)
+	# Get targets from the context's live rosters
+	cast.targets = skill.get_targets(unit, battle_context.get_alive_allies(unit.team), battle_context.get_alive_enemies(unit.team))
 	
 	if cast.targets.is_empty():
 		cast.refund()
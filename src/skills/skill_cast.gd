@@ -50,7 +50,7 @@ func claim_resources() -> bool:
         claimed_resources[resource_type] = skill.resource_cost
     
     is_committed = true
-    cast_start_time = Time.get_unix_time_from_system()
+    cast_start_time = skill.get_current_time()
     last_refunded_resources = {}
     cast_started.emit()
     
@@ -101,7 +101,7 @@ func execute(rule_processor = null) -> bool:
             current_execution.append(result)
 
     # Mark skill as used (for cooldown)
-    skill.last_used_time = Time.get_unix_time_from_system()
+    skill.last_used_time = skill.get_current_time()
 
     # Clean up
     claimed_resources.clear()
@@ -118,7 +118,7 @@ func get_cast_progress() -> float:
     if skill.cast_time <= 0:
         return 1.0
     
-    var elapsed = Time.get_unix_time_from_system() - cast_start_time
+    var elapsed = skill.get_current_time() - cast_start_time
     return min(1.0, elapsed / skill.cast_time)
 
 func is_ready() -> bool:
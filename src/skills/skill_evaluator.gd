@@ -18,9 +18,30 @@ var activation_threshold: float = 30.0
 # Debug mode for logging decisions
 var debug_mode: bool = false
 
+# Per-tick scoring cache. Everything in it depends only on state that does not
+# change while one evaluation tick runs (stats, health, statuses, modifiers), so
+# it is shared by every unit evaluated in the tick and dropped when it ends.
+# Buckets: caster modifier snapshots, rule lookups keyed by the skill/target
+# context tuple, and aggregates keyed by the allies/enemies rosters.
+var _tick_cache: Dictionary = {}
+var _tick_depth: int = 0
+
+# Opens an evaluation tick; nested calls share the outer tick
+func begin_tick() -> void:
+    _tick_depth += 1
+
+func end_tick() -> void:
+    _tick_depth = max(0, _tick_depth - 1)
+    if _tick_depth == 0:
+        _tick_cache.clear()
+
 func evaluate_skills(unit: BattleUnit, context: Dictionary) -> BattleSkill:
+    var profile_start := Time.get_ticks_usec() if BattleProfiler.enabled else 0
     var evaluations: Array[Dictionary] = []
     
+    # A call outside an open tick is its own tick
+    begin_tick()
+    
     # Set AI-specific weights
     _apply_ai_weights(unit)
     
@@ -37,11 +58,15 @@ func evaluate_skills(unit: BattleUnit, context: Dictionary) -> BattleSkill:
                 "breakdown": _get_last_score_breakdown()
             })
     
+    end_tick()
+    
     evaluations.sort_custom(func(a, b): return a.score > b.score)
     
     if debug_mode and not evaluations.is_empty():
         _log_evaluation_results(unit, evaluations)
     
+    if BattleProfiler.enabled:
+        BattleProfiler.record(BattleProfiler.SKILL_EVALUATION, profile_start)
     return evaluations[0].skill if not evaluations.is_empty() else null
 
 func _calculate_skill_score(skill: BattleSkill, unit: BattleUnit, context: Dictionary) -> float:
@@ -85,48 +110,41 @@ func _evaluate_damage_efficiency(skill: BattleSkill, unit: BattleUnit, context:
     # Base damage consideration
     score += skill.base_damage * 0.5
     
-    # Calculate expected damage with modifiers
-    var damage_projector = StatProjector.new()
-    
-    # Copy caster's attack modifiers if applicable
-    if unit.stat_projectors.has("attack"):
-        for mod in unit.stat_projectors["attack"].list_modifiers():
-            var new_mod = StatProjector.StatModifier.new(
-                mod.id,
-                mod.op,
-                mod.value,
-                mod.priority,
-                mod.applies_to,
-                mod.expires_at_unix
-            )
-            damage_projector.add_modifier(new_mod)
+    # Expected damage starts from the caster's attack modifiers; the rule
+    # modifiers of each target accumulate on top, in priority order
+    var damage_modifiers: Array = _get_attack_snapshot(unit).duplicate()
+    var rule_processor = context.rule_processor if context.has("rule_processor") else null
+    var caster_health_percentage = _get_health_percentage(unit)
     
     var potential_targets = skill.get_targets(unit, context.allies, context.enemies)
     var total_expected_damage: float = 0.0
     
     for target in potential_targets:
-        # Build target-specific context
-        var skill_context = {
-            "skill_name": skill.skill_name,
-            "skill_damage_type": skill.damage_type,
-            "caster_health_percentage": unit.get_health_percentage(),
-            "caster_team": unit.team,
-            "target_health_percentage": target.get_health_percentage(),
-            "target_status": target.get_status_list(),
-            "target_team": target.team
-        }
-        
         # Get contextual modifiers
-        if context.has("rule_processor") and context.rule_processor:
-            var mods = context.rule_processor.get_modifiers_for_context(skill_context)
-            for mod in mods:
-                damage_projector.add_modifier(mod)
+        if rule_processor:
+            var target_status = target.get_status_list()
+            var lookup_key = [skill.skill_name, skill.damage_type, caster_health_percentage, unit.team, _get_health_percentage(target), target_status, target.team]
+            var lookups = _tick_bucket("rule_lookups")
+            if not lookups.has(lookup_key):
+                # Build target-specific context
+                var skill_context = {
+                    "skill_name": skill.skill_name,
+                    "skill_damage_type": skill.damage_type,
+                    "caster_health_percentage": caster_health_percentage,
+                    "caster_team": unit.team,
+                    "target_health_percentage": lookup_key[4],
+                    "target_status": target_status,
+                    "target_team": target.team
+                }
+                lookups[lookup_key] = rule_processor.get_modifier_templates_for_context(skill_context)
+            for mod in lookups[lookup_key]:
+                _insert_by_priority(damage_modifiers, mod)
         
-        var final_damage = damage_projector.calculate_stat(skill.base_damage)
+        var final_damage = _apply_modifiers(skill.base_damage, damage_modifiers)
         
         # Account for defense
-        if target.stat_projectors.has("defense"):
-            var defense = target.get_projected_stat("defense")
+        if target.stats.has("defense"):
+            var defense = target.get_projected_stat(BattleUnit.STAT_DEFENSE)
             final_damage = max(1.0, final_damage - defense)
         
         # Weight by target value
@@ -257,7 +275,7 @@ func _evaluate_timing_factors(skill: BattleSkill, unit: BattleUnit, context: Dic
     
     # Speed advantage
     var avg_enemy_speed = _calculate_average_enemy_speed(context)
-    var speed_advantage = unit.get_projected_stat("speed") - avg_enemy_speed
+    var speed_advantage = unit.get_projected_stat(BattleUnit.STAT_SPEED) - avg_enemy_speed
     if speed_advantage > 0:
         score += min(20.0, speed_advantage * 2.0)
     
@@ -283,12 +301,58 @@ func _evaluate_risk_factors(skill: BattleSkill, unit: BattleUnit, context: Dicti
     
     return clamp(risk_score, 0.0, 100.0)
 
+# Per-tick cache helpers
+func _tick_bucket(bucket: String) -> Dictionary:
+    # Outside a tick nothing is kept, so direct calls always see current state
+    if _tick_depth == 0:
+        return {}
+    if not _tick_cache.has(bucket):
+        _tick_cache[bucket] = {}
+    return _tick_cache[bucket]
+
+# The caster's attack modifiers in StatProjector order. Modifiers are only read
+# (never added to a projector), so snapshots and cached rule results are shared.
+func _get_attack_snapshot(unit: BattleUnit) -> Array:
+    var snapshots = _tick_bucket("attack_snapshots")
+    if snapshots.has(unit):
+        return snapshots[unit]
+    var snapshot: Array = []
+    var attack_projector: StatProjector = unit.get_stat_projector("attack", false)
+    if attack_projector != null:
+        snapshot = attack_projector.list_modifiers()
+    snapshots[unit] = snapshot
+    return snapshot
+
+func _get_health_percentage(unit: BattleUnit) -> float:
+    var health = _tick_bucket("health_percentage")
+    if not health.has(unit):
+        health[unit] = unit.get_health_percentage()
+    return health[unit]
+
+# Same ordering as StatProjector: higher priority first, then insertion order
+func _insert_by_priority(modifiers: Array, mod) -> void:
+    if not mod is StatProjector.StatModifier or mod.id.is_empty():
+        return
+    var position = modifiers.size()
+    while position > 0 and modifiers[position - 1].priority < mod.priority:
+        position -= 1
+    modifiers.insert(position, mod)
+
+# Matches StatProjector.calculate_stat for an unfiltered projection
+func _apply_modifiers(base: float, modifiers: Array) -> float:
+    var value: float = base
+    for mod in modifiers:
+        match mod.op:
+            StatProjector.ModifierOp.SET: value = mod.value
+            StatProjector.ModifierOp.MUL: value *= mod.value
+            StatProjector.ModifierOp.ADD: value += mod.value
+    return value
+
 # Helper functions
 func _apply_ai_weights(unit: BattleUnit) -> void:
     if not unit.has_meta("ai_type"):
         return
     
-    var BattleAI = load("res://src/battle/battle_ai.gd")
     var ai_type = unit.get_meta("ai_type")
     match ai_type:
         BattleAI.AIType.AGGRESSIVE:
@@ -305,30 +369,40 @@ func _apply_ai_weights(unit: BattleUnit) -> void:
             pass
 
 func _calculate_target_value(target: BattleUnit, context: Dictionary) -> float:
+    var values = _tick_bucket("target_value")
+    if values.has(target):
+        return values[target]
+    
     var value: float = 1.0
     
     # Higher value for low health enemies (finish them)
-    var health_percent = target.get_health_percentage()
+    var health_percent = _get_health_percentage(target)
     if health_percent < 0.3:
         value *= 1.5
     
     # Higher value for high threat enemies
-    var threat = target.get_projected_stat("attack") * health_percent
+    var threat = target.get_projected_stat(BattleUnit.STAT_ATTACK) * health_percent
     value *= (1.0 + threat / 100.0)
     
     # Higher value for enemies with dangerous buffs
     if target.has_status("enraged") or target.has_status("blessed"):
         value *= 1.3
     
+    values[target] = value
     return value
 
 func _calculate_battle_urgency(context: Dictionary) -> float:
+    var cached = _tick_bucket("urgency")
+    var key = [context.allies, context.enemies]
+    if cached.has(key):
+        return cached[key]
+    
     var urgency: float = 0.5  # Base urgency
     
     # Check allied health
     var allies_low_health = 0
     for ally in context.allies:
-        if ally.get_health_percentage() < 0.3:
+        if _get_health_percentage(ally) < 0.3:
             allies_low_health += 1
     
     urgency += allies_low_health * 0.2
@@ -339,7 +413,8 @@ func _calculate_battle_urgency(context: Dictionary) -> float:
     if enemy_count > ally_count:
         urgency += 0.2 * (enemy_count - ally_count)
     
-    return clamp(urgency, 0.0, 1.0)
+    cached[key] = clamp(urgency, 0.0, 1.0)
+    return cached[key]
 
 func _check_skill_combo_score(skill1: BattleSkill, skill2: BattleSkill) -> float:
     # Check for known combos
@@ -373,22 +448,30 @@ func _count_enabled_combos(skill: BattleSkill, context: Dictionary) -> int:
     return combo_count
 
 func _determine_battle_phase(context: Dictionary) -> String:
+    var cached = _tick_bucket("battle_phase")
+    var key = [context.allies, context.enemies]
+    if cached.has(key):
+        return cached[key]
+    
     # Determine battle phase based on various factors
     var total_health_percent = 0.0
     var unit_count = 0
     
     for unit in context.allies + context.enemies:
-        total_health_percent += unit.get_health_percentage()
+        total_health_percent += _get_health_percentage(unit)
         unit_count += 1
     
     var avg_health = total_health_percent / max(1, unit_count)
     
+    var phase: String
     if avg_health > 0.8:
-        return "opening"
+        phase = "opening"
     elif avg_health > 0.4:
-        return "mid_game"
+        phase = "mid_game"
     else:
-        return "end_game"
+        phase = "end_game"
+    cached[key] = phase
+    return phase
 
 func _calculate_single_target_priority(target: BattleUnit, skill: BattleSkill, context: Dictionary) -> float:
     var priority: float = 50.0  # Base priority
@@ -401,7 +484,7 @@ func _calculate_single_target_priority(target: BattleUnit, skill: BattleSkill, c
         priority += 30.0  # Interrupt important casts
     
     if target.team != context.unit.team:  # Enemy
-        var threat_level = target.get_projected_stat("attack")
+        var threat_level = target.get_projected_stat(BattleUnit.STAT_ATTACK)
         priority += threat_level * 0.5
     else:  # Ally
         if skill.target_type in ["single_ally", "all_allies"]:
@@ -413,28 +496,44 @@ func _calculate_single_target_priority(target: BattleUnit, skill: BattleSkill, c
 func _calculate_status_synergy(skill: BattleSkill, unit: BattleUnit, context: Dictionary) -> float:
     var synergy_score: float = 0.0
     
-    # Check for status effect combos
-    for enemy in context.enemies:
-        for status in enemy.get_status_list():
-            if status == "frozen" and skill.damage_type == "fire":
-                synergy_score += 25.0
-            elif status == "wet" and skill.damage_type == "lightning":
-                synergy_score += 20.0
-            elif status == "stunned" and skill.has_tag("execute"):
-                synergy_score += 30.0
+    # Check for status effect combos; the bonuses are whole numbers, so summing
+    # per status count gives exactly the per-enemy total
+    var status_counts = _count_enemy_statuses(context)
+    if skill.damage_type == "fire":
+        synergy_score += 25.0 * status_counts.get("frozen", 0)
+    elif skill.damage_type == "lightning":
+        synergy_score += 20.0 * status_counts.get("wet", 0)
+    if skill.has_tag("execute"):
+        synergy_score += 30.0 * status_counts.get("stunned", 0)
     
     return synergy_score
 
+func _count_enemy_statuses(context: Dictionary) -> Dictionary:
+    var cached = _tick_bucket("enemy_statuses")
+    if cached.has(context.enemies):
+        return cached[context.enemies]
+    var counts = {}
+    for enemy in context.enemies:
+        for status in enemy.get_status_list():
+            counts[status] = counts.get(status, 0) + 1
+    cached[context.enemies] = counts
+    return counts
+
 func _calculate_interruption_risk(unit: BattleUnit, cast_time: float, context: Dictionary) -> float:
     var risk: float = 0.0
     
     # Count enemies that could interrupt
-    var interrupters = 0
-    for enemy in context.enemies:
-        if enemy.get_projected_stat("speed") > unit.get_projected_stat("speed"):
-            interrupters += 1
-    
-    risk = interrupters * 10.0 * cast_time
+    var cached = _tick_bucket("interrupters")
+    var key = [unit, context.enemies]
+    if not cached.has(key):
+        var interrupters = 0
+        var speed = unit.get_projected_stat(BattleUnit.STAT_SPEED)
+        for enemy in context.enemies:
+            if enemy.get_projected_stat(BattleUnit.STAT_SPEED) > speed:
+                interrupters += 1
+        cached[key] = interrupters
+    
+    risk = cached[key] * 10.0 * cast_time
     
     return min(50.0, risk)
 
@@ -442,11 +541,16 @@ func _calculate_average_enemy_speed(context: Dictionary) -> float:
     if context.enemies.is_empty():
         return 0.0
     
+    var cached = _tick_bucket("average_enemy_speed")
+    if cached.has(context.enemies):
+        return cached[context.enemies]
+    
     var total_speed: float = 0.0
     for enemy in context.enemies:
-        total_speed += enemy.get_projected_stat("speed")
+        total_speed += enemy.get_projected_stat(BattleUnit.STAT_SPEED)
     
-    return total_speed / context.enemies.size()
+    cached[context.enemies] = total_speed / context.enemies.size()
+    return cached[context.enemies]
 
 # Debug helpers
 var _last_score_breakdown: Dictionary = {}
@@ -27,6 +27,25 @@ var _dirty: bool = true
 var _sorted_modifier_list: Array = []
 var _cached_calculations: Dictionary = {}
 var _last_base: float = 0.0
+var _modifier_count: int = 0
+
+# Bumped on every modifier change so owners can cache projected values cheaply
+var revision: int = 0
+
+# Min-heap of timed modifiers ordered by expires_at_unix. Entries for modifiers
+# removed by other means are dropped lazily when popped or on compaction.
+var _expiry_heap: Array = []
+
+# Optional clock used by prune_expired() when no time is passed, e.g. a battle's
+# simulated clock. Falls back to wall-clock unix time.
+var time_source: Callable = Callable()
+
+# Batch state: mutations inside begin_batch()/commit_batch() are reported as one change
+var _batch_depth: int = 0
+var _batch_has_changes: bool = false
+var _batch_old_value: float = 0.0
+var _batch_added: Array = []
+var _batch_removed: Array = []
 
 # Signal
 signal stat_calculation_changed(payload: Dictionary)
@@ -40,7 +59,7 @@ func add_modifier(mod: StatModifier) -> StatModifier:
         push_error("Modifier must have a non-empty id.")
         return null
 
-    var old_value = calculate_stat(_last_base)
+    var old_value = _capture_old_value()
 
     mod.insertion_index = _next_insert_index
     _next_insert_index += 1
@@ -48,11 +67,60 @@ func add_modifier(mod: StatModifier) -> StatModifier:
     if not _modifiers.has(mod.id):
         _modifiers[mod.id] = []
     _modifiers[mod.id].append(mod)
+    _modifier_count += 1
+
+    if mod.expires_at_unix >= 0.0:
+        _heap_push(mod)
 
     _mark_dirty()
-    stat_calculation_changed.emit({ "old_value": old_value, "added": [mod], "removed": [] })
+    if _batch_depth > 0:
+        _batch_added.append(mod)
+    else:
+        stat_calculation_changed.emit({ "old_value": old_value, "added": [mod], "removed": [] })
     return mod
 
+func add_modifiers(mods: Array) -> Array:
+    var added: Array = []
+    begin_batch()
+    for mod in mods:
+        var result = add_modifier(mod)
+        if result != null:
+            added.append(result)
+    commit_batch()
+    return added
+
+func begin_batch() -> void:
+    _batch_depth += 1
+
+# Ends the outermost batch and emits a single change covering every mutation
+# made since begin_batch(). Returns true if anything changed.
+func commit_batch() -> bool:
+    if _batch_depth == 0:
+        push_error("commit_batch called without a matching begin_batch")
+        return false
+
+    _batch_depth -= 1
+    if _batch_depth > 0 or not _batch_has_changes:
+        return false
+
+    var payload = { "old_value": _batch_old_value, "added": _batch_added, "removed": _batch_removed }
+    _batch_has_changes = false
+    _batch_added = []
+    _batch_removed = []
+    stat_calculation_changed.emit(payload)
+    return true
+
+func is_batching() -> bool:
+    return _batch_depth > 0
+
+func _capture_old_value() -> float:
+    if _batch_depth == 0:
+        return calculate_stat(_last_base)
+    if not _batch_has_changes:
+        _batch_has_changes = true
+        _batch_old_value = calculate_stat(_last_base)
+    return _batch_old_value
+
 func remove_modifier(mod_instance: StatModifier) -> void:
     if mod_instance == null:
         push_error("remove_modifier called with null")
@@ -62,6 +130,67 @@ func remove_modifier(mod_instance: StatModifier) -> void:
         return
     _process_removals([mod_instance])
 
+func remove_modifiers_by_applies_to(tag: String) -> Array:
+    var to_remove: Array = []
+    for id in _modifiers:
+        for mod in _modifiers[id]:
+            if mod.applies_to.has(tag):
+                to_remove.append(mod)
+
+    _process_removals(to_remove)
+    return to_remove
+
+# Removes every modifier whose expires_at_unix is at or before `now` as a single
+# change. Only the expired heap entries are visited. A negative `now` reads the
+# current time from time_source.
+func prune_expired(now: float = -1.0) -> Array:
+    if now < 0.0:
+        now = get_current_time()
+
+    # An instance added more than once has one heap entry per copy; list it once per
+    # copy still held so _process_removals erases every one. Entries left behind by
+    # copies removed earlier are skipped.
+    var expired: Array = []
+    var listed: Dictionary = {}
+    while not _expiry_heap.is_empty() and _expiry_heap[0].expires_at_unix <= now:
+        var mod: StatModifier = _heap_pop()
+        var count: int = listed.get(mod, 0)
+        if count >= _count_copies(mod):
+            continue
+        listed[mod] = count + 1
+        expired.append(mod)
+
+    _process_removals(expired)
+    return expired
+
+func get_next_expiry() -> float:
+    while not _expiry_heap.is_empty() and not _contains_modifier(_expiry_heap[0]):
+        _heap_pop()
+    if _expiry_heap.is_empty():
+        return -1.0
+    return _expiry_heap[0].expires_at_unix
+
+func get_current_time() -> float:
+    if time_source.is_valid():
+        return time_source.call()
+    return Time.get_unix_time_from_system()
+
+func clear() -> void:
+    var to_remove: Array = []
+    for id in _modifiers:
+        to_remove.append_array(_modifiers[id])
+
+    _process_removals(to_remove)
+    _expiry_heap.clear()
+
+func has_modifier(id: String) -> bool:
+    return _modifiers.has(id)
+
+func get_modifiers_for_id(id: String) -> Array:
+    if not _modifiers.has(id):
+        return []
+    return _modifiers[id].duplicate()
+
 func remove_modifiers_by_id(id: String) -> Array:
     if not _modifiers.has(id):
         return []
@@ -94,19 +223,27 @@ func _process_removals(removed_mods: Array) -> void:
     if removed_mods.is_empty():
         return
 
-    var old_value = calculate_stat(_last_base)
+    var old_value = _capture_old_value()
 
     for mod in removed_mods:
         if not mod is StatModifier:
             push_error("_process_removals: Invalid modifier type: " + str(typeof(mod)))
             continue
         if _modifiers.has(mod.id):
+            var before: int = _modifiers[mod.id].size()
             _modifiers[mod.id].erase(mod)
+            _modifier_count -= before - _modifiers[mod.id].size()
             if _modifiers[mod.id].is_empty():
                 _modifiers.erase(mod.id)
 
+    if _expiry_heap.size() > 2 * _modifier_count + 16:
+        _rebuild_expiry_heap()
+
     _mark_dirty()
-    stat_calculation_changed.emit({ "old_value": old_value, "added": [], "removed": removed_mods })
+    if _batch_depth > 0:
+        _batch_removed.append_array(removed_mods)
+    else:
+        stat_calculation_changed.emit({ "old_value": old_value, "added": [], "removed": removed_mods })
 
 func _calculate_value_from_sorted_list(base: float, applies_to_filter) -> float:
     var value: float = base
@@ -119,6 +256,8 @@ func _calculate_value_from_sorted_list(base: float, applies_to_filter) -> float:
     return value
 
 func _rebuild_sorted_list() -> void:
+    if BattleProfiler.enabled:
+        BattleProfiler.count(BattleProfiler.STAT_REBUILDS)
     _sorted_modifier_list.clear()
     for id in _modifiers.keys():
         _sorted_modifier_list.append_array(_modifiers[id])
@@ -130,9 +269,68 @@ func _modifier_compare(a: StatModifier, b: StatModifier) -> bool:
         return a.priority > b.priority
     return a.insertion_index < b.insertion_index
 
+func _contains_modifier(mod: StatModifier) -> bool:
+    return _modifiers.has(mod.id) and _modifiers[mod.id].has(mod)
+
+func _count_copies(mod: StatModifier) -> int:
+    if not _modifiers.has(mod.id):
+        return 0
+    return _modifiers[mod.id].count(mod)
+
+func _expires_before(a: StatModifier, b: StatModifier) -> bool:
+    if a.expires_at_unix != b.expires_at_unix:
+        return a.expires_at_unix < b.expires_at_unix
+    return a.insertion_index < b.insertion_index
+
+func _heap_push(mod: StatModifier) -> void:
+    _expiry_heap.append(mod)
+    var i: int = _expiry_heap.size() - 1
+    while i > 0:
+        var parent: int = (i - 1) / 2
+        if not _expires_before(_expiry_heap[i], _expiry_heap[parent]):
+            break
+        var tmp = _expiry_heap[i]
+        _expiry_heap[i] = _expiry_heap[parent]
+        _expiry_heap[parent] = tmp
+        i = parent
+
+func _heap_pop() -> StatModifier:
+    var top: StatModifier = _expiry_heap[0]
+    var last = _expiry_heap.pop_back()
+    if _expiry_heap.is_empty():
+        return top
+
+    _expiry_heap[0] = last
+    var size: int = _expiry_heap.size()
+    var i: int = 0
+    while true:
+        var smallest: int = i
+        var left: int = 2 * i + 1
+        var right: int = left + 1
+        if left < size and _expires_before(_expiry_heap[left], _expiry_heap[smallest]):
+            smallest = left
+        if right < size and _expires_before(_expiry_heap[right], _expiry_heap[smallest]):
+            smallest = right
+        if smallest == i:
+            break
+        var tmp = _expiry_heap[i]
+        _expiry_heap[i] = _expiry_heap[smallest]
+        _expiry_heap[smallest] = tmp
+        i = smallest
+    return top
+
+func _rebuild_expiry_heap() -> void:
+    _expiry_heap.clear()
+    for id in _modifiers:
+        for mod in _modifiers[id]:
+            if mod.expires_at_unix >= 0.0:
+                _expiry_heap.append(mod)
+    _expiry_heap.sort_custom(_expires_before)  # A sorted array is a valid min-heap
+
 func _mark_dirty() -> void:
     _dirty = true
     _cached_calculations.clear()
+    revision += 1
 
 # Convenience wrappers
 func add_flat_modifier(id: String, amount: float, priority: int = 0, applies_to: Array = [], expires_at_unix: float = -1.0) -> StatModifier:
@@ -148,6 +346,9 @@ func set_override(id: String, value: float, priority: int = 0, applies_to: Array
     return add_modifier(mod)
 
 func list_modifiers() -> Array:
+    if _dirty:
+        _rebuild_sorted_list()
+        _dirty = false
     return _sorted_modifier_list.duplicate()
 
 static func create_from_dict(dict: Dictionary) -> StatModifier:
@@ -25,6 +25,11 @@ func _init(_id: String = "", _name: String = "", _desc: String = "", _duration:
         expires_at = Time.get_unix_time_from_system() + duration
 
 func apply_to(unit: BattleUnit) -> void:
+    # Durations run on the unit's battle clock from the moment the status lands
+    var now = unit.get_current_time()
+    if duration > 0:
+        expires_at = now + duration
+    
     var rule_processor = BattleRuleProcessorScript.test_instance
 
     if not rule_processor and unit.is_inside_tree():
@@ -49,8 +54,9 @@ func apply_to(unit: BattleUnit) -> void:
         "target_status": unit.get_status_list()
     }
     
-    var modifiers = rule_processor.get_modifiers_for_context(context)
+    var modifiers = rule_processor.get_modifiers_for_context(context, now)
     
+    unit.begin_stat_batch()
     for mod in modifiers:
         if not mod is StatProjector.StatModifier:
             push_error("Invalid modifier type from rule processor: " + str(typeof(mod)))
@@ -64,15 +70,17 @@ func apply_to(unit: BattleUnit) -> void:
             applies_to = ["attack"]
         
         for stat_name in applies_to:
-            if unit.stat_projectors.has(stat_name):
-                unit.stat_projectors[stat_name].add_modifier(mod)
+            var projector: StatProjector = unit.get_stat_projector(stat_name)
+            if projector != null:
+                projector.add_modifier(mod)
                 if not mod is StatProjector.StatModifier:
                     push_error("Trying to store non-Modifier in applied_modifiers: " + str(typeof(mod)))
                 applied_modifiers.append({"modifier": mod, "stat": stat_name})
     
-    unit.recalculate_stats()
+    unit.commit_stat_batch()
 
 func remove_from(unit: BattleUnit) -> void:
+    unit.begin_stat_batch()
     for mod_data in applied_modifiers:
         if not mod_data.has("stat") or not mod_data.has("modifier"):
             push_error("Invalid mod_data structure: " + str(mod_data))
@@ -86,11 +94,12 @@ func remove_from(unit: BattleUnit) -> void:
             push_warning("Skipping non-Modifier object in applied_modifiers: " + str(typeof(modifier)))
             continue
             
-        if unit.stat_projectors.has(stat_name):
-            unit.stat_projectors[stat_name].remove_modifier(modifier)
+        var projector: StatProjector = unit.get_stat_projector(stat_name, false)
+        if projector != null:
+            projector.remove_modifier(modifier)
     
     applied_modifiers.clear()
-    unit.recalculate_stats()
+    unit.commit_stat_batch()
 
 func is_expired(now: float) -> bool:
     return expires_at > 0 and now >= expires_at
@@ -109,7 +118,7 @@ func on_turn_start(unit: BattleUnit) -> void:
         "target_team": unit.team
     }
     
-    var turn_effects = rule_processor.get_modifiers_for_context(context)
+    var turn_effects = rule_processor.get_modifier_templates_for_context(context)
     
     for mod in turn_effects:
         if mod.id.ends_with("_damage"):
@@ -117,12 +126,13 @@ func on_turn_start(unit: BattleUnit) -> void:
         elif mod.id.ends_with("_heal"):
             unit.heal(mod.value)
 
-func refresh(new_duration: float = 0.0) -> void:
+# `now` is the battle time of the refresh; wall-clock time when omitted
+func refresh(new_duration: float = 0.0, now: float = -1.0) -> void:
     if new_duration > 0:
         duration = new_duration
     
     if duration > 0:
-        expires_at = Time.get_unix_time_from_system() + duration
+        expires_at = (now if now >= 0.0 else Time.get_unix_time_from_system()) + duration
 
 func add_stack() -> void:
     if stacks < max_stacks:
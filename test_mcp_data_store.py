@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for the MCP data store cache: python3 -m pytest test_mcp_data_store.py
+"""
+
+import json
+import stat
+from unittest import mock
+
+import pytest
+
+import mcp_data_store
+from mcp_data_store import JsonCollection
+
+
+def _write_collection(path, records):
+    path.write_text(json.dumps({"templates": records}, indent=2) + "\n", encoding="utf-8")
+
+
+def test_append_splices_record_and_indexes_it(tmp_path):
+    path = tmp_path / "units.json"
+    _write_collection(path, [{"id": "goblin", "health": 30}])
+    collection = JsonCollection(path, "templates", "id")
+
+    collection.append({"id": "orc", "health": 60})
+
+    assert collection.find("orc") == {"id": "orc", "health": 60}
+    assert json.loads(path.read_text(encoding="utf-8"))["templates"][-1]["id"] == "orc"
+    # A fresh cache parses the written file the same way
+    assert JsonCollection(path, "templates", "id").find("orc") == {"id": "orc", "health": 60}
+
+
+def test_failed_append_leaves_cache_unchanged(tmp_path):
+    path = tmp_path / "units.json"
+    _write_collection(path, [{"id": "goblin", "health": 30}])
+    collection = JsonCollection(path, "templates", "id")
+    original_text = path.read_text(encoding="utf-8")
+
+    with mock.patch.object(mcp_data_store, "atomic_write_text", side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            collection.append({"id": "orc", "health": 60})
+
+    assert path.read_text(encoding="utf-8") == original_text
+    assert "orc" not in collection
+    assert collection.find("orc") is None
+    assert len(collection) == 1
+
+    # The record can still be added once writing works again
+    collection.append({"id": "orc", "health": 60})
+    assert len(collection) == 2
+    assert collection.find("orc") == {"id": "orc", "health": 60}
+
+
+def test_append_keeps_file_mode(tmp_path):
+    path = tmp_path / "units.json"
+    _write_collection(path, [{"id": "goblin", "health": 30}])
+    path.chmod(0o644)
+    collection = JsonCollection(path, "templates", "id")
+
+    collection.append({"id": "orc", "health": 60})
+
+    assert stat.S_IMODE(path.stat().st_mode) == 0o644
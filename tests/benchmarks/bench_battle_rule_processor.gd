@@ -0,0 +1,64 @@
+extends GutTest
+
+# Lookup cost benchmark for BattleRuleProcessor. Not part of the default run
+# (files use the bench_ prefix); run with:
+#   godot --headless -s res://addons/gut/gut_cmdln.gd -gdir=res://tests/benchmarks -gprefix=bench_ -gexit
+
+const BattleRuleProcessorScript = preload("res://src/battle/battle_rule_processor.gd")
+
+const RULE_COUNTS = [100, 1000, 5000]
+const UNINDEXED_RULES = 10
+const LOOKUPS_PER_SAMPLE = 2000
+const MAX_GROWTH_RATIO = 3.0
+
+func _build_rules(count: int) -> Array:
+	var generated: Array = []
+	for i in range(count - UNINDEXED_RULES):
+		generated.append({
+			"id": "skill_rule_%d" % i,
+			"conditions": {
+				"and": [
+					{"property": "skill_name", "op": "eq", "value": "Skill %d" % i},
+					{"property": "caster_health_percentage", "op": "lt", "value": 0.5}
+				]
+			},
+			"modifiers": [{"id": "skill_bonus_%d" % i, "op": "MUL", "value": 1.1, "applies_to": ["attack"]}]
+		})
+	for i in range(UNINDEXED_RULES):
+		generated.append({
+			"id": "generic_rule_%d" % i,
+			"conditions": {"property": "target_health_percentage", "op": "lt", "value": 0.25},
+			"modifiers": [{"id": "execute_bonus_%d" % i, "op": "ADD", "value": 2.0}]
+		})
+	return generated
+
+func _measure_lookup_usec(processor, context: Dictionary) -> float:
+	processor.get_modifiers_for_context(context)  # Compile the plan outside the timed loop
+	var start = Time.get_ticks_usec()
+	for i in range(LOOKUPS_PER_SAMPLE):
+		processor.get_modifiers_for_context(context)
+	return float(Time.get_ticks_usec() - start) / LOOKUPS_PER_SAMPLE
+
+func test_lookup_cost_stays_flat_as_rule_count_grows():
+	var context = {
+		"skill_name": "Skill 7",
+		"skill_damage_type": "fire",
+		"caster_health_percentage": 0.3,
+		"target_health_percentage": 0.9
+	}
+	var timings = {}
+	
+	for count in RULE_COUNTS:
+		var processor = BattleRuleProcessorScript.new()
+		processor.skip_auto_load = true
+		# Measure the compiled plan rather than the lookup cache
+		processor.lookup_cache_size = 0
+		processor.rules = _build_rules(count)
+		
+		assert_eq(processor.get_modifiers_for_context(context).size(), 1)
+		timings[count] = _measure_lookup_usec(processor, context)
+		gut.p("%d rules: %.2f usec/lookup" % [count, timings[count]])
+		processor.free()
+	
+	var ratio = timings[RULE_COUNTS[-1]] / max(0.001, timings[RULE_COUNTS[0]])
+	assert_lt(ratio, MAX_GROWTH_RATIO, "Lookup cost should not scale with rule count (ratio %.2f)" % ratio)
@@ -0,0 +1,46 @@
+extends GutTest
+
+# Stat read cost benchmark for BattleUnit. Not part of the default run
+# (files use the bench_ prefix); run with:
+#   godot --headless -s res://addons/gut/gut_cmdln.gd -gdir=res://tests/benchmarks -gprefix=bench_ -gexit
+
+const UNIT_COUNT = 500
+const READS_PER_SAMPLE = 20
+const STAT_NAMES = ["health", "max_health", "attack", "defense", "speed"]
+
+func _build_units() -> Array:
+	var units: Array = []
+	for i in range(UNIT_COUNT):
+		var unit = BattleUnit.new()
+		unit.unit_name = "Unit %d" % i
+		# Roughly a third of the roster carries modifiers, as in a typical wave
+		if i % 3 == 0:
+			unit.get_stat_projector("attack").add_percentage_modifier("buff", 1.2)
+			unit.get_stat_projector("defense").add_flat_modifier("armor", 4.0)
+		units.append(unit)
+	return units
+
+func _measure_read_usec(units: Array) -> float:
+	var start = Time.get_ticks_usec()
+	for i in range(READS_PER_SAMPLE):
+		for unit in units:
+			for stat_name in STAT_NAMES:
+				unit.get_projected_stat(stat_name)
+	return float(Time.get_ticks_usec() - start) / (READS_PER_SAMPLE * units.size() * STAT_NAMES.size())
+
+func test_stat_reads_across_roster():
+	var units = _build_units()
+	var projector_count = 0
+	for unit in units:
+		for stat_name in unit.stats:
+			if unit.get_stat_projector(stat_name, false) != null:
+				projector_count += 1
+	assert_eq(projector_count, 2 * ceili(UNIT_COUNT / 3.0), "Only modified stats should allocate projectors")
+	
+	var cold = _measure_read_usec(units)
+	var warm = _measure_read_usec(units)
+	gut.p("%d units: %.3f usec/read cold, %.3f usec/read warm" % [UNIT_COUNT, cold, warm])
+	assert_eq(units[0].get_projected_stat("attack"), 12.0)
+	
+	for unit in units:
+		unit.free()
@@ -0,0 +1,94 @@
+extends GutTest
+
+# Skill scoring cost benchmark for SkillEvaluator. Not part of the default run
+# (files use the bench_ prefix); run with:
+#   godot --headless -s res://addons/gut/gut_cmdln.gd -gdir=res://tests/benchmarks -gprefix=bench_ -gexit
+
+const BattleRuleProcessorScript = preload("res://src/battle/battle_rule_processor.gd")
+const SkillEvaluatorScript = preload("res://src/skills/skill_evaluator.gd")
+
+const TEAM_SIZES = [5, 20]
+const TICKS_PER_SAMPLE = 5
+const SKILL_TYPES = [
+	{"name": "Strike", "target_type": "single_enemy", "damage_type": "physical"},
+	{"name": "Flame Wave", "target_type": "all_enemies", "damage_type": "fire"},
+	{"name": "Execute", "target_type": "lowest_health_enemy", "damage_type": "physical"}
+]
+
+func _build_rule_processor():
+	var processor = BattleRuleProcessorScript.new()
+	processor.skip_auto_load = true
+	processor.rules = [
+		{
+			"id": "fire_bonus",
+			"conditions": {"property": "skill_damage_type", "op": "eq", "value": "fire"},
+			"modifiers": [{"id": "fire_mul", "op": "MUL", "value": 1.25}]
+		},
+		{
+			"id": "execute_bonus",
+			"conditions": {"property": "target_health_percentage", "op": "lt", "value": 0.5},
+			"modifiers": [{"id": "execute_add", "op": "ADD", "value": 5.0, "priority": 5}]
+		}
+	]
+	return processor
+
+func _build_units(team_size: int) -> Array[BattleUnit]:
+	var units: Array[BattleUnit] = []
+	for i in range(team_size * 2):
+		var unit = BattleUnit.new()
+		unit.team = 1 if i < team_size else 2
+		unit.stats.health = 40.0 + (i * 7) % 60
+		unit.get_stat_projector("attack").add_flat_modifier("weapon", 5.0, 10)
+		unit.get_stat_projector("attack").add_percentage_modifier("training", 1.1, 5)
+		for skill_type in SKILL_TYPES:
+			var skill = BattleSkill.new()
+			skill.skill_name = skill_type.name
+			skill.target_type = skill_type.target_type
+			skill.damage_type = skill_type.damage_type
+			skill.base_damage = 30.0
+			unit.add_skill(skill)
+		units.append(unit)
+	return units
+
+# Runs TICKS_PER_SAMPLE evaluation ticks over the whole roster. With `shared_tick`
+# every unit of a tick shares one scoring cache, as in SkillActivationObserver;
+# otherwise each evaluate_skills call only caches within itself.
+func _measure_tick_usec(evaluator, battle_context: BattleContext, units: Array[BattleUnit], shared_tick: bool, choices: Array) -> float:
+	var start = Time.get_ticks_usec()
+	for tick in range(TICKS_PER_SAMPLE):
+		if shared_tick:
+			evaluator.begin_tick()
+		for unit in units:
+			var context = battle_context.get_unit_context(unit)
+			var best = evaluator.evaluate_skills(unit, context)
+			if tick == 0:
+				choices.append(best)
+		if shared_tick:
+			evaluator.end_tick()
+	return float(Time.get_ticks_usec() - start) / TICKS_PER_SAMPLE
+
+func test_scoring_cost_per_skill_target_pair():
+	for team_size in TEAM_SIZES:
+		var processor = _build_rule_processor()
+		var units = _build_units(team_size)
+		var battle_context = BattleContext.new()
+		battle_context.rule_processor = processor
+		var casts: Array[SkillCast] = []
+		var history: Array[Dictionary] = []
+		battle_context.update_state(units, casts, history)
+		
+		# Every skill here is scored against each living enemy
+		var pairs = units.size() * SKILL_TYPES.size() * team_size
+		var per_call_choices = []
+		var shared_choices = []
+		var per_call = _measure_tick_usec(SkillEvaluatorScript.new(), battle_context, units, false, per_call_choices)
+		var shared = _measure_tick_usec(SkillEvaluatorScript.new(), battle_context, units, true, shared_choices)
+		gut.p("%dv%d: %.3f usec/pair per call, %.3f usec/pair per tick" % [team_size, team_size, per_call / pairs, shared / pairs])
+		
+		assert_eq(shared_choices, per_call_choices, "Sharing the cache across a tick must not change any decision")
+		if team_size == TEAM_SIZES[-1]:
+			assert_lt(shared, per_call, "A shared tick cache should make a %dv%d tick cheaper" % [team_size, team_size])
+		
+		for unit in units:
+			unit.free()
+		processor.free()
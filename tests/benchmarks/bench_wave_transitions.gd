@@ -0,0 +1,67 @@
+extends GutTest
+
+# Wave transition benchmark: tearing down one enemy wave and spawning the next
+# on a visual AutoBattler, with fresh units versus units reused through a
+# BattleUnitPool. Reports time per transition and the peak node count. Not
+# part of the default run (files use the bench_ prefix); run with:
+#   godot --headless -s res://addons/gut/gut_cmdln.gd -gdir=res://tests/benchmarks -gprefix=bench_ -gexit
+
+const WAVES = 20
+const WAVE_UNITS = [
+	{"template_id": "goblin_warrior", "count": 12, "level": 3},
+	{"template_id": "goblin_shaman", "count": 6, "level": 3},
+	{"template_id": "bandit_archer", "count": 12, "level": 3}
+]
+
+var battler: AutoBattler
+
+func before_each():
+	battler = AutoBattler.new()
+	# The battle itself is not run; only units and visuals are set up
+	battler.rule_processor = Node.new()
+	add_child(battler)
+	UnitFactory.load_templates()
+
+func after_each():
+	battler.rule_processor.free()
+	battler.free()
+
+# Returns [usec per transition, peak node count]
+func _run_waves(pool: BattleUnitPool) -> Array:
+	var players: Array[BattleUnit] = []
+	var peak_nodes = 0
+	var enemies: Array[BattleUnit] = []
+	var start = Time.get_ticks_usec()
+	for wave in range(WAVES):
+		if not enemies.is_empty():
+			battler.detach_units(enemies)
+			if pool:
+				pool.release_all(enemies)
+			else:
+				for unit in enemies:
+					unit.free()
+		enemies = UnitFactory.create_wave(WAVE_UNITS, 2, {}, pool)
+		battler._prepare_battle(players, enemies)
+		peak_nodes = maxi(peak_nodes, int(Performance.get_monitor(Performance.OBJECT_NODE_COUNT)))
+	var elapsed = float(Time.get_ticks_usec() - start) / WAVES
+
+	battler.detach_units(enemies)
+	if pool:
+		pool.release_all(enemies)
+	else:
+		for unit in enemies:
+			unit.free()
+	return [elapsed, peak_nodes]
+
+func test_wave_transitions_fresh_vs_pooled():
+	var fresh = _run_waves(null)
+	var pool = BattleUnitPool.new()
+	var pooled = _run_waves(pool)
+	var stats = pool.get_stats()
+
+	gut.p("%d waves of 30 units: fresh %.0f usec/transition (peak %d nodes), pooled %.0f usec/transition (peak %d nodes)" % [
+		WAVES, fresh[0], fresh[1], pooled[0], pooled[1]
+	])
+	assert_eq(stats.created, 30, "Only the first wave should create units")
+	assert_eq(stats.active, 0)
+	pool.clear()
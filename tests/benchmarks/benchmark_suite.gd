@@ -0,0 +1,284 @@
+extends RefCounted
+
+# Production-scale benchmark cases for the core engines, run by
+# tools/testing/run_benchmarks.gd and compared against baseline.json by
+# benchmark_check.py. Unlike the bench_ GUT scripts next to this file, the
+# cases only measure; they make no assertions about speed.
+#
+# build_case() returns {"run": Callable, "ops": int, "cleanup": Callable}.
+# Every call of `run` performs `ops` operations of the same work, so it can
+# be timed repeatedly; the optional `cleanup` frees what the case built.
+
+const BattleRuleProcessorScript = preload("res://src/battle/battle_rule_processor.gd")
+
+# Case name -> [engine, scale]
+const CASES = {
+	"stat_projector/10_modifiers": ["stat_projector", 10],
+	"stat_projector/100_modifiers": ["stat_projector", 100],
+	"stat_projector/1000_modifiers": ["stat_projector", 1000],
+	"rule_processor/10_rules": ["rule_processor", 10],
+	"rule_processor/100_rules": ["rule_processor", 100],
+	"rule_processor/1000_rules": ["rule_processor", 1000],
+	"rule_processor/5000_rules": ["rule_processor", 5000],
+	"rule_processor/5000_rules_cached": ["rule_processor_cached", 5000],
+	"rule_processor/skill_contexts": ["rule_processor_skill_contexts", 0],
+	"skill_evaluator/5v5": ["skill_evaluator", 5],
+	"skill_evaluator/20v20": ["skill_evaluator", 20],
+	"skill_evaluator/50v50": ["skill_evaluator", 50],
+	"action_queue/1000_units": ["action_queue", 1000],
+	"unit_factory/wave_30": ["unit_factory", 30],
+	"battle/5v5": ["battle", 5],
+	"battle/20v20": ["battle", 20]
+}
+
+const STAT_RECALCULATIONS = 200
+const RULE_LOOKUPS = 2000
+const UNINDEXED_RULES = 10
+const EVALUATION_TICKS = 2
+const QUEUE_STEPS = 100
+const QUEUE_STEP_SECONDS = 0.1
+const FACTORY_WAVES = 10
+const FACTORY_TEMPLATES = ["goblin_warrior", "goblin_shaman", "bandit_archer"]
+const SKILL_TYPES = [
+	{"name": "Strike", "target_type": "single_enemy", "damage_type": "physical"},
+	{"name": "Flame Wave", "target_type": "all_enemies", "damage_type": "fire"},
+	{"name": "Execute", "target_type": "lowest_health_enemy", "damage_type": "physical"}
+]
+# Per five units of each side in the battle cases
+const BATTLE_PLAYERS = [
+	{"template_id": "player_warrior", "count": 2, "level": 3},
+	{"template_id": "player_archer", "count": 1, "level": 3},
+	{"template_id": "player_healer", "count": 1, "level": 3},
+	{"template_id": "player_mage", "count": 1, "level": 3}
+]
+const BATTLE_ENEMIES = [
+	{"template_id": "goblin_warrior", "count": 3, "level": 3},
+	{"template_id": "goblin_shaman", "count": 2, "level": 3}
+]
+const BATTLE_SEED = 1234
+
+func get_case_names() -> Array:
+	return CASES.keys()
+
+# Returns an empty dictionary for unknown names. `root` parents the nodes of
+# cases that need the scene tree.
+func build_case(case_name: String, root: Node) -> Dictionary:
+	if not CASES.has(case_name):
+		return {}
+	var size: int = CASES[case_name][1]
+	match CASES[case_name][0]:
+		"stat_projector":
+			return _stat_projector_case(size)
+		"rule_processor":
+			return _rule_processor_case(size, false)
+		"rule_processor_cached":
+			return _rule_processor_case(size, true)
+		"rule_processor_skill_contexts":
+			return _skill_context_case()
+		"skill_evaluator":
+			return _skill_evaluator_case(size)
+		"action_queue":
+			return _action_queue_case(size)
+		"unit_factory":
+			return _unit_factory_case(size)
+		"battle":
+			return _battle_case(size, root)
+	return {}
+
+# Recalculation after a modifier change, which re-sorts the whole list
+func _stat_projector_case(modifier_count: int) -> Dictionary:
+	var projector = StatProjector.new()
+	for i in range(modifier_count):
+		if i % 4 == 0:
+			projector.add_percentage_modifier("mul_%d" % i, 1.01, i % 7)
+		else:
+			projector.add_flat_modifier("add_%d" % i, 1.0, i % 7)
+	var run = func():
+		for i in range(STAT_RECALCULATIONS):
+			var modifier = projector.add_flat_modifier("churn", 1.0, i % 7)
+			projector.calculate_stat(100.0)
+			projector.remove_modifier(modifier)
+	return {"run": run, "ops": STAT_RECALCULATIONS}
+
+# Uncached lookups measure the compiled plan; cached ones the lookup cache
+func _rule_processor_case(rule_count: int, cached: bool) -> Dictionary:
+	var processor = BattleRuleProcessorScript.new()
+	processor.skip_auto_load = true
+	if not cached:
+		processor.lookup_cache_size = 0
+	processor.rules = _build_rules(rule_count)
+	var context = {
+		"skill_name": "Skill 7",
+		"skill_damage_type": "fire",
+		"caster_health_percentage": 0.3,
+		"target_health_percentage": 0.9
+	}
+	var run = func():
+		for i in range(RULE_LOOKUPS):
+			processor.get_modifiers_for_context(context)
+	return {"run": run, "ops": RULE_LOOKUPS, "cleanup": func(): processor.free()}
+
+# The project's rules looked up with BattleSkill's real context while both
+# units' health changes, as every cast during a battle does
+func _skill_context_case() -> Dictionary:
+	var processor = BattleRuleProcessorScript.new()
+	processor.skip_auto_load = true
+	var rules_path: String = ProjectSettings.get_setting(BattleRuleProcessorScript.PROJECT_SETTING_RULES_PATH, "")
+	if not rules_path.is_empty():
+		processor.load_rules_from_path(rules_path)
+	var caster = BattleUnit.new()
+	var target = BattleUnit.new()
+	target.team = 2
+	var skills: Array[BattleSkill] = []
+	for skill_type in SKILL_TYPES:
+		var skill = BattleSkill.new()
+		skill.skill_name = skill_type.name
+		skill.target_type = skill_type.target_type
+		skill.damage_type = skill_type.damage_type
+		skills.append(skill)
+	var run = func():
+		for i in range(RULE_LOOKUPS):
+			caster.stats.health = 100.0 - (i * 7) % 100
+			target.stats.health = 100.0 - (i * 13) % 100
+			processor.get_modifiers_for_context(skills[i % skills.size()]._build_context(caster, target))
+	var cleanup = func():
+		caster.free()
+		target.free()
+		processor.free()
+	return {"run": run, "ops": RULE_LOOKUPS, "cleanup": cleanup}
+
+func _build_rules(count: int) -> Array:
+	var generated: Array = []
+	for i in range(maxi(0, count - UNINDEXED_RULES)):
+		generated.append({
+			"id": "skill_rule_%d" % i,
+			"conditions": {
+				"and": [
+					{"property": "skill_name", "op": "eq", "value": "Skill %d" % i},
+					{"property": "caster_health_percentage", "op": "lt", "value": 0.5}
+				]
+			},
+			"modifiers": [{"id": "skill_bonus_%d" % i, "op": "MUL", "value": 1.1, "applies_to": ["attack"]}]
+		})
+	for i in range(mini(count, UNINDEXED_RULES)):
+		generated.append({
+			"id": "generic_rule_%d" % i,
+			"conditions": {"property": "target_health_percentage", "op": "lt", "value": 0.25},
+			"modifiers": [{"id": "execute_bonus_%d" % i, "op": "ADD", "value": 2.0}]
+		})
+	return generated
+
+# Whole-roster evaluation ticks with a shared tick cache, as in SkillActivationObserver
+func _skill_evaluator_case(team_size: int) -> Dictionary:
+	var processor = BattleRuleProcessorScript.new()
+	processor.skip_auto_load = true
+	processor.rules = [
+		{
+			"id": "fire_bonus",
+			"conditions": {"property": "skill_damage_type", "op": "eq", "value": "fire"},
+			"modifiers": [{"id": "fire_mul", "op": "MUL", "value": 1.25}]
+		},
+		{
+			"id": "execute_bonus",
+			"conditions": {"property": "target_health_percentage", "op": "lt", "value": 0.5},
+			"modifiers": [{"id": "execute_add", "op": "ADD", "value": 5.0, "priority": 5}]
+		}
+	]
+	var units: Array[BattleUnit] = []
+	for i in range(team_size * 2):
+		var unit = BattleUnit.new()
+		unit.team = 1 if i < team_size else 2
+		unit.stats.health = 40.0 + (i * 7) % 60
+		unit.get_stat_projector("attack").add_flat_modifier("weapon", 5.0, 10)
+		unit.get_stat_projector("attack").add_percentage_modifier("training", 1.1, 5)
+		for skill_type in SKILL_TYPES:
+			var skill = BattleSkill.new()
+			skill.skill_name = skill_type.name
+			skill.target_type = skill_type.target_type
+			skill.damage_type = skill_type.damage_type
+			skill.base_damage = 30.0
+			unit.add_skill(skill)
+		units.append(unit)
+	var battle_context = BattleContext.new()
+	battle_context.rule_processor = processor
+	var casts: Array[SkillCast] = []
+	var history: Array[Dictionary] = []
+	battle_context.update_state(units, casts, history)
+	var evaluator = SkillEvaluator.new()
+
+	var run = func():
+		for tick in range(EVALUATION_TICKS):
+			evaluator.begin_tick()
+			for unit in units:
+				var context = battle_context.get_unit_context(unit)
+				evaluator.evaluate_skills(unit, context)
+			evaluator.end_tick()
+	var cleanup = func():
+		for unit in units:
+			unit.free()
+		processor.free()
+	return {"run": run, "ops": EVALUATION_TICKS * units.size(), "cleanup": cleanup}
+
+# Steps a simulated clock and pops the ready units, as AutoBattler's observer mode does
+func _action_queue_case(unit_count: int) -> Dictionary:
+	var queue = UnitActionQueue.new()
+	var clock = {"now": 0.0}
+	queue.battle_clock = func(): return clock.now
+	var units: Array[BattleUnit] = []
+	for i in range(unit_count):
+		var unit = BattleUnit.new()
+		unit.team = 1 + i % 2
+		unit.stats.speed = 5.0 + i % 11
+		unit.stats.health = 20.0 + (i * 13) % 80
+		units.append(unit)
+		queue.register_unit(unit)
+
+	var run = func():
+		for step in range(QUEUE_STEPS):
+			clock.now += QUEUE_STEP_SECONDS
+			queue.get_action_order()
+	var cleanup = func():
+		for unit in units:
+			unit.free()
+	return {"run": run, "ops": QUEUE_STEPS, "cleanup": cleanup}
+
+# Spawning and freeing whole waves of `wave_size` units split across three templates
+func _unit_factory_case(wave_size: int) -> Dictionary:
+	UnitFactory.load_templates()
+	var wave_units: Array = []
+	for template_id in FACTORY_TEMPLATES:
+		wave_units.append({"template_id": template_id, "count": int(wave_size / float(FACTORY_TEMPLATES.size())), "level": 3})
+	var run = func():
+		for wave in range(FACTORY_WAVES):
+			for unit in UnitFactory.create_wave(wave_units, 2):
+				unit.free()
+	return {"run": run, "ops": FACTORY_WAVES}
+
+# One seeded headless battle per run, including spawning both teams
+func _battle_case(team_size: int, root: Node) -> Dictionary:
+	UnitFactory.load_templates()
+	var processor = BattleRuleProcessorScript.new()
+	processor.skip_auto_load = true
+	root.add_child(processor)
+	var rules_path: String = ProjectSettings.get_setting(BattleRuleProcessorScript.PROJECT_SETTING_RULES_PATH, "")
+	if not rules_path.is_empty():
+		processor.load_rules_from_path(rules_path)
+	var players = _scaled_wave(BATTLE_PLAYERS, team_size)
+	var enemies = _scaled_wave(BATTLE_ENEMIES, team_size)
+
+	var run = func():
+		var battler = AutoBattler.new()
+		battler.rule_processor = processor
+		battler.headless = true
+		root.add_child(battler)
+		battler.simulate_battle(UnitFactory.create_wave(players, 1), UnitFactory.create_wave(enemies, 2), BATTLE_SEED)
+		battler.free()
+	return {"run": run, "ops": 1, "cleanup": func(): processor.free()}
+
+func _scaled_wave(wave_units: Array, team_size: int) -> Array:
+	var scaled: Array = []
+	for entry in wave_units:
+		var group = entry.duplicate()
+		group.count = entry.count * team_size / 5
+		scaled.append(group)
+	return scaled
@@ -285,3 +285,61 @@ func test_skill_targeting():
     
     ally.queue_free()
     enemy.queue_free()
+
+func _build_headless_team(team_id: int, count: int) -> Array[BattleUnit]:
+    var team: Array[BattleUnit] = []
+    for i in range(count):
+        var unit = BattleUnit.new()
+        unit.name = "Team%d_Unit%d" % [team_id, i]
+        unit.team = team_id
+        unit.stats.attack = 12.0 + i
+        unit.stats.speed = 4.0 + i
+        
+        var skill = BattleSkill.new()
+        skill.skill_name = "Critical Strike"
+        skill.base_damage = 18.0
+        skill.target_type = "random_enemy"
+        skill.cooldown = 1.5
+        unit.add_skill(skill)
+        team.append(unit)
+    return team
+
+func _run_headless_battle(seed_value: int) -> Dictionary:
+    var battler = AutoBattler.new()
+    battler.rule_processor = rule_processor
+    add_child(battler)
+    
+    var event_log: Array = []
+    battler.round_started.connect(func(round_number): event_log.append("round %d" % round_number))
+    battler.action_performed.connect(func(unit, action):
+        var target = action.get("target")
+        var target_name = target.name if target is BattleUnit else str(target is Array)
+        event_log.append("%s %s %s" % [unit.name, action.type, target_name]))
+    
+    var winner = battler.simulate_battle(_build_headless_team(1, 3), _build_headless_team(2, 3), seed_value)
+    var result = {
+        "winner": winner,
+        "rounds": battler.current_round,
+        "active": battler.is_battle_active,
+        "visuals": battler.team1[0].get_node_or_null("UnitVisual"),
+        "events": event_log
+    }
+    battler.queue_free()
+    return result
+
+func test_headless_battle_runs_to_completion_synchronously():
+    var result = _run_headless_battle(1234)
+    
+    assert_false(result.active, "Headless battle should finish without awaiting timers")
+    assert_true(result.winner in [0, 1, 2])
+    assert_gt(result.rounds, 0)
+    assert_null(result.visuals, "Headless battles should not create UnitVisual nodes")
+    assert_false(result.events.is_empty())
+
+func test_headless_battle_is_deterministic_for_seed():
+    var first = _run_headless_battle(42)
+    var second = _run_headless_battle(42)
+    
+    assert_eq(second.winner, first.winner)
+    assert_eq(second.rounds, first.rounds)
+    assert_eq(second.events, first.events)
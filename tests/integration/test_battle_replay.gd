@@ -0,0 +1,161 @@
+extends GutTest
+
+const BattleRuleProcessorScript = preload("res://src/battle/battle_rule_processor.gd")
+const BattleReplay = preload("res://src/battle/battle_replay.gd")
+const BattleReplayPlayer = preload("res://src/battle/battle_replay_player.gd")
+
+const REPLAY_PATH := "user://test_battle_replay.replay"
+
+var rule_processor
+var battlers: Array = []
+var players: Array = []
+
+func before_each():
+    rule_processor = BattleRuleProcessorScript.new()
+    rule_processor.name = "RuleProcessor"
+    rule_processor.skip_auto_load = true
+    get_tree().root.add_child(rule_processor)
+    await get_tree().process_frame
+
+    rule_processor.rules = [
+        {
+            "conditions": {"property": "skill_name", "op": "eq", "value": "Critical Strike"},
+            "modifiers": [
+                {"id": "crit_damage", "op": "MUL", "value": 2.0, "priority": 20}
+            ]
+        }
+    ]
+
+func after_each():
+    for player in players:
+        player.release()
+    players.clear()
+    for battler in battlers:
+        if is_instance_valid(battler):
+            battler.queue_free()
+    battlers.clear()
+    if is_instance_valid(rule_processor):
+        rule_processor.queue_free()
+    BattleRuleProcessorScript.test_instance = null
+    if FileAccess.file_exists(REPLAY_PATH):
+        DirAccess.remove_absolute(REPLAY_PATH)
+
+func _build_team(team_id: int, count: int) -> Array[BattleUnit]:
+    var team: Array[BattleUnit] = []
+    for i in range(count):
+        var unit = BattleUnit.new()
+        unit.name = "Team%d_Unit%d" % [team_id, i]
+        unit.team = team_id
+        unit.stats.attack = 12.0 + i
+        unit.stats.speed = 4.0 + i
+
+        var skill = BattleSkill.new()
+        skill.skill_name = "Critical Strike"
+        skill.base_damage = 18.0
+        skill.target_type = "random_enemy"
+        skill.cooldown = 1.5
+        unit.add_skill(skill)
+        team.append(unit)
+    return team
+
+func _new_battler() -> AutoBattler:
+    var battler = AutoBattler.new()
+    battler.rule_processor = rule_processor
+    add_child(battler)
+    battlers.append(battler)
+    return battler
+
+func _record(seed_value: int, checkpoint_interval: int = 2) -> BattleReplay:
+    var battler = _new_battler()
+    battler.record_replay = true
+    battler.replay_checkpoint_interval = checkpoint_interval
+    battler.simulate_battle(_build_team(1, 3), _build_team(2, 3), seed_value)
+    return battler.replay
+
+func _unit_states(battler: AutoBattler) -> Array:
+    var states: Array = []
+    for unit in battler.team1 + battler.team2:
+        states.append(unit.capture_battle_state())
+    return states
+
+func test_saved_replay_plays_back_identically():
+    var recorded = _record(77)
+    assert_gt(recorded.get_decision_count(), 0, "Replay should record AI decisions")
+    assert_eq(recorded.checkpoints[0].round, 1, "First checkpoint should be taken at round 1")
+    assert_eq(recorded.save(REPLAY_PATH), OK)
+
+    var loaded = BattleReplay.load_from(REPLAY_PATH)
+    assert_not_null(loaded)
+    assert_eq(loaded.decisions, recorded.decisions)
+
+    var player = BattleReplayPlayer.new(loaded, rule_processor)
+    players.append(player)
+    var result = player.play(self)
+    assert_true(result.matches, "Playback should reproduce every decision")
+    assert_eq(result.diverged_at_round, -1)
+    assert_eq(result.winner, recorded.winner)
+    assert_eq(result.rounds, recorded.rounds)
+
+func test_seek_matches_straight_run():
+    var recorded = _record(1234)
+    var target_round = mini(5, recorded.rounds)
+    assert_gt(target_round, 1, "Battle should last long enough to seek into")
+
+    var straight = _new_battler()
+    straight.pause_at_round = target_round
+    straight.simulate_battle(_build_team(1, 3), _build_team(2, 3), 1234)
+    assert_true(straight.is_paused)
+
+    var player = BattleReplayPlayer.new(recorded, rule_processor)
+    players.append(player)
+    var seeked = player.seek(target_round, self)
+    assert_not_null(seeked)
+    assert_true(seeked.is_paused, "Seek should stop at the start of the requested round")
+    assert_eq(seeked.current_round, straight.current_round)
+    assert_eq(seeked.rng.state, straight.rng.state)
+    assert_eq(seeked.get_battle_time(), straight.get_battle_time())
+    assert_eq(_unit_states(seeked), _unit_states(straight))
+
+    seeked.resume_battle()
+    straight.resume_battle()
+    assert_eq(seeked.winner, straight.winner)
+    assert_eq(seeked.current_round, straight.current_round)
+
+func test_playback_reports_divergence():
+    var recorded = _record(5)
+    var first_round = recorded.decisions[0]
+    # Change the recorded action of the first decision
+    recorded.decisions[2] = BattleReplay.Action.WAIT
+
+    var player = BattleReplayPlayer.new(recorded, rule_processor)
+    players.append(player)
+    var result = player.play(self)
+    assert_false(result.matches)
+    assert_eq(result.diverged_at_round, first_round)
+
+func test_replay_keeps_the_recording_clock():
+    # Skill cooldowns are stamped with get_battle_time(); a clock far from zero
+    # stands in for a recording made on unix time
+    var clock_offset = 1.7e9
+    var battler = _new_battler()
+    battler.record_replay = true
+    battler.replay_checkpoint_interval = 2
+    battler.battle_clock = func(): return clock_offset + battler._simulated_time
+    battler.simulate_battle(_build_team(1, 3), _build_team(2, 3), 1234)
+    var recorded = battler.replay
+    assert_eq(recorded.start_time, clock_offset)
+    assert_almost_eq(recorded.checkpoints[0].time, clock_offset, 0.001, "Checkpoints should be taken on the battle clock")
+    assert_eq(BattleReplay.from_dict(recorded.to_dict()).start_time, clock_offset)
+
+    var player = BattleReplayPlayer.new(recorded, rule_processor)
+    players.append(player)
+    var result = player.play(self)
+    assert_true(result.matches, "Playback should start on the recorded clock")
+
+    var target_round = mini(5, recorded.rounds)
+    var seeked = player.seek(target_round, self)
+    assert_not_null(seeked)
+    assert_gte(seeked.get_battle_time(), clock_offset)
+    seeked.resume_battle()
+    assert_eq(seeked.winner, recorded.winner)
+    assert_eq(seeked.current_round, recorded.rounds)
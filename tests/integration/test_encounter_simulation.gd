@@ -0,0 +1,54 @@
+extends GutTest
+
+const EncounterSimulation = preload("res://tools/simulation/encounter_simulation.gd")
+const BattleRuleProcessorScript = preload("res://src/battle/battle_rule_processor.gd")
+
+var processor
+var wave_index: int = -1
+# One entry per skill action: [wave index, BattleSkill, battle time]
+var skill_uses: Array = []
+
+func before_each():
+    processor = BattleRuleProcessorScript.new()
+    processor.skip_auto_load = true
+    add_child(processor)
+    wave_index = -1
+    skill_uses.clear()
+    # The simulation adds one AutoBattler per wave to the root it is given
+    child_entered_tree.connect(_on_child_entered)
+
+func after_each():
+    child_entered_tree.disconnect(_on_child_entered)
+    processor.free()
+    BattleRuleProcessorScript.test_instance = null
+
+func _on_child_entered(node: Node) -> void:
+    if not node is AutoBattler:
+        return
+    wave_index += 1
+    var wave = wave_index
+    node.action_performed.connect(func(unit, action):
+        if unit.team == 1 and action.type == "skill":
+            skill_uses.append([wave, action.skill, node.get_battle_time()]))
+
+func test_player_skills_come_off_cooldown_in_later_waves():
+    var wave = {"enemy_units": [{"template_id": "goblin_warrior", "count": 3, "level": 1}]}
+    var encounter = Encounter.from_dict({"encounter_id": "two_waves", "waves": [wave, wave.duplicate(true)]})
+    UnitFactory.load_templates()
+
+    var simulation = EncounterSimulation.new()
+    var record = simulation._simulate_run(encounter, {}, ["player_warrior", "player_archer", "player_mage"], 5, 3, processor, [], self)
+    assert_eq(record.waves_cleared, 2, "Level 5 players should clear both waves")
+
+    var first_wave_skills = {}
+    var first_wave_end = 0.0
+    var reused = false
+    for use in skill_uses:
+        if use[0] == 0:
+            first_wave_skills[use[1]] = true
+            first_wave_end = maxf(first_wave_end, use[2])
+        else:
+            assert_gte(use[2], first_wave_end, "The battle clock should keep counting across waves")
+            reused = reused or first_wave_skills.has(use[1])
+    assert_false(first_wave_skills.is_empty(), "Players should use skills in wave 1")
+    assert_true(reused, "A skill used in wave 1 should be usable again in wave 2")
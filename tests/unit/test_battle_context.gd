@@ -0,0 +1,93 @@
+extends GutTest
+
+var context: BattleContext
+var units: Array[BattleUnit] = []
+
+func before_each():
+    context = BattleContext.new()
+    units.clear()
+    for i in range(4):
+        var unit = BattleUnit.new()
+        unit.unit_name = "Unit %d" % i
+        unit.team = 1 if i < 2 else 2
+        add_child(unit)
+        units.append(unit)
+    var casts: Array[SkillCast] = []
+    var history: Array[Dictionary] = []
+    context.update_state(units, casts, history)
+
+func after_each():
+    for unit in units:
+        unit.queue_free()
+
+func test_team_state_tracks_damage_without_update():
+    assert_eq(context.get_team_state(2).total_health, 200.0)
+    
+    units[2].take_damage(45.0)  # 45 - 5 defense
+    assert_eq(context.get_team_state(2).total_health, 160.0)
+    assert_almost_eq(context.get_average_health_percentage(2), 0.8, 0.0001)
+    assert_true(context.verify_aggregates())
+
+func test_death_updates_counts_and_rosters():
+    var enemies = context.get_unit_context(units[0]).enemies
+    assert_eq(enemies.size(), 2)
+    assert_true(enemies.is_read_only())
+    
+    units[3].take_damage(1000.0)
+    assert_eq(context.get_team_state(2).unit_count, 1)
+    assert_eq(context.get_unit_context(units[0]).enemies, [units[2]])
+    assert_eq(context.get_team_state(1).unit_count, 2)
+    assert_true(context.verify_aggregates())
+
+func test_status_and_stat_changes_are_tracked():
+    units[0].add_status_effect(StatusEffect.new("marked", "Marked", "", 5.0))
+    assert_eq(context.count_units_with_status("marked"), 1)
+    assert_eq(context.get_team_state(1).status_counts, {"marked": 1})
+    
+    units[0].get_stat_projector("attack").add_flat_modifier("buff", 10.0)
+    assert_eq(context.get_team_state(1).total_attack, 30.0)
+    
+    units[0].remove_status_effect(units[0].status_effects[0])
+    assert_eq(context.count_units_with_status("marked"), 0)
+    assert_true(context.verify_aggregates())
+
+func test_roster_changes_are_picked_up():
+    units.pop_back().queue_free()
+    assert_eq(context.get_team_state(2).unit_count, 1)
+    assert_eq(context.get_unit_context(units[0]).enemies.size(), 1)
+    assert_true(context.verify_aggregates())
+
+func test_unit_context_carries_skill_history():
+    var history: Array[Dictionary] = [{"skill": null, "caster": units[0]}]
+    var casts: Array[SkillCast] = []
+    context.update_state(units, casts, history)
+    var unit_context = context.get_unit_context(units[0])
+    assert_same(unit_context.skill_history, history)
+    assert_same(context.get_unit_context(units[0]), unit_context)
+
+func test_units_released_to_pool_are_untracked():
+    var pool = BattleUnitPool.new()
+    var pooled = pool.acquire()
+    pooled.team = 2
+    units.append(pooled)
+    assert_eq(context.get_team_state(2).unit_count, 3)
+    
+    units.erase(pooled)
+    pool.release(pooled)
+    assert_false(pooled.stat_changed.is_connected(context._on_unit_stat_changed.bind(pooled)))
+    assert_eq(context.get_team_state(2).unit_count, 2)
+    assert_true(context.verify_aggregates())
+    
+    # Reacquired, the unit is tracked again from its reset state
+    var reused = pool.acquire()
+    assert_true(is_same(reused, pooled))
+    reused.team = 2
+    units.append(reused)
+    assert_eq(context.get_team_state(2).unit_count, 3)
+    reused.take_damage(45.0)
+    assert_eq(context.get_team_state(2).total_health, 260.0)
+    assert_true(context.verify_aggregates())
+    
+    units.erase(reused)
+    pool.release(reused)
+    pool.clear()
@@ -144,3 +144,66 @@ func test_turn_order():
     var round_events = event_manager.get_events_in_turn_order(1)
     assert_eq(round_events[0].source_unit_id, "test_unit", "Highest initiative should go first")
     assert_eq(round_events[1].source_unit_id, "third_unit", "Lowest initiative should go last")
+
+func test_ring_buffer_keeps_latest_events():
+    event_manager.max_events = 3
+    for i in range(5):
+        skill_observer.emit_signal("cast_progress_updated", test_unit, (i + 1) * 0.1)
+    
+    assert_eq(event_manager.get_event_count(), 3, "Only max_events events should be retained")
+    var events = event_manager.get_events()
+    assert_almost_eq(events[0].data["write"]["progress"], 0.3, 0.0001, "Oldest events should be evicted first")
+    assert_almost_eq(events[2].data["write"]["progress"], 0.5, 0.0001)
+
+func test_delta_snapshots_rebuild_unit_state():
+    event_manager.max_events = 5
+    event_manager.keyframe_interval = 4
+    var targets: Array[BattleUnit] = [target_unit]
+    for i in range(20):
+        test_unit.stats.mana = 100.0 - i
+        if i % 3 == 0:
+            target_unit.stats.health = 100.0 - i
+        event_manager.record_skill_cast_start(test_unit, targets, test_skill, {"mana": float(i)})
+    
+    var events = event_manager.get_events()
+    assert_eq(events.size(), 5)
+    for j in range(events.size()):
+        var i = 15 + j
+        var read = events[j].data["read"]
+        assert_eq(read["source"]["base_stats"]["mana"], 100.0 - i, "Source state should match the state at record time")
+        assert_eq(read["source"]["unit_id"], "test_unit")
+        assert_eq(read["targets"][0]["base_stats"]["health"], 100.0 - 18 if i >= 18 else 100.0 - 15)
+        assert_eq(events[j].data["write"]["resources_claimed"]["mana"], float(i))
+    
+    # Materialized events are copies; editing one must not leak into the store
+    events[0].data["read"]["source"]["base_stats"]["mana"] = -1.0
+    var again = event_manager.get_events_in_turn_order(battle_context.current_round)
+    assert_eq(again[0].data["read"]["source"]["base_stats"]["mana"], 85.0)
+
+func test_event_stream_keeps_evicted_events():
+    var path = "user://test_event_stream.jsonl"
+    event_manager.max_events = 2
+    assert_eq(event_manager.open_event_stream(path), OK)
+    for i in range(5):
+        skill_observer.emit_signal("cast_progress_updated", test_unit, (i + 1) * 0.1)
+    event_manager.close_event_stream()
+    
+    var file = FileAccess.open(path, FileAccess.READ)
+    assert_not_null(file, "Stream file should exist")
+    var event_lines = 0
+    var keyframes = 0
+    while not file.eof_reached():
+        var line = file.get_line()
+        if line.is_empty():
+            continue
+        var record = JSON.parse_string(line)
+        if record.has("seq"):
+            event_lines += 1
+        elif record.has("state"):
+            keyframes += 1
+    file.close()
+    DirAccess.remove_absolute(path)
+    
+    assert_eq(event_lines, 5, "Every event should be streamed, including evicted ones")
+    assert_eq(keyframes, 1, "Unchanged unit state should be streamed as deltas after one keyframe")
+    assert_eq(event_manager.get_event_count(), 2)
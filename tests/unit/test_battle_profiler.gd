@@ -0,0 +1,69 @@
+extends GutTest
+
+const BattleRuleProcessorScript = preload("res://src/battle/battle_rule_processor.gd")
+
+const PROFILE_PATH := "user://test_battle_profile.json"
+
+var rule_processor
+var battler: AutoBattler
+
+func before_each():
+    rule_processor = BattleRuleProcessorScript.new()
+    rule_processor.skip_auto_load = true
+    add_child(rule_processor)
+    battler = AutoBattler.new()
+    battler.rule_processor = rule_processor
+    add_child(battler)
+
+func after_each():
+    BattleProfiler.disable()
+    BattleProfiler.reset()
+    battler.free()
+    rule_processor.free()
+    BattleRuleProcessorScript.test_instance = null
+    if FileAccess.file_exists(PROFILE_PATH):
+        DirAccess.remove_absolute(PROFILE_PATH)
+
+func _build_team(team_id: int) -> Array[BattleUnit]:
+    var team: Array[BattleUnit] = []
+    for i in range(3):
+        var unit = BattleUnit.new()
+        unit.team = team_id
+        unit.stats.attack = 12.0 + i
+        var skill = BattleSkill.new()
+        skill.skill_name = "Strike"
+        skill.base_damage = 15.0
+        skill.cooldown = 1.0
+        unit.add_skill(skill)
+        team.append(unit)
+    return team
+
+func test_disabled_profiler_records_nothing():
+    battler.simulate_battle(_build_team(1), _build_team(2), 3)
+    var profile = BattleProfiler.get_profile()
+    assert_eq(profile.top_functions, [])
+    assert_eq(profile.counters, {})
+    assert_false(Performance.has_custom_monitor(BattleProfiler.MONITOR_PREFIX + "rules/lookups"))
+
+func test_battle_profile_covers_rounds_and_hot_paths():
+    BattleProfiler.enable()
+    assert_true(Performance.has_custom_monitor(BattleProfiler.MONITOR_PREFIX + "rules/lookups"))
+    battler.simulate_battle(_build_team(1), _build_team(2), 3)
+
+    var profile = BattleProfiler.get_profile()
+    assert_eq(profile.rounds.size(), battler.current_round, "Every round should get an entry")
+    var functions = profile.top_functions.map(func(entry): return entry.function)
+    assert_has(functions, String(BattleProfiler.RULE_LOOKUP))
+    assert_has(functions, String(BattleProfiler.BATTLE_ROUND))
+    assert_true(profile.subsystems.has("rules"))
+    assert_gt(profile.counters.get(String(BattleProfiler.STAT_CACHE_HITS), 0), 0)
+    assert_between(profile.stat_cache_hit_rate, 0.0, 1.0)
+    assert_eq(Performance.get_custom_monitor(BattleProfiler.MONITOR_PREFIX + "rules/lookups"),
+        float(profile.top_functions[functions.find(String(BattleProfiler.RULE_LOOKUP))].calls))
+
+    assert_eq(BattleProfiler.dump_profile(PROFILE_PATH), OK)
+    var dumped = JSON.parse_string(FileAccess.get_file_as_string(PROFILE_PATH))
+    assert_eq(dumped.rounds.size(), profile.rounds.size())
+
+    BattleProfiler.disable()
+    assert_false(Performance.has_custom_monitor(BattleProfiler.MONITOR_PREFIX + "rules/lookups"))
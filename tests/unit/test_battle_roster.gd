@@ -0,0 +1,60 @@
+extends GutTest
+
+var roster: BattleRoster
+var units: Array[BattleUnit] = []
+
+func before_each():
+    roster = BattleRoster.new()
+    units.clear()
+    for i in range(4):
+        var unit = BattleUnit.new()
+        unit.team = 1 if i < 2 else 2
+        units.append(unit)
+        roster.add_unit(unit)
+
+func after_each():
+    roster.clear()
+    for unit in units:
+        unit.free()
+
+func test_views_and_counts():
+    assert_eq(roster.alive_count(1), 2)
+    assert_eq(roster.alive_count(2), 2)
+    assert_eq(roster.get_allies(1), [units[0], units[1]])
+    assert_eq(roster.get_enemies(1), [units[2], units[3]])
+    assert_true(roster.get_enemies(1).is_read_only())
+
+func test_views_are_reused_until_alive_set_changes():
+    var enemies = roster.get_enemies(1)
+    assert_same(roster.get_enemies(1), enemies)
+    
+    units[2].take_damage(1000.0)
+    assert_not_same(roster.get_enemies(1), enemies)
+    assert_eq(roster.get_enemies(1), [units[3]])
+    assert_eq(roster.alive_count(2), 1)
+    assert_eq(roster.total_alive(), 3)
+
+func test_heal_revives_unit():
+    units[0].take_damage(1000.0)
+    assert_eq(roster.alive_count(1), 1)
+    
+    units[0].heal(10.0)
+    assert_eq(roster.alive_count(1), 2)
+    assert_eq(roster.get_allies(1), [units[0], units[1]])
+
+func test_explicit_team_keys_and_removal():
+    var neutral = BattleUnit.new()
+    roster.add_unit(neutral, 3)
+    assert_eq(roster.team_of(neutral), 3)
+    assert_eq(roster.get_enemies(1).size(), 3)
+    
+    roster.remove_unit(neutral)
+    assert_eq(roster.get_enemies(1).size(), 2)
+    assert_eq(roster.alive_count(3), 0)
+    neutral.free()
+
+func test_refresh_picks_up_direct_health_writes():
+    units[3].stats.health = 0.0
+    assert_eq(roster.alive_count(2), 2)
+    roster.refresh()
+    assert_eq(roster.alive_count(2), 1)
@@ -265,3 +265,247 @@ func test_get_modifiers_invalid_rule():
 	var modifiers = processor.get_modifiers_for_context({"health": 20, "team": 1})
 	assert_eq(modifiers.size(), 1)  # Only the valid rule's modifier
 	assert_eq(modifiers[0].id, "team_buff")
+
+func test_indexed_rules_only_match_their_key():
+	processor.rules = [
+		{
+			"conditions": {"property": "skill_name", "op": "eq", "value": "Fireball"},
+			"modifiers": [{"id": "fireball_bonus", "op": "ADD", "value": 5}]
+		},
+		{
+			"conditions": {"property": "skill_name", "op": "in", "value": ["Frost Bolt", "Ice Lance"]},
+			"modifiers": [{"id": "frost_bonus", "op": "ADD", "value": 3}]
+		}
+	]
+	
+	var summary = processor.get_plan_summary()
+	assert_eq(summary.unindexed_rules, 0)
+	assert_eq(summary.indexed_keys.skill_name, 3)
+	
+	var modifiers = processor.get_modifiers_for_context({"skill_name": "Ice Lance"})
+	assert_eq(modifiers.size(), 1)
+	assert_eq(modifiers[0].id, "frost_bonus")
+	
+	modifiers = processor.get_modifiers_for_context({"skill_name": &"Fireball"})
+	assert_eq(modifiers.size(), 1)
+	assert_eq(modifiers[0].id, "fireball_bonus")
+	
+	assert_eq(processor.get_modifiers_for_context({"skill_name": "Heal"}).size(), 0)
+	assert_eq(processor.get_modifiers_for_context({"health": 10}).size(), 0)
+
+func test_indexed_and_unindexed_rules_keep_rule_order():
+	processor.rules = [
+		{
+			"conditions": {"property": "health", "op": "lt", "value": 30},
+			"modifiers": [{"id": "first", "op": "ADD", "value": 1}]
+		},
+		{
+			"conditions": {
+				"and": [
+					{"property": "health", "op": "lt", "value": 50},
+					{"property": "status_id", "op": "eq", "value": "burn"}
+				]
+			},
+			"modifiers": [{"id": "second", "op": "ADD", "value": 1}]
+		},
+		{
+			"conditions": {"property": "skill_name", "op": "eq", "value": "Fireball"},
+			"modifiers": [{"id": "third", "op": "ADD", "value": 1}]
+		},
+		{
+			"conditions": {"not": {"property": "team", "op": "eq", "value": 2}},
+			"modifiers": [{"id": "fourth", "op": "ADD", "value": 1}]
+		}
+	]
+	
+	var modifiers = processor.get_modifiers_for_context({
+		"health": 20,
+		"team": 1,
+		"status_id": "burn",
+		"skill_name": "Fireball"
+	})
+	var ids = []
+	for mod in modifiers:
+		ids.append(mod.id)
+	assert_eq(ids, ["first", "second", "third", "fourth"])
+
+func test_plan_recompiles_when_rules_change():
+	processor.rules = [
+		{
+			"conditions": {"property": "skill_name", "op": "eq", "value": "Fireball"},
+			"modifiers": [{"id": "old_bonus", "op": "ADD", "value": 5}]
+		}
+	]
+	assert_eq(processor.get_modifiers_for_context({"skill_name": "Fireball"}).size(), 1)
+	
+	processor.rules = []
+	assert_eq(processor.get_modifiers_for_context({"skill_name": "Fireball"}).size(), 0)
+	
+	processor.add_temporary_rule({
+		"conditions": {"property": "skill_name", "op": "eq", "value": "Fireball"},
+		"modifiers": [{"id": "temp_bonus", "op": "ADD", "value": 2}]
+	})
+	var modifiers = processor.get_modifiers_for_context({"skill_name": "Fireball"})
+	assert_eq(modifiers.size(), 1)
+	assert_eq(modifiers[0].id, "temp_bonus")
+
+func test_modifiers_are_fresh_instances_per_lookup():
+	processor.rules = [
+		{
+			"conditions": {"property": "team", "op": "eq", "value": 1},
+			"modifiers": [{"id": "team_buff", "op": "ADD", "value": 10}]
+		}
+	]
+	
+	var first = processor.get_modifiers_for_context({"team": 1})
+	var second = processor.get_modifiers_for_context({"team": 1})
+	assert_ne(first[0], second[0])
+	first[0].expires_at_unix = 99.0
+	assert_eq(second[0].expires_at_unix, -1.0)
+
+func test_repeated_contexts_hit_the_lookup_cache():
+	processor.rules = [
+		{
+			"conditions": {"property": "skill_name", "op": "eq", "value": "Fireball"},
+			"modifiers": [{"id": "fire_bonus", "op": "MUL", "value": 1.5}]
+		}
+	]
+	
+	processor.get_modifiers_for_context({"skill_name": "Fireball", "caster_team": 1})
+	# caster_team is not read by any rule, so it does not split the cache
+	processor.get_modifiers_for_context({"skill_name": "Fireball", "caster_team": 2})
+	processor.get_modifiers_for_context({"skill_name": "Ice Lance"})
+	var stats = processor.get_lookup_cache_stats()
+	assert_eq(stats.hits, 1)
+	assert_eq(stats.misses, 2)
+	assert_eq(stats.size, 2)
+	assert_almost_eq(stats.hit_rate, 1.0 / 3.0, 0.0001)
+
+func test_templates_are_shared_and_read_only():
+	processor.rules = [
+		{
+			"conditions": {"property": "team", "op": "eq", "value": 1},
+			"modifiers": [{"id": "team_buff", "op": "ADD", "value": 10, "duration": 5.0}]
+		}
+	]
+	
+	var templates = processor.get_modifier_templates_for_context({"team": 1})
+	assert_same(processor.get_modifier_templates_for_context({"team": 1})[0], templates[0])
+	assert_true(templates.is_read_only())
+	assert_eq(templates[0].expires_at_unix, -1.0, "Templates do not resolve durations")
+	
+	var owned = processor.get_modifiers_for_context({"team": 1})
+	assert_ne(owned[0], templates[0])
+	assert_gt(owned[0].expires_at_unix, Time.get_unix_time_from_system(), "Instances get a fresh expiry")
+
+func test_lookup_cache_is_invalidated_when_rules_change():
+	processor.rules = [
+		{
+			"conditions": {"property": "skill_name", "op": "eq", "value": "Fireball"},
+			"modifiers": [{"id": "base_bonus", "op": "ADD", "value": 1}]
+		}
+	]
+	assert_eq(processor.get_modifiers_for_context({"skill_name": "Fireball"}).size(), 1)
+	
+	processor.add_temporary_rule({
+		"conditions": {"property": "skill_name", "op": "eq", "value": "Fireball"},
+		"modifiers": [{"id": "wave_bonus", "op": "ADD", "value": 2}]
+	})
+	assert_eq(processor.get_modifiers_for_context({"skill_name": "Fireball"}).size(), 2)
+	
+	processor.clear_temporary_rules()
+	var modifiers = processor.get_modifiers_for_context({"skill_name": "Fireball"})
+	assert_eq(modifiers.size(), 1)
+	assert_eq(modifiers[0].id, "base_bonus")
+	assert_eq(processor.rules.size(), 1, "Only temporary rules should be removed")
+
+func test_in_place_rule_edits_apply_after_invalidate_rules():
+	processor.rules = [
+		{
+			"conditions": {"property": "skill_name", "op": "eq", "value": "Fireball"},
+			"modifiers": [{"id": "old_bonus", "op": "ADD", "value": 1}]
+		}
+	]
+	assert_eq(processor.get_modifiers_for_context({"skill_name": "Fireball"})[0].id, "old_bonus")
+	
+	processor.rules[0] = {
+		"conditions": {"property": "skill_name", "op": "eq", "value": "Fireball"},
+		"modifiers": [{"id": "new_bonus", "op": "ADD", "value": 2}]
+	}
+	processor.invalidate_rules()
+	assert_eq(processor.get_modifiers_for_context({"skill_name": "Fireball"})[0].id, "new_bonus")
+	
+	processor.rules[0].conditions.value = "Frostbolt"
+	processor.invalidate_rules()
+	assert_eq(processor.get_modifiers_for_context({"skill_name": "Fireball"}).size(), 0)
+	assert_eq(processor.get_modifiers_for_context({"skill_name": "Frostbolt"}).size(), 1)
+
+func test_lookup_cache_is_bounded():
+	processor.lookup_cache_size = 2
+	processor.rules = [
+		{
+			"conditions": {"property": "target_class", "op": "eq", "value": "warrior"},
+			"modifiers": [{"id": "warrior_bonus", "op": "ADD", "value": 1}]
+		}
+	]
+	
+	for target_class in ["warrior", "mage", "rogue", "warrior"]:
+		processor.get_modifiers_for_context({"target_class": target_class})
+	var stats = processor.get_lookup_cache_stats()
+	assert_eq(stats.size, 2)
+	assert_eq(stats.hits, 0, "The least recently used context should have been evicted")
+	
+	processor.lookup_cache_size = 0
+	processor.get_modifiers_for_context({"target_class": "warrior"})
+	assert_eq(processor.get_lookup_cache_stats().misses, 4, "A disabled cache should not count lookups")
+
+func test_continuous_properties_share_cache_entries():
+	processor.rules = [
+		{
+			"conditions": {"and": [
+				{"property": "skill_name", "op": "eq", "value": "Execute"},
+				{"property": "target_health_percentage", "op": "lt", "value": 0.5}
+			]},
+			"modifiers": [{"id": "execute_bonus", "op": "MUL", "value": 2.0}]
+		}
+	]
+	
+	var expected = {0.9: 0, 0.75: 0, 0.3: 1, 0.1: 1, 0.5: 0, 0.49: 1}
+	for health in expected:
+		var modifiers = processor.get_modifiers_for_context({"skill_name": "Execute", "target_health_percentage": health})
+		assert_eq(modifiers.size(), expected[health], "Modifiers at %.2f health" % health)
+	var stats = processor.get_lookup_cache_stats()
+	# Above, below and exactly on the 0.5 threshold
+	assert_eq(stats.misses, 3)
+	assert_eq(stats.hits, 3)
+
+func test_reloading_rules_drops_temporary_rules():
+	var path = "user://test_reload_rules.json"
+	var file = FileAccess.open(path, FileAccess.WRITE)
+	file.store_string(JSON.stringify([
+		{
+			"conditions": {"property": "skill_name", "op": "eq", "value": "Fireball"},
+			"modifiers": [{"id": "base_bonus", "op": "ADD", "value": 1}]
+		}
+	]))
+	file.close()
+	
+	processor.add_temporary_rule({
+		"conditions": {"property": "skill_name", "op": "eq", "value": "Fireball"},
+		"modifiers": [{"id": "wave_bonus", "op": "ADD", "value": 2}]
+	})
+	assert_true(processor.load_rules_from_path(path))
+	assert_true(processor._temporary_rules.is_empty(), "Reloading replaces every rule, temporary ones included")
+	assert_eq(processor.get_modifiers_for_context({"skill_name": "Fireball"}).size(), 1)
+	DirAccess.remove_absolute(path)
+
+func test_durations_count_from_the_given_battle_time():
+	processor.rules = [
+		{
+			"conditions": {"property": "team", "op": "eq", "value": 1},
+			"modifiers": [{"id": "short_buff", "op": "ADD", "value": 1, "duration": 2.0}]
+		}
+	]
+	
+	assert_eq(processor.get_modifiers_for_context({"team": 1}, 30.0)[0].expires_at_unix, 32.0)
+	assert_gt(processor.get_modifiers_for_context({"team": 1})[0].expires_at_unix, Time.get_unix_time_from_system(), "Without a battle time durations use wall-clock time")
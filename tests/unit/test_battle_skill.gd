@@ -276,5 +276,24 @@ func test_build_context():
 	caster.queue_free()
 	target.queue_free()
 
+func test_get_targets_lowest_health_enemy_skips_dead():
+	var caster = BattleUnit.new()
+	var enemy1 = BattleUnit.new()
+	var enemy2 = BattleUnit.new()
+	var enemy3 = BattleUnit.new()
+	enemy1.stats.health = 60.0
+	enemy2.stats.health = 25.0
+	enemy3.stats.health = 0  # Dead
+	
+	battle_skill.target_type = "lowest_health_enemy"
+	var targets = battle_skill.get_targets(caster, [caster], [enemy1, enemy2, enemy3])
+	
+	assert_eq(targets, [enemy2])
+	
+	caster.queue_free()
+	enemy1.queue_free()
+	enemy2.queue_free()
+	enemy3.queue_free()
+
 # Note: execute() and _apply_effects() require BattleRuleProcessor
-# which is better tested in integration tests
\ No newline at end of file
+# which is better tested in integration tests
@@ -232,6 +232,30 @@ func test_projection_changed_signal():
     # Verify the stat was actually changed
     assert_eq(battle_unit.get_projected_stat("attack"), 20.0)  # 10 base + 10 buff
 
+func test_equip_item_reports_each_touched_stat_once():
+    var changes = []
+    battle_unit.stat_changed.connect(func(stat_name, value): changes.append([stat_name, value]))
+    
+    var ring = Equipment.create_accessory("Ring", {"attack": 5.0, "defense": 3.0})
+    battle_unit.equip_item("accessory", ring)
+    
+    assert_eq(changes.size(), 2)
+    assert_true(changes.has(["attack", 15.0]))
+    assert_true(changes.has(["defense", 8.0]))
+
+func test_stat_batch_defers_stat_changed_until_commit():
+    var changes = []
+    battle_unit.stat_changed.connect(func(stat_name, value): changes.append(stat_name))
+    
+    battle_unit.begin_stat_batch()
+    battle_unit.stat_projectors["attack"].add_flat_modifier("buff_a", 5.0)
+    battle_unit.stat_projectors["attack"].add_flat_modifier("buff_b", 5.0)
+    assert_eq(changes.size(), 0)
+    battle_unit.commit_stat_batch()
+    
+    assert_eq(changes, ["attack"])
+    assert_eq(battle_unit.get_projected_stat("attack"), 20.0)
+
 func test_complex_battle_scenario():
     # Equip items
     var sword = Equipment.create_weapon("Fire Sword", 15.0)
@@ -260,3 +284,49 @@ func test_complex_battle_scenario():
     # Heal
     battle_unit.heal(20.0)
     assert_eq(battle_unit.stats.health, 85.0)
+
+func test_projectors_allocated_only_for_modified_stats():
+    var unit = BattleUnit.new()
+    assert_null(unit.get_stat_projector("attack", false))
+    assert_eq(unit.get_projected_stat("attack"), 10.0)
+    assert_null(unit.get_stat_projector("attack", false))
+    
+    unit.get_stat_projector("attack").add_flat_modifier("buff", 5.0)
+    assert_not_null(unit.get_stat_projector("attack", false))
+    assert_null(unit.get_stat_projector("defense", false))
+    assert_null(unit.get_stat_projector("nonexistent"))
+    assert_eq(unit.get_projected_stat("attack"), 15.0)
+    unit.free()
+
+func test_projected_stat_cache_follows_modifiers_and_base():
+    var projector = battle_unit.get_stat_projector("attack")
+    var buff = projector.add_flat_modifier("buff", 5.0)
+    assert_eq(battle_unit.get_projected_stat("attack"), 15.0)
+    
+    battle_unit.stats.attack = 20.0
+    assert_eq(battle_unit.get_projected_stat("attack"), 25.0)
+    
+    projector.remove_modifier(buff)
+    assert_eq(battle_unit.get_projected_stat("attack"), 20.0)
+
+func test_projected_stat_by_interned_id_matches_name():
+    for stat_name in BattleUnit.DEFAULT_STATS:
+        assert_eq(BattleUnit.stat_id(stat_name), BattleUnit.stat_id(StringName(stat_name)))
+    assert_eq(BattleUnit.stat_id("attack"), BattleUnit.STAT_ATTACK)
+    
+    battle_unit.get_stat_projector("attack").add_flat_modifier("buff", 5.0)
+    assert_eq(battle_unit.get_projected_stat(BattleUnit.STAT_ATTACK), 15.0)
+    assert_eq(battle_unit.get_projected_stat(BattleUnit.STAT_ATTACK), battle_unit.get_projected_stat("attack"))
+    
+    battle_unit.stats.defense = 8.0
+    assert_eq(battle_unit.get_projected_stat(BattleUnit.STAT_DEFENSE), 8.0)
+    
+    battle_unit.stats["focus"] = 3.0
+    assert_eq(battle_unit.get_projected_stat(BattleUnit.stat_id("focus")), 3.0)
+
+func test_stat_projectors_view_adopts_replaced_projector():
+    var replacement = StatProjector.new()
+    replacement.add_flat_modifier("buff", 3.0)
+    battle_unit.stat_projectors["attack"] = replacement
+    assert_eq(battle_unit.get_stat_projector("attack"), replacement)
+    assert_eq(battle_unit.get_projected_stat("attack"), 13.0)
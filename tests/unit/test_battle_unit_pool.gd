@@ -0,0 +1,124 @@
+extends GutTest
+
+const UnitVisual = preload("res://src/shared/unit_visual.gd")
+const BattleRuleProcessorScript = preload("res://src/battle/battle_rule_processor.gd")
+
+var pool: BattleUnitPool
+var nodes: Array = []
+
+func before_each():
+    pool = BattleUnitPool.new()
+    nodes.clear()
+
+func after_each():
+    assert_eq(pool.get_active_count(), 0, "Every acquired unit should be released")
+    pool.clear()
+    for node in nodes:
+        if is_instance_valid(node):
+            node.free()
+    BattleRuleProcessorScript.test_instance = null
+
+func _on_unit_signal(_a = null, _b = null) -> void:
+    pass
+
+func _dirty_unit(unit: BattleUnit) -> void:
+    unit.unit_name = "Used"
+    unit.team = 2
+    unit.stats.health = 3.0
+    unit.stats["mana"] = 40.0
+    unit.get_stat_projector("mana").add_flat_modifier("focus", 5.0)
+    unit.position = Vector2(300, 40)
+    unit.set_meta("tags", ["boss"])
+    unit.get_stat_projector("attack").add_flat_modifier("rage", 5.0)
+    unit.lock_resource("mana", 10.0)
+    var skill = BattleSkill.new()
+    skill.skill_name = "Slash"
+    unit.add_skill(skill)
+    var sword = Equipment.new("sword", "Sword", "weapon")
+    sword.add_additive_stat("attack", 4.0)
+    unit.equip_item("weapon", sword)
+    unit.unit_died.connect(_on_unit_signal)
+    unit.stat_changed.connect(_on_unit_signal)
+
+func test_released_unit_is_reused_in_fresh_state():
+    var unit = pool.acquire()
+    _dirty_unit(unit)
+    var sword = unit.equipment.weapon
+    pool.release(unit)
+    assert_eq(pool.get_pooled_count(), 1)
+    assert_null(sword.equipped_to, "Released equipment should no longer point at the unit")
+
+    var reused = pool.acquire()
+    assert_same(reused, unit)
+    var fresh = BattleUnit.new()
+    nodes.append(fresh)
+    assert_eq(reused.capture_battle_state(), fresh.capture_battle_state())
+    assert_eq(reused.get_projected_stat("attack"), 10.0)
+    assert_null(reused.get_stat_projector("mana", false), "Projectors of stats outside DEFAULT_STATS should be dropped")
+    assert_true(reused.skills.is_empty())
+    assert_false(reused.has_meta("tags"))
+    assert_eq(reused.get_signal_connection_list("unit_died").size(), 0)
+    assert_eq(reused.get_signal_connection_list("stat_changed").size(), 0)
+    assert_eq(pool.get_stats().created, 1)
+    assert_eq(pool.get_stats().reused, 1)
+    pool.release(reused)
+
+func test_release_detaches_and_resets_visual():
+    var unit = pool.acquire()
+    add_child(unit)
+    var visual = UnitVisual.new()
+    visual.name = "UnitVisual"
+    unit.add_child(visual)
+    visual.setup(unit)
+    unit.take_damage(500.0)
+
+    pool.release(unit)
+    assert_null(unit.get_parent())
+    assert_null(visual.battle_unit)
+    assert_eq(visual.sprite.modulate, Color.WHITE)
+    assert_eq(unit.get_signal_connection_list("unit_died").size(), 0)
+
+    var reused = pool.acquire()
+    reused.unit_name = "Second"
+    add_child(reused)
+    visual.setup(reused)
+    assert_eq(visual.name_label.text, "Second")
+    assert_eq(reused.get_signal_connection_list("unit_died").size(), 1)
+    pool.release(reused)
+
+func test_double_release_is_rejected():
+    var unit = pool.acquire()
+    pool.release(unit)
+    pool.release(unit)
+    assert_eq(pool.get_pooled_count(), 1, "A unit must not be pooled twice")
+
+func test_waves_reuse_units_without_leaking():
+    var rule_processor = BattleRuleProcessorScript.new()
+    rule_processor.skip_auto_load = true
+    add_child(rule_processor)
+    nodes.append(rule_processor)
+    var battler = AutoBattler.new()
+    battler.rule_processor = rule_processor
+    add_child(battler)
+    nodes.append(battler)
+    var wave_units = [{"template_id": "goblin_warrior", "count": 3, "level": 1}]
+
+    for wave in range(3):
+        var players: Array[BattleUnit] = []
+        for i in range(2):
+            var player = BattleUnit.new()
+            player.stats.attack = 60.0
+            players.append(player)
+        var enemies = UnitFactory.create_wave(wave_units, 2, {}, pool)
+        battler.simulate_battle(players, enemies, wave)
+        assert_eq(pool.get_active_count(), 3)
+
+        battler.detach_units(players)
+        battler.detach_units(enemies)
+        pool.release_all(enemies)
+        for player in players:
+            player.free()
+        assert_eq(battler.get_child_count(), 0, "Finished wave units should leave the battler")
+
+    assert_eq(pool.get_stats().created, 3, "Later waves should only reuse pooled units")
+    assert_eq(pool.get_pooled_count(), 3)
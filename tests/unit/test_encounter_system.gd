@@ -92,6 +92,55 @@ func test_rewards_system() -> void:
     assert_eq(rewards.items.size(), 3)
     assert_true("gem" in rewards.items)
 
+func test_unit_factory_prototype_spawn_matches_direct_build() -> void:
+    UnitFactory.load_templates()
+    var difficulty = DifficultyScaler.get_difficulty_modifiers(DifficultyScaler.DifficultyMode.HARD)
+    var direct = UnitFactory._build_from_template(UnitFactory.unit_templates["bandit_leader"], 4, 2, difficulty)
+    var first = UnitFactory.create_from_template("bandit_leader", 4, 2, difficulty)
+    var second = UnitFactory.create_from_template("bandit_leader", 4, 2, difficulty)
+    
+    assert_eq(first.capture_battle_state(), direct.capture_battle_state())
+    assert_eq(second.capture_battle_state(), direct.capture_battle_state())
+    assert_eq(first.skills.size(), direct.skills.size())
+    for i in range(first.skills.size()):
+        assert_eq(first.skills[i].base_damage, direct.skills[i].base_damage)
+    
+    # Spawns share nothing mutable
+    assert_ne(first.skills[0], second.skills[0])
+    assert_ne(first.equipment.weapon, second.equipment.weapon)
+    assert_eq(first.equipment.weapon.equipped_to, first)
+    first.unequip_item("armor")
+    assert_eq(second.get_projected_stat("defense"), direct.get_projected_stat("defense"))
+    
+    direct.free()
+    first.free()
+    second.free()
+
+func test_unit_factory_create_wave() -> void:
+    UnitFactory.load_templates()
+    var wave_units = [
+        {"template_id": "goblin_warrior", "count": 3, "level": 2},
+        {"template_id": "goblin_shaman", "count": 1, "level": 2}
+    ]
+    var units = UnitFactory.create_wave(wave_units, 2)
+    
+    assert_eq(units.size(), 4)
+    assert_true(units[0].unit_name.ends_with(" 1"))
+    assert_true(units[2].unit_name.ends_with(" 3"))
+    assert_false(units[3].unit_name.ends_with(" 1"))
+    for unit in units:
+        assert_eq(unit.team, 2)
+    
+    var cache = UnitFactory.get_prototype_cache_stats()
+    assert_eq(cache.misses, 2, "Each template/level pair should be compiled once")
+    
+    UnitFactory.create_wave(wave_units, 2)
+    assert_eq(UnitFactory.get_prototype_cache_stats().misses, 2)
+    assert_eq(UnitFactory.get_prototype_cache_stats().hits, 2)
+    
+    for unit in units:
+        unit.free()
+
 func test_difficulty_scaling() -> void:
     var easy_mods = DifficultyScaler.get_difficulty_modifiers(DifficultyScaler.DifficultyMode.EASY)
     var normal_mods = DifficultyScaler.get_difficulty_modifiers(DifficultyScaler.DifficultyMode.NORMAL)
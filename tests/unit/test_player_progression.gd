@@ -191,6 +191,169 @@ func test_save_manager():
     var deleted_load = SaveManager.load_game(99)
     assert_null(deleted_load, "Deleted save should not load")
 
+func test_save_info_reads_header():
+    var player_data = PlayerData.new()
+    player_data.player_level = 7
+    player_data.gold = 1234
+    player_data.completed_encounters = ["tutorial_battle", "forest_ambush"]
+    
+    assert_true(SaveManager.save_game(player_data, 98))
+    var save_path = SaveManager.SAVE_DIR + "save_slot_98.sav"
+    assert_eq(SaveManager.get_save_version(save_path), SaveManager.SAVE_VERSION)
+    assert_false(FileAccess.file_exists(save_path + SaveManager.TEMP_SUFFIX), "Temp file should be renamed into place")
+    
+    var info = SaveManager.get_save_info(save_path)
+    assert_eq(info.player_level, 7)
+    assert_eq(info.gold, 1234)
+    assert_eq(info.completed_encounters, 2)
+    
+    var listed = SaveManager.list_saves().filter(func(s): return s.path == save_path)
+    assert_eq(listed.size(), 1, "list_saves should include the slot")
+    
+    SaveManager.delete_save(98)
+
+func test_version_1_save_is_migrated():
+    var player_data = PlayerData.new()
+    player_data.player_level = 4
+    player_data.gold = 321
+    
+    DirAccess.make_dir_recursive_absolute(SaveManager.SAVE_DIR)
+    var save_path = SaveManager.SAVE_DIR + "save_slot_97.sav"
+    var legacy_file = FileAccess.open(save_path, FileAccess.WRITE)
+    legacy_file.store_var({
+        "version": 1,
+        "timestamp": 1000.0,
+        "player_data": player_data.to_save_dict()
+    })
+    legacy_file.close()
+    
+    var info = SaveManager.get_save_info(save_path)
+    assert_eq(info.gold, 321, "Legacy saves should still be listed")
+    assert_eq(info.timestamp, 1000.0, "Migration should keep the original timestamp")
+    assert_eq(SaveManager.get_save_version(save_path), SaveManager.SAVE_VERSION, "Listing should migrate the save")
+    
+    var loaded = SaveManager.load_game(97)
+    assert_not_null(loaded)
+    assert_eq(loaded.player_level, 4)
+    
+    SaveManager.delete_save(97)
+
+func test_save_snapshot_reserializes_only_changes():
+    var player_data = PlayerData.new()
+    var warrior = UnitData.new("warrior_1", "player_warrior")
+    var archer = UnitData.new("archer_1", "player_archer")
+    player_data.add_unit_to_roster(warrior)
+    player_data.add_unit_to_roster(archer)
+    assert_true(player_data.is_dirty(), "New player data has never been saved")
+    
+    var first = player_data.take_save_snapshot()
+    assert_eq(first, player_data.to_save_dict(), "Snapshot should match the full save dict")
+    assert_false(player_data.is_dirty())
+    
+    player_data.add_gold(50)
+    warrior.add_experience(10)
+    assert_eq(player_data.get_dirty_sections(), ["profile", "roster"])
+    
+    var second = player_data.take_save_snapshot()
+    assert_eq(second.gold, 50)
+    assert_eq(second, player_data.to_save_dict())
+    assert_true(is_same(second.inventory, first.inventory), "Unchanged sections should be reused")
+    assert_true(is_same(second.unit_roster[1], first.unit_roster[1]), "Unchanged units should be reused")
+    assert_false(is_same(second.unit_roster[0], first.unit_roster[0]), "Changed units should be serialized again")
+    assert_eq(first.gold, 0, "Earlier snapshots must not change")
+
+func test_progression_manager_coalesces_saves():
+    var manager = load("res://src/progression/progression_manager.gd").new()
+    manager.save_slot = 95
+    SaveManager.delete_save(95)
+    add_child(manager)
+    watch_signals(manager)
+    
+    manager.player_data.add_gold(10)
+    manager.save_player_data()
+    manager.player_data.add_gold(5)
+    manager.save_player_data()
+    manager.player_data.add_gold(1)
+    manager.save_player_data()
+    assert_true(manager.is_save_in_flight(), "Save should run on a worker thread")
+    
+    manager.flush_save()
+    assert_false(manager.is_save_in_flight())
+    assert_signal_emit_count(manager, "player_data_saved", 2, "Saves requested during a write should be coalesced")
+    assert_eq(SaveManager.load_game(95).gold, 16, "The follow-up save should include every change")
+    
+    SaveManager.delete_save(95)
+    manager.queue_free()
+
+func test_progression_manager_flushes_before_loading():
+    var manager = load("res://src/progression/progression_manager.gd").new()
+    manager.save_slot = 93
+    SaveManager.delete_save(93)
+    add_child(manager)
+    
+    manager.player_data.add_gold(25)
+    manager.save_player_data()
+    manager.player_data.add_gold(5)
+    assert_true(manager.is_save_in_flight())
+    
+    manager.load_player_data()
+    assert_false(manager.is_save_in_flight(), "Loading should wait for the save in flight")
+    assert_eq(manager.player_data.gold, 30, "Loading should see every change made before it")
+    
+    SaveManager.delete_save(93)
+    manager.queue_free()
+
+func test_corrupt_save_falls_back_to_backup():
+    var player_data = PlayerData.new()
+    player_data.gold = 100
+    assert_true(SaveManager.save_game(player_data, 96))
+    player_data.gold = 200
+    assert_true(SaveManager.save_game(player_data, 96))
+    
+    # Simulate a torn write by truncating the payload
+    var save_path = SaveManager.SAVE_DIR + "save_slot_96.sav"
+    var bytes = FileAccess.get_file_as_bytes(save_path)
+    var truncated = FileAccess.open(save_path, FileAccess.WRITE)
+    truncated.store_buffer(bytes.slice(0, bytes.size() - 8))
+    truncated.close()
+    
+    var loaded = SaveManager.load_game(96)
+    assert_not_null(loaded, "Backup should be loaded when the save is corrupt")
+    assert_eq(loaded.gold, 100)
+    
+    SaveManager.delete_save(96)
+
+func test_missing_save_falls_back_to_backup_then_temp():
+    var player_data = PlayerData.new()
+    player_data.gold = 100
+    assert_true(SaveManager.save_game(player_data, 94))
+    player_data.gold = 200
+    assert_true(SaveManager.save_game(player_data, 94))
+    
+    # Simulate a crash between the two renames of _write_save: the old save is
+    # already the backup and the new one is still the temp file
+    var save_path = SaveManager.SAVE_DIR + "save_slot_94.sav"
+    var backup_path = SaveManager.SAVE_DIR + "save_slot_94.bak"
+    var temp_path = save_path + SaveManager.TEMP_SUFFIX
+    DirAccess.rename_absolute(save_path, temp_path)
+    assert_true(SaveManager.has_save(94), "A backup alone should still count as a save")
+    
+    var loaded = SaveManager.load_game(94)
+    assert_not_null(loaded, "Backup should be loaded when the save is missing")
+    assert_eq(loaded.gold, 100)
+    
+    var corrupt = FileAccess.open(backup_path, FileAccess.WRITE)
+    corrupt.store_buffer(PackedByteArray([1, 2, 3]))
+    corrupt.close()
+    loaded = SaveManager.load_game(94)
+    assert_not_null(loaded, "A complete temp file should be loaded when the backup is unreadable")
+    assert_eq(loaded.gold, 200)
+    
+    assert_true(SaveManager.delete_save(94))
+    assert_false(FileAccess.file_exists(backup_path))
+    assert_false(FileAccess.file_exists(temp_path))
+    assert_false(SaveManager.has_save(94))
+
 func test_max_level_handling():
     var unit_data = UnitData.new("test", "player_warrior")
     unit_data.unit_level = 9
@@ -196,6 +196,20 @@ func test_cast_progress() -> void:
     # Not ready yet
     assert_false(cast.is_ready())
 
+func test_cast_progress_follows_skill_clock() -> void:
+    var clock = {"now": 10.0}
+    skill.clock = func(): return clock.now
+    skill.cast_time = 2.0
+    
+    var cast = skill.prepare_cast(caster)
+    assert_true(cast.claim_resources())
+    assert_eq(cast.cast_start_time, 10.0)
+    
+    clock.now = 11.0
+    assert_eq(cast.get_cast_progress(), 0.5)
+    clock.now = 12.0
+    assert_true(cast.is_ready())
+
 func test_instant_cast() -> void:
     skill.cast_time = 0.0  # Instant cast
     
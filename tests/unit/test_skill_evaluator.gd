@@ -181,3 +181,67 @@ func test_situational_factors_tags() -> void:
     
     assert_gt(setup_score, 0.0, "Setup skills should score well in opening")
     assert_gt(burst_score, 30.0, "Burst skills should score well in end game")
+
+func _reference_damage_efficiency(skill: BattleSkill, caster: BattleUnit, eval_context: Dictionary) -> float:
+    # The scoring as it was before the per-tick cache: one projector per skill
+    var damage_projector = StatProjector.new()
+    for mod in caster.get_stat_projector("attack").list_modifiers():
+        damage_projector.add_modifier(StatProjector.StatModifier.new(mod.id, mod.op, mod.value, mod.priority, mod.applies_to, mod.expires_at_unix))
+    var total_expected_damage: float = 0.0
+    for target in skill.get_targets(caster, eval_context.allies, eval_context.enemies):
+        var skill_context = {
+            "skill_name": skill.skill_name,
+            "skill_damage_type": skill.damage_type,
+            "caster_health_percentage": caster.get_health_percentage(),
+            "caster_team": caster.team,
+            "target_health_percentage": target.get_health_percentage(),
+            "target_status": target.get_status_list(),
+            "target_team": target.team
+        }
+        for mod in eval_context.rule_processor.get_modifiers_for_context(skill_context):
+            damage_projector.add_modifier(mod)
+        var final_damage = max(1.0, damage_projector.calculate_stat(skill.base_damage) - target.get_projected_stat("defense"))
+        total_expected_damage += final_damage * evaluator._calculate_target_value(target, eval_context)
+    return min(100.0, total_expected_damage / 10.0)
+
+func test_tick_cache_keeps_scores_identical() -> void:
+    var rule_processor = load("res://src/battle/battle_rule_processor.gd").new()
+    rule_processor.skip_auto_load = true
+    rule_processor.rules = [
+        {
+            "id": "fire_bonus",
+            "conditions": {"property": "skill_damage_type", "op": "eq", "value": "fire"},
+            "modifiers": [
+                {"id": "fire_add", "op": "ADD", "value": 3.0, "priority": 5},
+                {"id": "fire_mul", "op": "MUL", "value": 1.25, "priority": 5}
+            ]
+        }
+    ]
+    
+    var second_enemy = load("res://src/battle/battle_unit.gd").new()
+    second_enemy.team = 2
+    second_enemy.stats.health = 40.0
+    unit.get_stat_projector("attack").add_flat_modifier("sword", 4.0, 10)
+    unit.get_stat_projector("attack").add_percentage_modifier("rage", 1.1, 5)
+    context.enemies = [enemy, second_enemy]
+    context["rule_processor"] = rule_processor
+    
+    var skill = BattleSkill.new()
+    skill.skill_name = "Flame Wave"
+    skill.damage_type = "fire"
+    skill.base_damage = 30.0
+    skill.target_type = "all_enemies"
+    
+    var expected = _reference_damage_efficiency(skill, unit, context)
+    assert_eq(evaluator._evaluate_damage_efficiency(skill, unit, context), expected)
+    
+    var uncached = evaluator._calculate_skill_score(skill, unit, context)
+    evaluator.begin_tick()
+    var first = evaluator._calculate_skill_score(skill, unit, context)
+    var cached = evaluator._calculate_skill_score(skill, unit, context)
+    evaluator.end_tick()
+    assert_eq(first, uncached)
+    assert_eq(cached, uncached)
+    
+    second_enemy.free()
+    rule_processor.free()
@@ -219,3 +219,112 @@ func test_cache_invalidation_on_base_change():
     # Should recalculate with new base
     var result3 = projector.calculate_stat(100.0)
     assert_eq(result3, 200.0)
+
+func test_batch_emits_single_coalesced_change():
+    projector.calculate_stat(100.0)
+    projector.connect("stat_calculation_changed", _on_stat_calculation_changed_test)
+    
+    var emissions = []
+    projector.stat_calculation_changed.connect(func(payload): emissions.append(payload))
+    
+    projector.begin_batch()
+    var mod1 = projector.add_flat_modifier("buff", 10.0)
+    var mod2 = projector.add_percentage_modifier("mul", 2.0, 5)
+    projector.remove_modifier(mod1)
+    assert_eq(emissions.size(), 0)
+    assert_true(projector.commit_batch())
+    
+    assert_eq(emissions.size(), 1)
+    assert_eq(_test_payload.old_value, 100.0)
+    assert_eq(_test_payload.added, [mod1, mod2])
+    assert_eq(_test_payload.removed, [mod1])
+    assert_eq(projector.calculate_stat(100.0), 200.0)
+
+func test_nested_batches_emit_on_outermost_commit():
+    var emissions = []
+    projector.stat_calculation_changed.connect(func(payload): emissions.append(payload))
+    
+    projector.begin_batch()
+    projector.begin_batch()
+    projector.add_flat_modifier("buff", 10.0)
+    assert_false(projector.commit_batch())
+    assert_eq(emissions.size(), 0)
+    assert_true(projector.commit_batch())
+    assert_eq(emissions.size(), 1)
+    
+    # Empty batch reports no change
+    projector.begin_batch()
+    assert_false(projector.commit_batch())
+    assert_eq(emissions.size(), 1)
+
+func test_add_modifiers_matches_individual_adds():
+    var emissions = []
+    projector.stat_calculation_changed.connect(func(payload): emissions.append(payload))
+    
+    var added = projector.add_modifiers([
+        StatProjector.StatModifier.new("override", StatProjector.ModifierOp.SET, 50.0, 20, [], -1.0),
+        StatProjector.StatModifier.new("double", StatProjector.ModifierOp.MUL, 2.0, 15, [], -1.0),
+        StatProjector.StatModifier.new("", StatProjector.ModifierOp.ADD, 99.0, 0, [], -1.0),
+        StatProjector.StatModifier.new("buff", StatProjector.ModifierOp.ADD, 25.0, 10, [], -1.0)
+    ])
+    
+    assert_eq(added.size(), 3)
+    assert_eq(emissions.size(), 1)
+    assert_eq(projector.calculate_stat(100.0), 125.0)
+
+func test_prune_expired_coalesces_and_uses_injected_clock():
+    var battle_time = [0.0]
+    projector.time_source = func(): return battle_time[0]
+    
+    var emissions = []
+    projector.stat_calculation_changed.connect(func(payload): emissions.append(payload))
+    
+    for i in range(50):
+        projector.add_flat_modifier("short_%d" % i, 1.0, 0, [], float(i % 5))
+    projector.add_flat_modifier("permanent", 100.0)
+    emissions.clear()
+    
+    battle_time[0] = 2.0
+    var removed = projector.prune_expired()
+    assert_eq(removed.size(), 30)  # Expiries 0, 1 and 2
+    assert_eq(emissions.size(), 1)
+    assert_eq(emissions[0].removed.size(), 30)
+    assert_eq(projector.get_next_expiry(), 3.0)
+    assert_eq(projector.calculate_stat(0.0), 120.0)
+    
+    battle_time[0] = 10.0
+    assert_eq(projector.prune_expired().size(), 20)
+    assert_eq(projector.list_modifiers().size(), 1)
+    assert_eq(projector.get_next_expiry(), -1.0)
+
+func test_prune_expired_skips_modifiers_removed_earlier():
+    var mod = projector.add_flat_modifier("timed", 10.0, 0, [], 5.0)
+    projector.add_flat_modifier("other", 20.0, 0, [], 5.0)
+    projector.remove_modifier(mod)
+    
+    var removed = projector.prune_expired(5.0)
+    assert_eq(removed.size(), 1)
+    assert_eq(removed[0].id, "other")
+    assert_eq(projector.prune_expired(100.0).size(), 0)
+
+func test_prune_expired_removes_every_copy_of_a_modifier_added_twice():
+    var mod = StatProjector.StatModifier.new("timed", StatProjector.ModifierOp.ADD, 10.0, 0, [], 5.0)
+    projector.add_modifier(mod)
+    projector.add_modifier(mod)
+    assert_eq(projector.calculate_stat(0.0), 20.0)
+    
+    var removed = projector.prune_expired(5.0)
+    assert_eq(removed.size(), 2)
+    assert_eq(projector.list_modifiers().size(), 0)
+    assert_eq(projector.calculate_stat(0.0), 0.0)
+    assert_eq(projector.get_next_expiry(), -1.0)
+
+func test_prune_expired_skips_copies_removed_earlier():
+    var mod = StatProjector.StatModifier.new("timed", StatProjector.ModifierOp.ADD, 10.0, 0, [], 5.0)
+    projector.add_modifier(mod)
+    projector.add_modifier(mod)
+    projector.remove_modifier(mod)
+    
+    var removed = projector.prune_expired(5.0)
+    assert_eq(removed.size(), 1)
+    assert_eq(projector.list_modifiers().size(), 0)
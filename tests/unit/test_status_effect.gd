@@ -117,6 +117,16 @@ func test_apply_to_requires_scene_tree():
     # Should push error but not crash
     assert_true(true)
 
+func test_apply_to_counts_duration_on_unit_clock():
+    var unit = BattleUnit.new()
+    unit.clock = func(): return 42.0
+    var effect = StatusEffect.new("burn", "Burn", "", 3.0)
+    effect.apply_to(unit)
+    assert_eq(effect.expires_at, 45.0)
+    assert_false(effect.is_expired(44.9))
+    assert_true(effect.is_expired(45.0))
+    unit.free()
+
 func test_remove_from_clears_modifiers():
     status_effect.applied_modifiers = [
         {"modifier": {}, "stat": "attack"},
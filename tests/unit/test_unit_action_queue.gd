@@ -3,6 +3,7 @@ extends GutTest
 var queue: UnitActionQueue
 var fast_unit: BattleUnit
 var slow_unit: BattleUnit
+var clock_time: float = 0.0
 
 func before_each() -> void:
 	queue = UnitActionQueue.new()
@@ -162,4 +163,66 @@ func test_action_timeline() -> void:
 		elif entry.unit == slow_unit:
 			slow_count += 1
 	
-	assert_gt(fast_count, slow_count, "Fast unit should act more frequently")
\ No newline at end of file
+	assert_gt(fast_count, slow_count, "Fast unit should act more frequently")
+
+func _use_simulated_clock() -> void:
+	clock_time = 0.0
+	queue.battle_clock = func(): return clock_time
+
+func test_simulated_clock_schedules_actions() -> void:
+	_use_simulated_clock()
+	queue.register_unit(fast_unit)
+	queue.register_unit(slow_unit)
+	
+	assert_eq(queue.get_action_order().size(), 2, "Both units are ready at the start")
+	assert_eq(queue.get_action_order().size(), 0, "Nobody is ready until the clock advances")
+	
+	# Fast unit: 1 / (1 + 10 * 0.1) = 0.5s; slow unit: 1 / 1.3 = ~0.77s
+	clock_time = 0.5
+	var order = queue.get_action_order()
+	assert_eq(order.size(), 1)
+	assert_eq(order[0].unit, fast_unit)
+	assert_almost_eq(queue.get_time_until_next_action(fast_unit), 0.5, 0.0001)
+
+func test_simulated_runs_are_reproducible() -> void:
+	_use_simulated_clock()
+	queue.register_unit(fast_unit)
+	queue.register_unit(slow_unit)
+	
+	var runs = []
+	for run in range(2):
+		var actions = []
+		for step in range(40):
+			clock_time = step * 0.1
+			for data in queue.get_action_order():
+				actions.append([step, data.unit.unit_name])
+		runs.append(actions)
+		queue = UnitActionQueue.new()
+		_use_simulated_clock()
+		queue.register_unit(fast_unit)
+		queue.register_unit(slow_unit)
+	
+	assert_eq(runs[0], runs[1])
+
+func test_speed_change_reschedules_pending_action() -> void:
+	_use_simulated_clock()
+	queue.register_unit(slow_unit)
+	queue.get_action_order()
+	var before = queue.get_time_until_next_action(slow_unit)
+	
+	slow_unit.stats.speed = 20.0
+	queue.update_unit_priority(slow_unit)
+	
+	assert_lt(queue.get_time_until_next_action(slow_unit), before, "A faster unit should act sooner")
+	clock_time = queue.get_time_until_next_action(slow_unit)
+	assert_eq(queue.get_action_order().size(), 1)
+
+func test_timeline_uses_simulated_clock() -> void:
+	_use_simulated_clock()
+	queue.register_unit(fast_unit)
+	queue.register_unit(slow_unit)
+	queue.get_action_order()
+	
+	var timeline = queue.get_action_timeline(1.0)
+	var fast_times = timeline.filter(func(entry): return entry.unit == fast_unit).map(func(entry): return entry.time)
+	assert_eq(fast_times, [0.5, 1.0])
@@ -0,0 +1,187 @@
+extends SceneTree
+
+# Long-lived headless worker driven by the MCP server's worker pool. It listens
+# on a local TCP port and answers one JSON request per line:
+#
+#   {"id": "7", "command": "run_tests", "params": {"selected": "test_battle"}}
+#
+# Each reply is a single JSON line carrying the same id. Jobs run one at a time
+# and engine state is never reset between them; the pool recycles the whole
+# process instead (after N jobs, on memory growth or when project files change).
+#
+#   godot --headless --script res://tools/mcp/worker_loop.gd -- --port=0
+
+const EncounterSimulation = preload("res://tools/simulation/encounter_simulation.gd")
+const READY_PREFIX = "WORKER_READY "
+const JOB_END_PREFIX = "WORKER_JOB_END "
+const GUT_SCRIPT = "res://addons/gut/gut.gd"
+const GUT_CONFIG_PATH = "res://.gutconfig.json"
+const SCRIPT_DIRS = ["res://src", "res://tests", "res://tools"]
+
+var _server: TCPServer = TCPServer.new()
+var _peer: StreamPeerTCP = null
+var _buffer: PackedByteArray = PackedByteArray()
+var _pending: Array = []
+var _busy: bool = false
+var _jobs: int = 0
+var _started_msec: int = 0
+
+func _initialize() -> void:
+	var port = 0
+	for arg in OS.get_cmdline_user_args():
+		if arg.begins_with("--port="):
+			port = int(arg.substr(7))
+
+	var err = _server.listen(port, "127.0.0.1")
+	if err != OK:
+		push_error("Worker could not listen on port %d: %s" % [port, error_string(err)])
+		quit(1)
+		return
+
+	_started_msec = Time.get_ticks_msec()
+	# Sleep between frames while idle; jobs switch back to full speed
+	OS.low_processor_usage_mode = true
+	print(READY_PREFIX + str(_server.get_local_port()))
+
+func _process(_delta: float) -> bool:
+	if _server.is_connection_available():
+		# The pool holds a single connection per worker; a reconnect replaces it
+		_peer = _server.take_connection()
+		_buffer.clear()
+
+	if _peer == null:
+		return false
+
+	_peer.poll()
+	var status = _peer.get_status()
+	if status == StreamPeerTCP.STATUS_NONE or status == StreamPeerTCP.STATUS_ERROR:
+		# The pool is gone and nothing else will talk to this worker
+		return true
+
+	_read_requests()
+	if not _busy and not _pending.is_empty():
+		_run_job(_pending.pop_front())
+	return false
+
+func _read_requests() -> void:
+	var available = _peer.get_available_bytes()
+	if available > 0:
+		var chunk = _peer.get_data(available)
+		if chunk[0] == OK:
+			_buffer.append_array(chunk[1])
+
+	var newline = _buffer.find(10)
+	while newline >= 0:
+		var line = _buffer.slice(0, newline).get_string_from_utf8()
+		_buffer = _buffer.slice(newline + 1)
+		newline = _buffer.find(10)
+
+		if line.strip_edges().is_empty():
+			continue
+		var request = JSON.parse_string(line)
+		if request is Dictionary:
+			_pending.append(request)
+		else:
+			_send({"id": null, "ok": false, "error": "Malformed request: " + line.left(200)})
+
+func _run_job(request: Dictionary) -> void:
+	_busy = true
+	OS.low_processor_usage_mode = false
+
+	var started_usec = Time.get_ticks_usec()
+	var command: String = request.get("command", "")
+	var params: Dictionary = request.get("params", {})
+	var result: Dictionary
+
+	match command:
+		"ping":
+			result = {"uptime_seconds": (Time.get_ticks_msec() - _started_msec) / 1000.0}
+		"run_tests":
+			result = await _run_tests(params)
+		"check_scripts":
+			result = _check_scripts(params)
+		"simulate":
+			result = _simulate(params)
+		_:
+			result = {"error": "Unknown command: " + command}
+
+	_jobs += 1
+	var response = {
+		"id": request.get("id"),
+		"ok": not result.has("error"),
+		"jobs": _jobs,
+		"memory": OS.get_static_memory_usage(),
+		"elapsed_ms": (Time.get_ticks_usec() - started_usec) / 1000.0
+	}
+	if result.has("error"):
+		response["error"] = result.error
+	else:
+		response["result"] = result
+
+	# Marks the end of this job's console output for the pool's log capture
+	print(JOB_END_PREFIX + str(request.get("id")))
+	_send(response)
+
+	OS.low_processor_usage_mode = true
+	_busy = false
+
+func _send(response: Dictionary) -> void:
+	if _peer == null or _peer.get_status() != StreamPeerTCP.STATUS_CONNECTED:
+		return
+	_peer.put_data((JSON.stringify(response) + "\n").to_utf8_buffer())
+
+# Runs GUT in-process with the project's .gutconfig.json. "selected" keeps
+# scripts whose path contains the text (like -gselect), "tests" lists script
+# paths (like -gtest) and "unit_test_name" filters test methods.
+func _run_tests(params: Dictionary) -> Dictionary:
+	var config = GutUtils.GutConfig.new()
+	if FileAccess.file_exists(GUT_CONFIG_PATH):
+		config.load_options(GUT_CONFIG_PATH)
+	for key in ["dirs", "tests", "selected", "unit_test_name", "prefix", "log_level", "junit_xml_file"]:
+		if params.has(key):
+			config.options[key] = params[key]
+	config.options.log_level = int(config.options.log_level)
+	config.options.should_exit = false
+
+	var gut = load(GUT_SCRIPT).new()
+	root.add_child(gut)
+	config.apply_options(gut)
+	gut.test_scripts(config.options.unit_test_name == "")
+	if gut.is_running():
+		await gut.end_run
+
+	var results = GutUtils.ResultExporter.new().get_results_dictionary(gut)
+	root.remove_child(gut)
+	gut.free()
+	return results
+
+# Loads every script from disk, bypassing the resource cache, and reports the
+# ones that fail to parse or compile.
+func _check_scripts(params: Dictionary) -> Dictionary:
+	var paths: Array = []
+	for dir in params.get("dirs", SCRIPT_DIRS):
+		_collect_scripts(dir, paths)
+
+	var failed: Array = []
+	for path in paths:
+		var script = ResourceLoader.load(path, "GDScript", ResourceLoader.CACHE_MODE_IGNORE)
+		if script == null or not script.can_instantiate():
+			failed.append(path)
+	return {"checked": paths.size(), "failed": failed}
+
+func _collect_scripts(dir_path: String, paths: Array) -> void:
+	var dir = DirAccess.open(dir_path)
+	if dir == null:
+		return
+	for file_name in dir.get_files():
+		if file_name.get_extension() == "gd":
+			paths.append(dir_path.path_join(file_name))
+	for sub_dir in dir.get_directories():
+		_collect_scripts(dir_path.path_join(sub_dir), paths)
+
+func _simulate(params: Dictionary) -> Dictionary:
+	var simulation = EncounterSimulation.new()
+	var records = simulation.run(params, root)
+	if not simulation.error.is_empty():
+		return {"error": simulation.error}
+	return {"records": records}
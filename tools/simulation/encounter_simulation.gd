@@ -0,0 +1,169 @@
+extends RefCounted
+
+# Monte Carlo runs of one encounter, shared by the one-shot
+# encounter_simulator.gd script and the MCP worker loop. Each run plays every
+# wave with AutoBattler's headless mode and yields one record; run i uses
+# seed + i so shards can be merged by run index.
+
+const ENCOUNTERS_PATH = "res://data/encounters.json"
+const UNIT_KEY_META = "simulation_key"
+const DEFAULT_OPTIONS = {
+	"encounter": "",
+	"difficulty": "normal",
+	"runs": 1,
+	"first-run": 0,
+	"seed": 0,
+	"team": "player_warrior,player_archer,player_healer,player_mage",
+	"level": 1
+}
+
+# Set when run() fails before simulating anything
+var error: String = ""
+
+# Returns one record per run, or an empty array with error set
+func run(options: Dictionary, root: Node) -> Array:
+	error = ""
+	options = _with_defaults(options)
+	
+	var encounter = _load_encounter(options.encounter)
+	if encounter == null:
+		error = "Encounter not found: " + options.encounter
+		return []
+	
+	var mode_index = DifficultyScaler.DifficultyMode.keys().find(String(options.difficulty).to_upper())
+	if mode_index < 0:
+		error = "Unknown difficulty: " + options.difficulty
+		return []
+	var difficulty_modifiers = DifficultyScaler.get_difficulty_modifiers(DifficultyScaler.DifficultyMode.values()[mode_index], 0)
+	
+	UnitFactory.load_templates()
+	
+	var processor = BattleRuleProcessor.new()
+	processor.skip_auto_load = true
+	root.add_child(processor)
+	var rules_path: String = ProjectSettings.get_setting(BattleRuleProcessor.PROJECT_SETTING_RULES_PATH, "")
+	if not rules_path.is_empty():
+		processor.load_rules_from_path(rules_path)
+	var base_rules: Array = processor.rules.duplicate()
+	
+	var team_ids = options.team if options.team is Array else String(options.team).split(",", false)
+	var records: Array = []
+	for i in range(options.runs):
+		var run_index: int = options["first-run"] + i
+		var run_seed: int = options.seed + run_index
+		var record = _simulate_run(encounter, difficulty_modifiers, team_ids, options.level, run_seed, processor, base_rules, root)
+		record["run"] = run_index
+		record["seed"] = run_seed
+		records.append(record)
+	
+	processor.free()
+	return records
+
+func _with_defaults(options: Dictionary) -> Dictionary:
+	var resolved = DEFAULT_OPTIONS.duplicate()
+	for key in options:
+		if resolved.has(key):
+			# JSON numbers arrive as floats from the worker protocol
+			resolved[key] = int(options[key]) if resolved[key] is int else options[key]
+	return resolved
+
+func _load_encounter(encounter_id: String) -> Encounter:
+	var file = FileAccess.open(ENCOUNTERS_PATH, FileAccess.READ)
+	if not file:
+		return null
+	var data = JSON.parse_string(file.get_as_text())
+	file.close()
+	if not data is Dictionary:
+		return null
+	for encounter_data in data.get("encounters", []):
+		if encounter_data.get("encounter_id", "") == encounter_id:
+			return Encounter.from_dict(encounter_data)
+	return null
+
+func _simulate_run(encounter: Encounter, difficulty_modifiers: Dictionary, team_ids: Array, level: int, run_seed: int, processor: BattleRuleProcessor, base_rules: Array, root: Node) -> Dictionary:
+	var player_team: Array[BattleUnit] = []
+	for template_id in team_ids:
+		var unit = UnitFactory.create_from_template(template_id, level, 1)
+		unit.set_meta(UNIT_KEY_META, "player:" + template_id)
+		player_team.append(unit)
+	
+	var damage_dealt: Dictionary = {}
+	var unit_stats: Dictionary = {}
+	var rounds = 0
+	var waves_cleared = 0
+	# One clock for the whole run: player skills keep their last_used_time between waves
+	var run_time = 0.0
+	var victory = true
+	
+	for wave_index in range(encounter.waves.size()):
+		var wave: Wave = encounter.waves[wave_index]
+		processor.rules = base_rules + encounter.environment_modifiers + wave.wave_modifiers
+		
+		var enemies: Array[BattleUnit] = []
+		for unit_data in wave.enemy_units:
+			var group = UnitFactory.create_unit_group(unit_data.template_id, unit_data.get("count", 1), unit_data.get("level", 1), 2, difficulty_modifiers)
+			for unit in group:
+				unit.set_meta(UNIT_KEY_META, "enemy:" + unit_data.template_id)
+			enemies.append_array(group)
+		
+		var alive_players: Array[BattleUnit] = []
+		for unit in player_team:
+			if unit.is_alive():
+				alive_players.append(unit)
+		
+		var battler = AutoBattler.new()
+		battler.rule_processor = processor
+		battler.headless = true
+		battler.simulated_start_time = run_time
+		root.add_child(battler)
+		
+		# Damage dealt is attributed to the unit whose turn caused the opposing team's damage_taken to grow
+		var turn_state = {"before": 0.0}
+		battler.turn_started.connect(func(unit):
+			turn_state.before = _total_damage_taken(enemies if unit.team == 1 else alive_players))
+		battler.turn_ended.connect(func(unit):
+			var dealt = _total_damage_taken(enemies if unit.team == 1 else alive_players) - turn_state.before
+			damage_dealt[unit] = damage_dealt.get(unit, 0.0) + dealt)
+		
+		var winner = battler.simulate_battle(alive_players, enemies, run_seed * 31 + wave_index)
+		rounds += battler.current_round
+		run_time = battler.get_battle_time()
+		
+		for unit in enemies:
+			_record_unit(unit_stats, unit, damage_dealt)
+		for unit in alive_players:
+			battler.remove_child(unit)
+		battler.free()
+		
+		if winner != 1:
+			victory = false
+			break
+		waves_cleared += 1
+	
+	for unit in player_team:
+		_record_unit(unit_stats, unit, damage_dealt)
+		unit.free()
+	
+	return {
+		"victory": victory,
+		"rounds": rounds,
+		"waves_cleared": waves_cleared,
+		"units": unit_stats
+	}
+
+func _total_damage_taken(units: Array[BattleUnit]) -> float:
+	var total = 0.0
+	for unit in units:
+		total += unit.stats.get("damage_taken", 0.0)
+	return total
+
+# Per-key entry: [unit count, damage dealt, damage taken, survivors]
+func _record_unit(unit_stats: Dictionary, unit: BattleUnit, damage_dealt: Dictionary) -> void:
+	var key = unit.get_meta(UNIT_KEY_META, "unknown")
+	if not unit_stats.has(key):
+		unit_stats[key] = [0, 0.0, 0.0, 0]
+	var entry = unit_stats[key]
+	entry[0] += 1
+	entry[1] += damage_dealt.get(unit, 0.0)
+	entry[2] += unit.stats.get("damage_taken", 0.0)
+	entry[3] += 1 if unit.is_alive() else 0
@@ -0,0 +1,36 @@
+extends SceneTree
+
+# Headless Monte Carlo runner for one encounter, used by the MCP
+# simulate_encounter tool. Prints one result line per run, so shards can be
+# merged by run index. The simulation itself lives in encounter_simulation.gd.
+#
+#   godot --headless --script res://tools/simulation/encounter_simulator.gd -- \
+#       --encounter=forest_ambush --difficulty=normal --runs=250 --first-run=0 \
+#       --seed=1 --team=player_warrior,player_mage --level=1
+
+const EncounterSimulation = preload("res://tools/simulation/encounter_simulation.gd")
+const RESULT_PREFIX = "SIMULATION_RESULT "
+
+func _initialize() -> void:
+	quit(_run(_parse_args(OS.get_cmdline_user_args())))
+
+func _parse_args(args: PackedStringArray) -> Dictionary:
+	var options = {}
+	for arg in args:
+		if not arg.begins_with("--") or not "=" in arg:
+			continue
+		var key = arg.substr(2, arg.find("=") - 2)
+		var value = arg.substr(arg.find("=") + 1)
+		if EncounterSimulation.DEFAULT_OPTIONS.has(key):
+			options[key] = int(value) if EncounterSimulation.DEFAULT_OPTIONS[key] is int else value
+	return options
+
+func _run(options: Dictionary) -> int:
+	var simulation = EncounterSimulation.new()
+	var records = simulation.run(options, root)
+	if not simulation.error.is_empty():
+		push_error(simulation.error)
+		return 1
+	for record in records:
+		print(RESULT_PREFIX + JSON.stringify(record))
+	return 0
@@ -0,0 +1,10 @@
+extends GutHookScript
+
+# Post-run hook for the sharded test runner (gut_shard_runner.py). Writes GUT's
+# JSON results next to the shard's JUnit file, so shards can be merged without
+# parsing GUT's XML (failure messages are not escaped there).
+
+func run() -> void:
+	if gut.junit_xml_file.is_empty():
+		return
+	GutUtils.ResultExporter.new().write_json_file(gut, gut.junit_xml_file.get_basename() + ".json")
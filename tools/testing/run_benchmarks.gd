@@ -0,0 +1,68 @@
+extends SceneTree
+
+# Headless runner for tests/benchmarks/benchmark_suite.gd, used by
+# benchmark_check.py and the MCP run_benchmarks tool. Each case is run once to
+# warm up and then timed `trials` times; one result line is printed per case
+# with the median and spread of the trials.
+#
+#   godot --headless --script res://tools/testing/run_benchmarks.gd -- \
+#       --trials=7 --filter=rule_processor
+
+const BenchmarkSuite = preload("res://tests/benchmarks/benchmark_suite.gd")
+const INFO_PREFIX = "BENCHMARK_INFO "
+const RESULT_PREFIX = "BENCHMARK_RESULT "
+const DEFAULT_TRIALS = 7
+
+func _initialize() -> void:
+	quit(_run(_parse_args(OS.get_cmdline_user_args())))
+
+func _parse_args(args: PackedStringArray) -> Dictionary:
+	var options = {"trials": DEFAULT_TRIALS, "filter": ""}
+	for arg in args:
+		if arg.begins_with("--trials="):
+			options.trials = maxi(1, arg.substr(9).to_int())
+		elif arg.begins_with("--filter="):
+			options.filter = arg.substr(9)
+	return options
+
+func _run(options: Dictionary) -> int:
+	var suite = BenchmarkSuite.new()
+	var case_names = suite.get_case_names().filter(func(case_name): return options.filter in case_name)
+	if case_names.is_empty():
+		push_error("No benchmark case matches '%s'" % options.filter)
+		return 1
+
+	print(INFO_PREFIX + JSON.stringify({
+		"godot_version": Engine.get_version_info().string,
+		"trials": options.trials,
+		"cases": case_names.size()
+	}))
+	for case_name in case_names:
+		var bench_case = suite.build_case(case_name, root)
+		bench_case.run.call()
+		var samples: Array = []
+		for trial in range(options.trials):
+			var start = Time.get_ticks_usec()
+			bench_case.run.call()
+			samples.append(Time.get_ticks_usec() - start)
+		if bench_case.has("cleanup"):
+			bench_case.cleanup.call()
+
+		samples.sort()
+		var median = _median(samples)
+		print(RESULT_PREFIX + JSON.stringify({
+			"case": case_name,
+			"ops": bench_case.ops,
+			"median_usec": median,
+			"min_usec": samples[0],
+			"max_usec": samples[-1],
+			"usec_per_op": median / bench_case.ops,
+			"samples": samples
+		}))
+	return 0
+
+func _median(sorted_samples: Array) -> float:
+	var middle = sorted_samples.size() / 2
+	if sorted_samples.size() % 2 == 1:
+		return sorted_samples[middle]
+	return (sorted_samples[middle - 1] + sorted_samples[middle]) / 2.0